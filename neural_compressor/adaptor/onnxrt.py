@@ -158,6 +158,8 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         self.quantize_config = {}  # adaptor should know current configs at any time
         self.quantize_params = {}  # adaptor should know current params at any time
         self.min_max = None
+        # calibration statistics shared by tuning trials
+        self.calib_cache = None
 
         self.optype_statistics = None
 
@@ -795,11 +797,13 @@ class ONNXRUNTIMEAdaptor(Adaptor):
         self.optype_statistics = field_names, output_data
 
     def _get_quantize_params(self, model, data_loader, quantize_config, iterations, **kwargs):
-        from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
+        from neural_compressor.adaptor.ox_utils.calibration import CalibrationCache, ONNXRTAugment
         from neural_compressor.model.onnx_model import ONNXModel
 
         if not isinstance(model, ONNXModel):
             model = ONNXModel(model)
+        if self.calib_cache is None:
+            self.calib_cache = CalibrationCache()
         black_nodes = [node for node in quantize_config if quantize_config[node] == "fp32"]
         white_nodes = [node for node in quantize_config if quantize_config[node] != "fp32"]
 
@@ -812,6 +816,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
             iterations=list(range(0, iterations)),
             backend=self.backend,
             reduce_range=self.reduce_range,
+            calib_cache=self.calib_cache,
             **kwargs,
         )
         self.min_max = augment.dump_minmax(quantize_config)
@@ -1164,6 +1169,7 @@ class ONNXRUNTIMEAdaptor(Adaptor):
             for idx, node in enumerate(model.graph.node):
                 if node_names.count(node.name) > 1:
                     node.name = node.op_type + "_nc_rename_" + str(idx)
+            model_wrapper.update()
             if model_wrapper.is_large_model:
                 onnx.save(
                     model,
@@ -23,10 +23,12 @@
 """Calibration for onnx models."""
 
 import copy
+import hashlib
 import logging
 import os
 import sys
 from importlib.util import find_spec
+from itertools import chain
 
 import numpy as np
 import onnx
@@ -35,7 +37,7 @@ import onnxruntime
 from onnx import TensorProto, helper, shape_inference
 from packaging.version import Version
 
-from neural_compressor.adaptor.ox_utils.calibrator import CALIBRATOR
+from neural_compressor.adaptor.ox_utils.calibrator import CALIBRATOR, KLCalibrator
 from neural_compressor.adaptor.ox_utils.util import (
     _get_qrange_for_qType,
     calculate_scale_zp,
@@ -50,6 +52,102 @@ ONNX18_VERSION = Version("1.8.0")
 ORT112_VERSION = Version("1.12.0")
 
 
+def get_model_fingerprint(model):
+    """Get the fingerprint of an onnx model from its graph and initializers.
+
+    The whole graph and all initializer data are hashed, so any weight updated in place,
+    e.g. by smooth quant, changes the fingerprint. Initializers stored as external data
+    are hashed by their location and offset.
+
+    Args:
+        model (ModelProto): onnx model.
+
+    Returns:
+        str: the sha256 digest of the model.
+    """
+    sha = hashlib.sha256()
+    graph = model.graph
+    # serialize the protos one by one as the whole model may exceed the 2GB protobuf limit
+    for proto in chain(model.opset_import, graph.input, graph.output, graph.node, graph.initializer):
+        sha.update(proto.SerializeToString())
+    return sha.hexdigest()
+
+
+class CalibrationCache:
+    """Calibration statistics shared by the tuning trials.
+
+    The calib ranges of activation tensors are keyed by the model fingerprint, the calibration dataloader,
+    the calibrated iterations and the calibration method of each tensor. Trials that only differ in op-wise
+    fallback calibrate a subset of the recorded tensors, so they reuse the ranges instead of running the model.
+    """
+
+    def __init__(self):
+        """Initialization."""
+        self._records = []
+
+    def _get_record(self, fingerprint, dataloader, iterations, backend):
+        for record in self._records:
+            if (
+                record["fingerprint"] == fingerprint
+                and record["dataloader"] is dataloader
+                and record["iterations"] == iterations
+                and record["backend"] == backend
+            ):
+                return record
+        return None
+
+    def get(self, fingerprint, dataloader, iterations, backend, tensor_methods):
+        """Get the recorded calib ranges.
+
+        Args:
+            fingerprint (str): fingerprint of the calibrated model.
+            dataloader (object): calibration dataloader.
+            iterations (list): calibrated iterations.
+            backend (str): execution provider.
+            tensor_methods (dict): tensor name to calibration method.
+
+        Returns:
+            dict or None: tensor name to calib ranges, None if any tensor is not recorded.
+        """
+        record = self._get_record(fingerprint, dataloader, list(iterations), backend)
+        if record is None or any(item not in record["ranges"] for item in tensor_methods.items()):
+            return None
+        ranges = {}
+        for tensor_method in tensor_methods.items():
+            if record["ranges"][tensor_method] is not None:
+                ranges[tensor_method[0]] = copy.deepcopy(record["ranges"][tensor_method])
+        return ranges
+
+    def update(self, fingerprint, dataloader, iterations, backend, tensor_methods, ranges):
+        """Record the calib ranges.
+
+        Args:
+            fingerprint (str): fingerprint of the calibrated model.
+            dataloader (object): calibration dataloader.
+            iterations (list): calibrated iterations.
+            backend (str): execution provider.
+            tensor_methods (dict): tensor name to calibration method.
+            ranges (dict): tensor name to calib ranges, tensors with empty output are absent.
+        """
+        record = self._get_record(fingerprint, dataloader, list(iterations), backend)
+        if record is None:
+            # keep the dataloader referenced so that its identity is not reused by another object
+            record = {
+                "fingerprint": fingerprint,
+                "dataloader": dataloader,
+                "iterations": list(iterations),
+                "backend": backend,
+                "ranges": {},
+            }
+            self._records.append(record)
+        for tensor_method in tensor_methods.items():
+            record["ranges"][tensor_method] = copy.deepcopy(ranges.get(tensor_method[0]))
+
+    def clear(self):
+        """Clear the recorded calib ranges."""
+        self._records.clear()
+
+
 class ONNXRTAugment:
     """Augment input model to dump tensor or for calibration."""
 
@@ -76,6 +174,8 @@ class ONNXRTAugment:
             iterations (list, optional): tensor of which iteration will be collected. Defaults to [].
             backend (list, optional): execution provider for onnxruntime. Defaults to ['CPUExecutionProvider'].
             reduce_range (bool, optional): use 7 bit or not. Defaults to False.
+            calib_cache (CalibrationCache, optional): calibration statistics shared by tuning trials.
+                Defaults to None.
         """
         self.model_wrapper = model_wrapper
         self.model = model_wrapper.model
@@ -94,6 +194,7 @@ class ONNXRTAugment:
         self.dynamically_quantized = False
         self.ort_version = Version(onnxruntime.__version__)
         self.reduce_range = reduce_range
+        self.calib_cache = kwargs.get("calib_cache", None)
 
         self.layer_wise = True if len(kwargs.get("split_model_input_names", [])) != 0 else False
         if self.layer_wise:
@@ -237,6 +338,22 @@ class ONNXRTAugment:
         Returns:
             dict: calib ranges
         """
+        # reuse the calib ranges recorded by previous tuning trials if all dumped tensors are recorded
+        use_calib_cache = (
+            self.calib_cache is not None and q_config is not None and not self.layer_wise and not self.already_quantized
+        )
+        if use_calib_cache:
+            name_to_node = self._get_output_name_to_node([output.name for output in self.augmented_model.graph.output])
+            tensor_methods = {
+                data_name: self._get_calib_method(q_config, node_name) for data_name, node_name in name_to_node.items()
+            }
+            cache_key = (get_model_fingerprint(self.model), self.dataloader, self.iterations, self.backend)
+            activation_tensors_calib_range = self.calib_cache.get(*cache_key, tensor_methods)
+            if activation_tensors_calib_range is not None:
+                logger.info("Reuse calibration ranges of {} tensors recorded in tuning.".format(len(tensor_methods)))
+                self._dataloder_for_next_split_model = []
+                return activation_tensors_calib_range
+
         # conduct inference session and get intermediate outputs
         so = onnxruntime.SessionOptions()
         so.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
@@ -257,30 +374,12 @@ class ONNXRTAugment:
         len_outputs = len(session.get_outputs())
         outputs_names = [session.get_outputs()[i].name for i in range(len_outputs)]
 
-        node_output_names = [
-            output.name if output.name not in self.dequantized_output else self.dequantized_output[output.name]
-            for output in session.get_outputs()
-        ]
-        augment_model_wrapper = (
-            ONNXModel(self.augmented_model, load_external_data=False)
-            if not self.model_wrapper.is_large_model
-            else ONNXModel(self.model_wrapper.model_path + "_augment.onnx", load_external_data=False)
-        )
-        input_name_to_nodes = augment_model_wrapper.input_name_to_nodes
-        output_name_to_node = augment_model_wrapper.output_name_to_node
-        name_to_node = {}
-        for data_name in node_output_names:
-            node = None
-            if data_name in output_name_to_node:
-                node = output_name_to_node[data_name]
-            elif data_name in input_name_to_nodes:
-                node = input_name_to_nodes[data_name][0]
-            assert node, "{} is neither an input nor an output of nodes in augmented model.".format(data_name)
-            name_to_node[data_name] = node.name
+        node_output_names = [self.dequantized_output.get(output_name, output_name) for output_name in outputs_names]
+        name_to_node = self._get_output_name_to_node(outputs_names)
 
         activation_tensors_calib_range = {}
-        intermediate_tensor = {}
         name_to_calibrator = {}
+        name_to_minmax_calibrator = {}
         ort_inputs_for_next_split_model = []
         for idx, (inputs, labels) in enumerate(self.dataloader):
             ort_inputs = {}
@@ -315,11 +414,7 @@ class ONNXRTAugment:
                     if q_config is not None and output.size != 0:
                         node_name = name_to_node[node_output_names[output_idx]]
                         if node_output_names[output_idx] not in name_to_calibrator:
-                            calib_method = (
-                                q_config[node_name]["activation"]["algorithm"]
-                                if q_config and node_name in q_config and "activation" in q_config[node_name]
-                                else "minmax"
-                            )
+                            calib_method = self._get_calib_method(q_config, node_name)
                             assert calib_method in CALIBRATOR, "Calibration method {} is not registered.".format(
                                 calib_method
                             )
@@ -327,20 +422,19 @@ class ONNXRTAugment:
                         else:
                             calibrator = name_to_calibrator[node_output_names[output_idx]]
 
-                        # currently, the calibration range for each iteration is collected if
-                        # the calibration method is minmax, otherwise the tensor data is collected.
-                        # TODO: for kl and percentile method, need to support range collection
-                        # per iteration in the future.
+                        # the calibration range of minmax method is updated per iteration, kl and
+                        # percentile methods merge the output into a histogram, so no tensor data is kept.
+                        calibrator.collect(output)
+                        name_to_calibrator[node_output_names[output_idx]] = calibrator
+                        if use_calib_cache and calibrator.method_name != "minmax":
+                            # record the minmax range as well, which is used once the node falls back to fp32
+                            if node_output_names[output_idx] not in name_to_minmax_calibrator:
+                                name_to_minmax_calibrator[node_output_names[output_idx]] = CALIBRATOR["minmax"]()
+                            name_to_minmax_calibrator[node_output_names[output_idx]].collect(output)
                         if calibrator.method_name == "minmax":
-                            calibrator.collect(output)
                             activation_tensors_calib_range[node_output_names[output_idx]] = [
                                 list(calibrator.calib_range)
                             ]
-                            name_to_calibrator[node_output_names[output_idx]] = calibrator
-                        else:
-                            intermediate_tensor.setdefault((node_output_names[output_idx], node_name), []).append(
-                                output
-                            )
                     elif q_config is None:
                         activation_tensors_calib_range.setdefault(node_output_names[output_idx], []).append(output)
 
@@ -357,27 +451,66 @@ class ONNXRTAugment:
             else:
                 _collect_data(ort_inputs)
 
-        # for kl and percentile method, collect calibration range after all tensors are collected.
-        merged_dict = intermediate_tensor
-        for (output_name, node_name), datas in merged_dict.items():
-            if any([data is None for data in datas]):
-                continue
-            calib_method = (
-                q_config[node_name]["activation"]["algorithm"]
-                if q_config and node_name in q_config and "activation" in q_config[node_name]
-                else "minmax"
-            )
-            calibrator = CALIBRATOR[calib_method]()
-            calibrator.collect(datas)
-            activation_tensors_calib_range.setdefault(output_name, []).append(list(calibrator.calib_range))
+        # for kl and percentile method, compute calibration range after all tensors are collected.
+        # kl ranges of all tensors are computed in one batch
+        KLCalibrator.compute_kl_ranges(
+            [calibrator for calibrator in name_to_calibrator.values() if calibrator.method_name == "kl"]
+        )
+        for output_name, calibrator in name_to_calibrator.items():
+            if calibrator.method_name != "minmax":
+                activation_tensors_calib_range.setdefault(output_name, []).append(list(calibrator.calib_range))
             calibrator.clear()
-            del calibrator
+        del name_to_calibrator
 
         # set for layer-wise quant
         self._dataloder_for_next_split_model = ort_inputs_for_next_split_model
 
+        if use_calib_cache:
+            self.calib_cache.update(*cache_key, tensor_methods, activation_tensors_calib_range)
+            self.calib_cache.update(
+                *cache_key,
+                {output_name: "minmax" for output_name in name_to_minmax_calibrator},
+                {output_name: [list(c.calib_range)] for output_name, c in name_to_minmax_calibrator.items()},
+            )
         return activation_tensors_calib_range
 
+    def _get_output_name_to_node(self, outputs_names):
+        """Map the outputs of augmented model to the names of nodes producing or consuming them.
+
+        Args:
+            outputs_names (list): output names of augmented model.
+
+        Returns:
+            dict: dumped tensor name to node name, the dequantized outputs are mapped back to the original tensors.
+        """
+        augment_model_wrapper = (
+            ONNXModel(self.augmented_model, load_external_data=False)
+            if not self.model_wrapper.is_large_model
+            else ONNXModel(self.model_wrapper.model_path + "_augment.onnx", load_external_data=False)
+        )
+        input_name_to_nodes = augment_model_wrapper.input_name_to_nodes
+        output_name_to_node = augment_model_wrapper.output_name_to_node
+        name_to_node = {}
+        for output_name in outputs_names:
+            data_name = self.dequantized_output.get(output_name, output_name)
+            node = None
+            if data_name in output_name_to_node:
+                node = output_name_to_node[data_name]
+            elif data_name in input_name_to_nodes:
+                node = input_name_to_nodes[data_name][0]
+            assert node, "{} is neither an input nor an output of nodes in augmented model.".format(data_name)
+            name_to_node[data_name] = node.name
+        return name_to_node
+
+    @staticmethod
+    def _get_calib_method(q_config, node_name):
+        """Get the calibration method of the activation of a node, minmax is used by default."""
+        return (
+            q_config[node_name]["activation"]["algorithm"]
+            if q_config and node_name in q_config and "activation" in q_config[node_name]
+            else "minmax"
+        )
+
     def get_weight_tensors_calib_range(self):
         """Get calib ranges of weight tensors.
 
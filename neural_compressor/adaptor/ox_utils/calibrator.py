@@ -131,7 +131,8 @@ class PercentileCalibrator(CalibratorBase):
         if not self.collector:
             self.collector = HistogramCollector(self.num_bins)
         self.collector.collect_data(datas)
-        self.compute_percentile_range(self.percentile)
+        # the percentile range is computed on demand, so that data can be collected batch by batch
+        self._calib_min, self._calib_max = None, None
 
     def compute_percentile_range(self, percentile):
         """Compute percentile range."""
@@ -151,6 +152,13 @@ class PercentileCalibrator(CalibratorBase):
         if self._calib_max > max_range:
             self._calib_max = max_range
 
+    @property
+    def calib_range(self):
+        """Get calibration range value."""
+        if self.collector is not None and self._calib_min is None:
+            self.compute_percentile_range(self.percentile)
+        return self._calib_min, self._calib_max
+
     def clear(self):
         """Clear calibration range."""
         self._calib_min = None
@@ -185,13 +193,37 @@ class KLCalibrator(CalibratorBase):
         if not self.collector:
             self.collector = HistogramCollector(self.num_bins)
         self.collector.collect_data(datas)
-        self.compute_kl_range()
+        # the kl range is computed on demand, so that ranges of many tensors can be computed in one batch
+        self._calib_min, self._calib_max = None, None
 
     def compute_kl_range(self):
         """Compute kl range."""
         histogram = self.collector.histogram
         self._calib_min, self._calib_max = self.get_kl_threshold(histogram, self.num_quantized_bins)
 
+    @staticmethod
+    def compute_kl_ranges(calibrators):
+        """Compute kl ranges of many calibrators in one batch.
+
+        Args:
+            calibrators (list): KLCalibrator objects.
+        """
+        groups = {}
+        for calibrator in calibrators:
+            if calibrator.collector is not None and calibrator._calib_min is None:
+                groups.setdefault(calibrator.num_quantized_bins, []).append(calibrator)
+        for num_quantized_bins, group in groups.items():
+            thresholds = get_kl_thresholds([calibrator.collector.histogram for calibrator in group], num_quantized_bins)
+            for calibrator, (calib_min, calib_max) in zip(group, thresholds):
+                calibrator._calib_min, calibrator._calib_max = calib_min, calib_max
+
+    @property
+    def calib_range(self):
+        """Get calibration range value."""
+        if self.collector is not None and self._calib_min is None:
+            self.compute_kl_range()
+        return self._calib_min, self._calib_max
+
     def get_kl_threshold(self, histogram, num_quantized_bins):
         """Compute kl threshold.
 
@@ -206,79 +238,7 @@ class KLCalibrator(CalibratorBase):
         Returns:
             float: optimal threshold
         """
-        import copy
-
-        from scipy.stats import entropy
-
-        hist = histogram[0]
-        hist_edges = histogram[1]
-        num_bins = hist.size
-        zero_bin_index = num_bins // 2
-        num_half_quantized_bin = num_quantized_bins // 2
-
-        kl_divergence = np.zeros(zero_bin_index - num_half_quantized_bin + 1)
-        thresholds = [(0, 0) for i in range(kl_divergence.size)]
-
-        for i in range(num_half_quantized_bin, zero_bin_index + 1, 1):
-            start_index = zero_bin_index - i
-            end_index = zero_bin_index + i + 1 if (zero_bin_index + i + 1) <= num_bins else num_bins
-
-            thresholds[i - num_half_quantized_bin] = (
-                float(hist_edges[start_index]),
-                float(hist_edges[end_index]),
-            )
-
-            sliced_distribution = copy.deepcopy(hist[start_index:end_index])
-
-            # reference distribution p
-            p = sliced_distribution.copy()  # a copy of np array
-            left_outliers_count = sum(hist[:start_index])
-            right_outliers_count = sum(hist[end_index:])
-            p[0] += left_outliers_count
-            p[-1] += right_outliers_count
-
-            # nonzeros[i] incidates whether p[i] is non-zero
-            nonzeros = (p != 0).astype(np.int64)
-
-            # quantize p.size bins into quantized bins (default 128 bins)
-            quantized_bins = np.zeros(num_quantized_bins, dtype=np.int64)
-            num_merged_bins = sliced_distribution.size // num_quantized_bins
-
-            # merge bins into quantized bins
-            for index in range(num_quantized_bins):
-                start = index * num_merged_bins
-                end = start + num_merged_bins
-                quantized_bins[index] = sum(sliced_distribution[start:end])
-            quantized_bins[-1] += sum(sliced_distribution[num_quantized_bins * num_merged_bins :])
-
-            # in order to compare p and q, we need to make length of q equals to length of p
-            # expand quantized bins into p.size bins
-            q = np.zeros(p.size, dtype=np.int64)
-            for index in range(num_quantized_bins):
-                start = index * num_merged_bins
-                end = start + num_merged_bins
-
-                norm = sum(nonzeros[start:end])
-                if norm != 0:
-                    q[start:end] = float(quantized_bins[index]) / float(norm)
-
-            p = smooth_distribution(p)
-            q = smooth_distribution(q)
-
-            if isinstance(q, np.ndarray):
-                kl_divergence[i - num_half_quantized_bin] = entropy(p, q)
-            else:
-                kl_divergence[i - num_half_quantized_bin] = float("inf")
-
-        min_kl_divergence_idx = np.argmin(kl_divergence)
-        optimal_threshold = thresholds[min_kl_divergence_idx]
-        min_value = histogram[2]
-        max_value = histogram[3]
-        if optimal_threshold[0] < min_value:
-            optimal_threshold = (min_value, optimal_threshold[1])
-        if optimal_threshold[1] > max_value:
-            optimal_threshold = (optimal_threshold[0], max_value)
-        return optimal_threshold[0], optimal_threshold[1]
+        return get_kl_thresholds([histogram], num_quantized_bins)[0]
 
     def clear(self):
         """Clear calibration range."""
@@ -403,3 +363,163 @@ def smooth_distribution(p, eps=0.0001):
     assert (hist <= 0).sum() == 0
 
     return hist
+
+
+def _smooth_distributions(distributions, length, eps=0.0001):
+    """Smooth distributions row by row, the batched version of smooth_distribution.
+
+    Args:
+        distributions (array): non-negative integer distributions in shape [num_rows, max_length],
+            row i is distributions[i, :length[i]] and is padded with zeros.
+        length (array): length of each row.
+        eps (float, optional): a small probability. Defaults to 0.0001.
+
+    Returns:
+        array: smoothed distributions, only the first length[i] elements of row i are valid.
+        array: bool mask of the rows which can't be smoothed.
+    """
+    is_zeros = distributions == 0
+    n_zeros = is_zeros.sum(axis=1) - (distributions.shape[1] - length)
+    n_nonzeros = length - n_zeros
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps1 = (eps * n_zeros / n_nonzeros).astype(np.float32)
+    # same float32 arithmetic as smooth_distribution
+    hist = distributions.astype(np.float32)
+    hist += np.where(is_zeros, np.float32(eps), -eps1[:, None])
+    # non-zero values are at least 1, they stay positive as long as eps1 < 1
+    invalid_rows = (n_nonzeros == 0) | ~(eps1 < 1)
+    return hist, invalid_rows
+
+
+def _row_sums(array, length):
+    """Sum the first length[i] elements of each row."""
+    mask = np.arange(array.shape[1]) < length[:, None]
+    return np.where(mask, array, 0).sum(axis=1, dtype=array.dtype)
+
+
+def _kl_divergence_of_candidates(hists, num_quantized_bins, max_elements=2**21):
+    """Compute the KL divergence of every candidate threshold of histograms with the same number of bins.
+
+    All candidates are evaluated at once: bin merges are differences of prefix sums, and the
+    candidate windows are gathered into padded rows, processed in chunks of max_elements.
+    Results match evaluating the candidates one by one with scipy.stats.entropy up to float32
+    summation order.
+
+    Args:
+        hists (array): histograms in shape [num_hists, num_bins].
+        num_quantized_bins (int): number of quantized bins.
+        max_elements (int, optional): max number of elements of a chunk. Defaults to 2**21.
+
+    Returns:
+        array: KL divergences in shape [num_hists, num_candidates], candidate j keeps the bins
+            in [zero_bin_index - i, zero_bin_index + i] with i = num_quantized_bins // 2 + j.
+    """
+    from scipy.special import rel_entr
+
+    num_hists, num_bins = hists.shape
+    zero_bin_index = num_bins // 2
+    half_widths = np.arange(num_quantized_bins // 2, zero_bin_index + 1)
+    starts = zero_bin_index - half_widths
+    ends = np.minimum(zero_bin_index + half_widths + 1, num_bins)
+    num_candidates = half_widths.size
+    cumsum = np.zeros((num_hists, num_bins + 1), dtype=np.int64)
+    np.cumsum(hists, axis=1, out=cumsum[:, 1:])
+    nonzeros_cumsum = np.zeros((num_hists, num_bins + 1), dtype=np.int64)
+    np.cumsum(hists != 0, axis=1, out=nonzeros_cumsum[:, 1:])
+
+    max_len = int((ends - starts).max())
+    padded_hists = np.zeros((num_hists, num_bins + max_len), dtype=np.int64)
+    padded_hists[:, :num_bins] = hists
+    block_bounds = np.arange(num_quantized_bins + 1)
+    # block_table[m, pos] is the quantized bin of position pos when m bins are merged, positions
+    # beyond the merged bins point to an extra zero bin
+    max_merged_bins = max_len // num_quantized_bins
+    block_table = np.arange(max_len)[None, :] // np.arange(1, max_merged_bins + 1)[:, None]
+    block_table = np.concatenate([np.zeros((1, max_len), dtype=block_table.dtype), block_table])
+    block_table = np.minimum(block_table, num_quantized_bins)
+    kl_divergence = np.empty(num_candidates * num_hists)
+    chunk_size = max(1, max_elements // max_len)
+    for chunk_start in range(0, num_candidates * num_hists, chunk_size):
+        # rows are ordered by candidate, so the rows of a chunk have similar lengths
+        rows = np.arange(chunk_start, min(chunk_start + chunk_size, num_candidates * num_hists))
+        cand_idx, hist_idx = np.divmod(rows, num_hists)
+        start, end = starts[cand_idx], ends[cand_idx]
+        length = end - start
+        num_merged_bins = length // num_quantized_bins
+        chunk_len = int(length.max())
+        positions = np.arange(chunk_len)
+        valid = positions < length[:, None]
+        windows = np.lib.stride_tricks.sliding_window_view(padded_hists, chunk_len, axis=1)
+        row_range = np.arange(rows.size)
+
+        # reference distribution p, outliers are added to the edge bins
+        p = np.where(valid, windows[hist_idx, start], 0)
+        first_bin, last_bin = p[:, 0].copy(), p[row_range, length - 1].copy()
+        p[:, 0] += cumsum[hist_idx, start]
+        p[row_range, length - 1] += cumsum[hist_idx, -1] - cumsum[hist_idx, end]
+
+        # merge bins into quantized bins, the remainder goes to the last quantized bin
+        bounds = start[:, None] + block_bounds * num_merged_bins[:, None]
+        merge_bounds = bounds.copy()
+        merge_bounds[:, -1] = end
+        quantized_bins = np.diff(cumsum[hist_idx[:, None], merge_bounds], axis=1)
+
+        # expand quantized bins into p.size bins, the remainder is not expanded.
+        # the number of non-zero bins of p differs from the histogram only at the edge bins
+        norm = np.diff(nonzeros_cumsum[hist_idx[:, None], bounds], axis=1)
+        norm[:, 0] += (p[:, 0] != 0).astype(np.int64) - (first_bin != 0)
+        last_block = (length - 1) // num_merged_bins
+        in_blocks = last_block < num_quantized_bins
+        norm[row_range[in_blocks], last_block[in_blocks]] += (p[row_range, length - 1] != 0).astype(np.int64)[
+            in_blocks
+        ] - (last_bin != 0)[in_blocks]
+        expanded = np.zeros((rows.size, num_quantized_bins + 1), dtype=np.int64)
+        expanded[:, :-1] = np.where(norm != 0, (quantized_bins / np.maximum(norm, 1)).astype(np.int64), 0)
+        q = np.take_along_axis(expanded, block_table[num_merged_bins, :chunk_len], axis=1)
+
+        p, invalid_p = _smooth_distributions(p, length)
+        q, invalid_q = _smooth_distributions(q, length)
+        # same float32 arithmetic as scipy.stats.entropy, the bins past each row's length are masked out
+        p = p / _row_sums(p, length)[:, None]
+        q = q / _row_sums(q, length)[:, None]
+        chunk_kl = _row_sums(rel_entr(p, q), length).astype(np.float64)
+        chunk_kl[invalid_p | invalid_q] = float("inf")
+        kl_divergence[rows] = chunk_kl
+    return kl_divergence.reshape(num_candidates, num_hists).T
+
+
+def get_kl_thresholds(histograms, num_quantized_bins=128):
+    """Compute kl thresholds of many histograms in one batch.
+
+    Histograms with the same number of bins are evaluated together.
+
+    Args:
+        histograms (list): histograms collected by HistogramCollector, each is a tuple of
+            hist, hist_edges, min, max and threshold.
+        num_quantized_bins (int, optional): number of quantized bins. Defaults to 128.
+
+    Returns:
+        list: (min, max) optimal threshold of each histogram.
+    """
+    groups = {}
+    for idx, histogram in enumerate(histograms):
+        groups.setdefault(histogram[0].size, []).append(idx)
+
+    thresholds = [None] * len(histograms)
+    for num_bins, indices in groups.items():
+        hists = np.stack([histograms[idx][0] for idx in indices]).astype(np.int64)
+        min_kl_divergence_idx = np.argmin(_kl_divergence_of_candidates(hists, num_quantized_bins), axis=1)
+        zero_bin_index = num_bins // 2
+        for idx, candidate_idx in zip(indices, min_kl_divergence_idx):
+            hist_edges, min_value, max_value = histograms[idx][1:4]
+            i = num_quantized_bins // 2 + candidate_idx
+            optimal_threshold = (
+                float(hist_edges[zero_bin_index - i]),
+                float(hist_edges[min(zero_bin_index + i + 1, num_bins)]),
+            )
+            if optimal_threshold[0] < min_value:
+                optimal_threshold = (min_value, optimal_threshold[1])
+            if optimal_threshold[1] > max_value:
+                optimal_threshold = (optimal_threshold[0], max_value)
+            thresholds[idx] = optimal_threshold
+    return thresholds
@@ -135,7 +135,7 @@ class BinaryDirect8BitOperator(Operator):
         ):
             for idx, parent in enumerate(parents):
                 if parent.op_type == "DequantizeLinear":
-                    self.node.input[idx] = parent.input[0]
+                    self.quantizer.model.set_node_input(self.node, idx, parent.input[0])
                     self.quantizer.remove_nodes.append(parent)
             for child in children:
                 if child.op_type == "QuantizeLinear":
@@ -67,7 +67,7 @@ class Direct8BitOperator(Operator):
         ):
             for parent in parents:
                 if parent.op_type == "DequantizeLinear":
-                    self.node.input[0] = parent.input[0]
+                    self.quantizer.model.set_node_input(self.node, 0, parent.input[0])
                     self.quantizer.remove_nodes.append(parents[0])
                     break
             for child in children:
@@ -89,16 +89,17 @@ class PadOperator(Operator):
                     # Suppose this padding constant initializer only used by the node
                     self.quantizer.model.remove_initializer(padding_constant_initializer)
                     self.quantizer.model.add_initializer(quantized_padding_constant_initializer)
-                    node.input[2] = quantized_padding_constant_name
+                    self.quantizer.model.set_node_input(node, 2, quantized_padding_constant_name)
                 else:
                     self.quantizer.quantize_inputs(node, [2], False)
-                    node.input[2] = node.input[2] + "_DequantizeLinear"
+                    self.quantizer.model.set_node_input(node, 2, node.input[2] + "_DequantizeLinear")
             else:
                 # pad zero_point for original zero
                 node.input.extend([parent.input[2]])
+                self.quantizer.model.invalidate_node_index()
 
         # Create an entry for output quantized value
-        node.input[0] = parent.input[0]
+        self.quantizer.model.set_node_input(node, 0, parent.input[0])
         node.output[0] = child.output[0]
         self.quantizer.remove_nodes.extend([parent, child])
 
@@ -68,7 +68,7 @@ class ResizeOperator(Operator):
         ):
             for parent in parents:
                 if parent.op_type == "DequantizeLinear" and parent.output[0] == node.input[0]:
-                    self.node.input[0] = parent.input[0]
+                    self.quantizer.model.set_node_input(self.node, 0, parent.input[0])
                     self.quantizer.remove_nodes.append(parent)
                     break
             for child in children:
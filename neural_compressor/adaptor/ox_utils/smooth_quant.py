@@ -99,7 +99,7 @@ def quant_dequant_data(data, reduce_range=False, qType=3, scheme="sym"):
         scheme (str): sym or asym quantization
     """
     rmin, rmax, zero_point, scale, quantized_data = quantize_data(
-        data.flatten().tolist(), _get_qrange_for_qType(qType, reduce_range), qType, scheme
+        data.flatten(), _get_qrange_for_qType(qType, reduce_range), qType, scheme
     )
     return ((quantized_data - zero_point) * scale).astype(data.dtype).reshape(data.shape)
 
@@ -373,7 +373,7 @@ class ORTSmoothQuant:
                             for child in children:
                                 for idx, inp in enumerate(child.input):
                                     if inp == node.output[0]:
-                                        child.input[idx] = node.input[0]
+                                        self.model.set_node_input(child, idx, node.input[0])
         self.model.remove_nodes(remove_nodes)
 
     def _dump_op_info(self, percentile, op_types, iterations, quantize_config=None):
@@ -644,12 +644,7 @@ class ORTSmoothQuant:
             else:
                 assert False, "not support"
             name = key + "_" + "smooth_scale"
-            scale_tensor = helper.make_tensor(
-                name=key + "_" + "smooth_scale",
-                data_type=onnx_proto.TensorProto.FLOAT,
-                dims=scale_factor.shape,
-                vals=scale_factor.flatten().tolist(),
-            )
+            scale_tensor = numpy_helper.from_array(scale_factor.astype(np.float32), name)
             self.new_init_tensors.append(scale_tensor)
             mul_output_name = key + "_smooth_output"
             mul_node = helper.make_node(
@@ -189,7 +189,7 @@ def split_shared_bias(model):
                         True,
                     )
                     model.add_initializer(new_input)
-                    node.input[2] = new_input_name
+                    model.set_node_input(node, 2, new_input_name)
     return model
 
 
@@ -236,7 +236,16 @@ def cast_tensor(tensor, dtype, is_large_model=False):  # pragma: no cover
         else:
             raise ValueError("Expect fp16 or bf16 but get {}.".format(dtype))
 
-        if not is_large_model:
+        if dtype == "fp16" and len(val.shape) != 0:
+            # float16 values are stored as raw bytes to avoid a round trip through a python list
+            new_tensor = helper.make_tensor(
+                name=tensor.name + "_init_cast",
+                data_type=dtype_mapping[dtype],
+                dims=val.shape,
+                vals=new_val.tobytes(),
+                raw=True,
+            )
+        elif not is_large_model:
             new_tensor = helper.make_tensor(
                 name=tensor.name + "_init_cast",
                 data_type=dtype_mapping[dtype],
@@ -369,13 +378,13 @@ def quantize_data(data, quantize_range, qType, scheme):
         z: zero point
 
     Args:
-        data (array): data to quantize
+        data (np.array or list): data to quantize
         quantize_range (list): list of data to weight pack.
         qType (int): data type to quantize to. Supported types UINT8 and INT8
         scheme (string): sym or asym quantization.
     """
-    rmin = min(min(data), 0)
-    rmax = max(max(data), 0)
+    rmin = min(float(np.min(data)), 0)
+    rmax = max(float(np.max(data)), 0)
 
     scale, zero_point = calculate_scale_zp(rmin, rmax, quantize_range, qType, scheme)
     quantized_data = quantize_data_with_scale_zero(data, qType, scheme, scale, zero_point)
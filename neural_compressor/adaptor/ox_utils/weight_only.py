@@ -19,14 +19,18 @@
 import copy
 import logging
 import math
+import mmap
 import os
 import struct
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import numpy as np
 import onnx
 from onnx import helper, numpy_helper
 from onnx import onnx_pb as onnx_proto
+from onnx.external_data_helper import ExternalDataInfo
 from packaging.version import Version
 
 from neural_compressor.adaptor.ox_utils.util import dtype_mapping, simple_progress_bar
@@ -229,9 +233,8 @@ def quant_tensor(data, num_bits=4, group_size=32, scheme="asym", dtype="int", ra
         )
     else:
         scale = np.ones(rmax.shape)
-        scale[rmin != rmax] = np.array(
-            [float(i) / (maxq - minq) for i in (rmax - rmin)[rmin != rmax].flatten().tolist()]
-        )
+        mask = rmin != rmax
+        scale[mask] = (rmax - rmin)[mask].astype(np.float64) / (maxq - minq)
         zero_point = (
             ((np.zeros(scale.shape) - rmin) / scale).round()
             if dtype == "int"
@@ -290,6 +293,215 @@ def pad_tensor(weight, group_size, k_blocks):
     return weight
 
 
+class ExternalDataReader:
+    """Read initializers from memory-mapped external data files without copying them."""
+
+    # data types stored with the same layout as their numpy dtype
+    MAPPABLE_TYPES = [
+        onnx.TensorProto.FLOAT,
+        onnx.TensorProto.FLOAT16,
+        onnx.TensorProto.DOUBLE,
+        onnx.TensorProto.INT8,
+        onnx.TensorProto.UINT8,
+        onnx.TensorProto.INT16,
+        onnx.TensorProto.UINT16,
+        onnx.TensorProto.INT32,
+        onnx.TensorProto.UINT32,
+        onnx.TensorProto.INT64,
+        onnx.TensorProto.UINT64,
+        onnx.TensorProto.BOOL,
+    ]
+
+    def __init__(self, base_dir):
+        """Init an ExternalDataReader object.
+
+        Args:
+            base_dir (str): the directory the external data locations are relative to.
+        """
+        self.base_dir = base_dir
+        self._maps = {}
+
+    @staticmethod
+    def is_external(tensor):
+        """Check whether the initializer data is stored in an external file."""
+        return tensor.HasField("data_location") and tensor.data_location == onnx.TensorProto.EXTERNAL
+
+    def _get_range(self, tensor):
+        """Return the mapped file, offset and length of an external initializer."""
+        info = ExternalDataInfo(tensor)
+        if info.location not in self._maps:
+            with open(os.path.join(self.base_dir, info.location), "rb") as f:
+                self._maps[info.location] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._maps[info.location]
+        offset = info.offset or 0
+        length = info.length if info.length is not None else len(buffer) - offset
+        return buffer, offset, length
+
+    def to_array(self, tensor):
+        """Return the initializer as an array, a read-only view of the mapped file for external data."""
+        if not self.is_external(tensor) or tensor.data_type not in self.MAPPABLE_TYPES:
+            return numpy_helper.to_array(tensor, base_dir=self.base_dir)
+        buffer, offset, _ = self._get_range(tensor)
+        dtype = helper.tensor_dtype_to_np_dtype(tensor.data_type)
+        count = int(np.prod(tensor.dims))
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(tuple(tensor.dims))
+
+    def iter_chunks(self, tensor, chunk_size=64 * 1024 * 1024):
+        """Yield the raw bytes of an external initializer chunk by chunk, dropping the pages read."""
+        buffer, offset, length = self._get_range(tensor)
+
+        def _generator():
+            view = memoryview(buffer)
+            try:
+                for start in range(offset, offset + length, chunk_size):
+                    end = min(start + chunk_size, offset + length)
+                    yield view[start:end]
+                    self._release_range(buffer, start, end - start)
+            finally:
+                view.release()
+
+        return _generator()
+
+    @staticmethod
+    def _release_range(buffer, offset, length):
+        """Drop the mapped pages from the resident memory, they are read again from the file if needed."""
+        if not hasattr(mmap, "MADV_DONTNEED"):  # pragma: no cover
+            return
+        start = offset - offset % mmap.PAGESIZE
+        end = min(len(buffer), offset + length)
+        if end > start:
+            buffer.madvise(mmap.MADV_DONTNEED, start, end - start)
+
+    def release(self, tensor):
+        """Drop the pages of an external initializer from the resident memory."""
+        if self.is_external(tensor) and ExternalDataInfo(tensor).location in self._maps:
+            buffer, offset, length = self._get_range(tensor)
+            self._release_range(buffer, offset, length)
+
+    def close(self):
+        """Unmap the external data files."""
+        for buffer in self._maps.values():
+            try:
+                buffer.close()
+            except BufferError:  # pragma: no cover
+                # arrays still viewing the file keep it mapped until they are released
+                pass
+        self._maps = {}
+
+
+class ExternalDataWriter:
+    """Append initializers to a new external data file and leave only their stubs in the graph."""
+
+    def __init__(self, path, alignment=4096):
+        """Init an ExternalDataWriter object.
+
+        Args:
+            path (str): the external data file to create, in the directory of the model.
+            alignment (int, optional): the alignment of the tensor offsets so they can be memory-mapped.
+                Defaults to 4096.
+        """
+        self.location = os.path.basename(path)
+        self.alignment = alignment
+        self.names = set()
+        self._file = open(path, "wb")
+        self._offset = 0
+
+    def write(self, tensor, chunks=None):
+        """Write the data of the initializer and turn it into an external data stub.
+
+        Args:
+            tensor (TensorProto): the initializer.
+            chunks (iterable, optional): the bytes-like chunks of the data. Defaults to the raw_data of the tensor.
+        """
+        padding = -self._offset % self.alignment
+        if padding:
+            self._file.write(b"\0" * padding)
+            self._offset += padding
+        offset = self._offset
+        for chunk in chunks if chunks is not None else [tensor.raw_data]:
+            self._offset += self._file.write(chunk)
+
+        del tensor.external_data[:]
+        tensor.data_location = onnx.TensorProto.EXTERNAL
+        for key, value in {"location": self.location, "offset": offset, "length": self._offset - offset}.items():
+            entry = tensor.external_data.add()
+            entry.key = key
+            entry.value = str(value)
+        tensor.ClearField("raw_data")
+        self.names.add(tensor.name)
+
+    def close(self):
+        """Close the external data file."""
+        self._file.close()
+
+
+def rtn_quantize_weight(
+    node,
+    weight,
+    num_bits=4,
+    group_size=32,
+    scheme="asym",
+    ratio=1.0,
+    accuracy_level=0,
+    providers=["CPUExecutionProvider"],
+):
+    """Quantize the weight of one MatMul node with round to nearst method.
+
+    Only numpy arrays and new protos are touched, so it can run on a worker thread.
+
+    Args:
+        node (NodeProto): the MatMul node
+        weight (array): the 2D weight of the node
+        num_bits (int, optional): num_bits. Default is 4.
+        group_size (int, optional): how many elements share one scale/zp. Default is 32.
+        scheme (str, optional): sym or asym. Defaults to "asym".
+        ratio (float, optional): percentile of clip. Defaults to 1.0.
+        accuracy_level (int): accuracy level of the weight-only MatMul node.
+        providers (list): providers to use
+
+    Returns:
+        q_matmul_node: the weight-only MatMul node to replace the node with, None if the node keeps MatMul
+        new_inits: the new initializers, the first one is the quantized weight if q_matmul_node is None
+    """
+    dtype = weight.dtype
+    org_w_shape = weight.shape  # ic, oc
+    k_blocks = (org_w_shape[0] - 1) // group_size + 1
+    weight = pad_tensor(weight, group_size, k_blocks)
+
+    satisfy_MatMulNBits_condition = Version(ort.__version__) > ONNXRT1161_VERSION and num_bits == 4
+    satisfy_MatMulFpQ4_condition = Version(ort.__version__) >= ONNXRT116_VERSION and num_bits == 4 and group_size == 32
+    if ("CUDAExecutionProvider" in providers and satisfy_MatMulNBits_condition) or (
+        "CUDAExecutionProvider" not in providers and (satisfy_MatMulFpQ4_condition or satisfy_MatMulNBits_condition)
+    ):  # pragma: no cover
+        # MatMulFpQ4 support 4 bits and 32 group_size with ort 1.16.0 and 1.16.1 versions, supported by CPU EP
+        # MatMulNBits supports 4 bits and 2^n group_size with ort > 1.16.1, supported by CPU EP AND CUDA EP
+        q_weight, scale, zp = quant_tensor(weight.T, num_bits, group_size, scheme, "uint", ratio)
+        return make_matmul_weight_only_node(
+            node=node,
+            weight_shape=org_w_shape,
+            num_bits=num_bits,
+            group_size=group_size,
+            k_blocks=k_blocks,
+            q_weight=q_weight.astype("uint8"),
+            scale=scale.astype(dtype),
+            zero_point=zp if scheme == "asym" else None,
+            accuracy_level=accuracy_level,
+        )
+
+    q_weight = qdq_tensor(weight.T, num_bits, group_size, scheme, "int", ratio)
+    q_weight = np.reshape(q_weight, (org_w_shape[1], -1))
+    q_weight = np.transpose(q_weight)
+    q_weight = q_weight[: org_w_shape[0], :].astype(dtype)
+    q_weight_tensor = onnx.helper.make_tensor(
+        name=node.input[1] + "_Q{}G{}".format(str(num_bits), str(group_size)),
+        data_type=dtype_mapping[str(dtype)],
+        dims=weight.shape,
+        vals=q_weight.tobytes(),
+        raw=True,
+    )
+    return None, [q_weight_tensor]
+
+
 def rtn_quantize(
     model,
     weight_config={},
@@ -299,6 +511,8 @@ def rtn_quantize(
     ratios={},
     accuracy_level=0,
     providers=["CPUExecutionProvider"],
+    save_path=None,
+    num_workers=1,
 ):
     """Quant the model with round to nearst method.
 
@@ -323,93 +537,129 @@ def rtn_quantize(
                               2 (fp16 compute type of jblas kernel), 3 (bf16 compute type of jblas kernel),
                               4 (int8 compute type of jblas kernel)
         providers (list): providers to use
+        save_path (str, optional): stream the quantized model to this path for models with external data.
+            Weights are read from the memory-mapped external data, and all initializers are written to
+            `<save_path>_data` as they are quantized, so only the weights in flight stay in memory.
+            A model path is loaded without its external data. Defaults to None (quantize in memory).
+        num_workers (int, optional): the number of threads quantizing weights in parallel. Defaults to 1.
 
     Returns:
         model: fake quantized ONNXModel
     """
+    if save_path is not None and isinstance(model, str):
+        model = ONNXModel(model, ignore_warning=True, load_external_data=False)
     model = model if isinstance(model, BaseModel) else ONNXModel(model)
     base_dir = os.path.dirname(model.model_path) if model.model_path is not None else ""
+    reader = ExternalDataReader(base_dir)
+    writer = None
+    if save_path is not None:
+        assert model.model_path is None or os.path.abspath(save_path) != os.path.abspath(
+            model.model_path
+        ), "save_path should not overwrite the original model."
+        os.makedirs(os.path.dirname(os.path.abspath(save_path)), exist_ok=True)
+        writer = ExternalDataWriter(save_path + "_data")
     new_nodes = []
     remove_nodes = []
-    total_num = len([i for i in model.nodes() if i.op_type in ["MatMul"]])
-    curr_id = 0
-    for node in model.nodes():
-        if node.op_type in ["MatMul"]:
-            curr_id += 1
-            simple_progress_bar(total_num, curr_id)
-        if (
-            node.op_type in ["MatMul"]
-            and model.get_initializer(node.input[1]) is not None
-            and weight_config.get(node.name, {}) != "fp32"
-        ):
-            weight_tensor = model.get_initializer(node.input[1])
-            weight = numpy_helper.to_array(weight_tensor, base_dir=base_dir).copy()
-            if len(weight.shape) != 2:
-                continue
 
-            dtype = weight.dtype
-
-            if node.name in weight_config:
-                num_bits = weight_config[node.name]["bits"]
-                group_size = weight_config[node.name]["group_size"]
-                scheme = weight_config[node.name]["scheme"]
-
-            org_w_shape = weight.shape  # ic, oc
-            group_size = group_size if group_size != -1 else org_w_shape[0]
-
-            k_blocks = (org_w_shape[0] - 1) // group_size + 1
-            init_share_num = model.get_initializer_share_num(node.input[1])
+    def _apply(node, weight_tensor, q_matmul_node, new_inits):
+        init_share_num = model.get_initializer_share_num(node.input[1])
+        q_weight_name = new_inits[0].name
+        new_inits = [tensor for tensor in new_inits if model.get_initializer(tensor.name) is None]
+        if writer is not None:
+            for tensor in new_inits:
+                writer.write(tensor)
+        model.add_initializers(new_inits)
+        if q_matmul_node is not None:
+            remove_nodes.append(node)
+            new_nodes.append(q_matmul_node)
+        else:
+            model.set_node_input(node, 1, q_weight_name)
+        if init_share_num == 1:
+            model.remove_initializer(weight_tensor)
+        reader.release(weight_tensor)
 
-            weight = pad_tensor(weight, group_size, k_blocks)
+    total_num = len([i for i in model.nodes() if i.op_type in ["MatMul"]])
+    curr_id = 0
+    pending = []
+    executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+    try:
+        for node in model.nodes():
+            if node.op_type in ["MatMul"]:
+                curr_id += 1
+                simple_progress_bar(total_num, curr_id)
+            if (
+                node.op_type in ["MatMul"]
+                and model.get_initializer(node.input[1]) is not None
+                and weight_config.get(node.name, {}) != "fp32"
+            ):
+                weight_tensor = model.get_initializer(node.input[1])
+                if len(weight_tensor.dims) != 2:
+                    continue
 
-            satisfy_MatMulNBits_condition = Version(ort.__version__) > ONNXRT1161_VERSION and num_bits == 4
-            satisfy_MatMulFpQ4_condition = (
-                Version(ort.__version__) >= ONNXRT116_VERSION and num_bits == 4 and group_size == 32
-            )
-            if ("CUDAExecutionProvider" in providers and satisfy_MatMulNBits_condition) or (
-                "CUDAExecutionProvider" not in providers
-                and (satisfy_MatMulFpQ4_condition or satisfy_MatMulNBits_condition)
-            ):  # pragma: no cover
-                # MatMulFpQ4 support 4 bits and 32 group_size with ort 1.16.0 and 1.16.1 versions, supported by CPU EP
-                # MatMulNBits supports 4 bits and 2^n group_size with ort > 1.16.1, supported by CPU EP AND CUDA EP
-                q_weight, scale, zp = quant_tensor(
-                    weight.T, num_bits, group_size, scheme, "uint", ratios.get(node.input[1], 1)
-                )
-                q_matmul_node, new_inits = make_matmul_weight_only_node(
-                    node=node,
-                    weight_shape=org_w_shape,
-                    num_bits=num_bits,
-                    group_size=group_size,
-                    k_blocks=k_blocks,
-                    q_weight=q_weight.astype("uint8"),
-                    scale=scale.astype(dtype),
-                    zero_point=zp if scheme == "asym" else None,
-                    accuracy_level=accuracy_level,
+                if node.name in weight_config:
+                    num_bits = weight_config[node.name]["bits"]
+                    group_size = weight_config[node.name]["group_size"]
+                    scheme = weight_config[node.name]["scheme"]
+                group_size = group_size if group_size != -1 else weight_tensor.dims[0]
+
+                # workers get a copy of the node as the graph is edited meanwhile
+                node_copy = onnx.NodeProto()
+                node_copy.CopyFrom(node)
+                args = (
+                    node_copy,
+                    reader.to_array(weight_tensor),
+                    num_bits,
+                    group_size,
+                    scheme,
+                    ratios.get(node.input[1], 1),
+                    accuracy_level,
+                    providers,
                 )
-
-                model.add_initializers(new_inits)
-                remove_nodes.append(node)
-                new_nodes.append(q_matmul_node)
-            else:
-                q_weight = qdq_tensor(weight.T, num_bits, group_size, scheme, "int", ratios.get(node.input[1], 1))
-                q_weight = np.reshape(q_weight, (org_w_shape[1], -1))
-                q_weight = np.transpose(q_weight)
-                q_weight = q_weight[: org_w_shape[0], :].astype(dtype)
-                q_weight_tensor = onnx.helper.make_tensor(
-                    name=node.input[1] + "_Q{}G{}".format(str(num_bits), str(group_size)),
-                    data_type=dtype_mapping[str(dtype)],
-                    dims=weight.shape,
-                    vals=q_weight.tobytes(),
-                    raw=True,
+                if executor is None:
+                    _apply(node, weight_tensor, *rtn_quantize_weight(*args))
+                    continue
+                pending.append((node, weight_tensor, executor.submit(rtn_quantize_weight, *args)))
+                # keep a few weights in flight and apply the results in order
+                if len(pending) > 2 * num_workers:
+                    node, weight_tensor, future = pending.pop(0)
+                    _apply(node, weight_tensor, *future.result())
+        for node, weight_tensor, future in pending:
+            _apply(node, weight_tensor, *future.result())
+        pending = []
+
+        model.add_nodes(new_nodes)
+        model.remove_nodes(remove_nodes)
+        model.topological_sort()
+
+        if writer is not None:
+            # move the initializers left in the original external data or in the graph to the new file
+            for tensor in model.initializer():
+                if tensor.name in writer.names:
+                    continue
+                if reader.is_external(tensor):
+                    writer.write(tensor, reader.iter_chunks(tensor))
+                elif len(tensor.raw_data) >= 1024:
+                    writer.write(tensor)
+            writer.close()
+            model.model_path = save_path
+            model.check_is_large_model()
+            onnx.save_model(model.model, save_path)
+            if model.hf_config is not None:
+                model_type = (
+                    "" if not hasattr(model.hf_config, "model_type") else getattr(model.hf_config, "model_type")
                 )
-                model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
-            if init_share_num == 1:
-                model.remove_initializer(weight_tensor)
-
-    model.add_nodes(new_nodes)
-    model.remove_nodes(remove_nodes)
-    model.topological_sort()
+                setattr(model.hf_config.__class__, "model_type", model_type)
+                output_config_file = Path(save_path).parent.joinpath("config.json").as_posix()
+                model.hf_config.to_json_file(output_config_file, use_diff=False)
+    finally:
+        if executor is not None:
+            for _, _, future in pending:
+                future.cancel()
+            executor.shutdown()
+        # also reached when quantizing or saving fails
+        if writer is not None:
+            writer.close()
+        reader.close()
     return model
 
 
@@ -519,7 +769,7 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
                 raw=True,
             )
             model.add_initializer(new_tensor)
-            node.input[1] = new_tensor.name
+            model.set_node_input(node, 1, new_tensor.name)
 
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
@@ -565,11 +815,8 @@ def apply_awq_scale(model, weight_config, absorb_pairs, output_dicts, num_bits,
 
         else:  # pragma: no cover
             # insert mul
-            scale_tensor = helper.make_tensor(
-                name=parent.output[0] + "_weight_only_scale",
-                data_type=dtype_mapping[str(dtype)],
-                dims=best_scale.shape,
-                vals=(1.0 / best_scale).flatten().tolist(),
+            scale_tensor = numpy_helper.from_array(
+                (1.0 / best_scale).astype(dtype), parent.output[0] + "_weight_only_scale"
             )
             new_init_tensors.append(scale_tensor)
             mul_output_name = parent.output[0] + "_weight_only_out"
@@ -1164,7 +1411,7 @@ def gptq_quantize(
                     raw=True,
                 )
                 model.add_initializer(q_weight_tensor)
-                node.input[1] = q_weight_tensor.name
+                model.set_node_input(node, 1, q_weight_tensor.name)
             if init_share_num == 1:
                 model.remove_initializer(weight_tensor)
 
@@ -33,7 +33,7 @@ from .adaptor import FRAMEWORKS
 from .config import BenchmarkConfig, options
 from .data import check_dataloader
 from .model import BaseModel, Model
-from .objective import MultiObjective
+from .objective import MemorySampler, MultiObjective
 from .profiling.parser.parser import ProfilingParser
 from .profiling.profiler.profiler import Profiler
 from .utils import OPTIONS, alias_param, logger
@@ -187,7 +187,10 @@ def run_instance(model, conf, b_dataloader=None, b_func=None):
 
         objectives = MultiObjective(["performance"], {"relative": 0.1}, is_measure=True)
 
+        memory_sampler = MemorySampler()
+        memory_sampler.start()
         val = objectives.evaluate(b_func, model)
+        memory_sampler.stop()
         # measurer contain info not only performance(eg, memory, model_size)
         # also measurer have result list among steps
         acc, _ = val
@@ -202,6 +205,9 @@ def run_instance(model, conf, b_dataloader=None, b_func=None):
         result_list = objectives.objectives[0].result_list()[warmup:]
         latency = np.array(result_list).mean() / batch_size
         results["performance"] = acc, batch_size, result_list
+        # the latency distribution of the batches, in seconds
+        results["latency"] = objectives.objectives[0].latency_stats(warmup)
+        results["memory"] = memory_sampler.stats()
 
         logger.info("\nbenchmark result:")
         for i, res in enumerate(result_list):
@@ -209,6 +215,17 @@ def run_instance(model, conf, b_dataloader=None, b_func=None):
         logger.info("Batch size = {}".format(batch_size))
         logger.info("Latency: {:.3f} ms".format(latency * 1000))
         logger.info("Throughput: {:.3f} images/sec".format(1.0 / latency))
+        if results["latency"]:
+            logger.info(
+                "Batch latency percentiles (ms): p50 {:.3f}, p90 {:.3f}, p99 {:.3f}, max {:.3f}".format(
+                    *[results["latency"][key] * 1000 for key in ["p50", "p90", "p99", "max"]]
+                )
+            )
+        logger.info(
+            "Peak memory (MB): RSS {:.1f}, USS {:.1f}".format(
+                results["memory"]["peak_rss"], results["memory"]["peak_uss"]
+            )
+        )
         return results
     else:
         b_func(model.model)
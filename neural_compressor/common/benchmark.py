@@ -14,10 +14,13 @@
 """Benchmark API for Intel Neural Compressor."""
 
 import argparse
+import contextlib
+import json
 import os
 import re
 import subprocess
 import sys
+import time
 
 import psutil
 
@@ -35,6 +38,9 @@ Params in `incbench`:
  - C, cores                 Default to 0-${num_cores_on_NUMA-1}, decides the visible core range.
  - cross_memory             Default to False, decides whether to allocate memory cross NUMA.
                                 Note: Use it only when memory for instance is not enough.
+ - warmup                   Default to 0, the number of steps reported by `BenchmarkRecorder` to skip per instance.
+ - sweep                    Default to False, tries several `num_instances x num_cores_per_instance` layouts on
+                                each NUMA node and reports the best throughput/latency frontier.
 
 # General use cases:
 1. `incbench main.py`: run 1 instance on NUMA:0.
@@ -42,6 +48,7 @@ Params in `incbench`:
 3. `incbench --num_c 2 main.py`: run multi-instances with 2 cores per instance on NUMA:0.
 4. `incbench -C 24-47 main.py`: run 1 instance on COREs:24-47.
 5. `incbench -C 24-47 --num_c 4 main.py`: run multi-instances with 4 COREs per instance on COREs:24-47.
+6. `incbench --sweep main.py`: try several instance layouts on every NUMA node and report the frontier.
 
 Note:
     - `num_i` works the same as `num_instances`
@@ -49,6 +56,10 @@ Note:
 ##################################################################################################################
 """
 
+# environment variables passed to each instance, read by `BenchmarkRecorder`
+RESULT_FILE_ENV = "INC_BENCHMARK_RESULT_FILE"
+INSTANCE_INDEX_ENV = "INC_BENCHMARK_INSTANCE"
+
 
 def get_linux_numa_info():
     """Collect numa/socket information on linux system.
@@ -334,6 +345,19 @@ def set_cores_for_instance(args, numa_info):
         last_index = args.num_instances - 1
         core_list_per_instance[last_index] = cores_list[last_index * num_cores_per_instance :]
 
+    return format_core_list_per_instance(core_list_per_instance, numa_info)
+
+
+def format_core_list_per_instance(core_list_per_instance, numa_info):
+    """Attach NUMA nodes to the cores of each instance and dump the binding stats.
+
+    Args:
+        core_list_per_instance (dict): {"instance_index": cpu_index_list}
+        numa_info (dict): {numa_node_index: list of Physical CPUs in this numa node, ...}
+
+    Returns:
+        core_list_per_instance (dict): {"instance_index": ["node_index", "cpu_index", num_cpu]}
+    """
     # convert core_list_per_instance = {"instance_index": cpu_index_list}
     #                                -> {"instance_index": ["node_index", "cpu_index", num_cores]}
     reversed_numa_info = get_reversed_numa_info(numa_info)
@@ -379,13 +403,113 @@ def generate_prefix(args, core_list):
         return ""
 
 
+class BenchmarkRecorder:
+    """Report per-step timestamps of a benchmark instance to `incbench`.
+
+    `incbench` passes a JSON lines file to each instance through the `INC_BENCHMARK_RESULT_FILE`
+    environment variable. Every step is appended as one record with wall-clock start/end timestamps,
+    so the launcher can aggregate throughput over the window in which all instances are running.
+    Without the environment variable (e.g. the script is launched directly), the recorder only
+    times the steps.
+
+    Example::
+
+        recorder = BenchmarkRecorder(unit="samples")
+        for inputs in dataloader:
+            with recorder.step(num_samples=len(inputs)):
+                model(inputs)
+    """
+
+    def __init__(self, result_file=None, unit="samples"):
+        """Init a BenchmarkRecorder object.
+
+        Args:
+            result_file (str, optional): the JSON lines file to append to.
+                Defaults to the `INC_BENCHMARK_RESULT_FILE` environment variable.
+            unit (str, optional): the unit of the samples counted in each step. Defaults to "samples".
+        """
+        self.result_file = result_file or os.getenv(RESULT_FILE_ENV)
+        self.instance = int(os.getenv(INSTANCE_INDEX_ENV, "1"))
+        self.unit = unit
+        # wall-clock epoch shared by all instances, advanced with the monotonic perf_counter
+        self._wall_start = time.time()
+        self._perf_start = time.perf_counter()
+        self._file = None
+        if self.result_file:
+            self._file = open(self.result_file, "a", 1, encoding="utf-8")
+            self._write({"type": "meta", "unit": unit, "time": self.now()})
+
+    @property
+    def enabled(self):
+        """Whether the records are sent to a result file."""
+        return self._file is not None
+
+    def now(self):
+        """Return the current timestamp in seconds since the epoch."""
+        return self._wall_start + (time.perf_counter() - self._perf_start)
+
+    def _write(self, record):
+        record["instance"] = self.instance
+        self._file.write(json.dumps(record) + "\n")
+
+    def record(self, num_samples, start, end):
+        """Record one step which processed `num_samples` samples between `start` and `end`."""
+        if self.enabled:
+            self._write({"type": "step", "start": start, "end": end, "samples": num_samples})
+
+    @contextlib.contextmanager
+    def step(self, num_samples=1):
+        """Time the wrapped code as one step of `num_samples` samples."""
+        start = self.now()
+        yield
+        self.record(num_samples, start, self.now())
+
+    def report(self, latency=None, throughput=None, latency_unit="ms", throughput_unit="samples/sec"):
+        """Record the final latency/throughput computed by the script itself."""
+        if self.enabled:
+            self._write(
+                {
+                    "type": "summary",
+                    "latency": latency,
+                    "latency_unit": latency_unit,
+                    "throughput": throughput,
+                    "throughput_unit": throughput_unit,
+                }
+            )
+
+    def close(self):
+        """Close the result file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        """Return the recorder itself."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the result file."""
+        self.close()
+
+
+def get_result_file(log_file):
+    """Return the JSON lines result file paired with the log file of an instance."""
+    return os.path.splitext(log_file)[0] + ".jsonl"
+
+
 def run_multi_instance_command(args, core_list_per_instance, raw_cmd):
     """Build and trigger commands for multi-instances with subprocess.
 
+    Each instance streams its output straight into its log file and gets the path of its JSON lines
+    result file through the `INC_BENCHMARK_RESULT_FILE` environment variable.
+
     Args:
         args (argparse): arguments for setting different configurations
         core_list_per_instance (dict): {"instance_index": ["node_index", "cpu_index", num_cpu]}
         raw_cmd (str): script.py and parameters for this script
+
+    Returns:
+        logfile_dict (dict): {instance_index: log_file_path}
     """
     instance_cmd = ""
     if not os.getenv("PYTHON_PATH"):  # pragma: no cover
@@ -393,6 +517,7 @@ def run_multi_instance_command(args, core_list_per_instance, raw_cmd):
         logger.info("To replace it, use `export PYTHON_PATH=xxx`.")
     interpreter = os.getenv("PYTHON_PATH", "python")
     workspace_dir = get_workspace()
+    os.makedirs(workspace_dir, exist_ok=True)
     logfile_process_map = {}
     logfile_dict = {}
     for i, core_list in core_list_per_instance.items():
@@ -402,97 +527,379 @@ def run_multi_instance_command(args, core_list_per_instance, raw_cmd):
         logger.info(f"Instance {i+1}: {instance_cmd}")
         instance_log_file = "{}_{}_{}C.log".format(i + 1, len(core_list_per_instance), core_list[2])
         instance_log_file = os.path.join(workspace_dir, instance_log_file)
-        # trigger subprocess
+        result_file = get_result_file(instance_log_file)
+        if os.path.exists(result_file):
+            os.remove(result_file)
+        env = dict(os.environ, **{RESULT_FILE_ENV: result_file, INSTANCE_INDEX_ENV: str(i + 1)})
+        # trigger subprocess, its output goes to the log file without being buffered here
+        log_file = open(instance_log_file, "w", 1, encoding="utf-8")
+        log_file.write(f"[COMMAND]: {instance_cmd}\n")
+        log_file.flush()
         p = subprocess.Popen(
-            instance_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, shell=True
+            instance_cmd, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT, shell=True, env=env
         )  # nosec
-        # log_file_path: [process_object, instance_command, instance_index]
-        logfile_process_map[instance_log_file] = [p, instance_cmd, i + 1]
+        # log_file_path: [process_object, log_file_object, instance_index]
+        logfile_process_map[instance_log_file] = [p, log_file, i + 1]
         logfile_dict[i + 1] = instance_log_file
 
-    # Dump each instance's standard output to the corresponding log file
-    for instance_log_file, p_cmd_i in logfile_process_map.items():
-        # p.communicate() reads std to avoid dead-lock, p.wait() only return.
-        stdout, stderr = p_cmd_i[0].communicate()  # stderr is merged to stdout, so it's None
-        with open(instance_log_file, "w", 1, encoding="utf-8") as log_file:
-            log_file.write(f"[COMMAND]: {p_cmd_i[1]}\n")
-            log_file.write(stdout.decode())
-        logger.info(f"The log of instance {p_cmd_i[2]} is saved to {instance_log_file}")
+    for instance_log_file, p_file_i in logfile_process_map.items():
+        p_file_i[0].wait()
+        p_file_i[1].close()
+        logger.info(f"The log of instance {p_file_i[2]} is saved to {instance_log_file}")
 
     return logfile_dict
 
 
-def summary_latency_throughput(logfile_dict):
-    """Get the summary of the benchmark."""
+def load_result_records(result_file):
+    """Load the records written by `BenchmarkRecorder`, return [] if the instance reported nothing."""
+    records = []
+    if not os.path.exists(result_file):
+        return records
+    with open(result_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:  # pragma: no cover
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:  # pragma: no cover
+                # the last line may be truncated if the instance was killed
+                logger.warning(f"Skip the invalid record in {result_file}: {line}")
+    return records
+
+
+def summary_result_records(records_dict, warmup=0):
+    """Aggregate the step records of all instances over their overlapping steady-state window.
+
+    The window starts when the last instance finished its warmup steps and ends when the first
+    instance reported its last step, so instances which start late or finish early don't dilute
+    the aggregate throughput. Steps crossing the window border are counted proportionally.
+
+    Args:
+        records_dict (dict): {instance_index: records loaded by `load_result_records`}
+        warmup (int, optional): the number of leading steps to skip per instance. Defaults to 0.
+
+    Returns:
+        summary (dict): {
+            "instances": {instance_index: {"latency": ms, "throughput": samples/sec, "samples": int}},
+            "latency": average step latency in ms, "throughput": aggregate throughput,
+            "window": seconds, "unit": sample unit
+        }, or None if some instance reported no step after warmup.
+    """
+    steps_dict = {}
+    unit = "samples"
+    for idx, records in records_dict.items():
+        steps = sorted(
+            ((r["start"], r["end"], r["samples"]) for r in records if r.get("type") == "step"), key=lambda s: s[0]
+        )
+        steps = steps[warmup:]
+        if not steps:
+            return None
+        steps_dict[idx] = steps
+        unit = next((r["unit"] for r in records if r.get("type") == "meta"), unit)
+
+    window_start = max(steps[0][0] for steps in steps_dict.values())
+    window_end = min(steps[-1][1] for steps in steps_dict.values())
+    overlapped = window_end > window_start
+    if not overlapped:
+        logger.warning("The instances did not run concurrently, fall back to the throughput of each instance.")
+
+    instances = {}
+    total_throughput = 0.0
+    for idx, steps in steps_dict.items():
+        if overlapped:
+            start, end = window_start, window_end
+        else:
+            start, end = steps[0][0], steps[-1][1]
+        samples = 0.0
+        latency_list = []
+        for step_start, step_end, num_samples in steps:
+            duration = step_end - step_start
+            if duration > 0:
+                overlap = min(step_end, end) - max(step_start, start)
+                if overlap <= 0:
+                    continue
+                samples += num_samples * overlap / duration
+            elif start <= step_start <= end:
+                samples += num_samples
+            else:
+                continue
+            latency_list.append(duration)
+        throughput = samples / (end - start) if end > start else 0.0
+        total_throughput += throughput
+        instances[idx] = {
+            "latency": sum(latency_list) / len(latency_list) * 10**3 if latency_list else 0.0,
+            "throughput": throughput,
+            "samples": sum(s[2] for s in steps),
+        }
+    return {
+        "instances": instances,
+        "latency": sum(i["latency"] for i in instances.values()) / len(instances),
+        "throughput": total_throughput,
+        "window": window_end - window_start if overlapped else 0.0,
+        "unit": unit,
+    }
+
+
+def parse_log_latency_throughput(logfile):
+    """Scrape `Latency:`/`Throughput:` messages of one instance from its log file.
+
+    Returns:
+        result (dict): {"latency": value, "latency_unit": unit, "throughput": value, "throughput_unit": unit},
+            the items which are not found are absent.
+    """
     throughput_pattern = r"[T,t]hroughput:\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z/]*)"
     latency_pattern = r"[L,l]atency:\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z/]*)"
 
-    latency_list = []
-    throughput_list = []
-    latency_unit_name = ""
-    throughput_unit_name = ""
-    for idx, logfile in logfile_dict.items():
-        with open(logfile, "r") as f:
-            for line in f:
-                re_latency = re.search(latency_pattern, line)
-                re_throughput = re.search(throughput_pattern, line)
-                if re_latency:
-                    latency_list.append(float(re_latency.group(1)))
-                    if not latency_unit_name:
-                        latency_unit_name = re_latency.group(2)
-                if re_throughput:
-                    throughput_list.append(float(re_throughput.group(1)))
-                    if not throughput_unit_name:
-                        throughput_unit_name = re_throughput.group(2)
-    if throughput_list and latency_list:
-        assert (
-            len(latency_list) == len(throughput_list) == len(logfile_dict)
-        ), "Multiple instance benchmark failed with some instances!"
-
-        # dump collected latency and throughput info
-        header = "Multiple Instance Benchmark Summary"
+    result = {}
+    with open(logfile, "r") as f:
+        for line in f:
+            re_latency = re.search(latency_pattern, line)
+            re_throughput = re.search(throughput_pattern, line)
+            if re_latency:
+                result["latency"] = float(re_latency.group(1))
+                result["latency_unit"] = re_latency.group(2)
+            if re_throughput:
+                result["throughput"] = float(re_throughput.group(1))
+                result["throughput_unit"] = re_throughput.group(2)
+    return result
+
+
+def summary_latency_throughput(logfile_dict, warmup=0):
+    """Get the summary of the benchmark.
+
+    Step records reported by `BenchmarkRecorder` are preferred. Otherwise the final values reported
+    by `BenchmarkRecorder.report` or printed as `Latency:`/`Throughput:` messages are merged.
+
+    Args:
+        logfile_dict (dict): {instance_index: log_file_path}
+        warmup (int, optional): the number of leading steps to skip per instance. Defaults to 0.
+
+    Returns:
+        summary (dict): {"latency": value, "latency_unit": unit, "throughput": value, "throughput_unit": unit},
+            the items which are not collected are None.
+    """
+    header = "Multiple Instance Benchmark Summary"
+    records_dict = {idx: load_result_records(get_result_file(logfile)) for idx, logfile in logfile_dict.items()}
+    summary = None
+    if all(any(r.get("type") == "step" for r in records) for records in records_dict.values()):
+        summary = summary_result_records(records_dict, warmup=warmup)
+    if summary is not None:
+        latency_unit_name, throughput_unit_name = "ms", "{}/sec".format(summary["unit"])
         field_names = [
             "Instance",
             "Latency ({})".format(latency_unit_name),
             "Throughput ({})".format(throughput_unit_name),
+            "Samples",
         ]
         output_data = []
-        for idx, (latency, throughput) in enumerate(zip(latency_list, throughput_list)):
-            output_data.append([idx + 1, round(latency, 3), round(throughput, 3)])
+        for idx, result in sorted(summary["instances"].items()):
+            output_data.append([idx, round(result["latency"], 3), round(result["throughput"], 3), result["samples"]])
         Statistics(output_data, header=header, field_names=field_names).print_stat()
-        # show summary info
-        logger.info("Average latency: {} {}".format(round(sum(latency_list) / len(latency_list), 3), latency_unit_name))
-        logger.info("Total throughput: {} {}".format(round(sum(throughput_list), 3), throughput_unit_name))
-    elif throughput_list:
-        assert len(throughput_list) == len(logfile_dict), "Multiple instance benchmark failed with some instances!"
+        logger.info("Overlapping window: {} sec".format(round(summary["window"], 3)))
+        logger.info("Average latency: {} {}".format(round(summary["latency"], 3), latency_unit_name))
+        logger.info("Total throughput: {} {}".format(round(summary["throughput"], 3), throughput_unit_name))
+        return {
+            "latency": summary["latency"],
+            "latency_unit": latency_unit_name,
+            "throughput": summary["throughput"],
+            "throughput_unit": throughput_unit_name,
+        }
 
-        # dump collected throughput info
-        header = "Multiple Instance Benchmark Summary"
-        field_names = [
-            "Instance",
-            "Throughput ({})".format(throughput_unit_name),
-        ]
-        output_data = []
-        for idx, throughput in enumerate(throughput_list):
-            output_data.append([idx + 1, round(throughput, 3)])
-        Statistics(output_data, header=header, field_names=field_names).print_stat()
-        # show summary info
-        logger.info("Total throughput: {} {}.hdfghdfghs".format(round(sum(throughput_list), 3), throughput_unit_name))
-    elif latency_list:
+    latency_list = []
+    throughput_list = []
+    latency_unit_name = ""
+    throughput_unit_name = ""
+    for idx, logfile in logfile_dict.items():
+        reported = [r for r in records_dict[idx] if r.get("type") == "summary"]
+        if reported:
+            result = {k: v for k, v in reported[-1].items() if v is not None}
+        else:
+            result = parse_log_latency_throughput(logfile)
+        if "latency" in result:
+            latency_list.append(result["latency"])
+            latency_unit_name = latency_unit_name or result["latency_unit"]
+        if "throughput" in result:
+            throughput_list.append(result["throughput"])
+            throughput_unit_name = throughput_unit_name or result["throughput_unit"]
+
+    summary = {
+        "latency": None,
+        "latency_unit": latency_unit_name,
+        "throughput": None,
+        "throughput_unit": throughput_unit_name,
+    }
+    field_names = ["Instance"]
+    columns = []
+    if latency_list:
         assert len(latency_list) == len(logfile_dict), "Multiple instance benchmark failed with some instances!"
+        field_names.append("Latency ({})".format(latency_unit_name))
+        columns.append(latency_list)
+        summary["latency"] = sum(latency_list) / len(latency_list)
+    if throughput_list:
+        assert len(throughput_list) == len(logfile_dict), "Multiple instance benchmark failed with some instances!"
+        field_names.append("Throughput ({})".format(throughput_unit_name))
+        columns.append(throughput_list)
+        summary["throughput"] = sum(throughput_list)
+    if not columns:
+        return summary
+
+    # dump collected latency and throughput info
+    output_data = []
+    for idx, values in enumerate(zip(*columns)):
+        output_data.append([idx + 1] + [round(v, 3) for v in values])
+    Statistics(output_data, header=header, field_names=field_names).print_stat()
+    # show summary info
+    if summary["latency"] is not None:
+        logger.info("Average latency: {} {}".format(round(summary["latency"], 3), latency_unit_name))
+    if summary["throughput"] is not None:
+        logger.info("Total throughput: {} {}".format(round(summary["throughput"], 3), throughput_unit_name))
+    return summary
 
-        # dump collected latency info
-        header = "Multiple Instance Benchmark Summary"
-        field_names = [
-            "Instance",
-            "Latency ({})".format(latency_unit_name),
-        ]
-        output_data = []
-        for idx, latency in enumerate(latency_list):
-            output_data.append([idx + 1, round(latency, 3)])
-        Statistics(output_data, header=header, field_names=field_names).print_stat()
-        # show summary info
-        logger.info("Average latency: {} {}".format(round(sum(latency_list) / len(latency_list), 3), latency_unit_name))
+
+def get_sweep_layouts(cores_per_node):
+    """Generate the candidate numbers of cores per instance for the sweep.
+
+    Powers of two are tried together with the whole node, e.g. 24 cores -> [1, 2, 4, 8, 16, 24].
+
+    Args:
+        cores_per_node (dict): {numa_node_index: list of cores to use in this numa node}
+
+    Returns:
+        num_cores_list (list): the candidate numbers of cores per instance.
+    """
+    max_cores = min(len(cores) for cores in cores_per_node.values())
+    num_cores_list = []
+    num_cores = 1
+    while num_cores < max_cores:
+        num_cores_list.append(num_cores)
+        num_cores *= 2
+    num_cores_list.append(max_cores)
+    return num_cores_list
+
+
+def get_pareto_frontier(results):
+    """Select the layouts which no other layout beats on both throughput and latency.
+
+    Args:
+        results (list): [{"throughput": value, "latency": value, ...}, ...]
+
+    Returns:
+        frontier (list): the indexes of the results on the frontier.
+    """
+    frontier = []
+    for i, result in enumerate(results):
+        dominated = False
+        for j, other in enumerate(results):
+            if i == j:
+                continue
+            if (
+                other["throughput"] >= result["throughput"]
+                and other["latency"] <= result["latency"]
+                and (other["throughput"] > result["throughput"] or other["latency"] < result["latency"])
+            ):
+                dominated = True
+                break
+        if not dominated:
+            frontier.append(i)
+    return frontier
+
+
+def sweep_instance_layouts(args, numa_info, raw_cmd):
+    """Benchmark several `num_instances x num_cores_per_instance` layouts and dump the frontier.
+
+    Every layout tiles each NUMA node with instances of the same number of cores, so no instance
+    crosses NUMA nodes. With `-C`, only the given cores are used.
+
+    Args:
+        args (argparse): arguments for setting different configurations
+        numa_info (dict): {numa_node_index: list of Physical CPUs in this numa node, ...}
+        raw_cmd (str): script.py and parameters for this script
+
+    Returns:
+        results (list): [{"num_instances": int, "num_cores_per_instance": int, "throughput": value,
+            "latency": value, "frontier": bool}, ...]
+    """
+    cores_per_node = numa_info
+    if args.cores is not None:
+        visible_cores = set(parse_str2list(args.cores))
+        cores_per_node = {n: [c for c in cores if c in visible_cores] for n, cores in numa_info.items()}
+        cores_per_node = {n: cores for n, cores in cores_per_node.items() if cores}
+    assert cores_per_node, "No physical CPU is available for the sweep."
+
+    results = []
+    latency_unit_name = throughput_unit_name = ""
+    for num_cores in get_sweep_layouts(cores_per_node):
+        core_list_per_instance = {}
+        for cores in cores_per_node.values():
+            for start in range(0, len(cores) - num_cores + 1, num_cores):
+                core_list_per_instance[len(core_list_per_instance)] = cores[start : start + num_cores]
+        logger.info(
+            "Sweep layout: {} instances x {} cores per instance.".format(len(core_list_per_instance), num_cores)
+        )
+        core_list_per_instance = format_core_list_per_instance(core_list_per_instance, numa_info)
+        logfile_dict = run_multi_instance_command(args, core_list_per_instance, raw_cmd=raw_cmd)
+        summary = summary_latency_throughput(logfile_dict, warmup=args.warmup)
+        if summary["throughput"] is None or summary["latency"] is None:
+            logger.warning("Skip the layout without both latency and throughput reported.")
+            continue
+        latency_unit_name = latency_unit_name or summary["latency_unit"]
+        throughput_unit_name = throughput_unit_name or summary["throughput_unit"]
+        results.append(
+            {
+                "num_instances": len(core_list_per_instance),
+                "num_cores_per_instance": num_cores,
+                "throughput": summary["throughput"],
+                "latency": summary["latency"],
+                "frontier": False,
+            }
+        )
+
+    if not results:
+        logger.error("No layout reported both latency and throughput, please report them in the script.")
+        return results
+    for i in get_pareto_frontier(results):
+        results[i]["frontier"] = True
+
+    # dump stats of all layouts
+    field_names = [
+        "Instances",
+        "Cores per instance",
+        "Latency ({})".format(latency_unit_name),
+        "Throughput ({})".format(throughput_unit_name),
+        "Frontier",
+    ]
+    output_data = []
+    for result in results:
+        output_data.append(
+            [
+                result["num_instances"],
+                result["num_cores_per_instance"],
+                round(result["latency"], 3),
+                round(result["throughput"], 3),
+                "*" if result["frontier"] else "",
+            ]
+        )
+    Statistics(output_data, header="Instance Layout Sweep Summary", field_names=field_names).print_stat()
+    best_throughput = max(results, key=lambda r: r["throughput"])
+    best_latency = min(results, key=lambda r: r["latency"])
+    logger.info(
+        "Best throughput: {} {} with --num_instances {} --num_cores_per_instance {}".format(
+            round(best_throughput["throughput"], 3),
+            throughput_unit_name,
+            best_throughput["num_instances"],
+            best_throughput["num_cores_per_instance"],
+        )
+    )
+    logger.info(
+        "Best latency: {} {} with --num_instances {} --num_cores_per_instance {}".format(
+            round(best_latency["latency"], 3),
+            latency_unit_name,
+            best_latency["num_instances"],
+            best_latency["num_cores_per_instance"],
+        )
+    )
+    return results
 
 
 def benchmark():
@@ -510,6 +917,12 @@ def benchmark():
     )
     parser.add_argument("-C", "--cores", type=str, default=None, help="Determine the visible core range.")
     parser.add_argument("--cross_memory", action="store_true", help="Determine the visible core range.")
+    parser.add_argument(
+        "--warmup", type=int, default=0, help="Determine the number of reported steps to skip per instance."
+    )
+    parser.add_argument(
+        "--sweep", action="store_true", help="Try several instance layouts on each NUMA node and report the frontier."
+    )
     parser.add_argument("script", type=str, help="The path to the script to launch.")
     parser.add_argument("parameters", nargs=argparse.REMAINDER, help="arguments to the script.")
 
@@ -518,7 +931,12 @@ def benchmark():
     assert sys.platform in ["linux", "win32"], "only support platform windows and linux..."
 
     numa_info = dump_numa_info()  # show numa info and current usage of cores
-    core_list_per_instance = set_cores_for_instance(args, numa_info=numa_info)
     script_and_parameters = args.script + " " + " ".join(args.parameters)
+    if args.sweep:
+        if args.num_instances or args.num_cores_per_instance:
+            logger.warning("num_instances and num_cores_per_instance are ignored in the sweep mode.")
+        sweep_instance_layouts(args, numa_info, raw_cmd=script_and_parameters)
+        return
+    core_list_per_instance = set_cores_for_instance(args, numa_info=numa_info)
     logfile_dict = run_multi_instance_command(args, core_list_per_instance, raw_cmd=script_and_parameters)
-    summary_latency_throughput(logfile_dict)
+    summary_latency_throughput(logfile_dict, warmup=args.warmup)
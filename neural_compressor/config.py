@@ -596,7 +596,8 @@ class TuningCriterion:
         strategy: Strategy name used in tuning. Please refer to docs/source/tuning_strategies.md.
         strategy_kwargs: Parameters for strategy. Please refer to docs/source/tuning_strategies.md.
         objective: String or dict. Objective with accuracy constraint guaranteed. String value supports
-                  "performance", "modelsize", "footprint". Default value is "performance".
+                  "performance", "modelsize", "footprint", "p90latency", "p99latency".
+                  Default value is "performance".
                    Please refer to docs/source/objective.md.
         timeout: Tuning timeout (seconds). Default value is 0 which means early stop.
         max_trials: Max tune times. Default value is 100. Combine with timeout field to decide when to exit.
@@ -663,13 +664,14 @@ class TuningCriterion:
                 "weight": [0.1, 0.9]
                 }
         """
+        supported_objectives = ["performance", "accuracy", "modelsize", "footprint", "p90latency", "p99latency"]
         if isinstance(objective, list):
             for val in objective:
-                assert _check_value("objective", val, str, ["performance", "accuracy", "modelsize", "footprint"])
+                assert _check_value("objective", val, str, supported_objectives)
             self._objective = objective
             return
 
-        if _check_value("objective", objective, str, ["performance", "accuracy", "modelsize", "footprint"]):
+        if _check_value("objective", objective, str, supported_objectives):
             self._objective = [objective]
             return
 
@@ -679,7 +681,7 @@ class TuningCriterion:
             for k, v in objective.items():
                 _check_value("objective", k, str, ["objective", "weight", "higher_is_better"])
                 if k == "objective":
-                    _check_value("objective", v, str, ["performance", "accuracy", "modelsize", "footprint"])
+                    _check_value("objective", v, str, supported_objectives)
             self._objective = objective
 
     @property
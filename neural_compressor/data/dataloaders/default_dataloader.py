@@ -18,8 +18,14 @@
 """Default dataloader for multiple framework backends."""
 
 import collections
+import multiprocessing
+import queue
+import sys
+import threading
+import traceback
 from abc import abstractmethod
 from math import ceil, floor
+from multiprocessing import resource_tracker, shared_memory
 
 import numpy as np
 
@@ -27,6 +33,11 @@ from .base_dataloader import BaseDataLoader
 from .fetcher import FETCHERS
 from .sampler import BatchSampler, IterableSampler, SequentialSampler
 
+# arrays smaller than this are sent back from the worker processes by pickling
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+# interval in seconds to check whether the workers are still alive while waiting for a batch
+WORKER_STATUS_CHECK_INTERVAL = 5.0
+
 
 def default_collate(batch):  # pragma: no cover
     """Merge data with outer dimension batch size."""
@@ -45,6 +56,103 @@ def default_collate(batch):  # pragma: no cover
         return batch
 
 
+class _SharedArray(collections.namedtuple("_SharedArray", ["name", "shape", "dtype"])):
+    """Descriptor of a numpy array stored in a shared memory block."""
+
+
+class _WorkerFailure(object):
+    """The exception raised in a dataloader worker, to be raised again in the main process."""
+
+    def __init__(self, worker_id, exc):
+        """Initialize _WorkerFailure."""
+        self.worker_id = worker_id
+        self.exc_type = type(exc).__name__
+        self.message = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+
+class _EndOfData(object):
+    """Marker sent by a worker when its fetcher is exhausted."""
+
+
+def _to_shared_memory(data):
+    """Move the large numpy arrays of a batch into shared memory blocks."""
+    if isinstance(data, np.ndarray):
+        if data.dtype.hasobject or data.nbytes < SHARED_MEMORY_MIN_BYTES:
+            return data
+        shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        np.ndarray(data.shape, dtype=data.dtype, buffer=shm.buf)[...] = data
+        shared_array = _SharedArray(shm.name, data.shape, data.dtype.str)
+        shm.close()
+        # the block is unlinked by the main process, the tracker of this worker must not release it
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shared_array
+    elif isinstance(data, collections.abc.Mapping):
+        return {key: _to_shared_memory(value) for key, value in data.items()}
+    elif isinstance(data, tuple) and not hasattr(data, "_fields"):
+        return tuple(_to_shared_memory(value) for value in data)
+    elif isinstance(data, list):
+        return [_to_shared_memory(value) for value in data]
+    return data
+
+
+def _from_shared_memory(data, release_only=False):
+    """Copy the arrays of a batch out of their shared memory blocks and release the blocks."""
+    if isinstance(data, _SharedArray):
+        shm = shared_memory.SharedMemory(name=data.name)
+        array = None
+        if not release_only:
+            array = np.ndarray(data.shape, dtype=np.dtype(data.dtype), buffer=shm.buf).copy()
+        shm.close()
+        shm.unlink()
+        return array
+    elif isinstance(data, collections.abc.Mapping):
+        return {key: _from_shared_memory(value, release_only) for key, value in data.items()}
+    elif isinstance(data, tuple) and not hasattr(data, "_fields"):
+        return tuple(_from_shared_memory(value, release_only) for value in data)
+    elif isinstance(data, list):
+        return [_from_shared_memory(value, release_only) for value in data]
+    return data
+
+
+def _worker_loop(
+    dataset, dataset_type, collate_fn, drop_last, shard_info, index_queue, data_queue, use_shared_memory
+):  # pragma: no cover
+    """Fetch the batches requested through index_queue and put them into data_queue in the same order.
+
+    Args:
+        dataset (object): dataset from which to load the data
+        dataset_type (str): the fetcher type, 'index' or 'iter'
+        collate_fn (callable): merge data with outer dimension batch size
+        drop_last (bool): whether to drop the last batch if it is incomplete
+        shard_info (tuple): worker_id, num_workers, process_rank and process_size of this worker
+        index_queue (Queue): the batched indices to fetch, None to stop the worker
+        data_queue (Queue): the fetched batches
+        use_shared_memory (bool): whether to send the large arrays back through shared memory
+    """
+    fetcher = FETCHERS[dataset_type](dataset, collate_fn, drop_last, False)
+    if dataset_type == "iter":
+        fetcher.shard(*shard_info)
+    exhausted = False
+    while True:
+        batched_indices = index_queue.get()
+        if batched_indices is None:
+            break
+        if exhausted:
+            data_queue.put(_EndOfData())
+            continue
+        try:
+            data = fetcher(batched_indices)
+            if use_shared_memory:
+                data = _to_shared_memory(data)
+        except StopIteration:
+            exhausted = True
+            data = _EndOfData()
+        except Exception as exc:
+            exhausted = True
+            data = _WorkerFailure(shard_info[0], exc)
+        data_queue.put(data)
+
+
 class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
     """DefaultDataLoader for multiple framework backends."""
 
@@ -60,6 +168,8 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         pin_memory=False,
         shuffle=False,
         distributed=False,
+        prefetch_factor=2,
+        worker_type="process",
     ):
         """Initialize DefaultDataLoader.
 
@@ -72,10 +182,15 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
             collate_fn (callable, optional): merge data with outer dimension batch size. Defaults to None.
             sampler (Sampler, optional): Sampler object to sample data. Defaults to None.
             batch_sampler (BatchSampler, optional): BatchSampler object to generate batch of indices. Defaults to None.
-            num_workers (int, optional): number of subprocesses to use for data loading. Defaults to 0.
+            num_workers (int, optional): number of subprocesses to use for data loading.
+                                         0 means the data will be loaded in the main process. Defaults to 0.
             pin_memory (bool, optional): whether to copy data into pinned memory before returning. Defaults to False.
             shuffle (bool, optional): whether to shuffle data. Defaults to False.
             distributed (bool, optional): whether the dataloader is distributed. Defaults to False.
+            prefetch_factor (int, optional): number of batches loaded in advance by each worker. Defaults to 2.
+            worker_type (str, optional): run the workers as 'process' or 'thread'. Processes send the large arrays
+                                         back through shared memory, threads suit datasets that release the GIL
+                                         or can't be pickled. Defaults to 'process'.
         """
         self.dataset = dataset
         self.last_batch = last_batch
@@ -88,6 +203,9 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         self.shuffle = shuffle
         self.distributed = distributed
         self.drop_last = False if last_batch == "rollover" else True
+        self.prefetch_factor = prefetch_factor
+        assert worker_type in ["process", "thread"], "worker_type only support 'process' and 'thread'."
+        self.worker_type = worker_type
         if self.collate_fn is None:
             self.collate_fn = default_collate
 
@@ -152,6 +270,10 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
         self.batch_sampler = BatchSampler(sampler, batch_size, self.drop_last)
         self.fetcher = FETCHERS[self.dataset_type](dataset, collate_fn, self.drop_last, distributed)
 
+        if num_workers > 0:
+            yield from self._generate_from_workers(dataset, collate_fn, num_workers)
+            return
+
         for batched_indices in self.batch_sampler:
             try:
                 data = self.fetcher(batched_indices)
@@ -159,6 +281,92 @@ class DefaultDataLoader(BaseDataLoader):  # pragma: no cover
             except StopIteration:
                 return
 
+    def _generate_from_workers(self, dataset, collate_fn, num_workers):
+        """Yield the batches fetched by a pool of workers in the order of the batch sampler.
+
+        Batch k is fetched by worker k % num_workers, and each worker keeps up to prefetch_factor batches
+        in flight. The workers of an iterable dataset each iterate the whole dataset and only keep their own
+        batches, so the work done in the dataset iterator itself is not split between the workers.
+        """
+        use_process = self.worker_type == "process"
+        if use_process:
+            context = multiprocessing.get_context("fork" if sys.platform.startswith("linux") else None)
+            queue_cls, worker_cls = context.Queue, context.Process
+        else:
+            queue_cls, worker_cls = queue.Queue, threading.Thread
+        process_rank = getattr(self.fetcher, "process_rank", 0)
+        process_size = getattr(self.fetcher, "process_size", 1)
+
+        index_queues, data_queues, workers = [], [], []
+        for worker_id in range(num_workers):
+            index_queues.append(queue_cls())
+            data_queues.append(queue_cls())
+            worker = worker_cls(
+                target=_worker_loop,
+                args=(
+                    dataset,
+                    self.dataset_type,
+                    collate_fn,
+                    self.drop_last,
+                    (worker_id, num_workers, process_rank, process_size),
+                    index_queues[worker_id],
+                    data_queues[worker_id],
+                    use_process,
+                ),
+                daemon=True,
+            )
+            worker.start()
+            workers.append(worker)
+
+        sampler_iter = iter(self.batch_sampler)
+        sent_idx, rcvd_idx = 0, 0
+        try:
+            # the batch sampler of an iterable dataset never ends, so only the workers can stop it
+            for batched_indices in sampler_iter:
+                index_queues[sent_idx % num_workers].put(batched_indices)
+                sent_idx += 1
+                if sent_idx == num_workers * max(1, self.prefetch_factor):
+                    break
+            while rcvd_idx < sent_idx:
+                data = self._get_worker_data(data_queues, workers, rcvd_idx % num_workers)
+                rcvd_idx += 1
+                if isinstance(data, _EndOfData):
+                    return
+                if isinstance(data, _WorkerFailure):
+                    raise RuntimeError(
+                        "Caught {} in DataLoader worker {}.\n{}".format(data.exc_type, data.worker_id, data.message)
+                    )
+                for batched_indices in sampler_iter:
+                    index_queues[sent_idx % num_workers].put(batched_indices)
+                    sent_idx += 1
+                    break
+                yield _from_shared_memory(data) if use_process else data
+        finally:
+            for index_queue in index_queues:
+                index_queue.put(None)
+            # release the shared memory of the batches which were prefetched but not consumed
+            while rcvd_idx < sent_idx and use_process:
+                try:
+                    data = self._get_worker_data(data_queues, workers, rcvd_idx % num_workers)
+                except RuntimeError:
+                    break
+                rcvd_idx += 1
+                _from_shared_memory(data, release_only=True)
+            for worker in workers:
+                worker.join(timeout=WORKER_STATUS_CHECK_INTERVAL)
+                if use_process and worker.is_alive():
+                    worker.terminate()
+
+    @staticmethod
+    def _get_worker_data(data_queues, workers, worker_id):
+        """Get the next batch of a worker, raise RuntimeError if the worker exited unexpectedly."""
+        while True:
+            try:
+                return data_queues[worker_id].get(timeout=WORKER_STATUS_CHECK_INTERVAL)
+            except queue.Empty:
+                if not workers[worker_id].is_alive():
+                    raise RuntimeError("DataLoader worker {} exited unexpectedly.".format(worker_id))
+
     def _generate_sampler(self, dataset, distributed):
         if hasattr(dataset, "__getitem__"):
             self.dataset_type = "index"
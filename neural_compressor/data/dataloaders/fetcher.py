@@ -60,8 +60,11 @@ class IterableFetcher(Fetcher):  # pragma: no cover
         super(IterableFetcher, self).__init__(dataset, collate_fn, drop_last)
         self.dataset_iter = iter(dataset)
         self.index_whole = 0
+        self.index_process = 0
         self.process_rank = 0  # The default rank is 0, which represents the main process
         self.process_size = 1  # By default, process_size=1, only the main process is running
+        self.worker_id = 0  # The loader worker fetching the batches, see `shard`
+        self.num_workers = 1
         if distributed:
             import horovod.tensorflow as hvd
 
@@ -77,6 +80,23 @@ class IterableFetcher(Fetcher):  # pragma: no cover
                     " please set 'distributed: True' and launch multiple processes."
                 )
 
+    def shard(self, worker_id, num_workers, process_rank=0, process_size=1):
+        """Only fetch the batches belonging to one of the dataloader workers.
+
+        The samples of this process are split by batch, worker k fetches the batches k, k + num_workers, ...
+        so the batches of all the workers interleaved are the same as the ones fetched by a single fetcher.
+
+        Args:
+            worker_id (int): the id of the worker using this fetcher
+            num_workers (int): the number of dataloader workers
+            process_rank (int, optional): the rank of the distributed process. Defaults to 0.
+            process_size (int, optional): the number of distributed processes. Defaults to 1.
+        """
+        self.worker_id = worker_id
+        self.num_workers = num_workers
+        self.process_rank = process_rank
+        self.process_size = process_size
+
     def __call__(self, batched_indices):
         """Fetch data.
 
@@ -89,7 +109,9 @@ class IterableFetcher(Fetcher):  # pragma: no cover
             try:
                 iter_data = next(self.dataset_iter)
                 if (self.index_whole - self.process_rank) % self.process_size == 0:
-                    batch_data.append(iter_data)
+                    if (self.index_process // batch_size) % self.num_workers == self.worker_id:
+                        batch_data.append(iter_data)
+                    self.index_process += 1
                 self.index_whole += 1
                 if len(batch_data) == batch_size:
                     break
@@ -529,6 +529,10 @@ def get_torchvision_map(interpolation):
 class ComposeTransform(BaseTransform):
     """Composes several transforms together.
 
+    The transforms can also be applied to a whole batch with `collate`, e.g. as the collate_fn of a dataloader
+    on a dataset without transform. The transforms supporting it (`batch_call`) at the end of transform_list
+    then run once on the batch instead of once per sample.
+
     Args:
         transform_list (list of Transform objects):  list of transforms to compose
 
@@ -539,6 +543,11 @@ class ComposeTransform(BaseTransform):
     def __init__(self, transform_list):
         """Initialize `ComposeTransform` class."""
         self.transform_list = transform_list
+        num_sample_transforms = len(transform_list)
+        while num_sample_transforms > 0 and _support_batch_call(transform_list[num_sample_transforms - 1]):
+            num_sample_transforms -= 1
+        self.sample_transforms = transform_list[:num_sample_transforms]
+        self.batch_transforms = transform_list[num_sample_transforms:]
 
     def __call__(self, sample):
         """Call transforms in transform_list."""
@@ -546,6 +555,77 @@ class ComposeTransform(BaseTransform):
             sample = transform(sample)
         return sample
 
+    def collate(self, samples):
+        """Apply the transforms to a list of samples and merge them with outer dimension batch size.
+
+        The leading transforms without batch support run per sample and their results are stacked into one
+        batch array. If those images share a shape, the remaining transforms run on the whole batch, where
+        crop and transpose are views and a cast is done by the final copy into the output array.
+
+        Args:
+            samples (list): list of (image, label) samples
+
+        Returns:
+            list: the batched images and labels, the same as default_collate of the transformed samples
+        """
+        from neural_compressor.data.dataloaders.default_dataloader import default_collate
+
+        sample_images, labels = [], []
+        for sample in samples:
+            for transform in self.sample_transforms:
+                sample = transform(sample)
+            sample_images.append(sample[0])
+            labels.append(sample[1])
+
+        first_image = sample_images[0]
+        if not (
+            isinstance(first_image, np.ndarray)
+            and not first_image.dtype.hasobject
+            and all(
+                isinstance(image, np.ndarray) and image.shape == first_image.shape and image.dtype == first_image.dtype
+                for image in sample_images
+            )
+        ):
+            # the images can't be batched, fall back to the per sample transforms
+            transformed = [self._call_batch_transforms(sample) for sample in zip(sample_images, labels)]
+            return default_collate(transformed)
+
+        images = np.stack(sample_images)
+        dtype = None
+        for transform in self.batch_transforms:
+            if isinstance(transform, CastONNXTransform):
+                # delay the cast to the final copy as long as only views are taken,
+                # an earlier pending cast may change the values so it is applied first
+                if dtype is not None:
+                    images = images.astype(dtype)
+                dtype = np_dtype_map[transform.dtype]
+                continue
+            if dtype is not None and not getattr(transform, "batch_view", False):
+                images, dtype = images.astype(dtype), None
+            images = transform.batch_call(images)
+        if dtype is not None or not images.flags.c_contiguous or images.base is not None:
+            output = np.empty(images.shape, dtype=images.dtype if dtype is None else dtype)
+            np.copyto(output, images, casting="unsafe")
+            images = output
+        return [images, default_collate(labels)]
+
+    def _call_batch_transforms(self, sample):
+        """Apply the batch transforms to one sample."""
+        for transform in self.batch_transforms:
+            sample = transform(sample)
+        return sample
+
+
+def _support_batch_call(transform):
+    """Check whether the batch_call of the transform matches its __call__.
+
+    A subclass overriding __call__ without batch_call, e.g. for other tensor types, has no batch support.
+    """
+    mro = type(transform).__mro__
+    batch_cls = next((cls for cls in mro if "batch_call" in cls.__dict__), None)
+    call_cls = next((cls for cls in mro if "__call__" in cls.__dict__), None)
+    return batch_cls is not None and batch_cls is call_cls
+
 
 @transform_registry(transform_type="CropToBoundingBox", process="preprocess", framework="pytorch")
 class CropToBoundingBox(BaseTransform):
@@ -803,6 +883,8 @@ class Transpose(BaseTransform):
         tuple of processed image and label
     """
 
+    batch_view = True
+
     def __init__(self, perm):
         """Initialize `Transpose` class."""
         self.perm = perm
@@ -814,6 +896,11 @@ class Transpose(BaseTransform):
         image = np.transpose(image, axes=self.perm)
         return (image, label)
 
+    def batch_call(self, images):
+        """Transpose a batch of images according to perm, the batch dimension is kept first."""
+        assert len(images.shape) == len(self.perm) + 1, "Image rank doesn't match Perm rank"
+        return np.transpose(images, axes=[0] + [axis + 1 for axis in self.perm])
+
 
 @transform_registry(transform_type="Transpose", process="preprocess", framework="tensorflow, tensorflow_itex")
 class TensorflowTranspose(Transpose):
@@ -1063,6 +1150,10 @@ class CastONNXTransform(BaseTransform):
         image = image.astype(np_dtype_map[self.dtype])
         return (image, label)
 
+    def batch_call(self, images):
+        """Convert a batch of images to given dtype."""
+        return images.astype(np_dtype_map[self.dtype])
+
 
 @transform_registry(transform_type="Cast", process="general", framework="pytorch")
 class CastPyTorchTransform(BaseTransform):
@@ -1588,6 +1679,12 @@ class RescaleTransform(BaseTransform):
             image = image.astype("float32") / 255.0
         return (image, label)
 
+    def batch_call(self, images):
+        """Scale the values of a batch of images."""
+        images = images.astype("float32")
+        images /= 255.0
+        return images
+
 
 @transform_registry(
     transform_type="AlignImageChannel",
@@ -1921,6 +2018,8 @@ class CenterCropTransform(BaseTransform):
         tuple of processed image and label
     """
 
+    batch_view = True
+
     def __init__(self, size):
         """Initialize `CenterCropTransform` class."""
         if isinstance(size, int):
@@ -1948,6 +2047,21 @@ class CenterCropTransform(BaseTransform):
         image = image[y0 : y0 + self.height, x0 : x0 + self.width, :]
         return (image, label)
 
+    def batch_call(self, images):
+        """Crop a batch of images at the center to the given size, the result is a view of the batch."""
+        h, w = images.shape[1], images.shape[2]
+        if h + 1 < self.height or w + 1 < self.width:
+            raise ValueError(
+                "Required crop size {} is larger then input image size {}".format((self.height, self.width), (h, w))
+            )
+
+        if self.height == h and self.width == w:
+            return images
+
+        y0 = (h - self.height) // 2
+        x0 = (w - self.width) // 2
+        return images[:, y0 : y0 + self.height, x0 : x0 + self.width, :]
+
 
 @transform_registry(transform_type="Normalize", process="preprocess", framework="mxnet")
 class MXNetNormalizeTransform(BaseTransform):
@@ -2043,6 +2157,23 @@ class NormalizeTransform(BaseTransform):
         image = (image - self.mean) / self.std
         return (image, label)
 
+    def batch_call(self, images):
+        """Normalize a batch of images, the division is done in place."""
+        assert len(self.mean) == images.shape[-1], "Mean channel must match image channel"
+        mean, std = np.asarray(self.mean), np.asarray(self.std)
+        shape = images.shape
+        if len(shape) > 2 and images.flags.c_contiguous:
+            # broadcast along the merged width and channel dims, an inner loop over the channels only is slow
+            mean = np.tile(mean, shape[-2])
+            std = np.tile(np.broadcast_to(std, shape[-1:]), shape[-2])
+            images = images.reshape(shape[:-2] + (shape[-2] * shape[-1],))
+        images = images - mean
+        if images.dtype.kind == "f" and np.result_type(images, std) == images.dtype:
+            images /= std
+        else:
+            images = images / std
+        return images.reshape(shape)
+
 
 @transform_registry(
     transform_type="RandomCrop", process="preprocess", framework="mxnet, onnxrt_qlinearops, onnxrt_integerops"
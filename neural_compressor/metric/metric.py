@@ -501,6 +501,23 @@ def _shape_validate(preds, labels):
     return preds, labels
 
 
+def _hvd_reduce_sum(hvd, *states):
+    """Sum the accumulator states of all the Horovod ranks.
+
+    The states of a rank are gathered together in one call, they are counters or fixed size arrays
+    so the communication doesn't grow with the number of evaluated samples.
+
+    Args:
+        hvd: The Horovod class for distributed training.
+        states: The accumulator states of this rank.
+
+    Returns:
+        list: The sum of each state over all the ranks.
+    """
+    gathered_states = hvd.allgather_object(states)
+    return [sum(rank_states[i] for rank_states in gathered_states) for i in range(len(states))]
+
+
 @metric_registry("F1", "tensorflow, tensorflow_itex, pytorch, mxnet, onnxrt_qlinearops, onnxrt_integerops")
 class F1(BaseMetric):
     """F1 score of a binary classification problem.
@@ -599,18 +616,17 @@ class Accuracy(BaseMetric):
     """The Accuracy for the classification tasks.
 
     The accuracy score is the proportion of the total number of predictions
-    that were correct classified.
+    that were correct classified. Only the running counters are kept, so the
+    memory doesn't grow with the number of evaluated samples.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of labels to score.
+        correct_num: The number of correct predictions.
         sample: The total number of samples.
     """
 
     def __init__(self):
-        """Initialize predictions, labels and sample."""
-        self.pred_list = []
-        self.label_list = []
+        """Initialize the number of correct predictions and samples."""
+        self.correct_num = 0
         self.sample = 0
 
     def update(self, preds, labels, sample_weight=None):
@@ -624,12 +640,12 @@ class Accuracy(BaseMetric):
         preds, labels = _accuracy_shape_check(preds, labels)
         update_type = _accuracy_type_check(preds, labels)
         if update_type == "binary":
-            self.pred_list.extend(preds)
-            self.label_list.extend(labels)
+            if preds.size == labels.size:
+                preds = preds.reshape(labels.shape)
+            self.correct_num += int(np.sum(preds == labels))
             self.sample += labels.shape[0]
         elif update_type == "multiclass":
-            self.pred_list.extend(np.argmax(preds, axis=1).astype("int32"))
-            self.label_list.extend(labels)
+            self.correct_num += int(np.sum(np.argmax(preds, axis=1).astype("int32") == labels))
             self.sample += labels.shape[0]
         elif update_type == "multilabel":
             # (N, C, ...) -> (N*..., C)
@@ -642,23 +658,19 @@ class Accuracy(BaseMetric):
                 preds = preds.transpose(trans_list).reshape(-1, num_label)
                 labels = labels.transpose(trans_list).reshape(-1, num_label)
             self.sample += preds.shape[0] * preds.shape[1]
-            self.pred_list.append(preds)
-            self.label_list.append(labels)
+            self.correct_num += int(np.sum(preds == labels))
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.pred_list = []
-        self.label_list = []
+        """Reset the number of correct predictions and samples."""
+        self.correct_num = 0
         self.sample = 0
 
     def result(self):
         """Compute the accuracy."""
-        correct_num = np.sum(np.array(self.pred_list) == np.array(self.label_list))
         if getattr(self, "_hvd", None) is not None:
-            allghter_correct_num = sum(self._hvd.allgather_object(correct_num))
-            allgather_sample = sum(self._hvd.allgather_object(self.sample))
-            return allghter_correct_num / allgather_sample
-        return correct_num / self.sample
+            allgather_correct_num, allgather_sample = _hvd_reduce_sum(self._hvd, self.correct_num, self.sample)
+            return allgather_correct_num / allgather_sample
+        return self.correct_num / self.sample
 
 
 class PyTorchLoss:
@@ -749,8 +761,7 @@ class Loss(BaseMetric):
             The dummy loss.
         """
         if getattr(self, "_hvd", None) is not None:
-            allgather_sum = sum(self._hvd.allgather_object(self.sum))
-            allgather_sample = sum(self._hvd.allgather_object(self.sample))
+            allgather_sum, allgather_sample = _hvd_reduce_sum(self._hvd, self.sum, self.sample)
             return allgather_sum / allgather_sample
         return self.sum / self.sample
 
@@ -763,21 +774,21 @@ class MAE(BaseMetric):
     difference between the predicted and actual numeric values.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of references corresponding to the prediction result.
+        aes_sum: The running sum of the absolute errors.
+        aes_size: The number of the accumulated errors.
         compare_label (bool): Whether to compare label. False if there are no
           labels and will use FP32 preds as labels.
     """
 
     def __init__(self, compare_label=True):
-        """Initialize the list of prediction and labels.
+        """Initialize the running sum and size of the absolute errors.
 
         Args:
             compare_label: Whether to compare label. False if there are no
               labels and will use FP32 preds as labels.
         """
-        self.label_list = []
-        self.pred_list = []
+        self.aes_sum = 0
+        self.aes_size = 0
         self.compare_label = compare_label
 
     def update(self, preds, labels, sample_weight=None):
@@ -789,13 +800,15 @@ class MAE(BaseMetric):
             sample_weight: The sample weight.
         """
         preds, labels = _shape_validate(preds, labels)
-        self.label_list.extend(labels)
-        self.pred_list.extend(preds)
+        for label, pred in zip(labels, preds):
+            ae = abs(label - pred)
+            self.aes_sum += np.sum(ae)
+            self.aes_size += ae.size
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.label_list = []
-        self.pred_list = []
+        """Reset the running sum and size of the absolute errors."""
+        self.aes_sum = 0
+        self.aes_size = 0
 
     def result(self):
         """Compute the MAE score.
@@ -803,13 +816,10 @@ class MAE(BaseMetric):
         Returns:
             The MAE score.
         """
-        aes = [abs(a - b) for (a, b) in zip(self.label_list, self.pred_list)]
-        aes_sum = sum([np.sum(ae) for ae in aes])
-        aes_size = sum([ae.size for ae in aes])
-        assert aes_size, "predictions shouldn't be none"
+        assert self.aes_size, "predictions shouldn't be none"
+        aes_sum, aes_size = self.aes_sum, self.aes_size
         if getattr(self, "_hvd", None) is not None:
-            aes_sum = sum(self._hvd.allgather_object(aes_sum))
-            aes_size = sum(self._hvd.allgather_object(aes_size))
+            aes_sum, aes_size = _hvd_reduce_sum(self._hvd, aes_sum, aes_size)
         return aes_sum / aes_size
 
 
@@ -864,21 +874,21 @@ class MSE(BaseMetric):
     and the actual values.
 
     Attributes:
-        pred_list: List of prediction to score.
-        label_list: List of references corresponding to the prediction result.
+        squares_sum: The running sum of the squared errors.
+        squares_size: The number of the accumulated errors.
         compare_label (bool): Whether to compare label. False if there are no labels
                               and will use FP32 preds as labels.
     """
 
     def __init__(self, compare_label=True):
-        """Initialize the list of prediction and labels.
+        """Initialize the running sum and size of the squared errors.
 
         Args:
             compare_label: Whether to compare label. False if there are no
               labels and will use FP32 preds as labels.
         """
-        self.label_list = []
-        self.pred_list = []
+        self.squares_sum = 0
+        self.squares_size = 0
         self.compare_label = compare_label
 
     def update(self, preds, labels, sample_weight=None):
@@ -890,13 +900,15 @@ class MSE(BaseMetric):
             sample_weight: The sample weight.
         """
         preds, labels = _shape_validate(preds, labels)
-        self.pred_list.extend(preds)
-        self.label_list.extend(labels)
+        for label, pred in zip(labels, preds):
+            square = (label - pred) ** 2.0
+            self.squares_sum += np.sum(square)
+            self.squares_size += square.size
 
     def reset(self):
-        """Clear the predictions and labels."""
-        self.label_list = []
-        self.pred_list = []
+        """Reset the running sum and size of the squared errors."""
+        self.squares_sum = 0
+        self.squares_size = 0
 
     def result(self):
         """Compute the MSE score.
@@ -904,13 +916,10 @@ class MSE(BaseMetric):
         Returns:
             The MSE score.
         """
-        squares = [(a - b) ** 2.0 for (a, b) in zip(self.label_list, self.pred_list)]
-        squares_sum = sum([np.sum(square) for square in squares])
-        squares_size = sum([square.size for square in squares])
-        assert squares_size, "predictions shouldn't be None"
+        assert self.squares_size, "predictions shouldn't be None"
+        squares_sum, squares_size = self.squares_sum, self.squares_size
         if getattr(self, "_hvd", None) is not None:
-            squares_sum = sum(self._hvd.allgather_object(squares_sum))
-            squares_size = sum(self._hvd.allgather_object(squares_size))
+            squares_sum, squares_size = _hvd_reduce_sum(self._hvd, squares_sum, squares_size)
         return squares_sum / squares_size
 
 
@@ -984,8 +993,7 @@ class TensorflowTopK(BaseMetric):
             logger.warning("Sample num during evaluation is 0.")
             return 0
         elif getattr(self, "_hvd", None) is not None:
-            allgather_num_correct = sum(self._hvd.allgather_object(self.num_correct))
-            allgather_num_sample = sum(self._hvd.allgather_object(self.num_sample))
+            allgather_num_correct, allgather_num_sample = _hvd_reduce_sum(self._hvd, self.num_correct, self.num_sample)
             return allgather_num_correct / allgather_num_sample
         return self.num_correct / self.num_sample
 
@@ -1028,12 +1036,7 @@ class GeneralTopK(BaseMetric):
             self.num_correct += correct
 
         else:
-            for p, l in zip(preds, labels):
-                # get top-k labels with np.argpartition
-                # p = np.argpartition(p, -self.k)[-self.k:]
-                l = l.astype("int32")
-                if l in p:
-                    self.num_correct += 1
+            self.num_correct += int(np.sum(np.any(preds == labels.astype("int32"), axis=1)))
 
         self.num_sample += len(labels)
 
@@ -1052,8 +1055,7 @@ class GeneralTopK(BaseMetric):
             logger.warning("Sample num during evaluation is 0.")
             return 0
         elif getattr(self, "_hvd", None) is not None:
-            allgather_num_correct = sum(self._hvd.allgather_object(self.num_correct))
-            allgather_num_sample = sum(self._hvd.allgather_object(self.num_sample))
+            allgather_num_correct, allgather_num_sample = _hvd_reduce_sum(self._hvd, self.num_correct, self.num_sample)
             return allgather_num_correct / allgather_num_sample
         return self.num_correct / self.num_sample
 
@@ -1579,23 +1581,32 @@ class ONNXRTGLUE(BaseMetric):
 
 @metric_registry("ROC", "pytorch")
 class ROC(BaseMetric):
-    """Computes ROC score."""
+    """Computes ROC score.
+
+    The scores are accumulated into fixed-bin histograms of the positive and negative samples, so the memory
+    doesn't grow with the number of evaluated samples. The area under the ROC curve is computed from the
+    histograms, the samples falling into the same bin are counted as ties.
+
+    Attributes:
+        auc: The area under the ROC curve of the last result, None if the samples are all of one class.
+    """
 
-    def __init__(self, task="dlrm"):
+    def __init__(self, task="dlrm", num_bins=65536):
         """Initialize the metric.
 
         Args:
             task:The name of the task (Choices: dlrm, dien, wide_deep.).
+            num_bins: The number of bins between 0 and 1 to accumulate the scores. Defaults to 65536.
         """
         assert task in ["dlrm", "dien", "wide_deep"], "Unsupported task type"
-        self.pred_list = None
-        self.label_list = None
         self.task = task
+        self.num_bins = num_bins
         self.return_key = {
             "dlrm": "acc",
             "dien": "acc",
             "wide_deep": "acc",
         }
+        self.reset()
 
     def update(self, preds, labels):
         """Add the predictions and labels.
@@ -1608,26 +1619,38 @@ class ROC(BaseMetric):
             preds = preds[0]
         if isinstance(labels, list) and len(labels) == 1:
             labels = labels[0]
-        if self.pred_list is None:
-            self.pred_list = preds
-            self.label_list = labels
-        else:
-            self.pred_list = np.append(self.pred_list, preds, axis=0)
-            self.label_list = np.append(self.label_list, labels, axis=0)
+        scores = np.asarray(preds).reshape(-1)
+        targets = np.asarray(labels).reshape(-1)
+        self.correct_num += int(np.sum(np.round(scores) == targets))
+        self.sample += targets.size
+        bins = np.clip((scores * self.num_bins).astype(np.int64), 0, self.num_bins - 1)
+        positive = targets > 0.5
+        self.positive_hist += np.bincount(bins[positive], minlength=self.num_bins)
+        self.negative_hist += np.bincount(bins[~positive], minlength=self.num_bins)
 
     def reset(self):
         """Reset the prediction and labels."""
-        self.pred_list = None
-        self.label_list = None
+        self.correct_num = 0
+        self.sample = 0
+        self.positive_hist = np.zeros(self.num_bins, dtype=np.int64)
+        self.negative_hist = np.zeros(self.num_bins, dtype=np.int64)
+        self.auc = None
 
     def result(self):
         """Compute the ROC score."""
-        import sklearn.metrics
-
-        scores = np.squeeze(self.pred_list)
-        targets = np.squeeze(self.label_list)
-        roc_auc = sklearn.metrics.roc_auc_score(targets, scores)
-        acc = sklearn.metrics.accuracy_score(targets, np.round(scores))
+        correct_num, sample = self.correct_num, self.sample
+        positive_hist, negative_hist = self.positive_hist, self.negative_hist
+        if getattr(self, "_hvd", None) is not None:
+            correct_num, sample, positive_hist, negative_hist = _hvd_reduce_sum(
+                self._hvd, correct_num, sample, positive_hist, negative_hist
+            )
+        # Mann-Whitney statistic: the pairs ranked correctly, plus half of the pairs in the same bin
+        negatives_below = np.cumsum(negative_hist) - negative_hist
+        num_pairs = float(positive_hist.sum()) * float(negative_hist.sum())
+        self.auc = None
+        if num_pairs > 0:
+            self.auc = float(np.sum(positive_hist * (negatives_below + 0.5 * negative_hist))) / num_pairs
+        acc = correct_num / sample
         return acc
 
 
@@ -16,7 +16,6 @@
 # limitations under the License.
 """Mix Precision for Neural Compressor."""
 import os
-import pickle
 import random
 import sys
 
@@ -29,7 +28,7 @@ from .config import _Config, options
 from .model import Model
 from .strategy import STRATEGIES
 from .utils import alias_param, logger
-from .utils.utility import CpuInfo, time_limit
+from .utils.utility import CpuInfo, load_tuning_snapshot, time_limit
 
 
 @alias_param("conf", param_alias="config")
@@ -141,8 +140,7 @@ def fit(model, conf, eval_func=None, eval_dataloader=None, eval_metric=None, **k
     )
     if resume_file:
         assert os.path.exists(resume_file), "The specified resume file {} doesn't exist!".format(resume_file)
-        with open(resume_file, "rb") as f:
-            _resume = pickle.load(f).__dict__
+        _resume = load_tuning_snapshot(resume_file).__dict__
 
     strategy = STRATEGIES["automixedprecision"](
         model=wrapped_model,
@@ -18,9 +18,10 @@
 
 import logging
 import os
-import sys
 from pathlib import Path
 
+import numpy as np
+
 from neural_compressor.adaptor.ox_utils.util import MAXIMUM_PROTOBUF
 from neural_compressor.model.base_model import BaseModel
 from neural_compressor.utils.utility import LazyImport
@@ -62,6 +63,7 @@ class ONNXModel(BaseModel):
             self._config = AutoConfig.from_pretrained(Path(model).parent.as_posix())
 
         self.node_name_counter = {}
+        self._reset_index()
         self._output_name_to_node = {}
         self._input_name_to_nodes = {}
         self._get_input_name_to_nodes(self._model.graph.node)
@@ -70,6 +72,18 @@ class ONNXModel(BaseModel):
         self._get_graph_info()
         self._q_config = None
 
+    # data types whose raw bytes have the layout of their numpy dtype
+    _NUMPY_DATA_TYPES = [1, 2, 3, 4, 5, 6, 7, 9, 10, 11, 12, 13]
+
+    @staticmethod
+    def _get_initializer_size(init):
+        """Get the bytes of an initializer from its dims and data type without serializing it."""
+        if init.data_type in ONNXModel._NUMPY_DATA_TYPES:
+            itemsize = onnx.helper.tensor_dtype_to_np_dtype(init.data_type).itemsize
+            return int(np.prod(init.dims, dtype=np.int64)) * itemsize
+        # strings and types without numpy equivalent
+        return init.ByteSize()
+
     def check_is_large_model(self):
         """Check model > 2GB."""
         init_size = 0
@@ -78,16 +92,7 @@ class ONNXModel(BaseModel):
             if init.HasField("data_location") and init.data_location == onnx.TensorProto.EXTERNAL:
                 self._is_large_model = True
                 return
-            # if raise error of initializer size > 2GB, return True
-            try:
-                init_bytes = init.SerializeToString()
-                init_size += sys.getsizeof(init_bytes)
-            except Exception as e:
-                if "exceeds maximum protobuf size of 2GB" in str(e):
-                    self._is_large_model = True
-                    return
-                else:  # pragma: no cover
-                    raise e
+            init_size += self._get_initializer_size(init)
             if init_size > MAXIMUM_PROTOBUF:
                 self._is_large_model = True
                 return
@@ -136,6 +141,7 @@ class ONNXModel(BaseModel):
     def model(self, model):
         """Set model itself."""
         self._model = model
+        self._reset_index()
         self._graph_info = {}
         self._get_graph_info()
         self._output_name_to_node = {}
@@ -153,6 +159,7 @@ class ONNXModel(BaseModel):
 
     def update(self):
         """Update model info."""
+        self._reset_index()
         self._graph_info = {}
         self._get_graph_info()
         self._output_name_to_node = {}
@@ -216,80 +223,253 @@ class ONNXModel(BaseModel):
         """Return model opset_import."""
         return self._model.opset_import
 
+    def _reset_index(self):
+        """Drop the name indexes, they are rebuilt on the next lookup."""
+        self._name_to_node = {}
+        self._input_name_to_consumers = {}
+        self._node_index_state = None
+        self._duplicate_node_names = False
+        self._name_to_initializer = {}
+        self._initializer_index_state = None
+        self._duplicate_initializer_names = False
+
+    @staticmethod
+    def _field_state(field):
+        """Fingerprint a repeated field to detect edits made without ONNXModel.
+
+        Message wrappers are cached by protobuf and kept alive by the indexes, so an extend,
+        remove or rebuild of the field changes its length or its first/last element.
+        """
+        if len(field) == 0:
+            return (0, None, None)
+        return (len(field), field[0], field[-1])
+
+    @staticmethod
+    def _is_valid_state(field, state):
+        """Check whether the fingerprint still matches the repeated field."""
+        if state is None or len(field) != state[0]:
+            return False
+        return state[0] == 0 or (field[0] is state[1] and field[-1] is state[2])
+
+    @staticmethod
+    def _remove_from_field(field, items):
+        """Remove items from a repeated field in one pass and return the removed ones.
+
+        Items are matched by identity and copies fall back to equality. Adjacent positions are
+        deleted as one slice from the back, so the messages left in the field stay valid.
+        """
+        targets = {id(item): item for item in items if item is not None}
+        positions = []
+        for i, element in enumerate(field):
+            if targets.get(id(element)) is element:
+                positions.append(i)
+                del targets[id(element)]
+        if targets:
+            remaining = list(targets.values())
+            matched = set(positions)
+            for i, element in enumerate(field):
+                if not remaining:
+                    break
+                if i in matched:
+                    continue
+                for item in remaining:
+                    if element == item:
+                        positions.append(i)
+                        remaining.remove(item)
+                        break
+            positions.sort()
+
+        removed = [field[i] for i in positions]
+        end = len(positions)
+        while end > 0:
+            start = end - 1
+            while start > 0 and positions[start - 1] == positions[start] - 1:
+                start -= 1
+            del field[positions[start] : positions[end - 1] + 1]
+            end = start
+        return removed
+
+    def _index_node(self, node):
+        """Add a node to the name and consumer indexes."""
+        if node.name in self._name_to_node:
+            self._duplicate_node_names = True
+        else:
+            self._name_to_node[node.name] = node
+        for input_name in set(node.input):
+            self._input_name_to_consumers.setdefault(input_name, []).append(node)
+
+    def _check_node_index(self):
+        """Rebuild the node indexes if the graph was edited without ONNXModel."""
+        if self._is_valid_state(self._model.graph.node, self._node_index_state):
+            return
+        self._name_to_node = {}
+        self._input_name_to_consumers = {}
+        self._duplicate_node_names = False
+        for node in self._model.graph.node:
+            self._index_node(node)
+        self._node_index_state = self._field_state(self._model.graph.node)
+
+    def invalidate_node_index(self):
+        """Mark the node indexes as stale after node inputs were added in place without ONNXModel."""
+        self._node_index_state = None
+
+    def set_node_input(self, node, index, input_name):
+        """Set the input of a node at the given position and keep the consumer index up to date.
+
+        Args:
+            node (NodeProto): a node of the model.
+            index (int): position of the input.
+            input_name (str): name of the new input.
+        """
+        self._check_node_index()
+        node.input[index] = input_name
+        self._add_consumer(node, input_name)
+
+    def _add_consumer(self, node, input_name):
+        """Index a node as a consumer of input_name after its input was edited by this model."""
+        consumers = self._input_name_to_consumers.setdefault(input_name, [])
+        if all(n is not node for n in consumers):
+            consumers.append(node)
+
+    def _check_initializer_index(self):
+        """Rebuild the initializer index if the graph was edited without ONNXModel."""
+        if self._is_valid_state(self._model.graph.initializer, self._initializer_index_state):
+            return
+        self._name_to_initializer = {}
+        self._duplicate_initializer_names = False
+        for tensor in self._model.graph.initializer:
+            if tensor.name in self._name_to_initializer:
+                self._duplicate_initializer_names = True
+            else:
+                self._name_to_initializer[tensor.name] = tensor
+        self._initializer_index_state = self._field_state(self._model.graph.initializer)
+
     def remove_node(self, node):
         """Remove a node from model."""
-        if node in self._model.graph.node:
-            self._model.graph.node.remove(node)
+        self.remove_nodes([node])
 
     def remove_nodes(self, nodes_to_remove):
         """Remove nodes from model."""
-        for node in nodes_to_remove:
-            self.remove_node(node)
+        self._check_node_index()
+        removed = self._remove_from_field(self._model.graph.node, nodes_to_remove)
+        if not removed:
+            return
+        if self._duplicate_node_names:
+            # another node with the same name may take over, rebuild on the next lookup
+            self._node_index_state = None
+            return
+        removed_ids = set()
+        for node in removed:
+            removed_ids.add(id(node))
+            if self._name_to_node.get(node.name) is node:
+                del self._name_to_node[node.name]
+        for node in removed:
+            for input_name in set(node.input):
+                consumers = self._input_name_to_consumers.get(input_name)
+                if consumers:
+                    consumers[:] = [n for n in consumers if id(n) not in removed_ids]
+        self._node_index_state = self._field_state(self._model.graph.node)
 
     def add_node(self, node):
         """Add a node to model."""
-        self._model.graph.node.extend([node])
+        self.add_nodes([node])
 
     def add_nodes(self, nodes_to_add):
         """Add nodes to model."""
-        self._model.graph.node.extend(nodes_to_add)
+        self._check_node_index()
+        nodes = self._model.graph.node
+        num_nodes = len(nodes)
+        nodes.extend(nodes_to_add)
+        # index the copies owned by the graph instead of the given nodes
+        for i in range(num_nodes, len(nodes)):
+            self._index_node(nodes[i])
+        self._node_index_state = self._field_state(nodes)
 
     def add_initializer(self, tensor):
         """Add a initializer to model."""
-        if ortq.find_by_name(tensor.name, self._model.graph.initializer) is None:
-            self._model.graph.initializer.extend([tensor])
+        self.add_initializers([tensor])
 
     def add_initializers(self, tensors):
         """Add initializers to model."""
+        self._check_initializer_index()
+        initializers = self._model.graph.initializer
         for tensor in tensors:
-            self.add_initializer(tensor)
+            if tensor.name not in self._name_to_initializer:
+                initializers.extend([tensor])
+                self._name_to_initializer[tensor.name] = initializers[-1]
+        self._initializer_index_state = self._field_state(initializers)
 
     def get_initializer(self, name):
         """Get an initializer by name."""
-        for tensor in self._model.graph.initializer:
-            if tensor.name == name:
-                return tensor
-        return None
+        self._check_initializer_index()
+        tensor = self._name_to_initializer.get(name)
+        if tensor is not None and tensor.name != name:
+            # the initializer was renamed in place
+            self._initializer_index_state = None
+            self._check_initializer_index()
+            tensor = self._name_to_initializer.get(name)
+        return tensor
 
     def get_initializer_share_num(self, name):
         """Get the number of shares of initializer."""
-        num = 0
         if self.get_initializer(name) is None:
-            return num
+            return 0
 
-        for node in self.nodes():
-            if name in node.input:
-                num += 1
-        return num
+        self._check_node_index()
+        # drop the consumers whose input was replaced in place
+        return len([node for node in self._input_name_to_consumers.get(name, []) if name in node.input])
 
     def get_node(self, name):
         """Get a node by name."""
-        for node in self._model.graph.node:
-            if node.name == name:
-                return node
-        return None
+        self._check_node_index()
+        node = self._name_to_node.get(name)
+        if node is None or node.name != name:
+            # fall back to the scan in case a node was renamed in place
+            node = None
+            for n in self._model.graph.node:
+                if n.name == name:
+                    node = n
+                    self._node_index_state = None
+                    break
+        return node
 
     def remove_initializer(self, tensor):
         """Remove an initializer from model."""
-        if tensor in self._model.graph.initializer:
-            self._model.graph.initializer.remove(tensor)
+        self.remove_initializers([tensor])
 
     def remove_initializers(self, init_to_remove):
         """Remove initializers from model."""
-        for initializer in init_to_remove:
-            self.remove_initializer(initializer)
+        self._check_initializer_index()
+        removed = self._remove_from_field(self._model.graph.initializer, init_to_remove)
+        if not removed:
+            return
+        if self._duplicate_initializer_names:
+            self._initializer_index_state = None
+            return
+        for tensor in removed:
+            if self._name_to_initializer.get(tensor.name) is tensor:
+                del self._name_to_initializer[tensor.name]
+        self._initializer_index_state = self._field_state(self._model.graph.initializer)
 
     def set_initializer(self, tensor, array, raw=False):
-        """Update initializer."""
+        """Update initializer.
+
+        The array is cast to the data type of the initializer and stored as raw bytes, data types
+        without numpy equivalent are stored as a list of values unless raw is True.
+        """
         old_tensor = self.get_initializer(tensor)
         self.remove_initializer(old_tensor)
         dims = old_tensor.dims
         data_type = old_tensor.data_type
-        new_tensor = (
-            onnx.helper.make_tensor(tensor, data_type, dims, array.flatten().tolist())
-            if not raw
-            else onnx.helper.make_tensor(tensor, data_type, dims, array.tostring(), raw=raw)
-        )
+        if data_type in self._NUMPY_DATA_TYPES:
+            array = np.asarray(array, dtype=onnx.helper.tensor_dtype_to_np_dtype(data_type)).reshape(tuple(dims))
+            new_tensor = onnx.numpy_helper.from_array(array, tensor)
+        else:
+            new_tensor = (
+                onnx.helper.make_tensor(tensor, data_type, dims, array.flatten().tolist())
+                if not raw
+                else onnx.helper.make_tensor(tensor, data_type, dims, array.tobytes(), raw=raw)
+            )
         self.add_initializer(new_tensor)
 
     @property
@@ -459,24 +639,33 @@ class ONNXModel(BaseModel):
             )
         onnx.save_model(self._model, output_path)
 
-    @staticmethod
-    def replace_node_input(node, old_input_name, new_input_name):
+    def replace_node_input(self, node, old_input_name, new_input_name):
         """Replace input of a node."""
+        self._check_node_index()
+        if ONNXModel._replace_node_input(node, old_input_name, new_input_name):
+            self._add_consumer(node, new_input_name)
+
+    @staticmethod
+    def _replace_node_input(node, old_input_name, new_input_name):
+        """Replace input of a node and return whether it was changed, the node indexes are not updated."""
         assert isinstance(old_input_name, str) and isinstance(new_input_name, str)
+        replaced = False
         for j in range(len(node.input)):
             if node.input[j] == old_input_name:
                 node.input[j] = new_input_name
+                replaced = True
+        return replaced
 
     def replace_input_of_all_nodes(self, old_input_name, new_input_name, white_optype=[], black_optype=[]):
         """Replace inputs of all nodes."""
+        self._check_node_index()
         if len(white_optype) > 0:
-            for node in self.model.graph.node:
-                if node.op_type in white_optype:
-                    ONNXModel.replace_node_input(node, old_input_name, new_input_name)
+            nodes = [node for node in self.model.graph.node if node.op_type in white_optype]
         else:
-            for node in self.model.graph.node:
-                if node.op_type not in black_optype:
-                    ONNXModel.replace_node_input(node, old_input_name, new_input_name)
+            nodes = [node for node in self.model.graph.node if node.op_type not in black_optype]
+        for node in nodes:
+            if ONNXModel._replace_node_input(node, old_input_name, new_input_name):
+                self._add_consumer(node, new_input_name)
 
     @staticmethod
     def replace_node_output(node, old_output_name, new_output_name):
@@ -18,13 +18,15 @@
 
 To support new objective, developers just need implement a new subclass in this file.
 """
+import os
+import threading
 import time
-import tracemalloc
 from abc import abstractmethod
 from copy import deepcopy
 from typing import List, Tuple
 
 import numpy as np
+import psutil
 
 from .utils.utility import get_size
 
@@ -164,33 +166,170 @@ class Performance(Objective):
 
     def start(self):
         """Record the start time."""
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
 
     def end(self):
         """Record the duration time."""
-        self.duration = time.time() - self.start_time
+        self.duration = time.perf_counter() - self.start_time
         assert self.duration >= 0, "please use start() before end()"
         self._result_list.append(self.duration)
 
+    def latency_stats(self, warmup=0):
+        """Get the distribution of the measured durations.
+
+        Args:
+            warmup (int): number of the first measures to discard.
+
+        Returns:
+            dict: the mean, p50, p90, p99 and max durations in seconds, empty if nothing was measured.
+        """
+        durations = np.array(self._result_list[warmup:])
+        if durations.size == 0:
+            return {}
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99])
+        return {"mean": durations.mean(), "p50": p50, "p90": p90, "p99": p99, "max": durations.max()}
+
+
+class LatencyPercentile(Performance):
+    """Evaluate a percentile of the inference time, the first `warmup` measures are discarded.
+
+    The durations are measured per iteration when the evaluation reports them, otherwise per evaluation.
+    """
+
+    percentile = 50
+    warmup = 1
+    per_iteration = True
+
+    def result(self, start=None, end=None):
+        """Get the percentile of the durations after warmup."""
+        durations = self._result_list[start:end]
+        if len(durations) > self.warmup:
+            durations = durations[self.warmup :]
+        return np.percentile(np.array(durations), self.percentile)
+
+
+@objective_registry
+class P90Latency(LatencyPercentile):
+    """Configuration P90Latency class.
+
+    Evaluate the 90th percentile of the inference time.
+    """
+
+    representation = "p90 latency (seconds)"
+    percentile = 90
+
+
+@objective_registry
+class P99Latency(LatencyPercentile):
+    """Configuration P99Latency class.
+
+    Evaluate the 99th percentile of the inference time.
+    """
+
+    representation = "p99 latency (seconds)"
+    percentile = 99
+
+
+class MemorySampler:
+    """Sample the resident memory of the process in a background thread.
+
+    Unlike tracemalloc, the native allocations of the frameworks are seen and Python isn't slowed down.
+    USS needs to read the whole memory map of the process, so it is sampled less often than RSS.
+
+    Args:
+        interval (float): the seconds between two RSS samples.
+        uss_every (int): sample USS once every uss_every RSS samples, 0 to disable it.
+    """
+
+    def __init__(self, interval=0.005, uss_every=20):
+        """Initialize MemorySampler."""
+        self.interval = interval
+        self.uss_every = uss_every
+        self._process = psutil.Process(os.getpid())
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.start_rss = 0
+        self.peak_rss = 0
+        self.peak_uss = 0
+
+    def _sample(self, with_uss):
+        if with_uss:
+            memory_info = self._process.memory_full_info()
+            self.peak_uss = max(self.peak_uss, memory_info.uss)
+        else:
+            memory_info = self._process.memory_info()
+        self.peak_rss = max(self.peak_rss, memory_info.rss)
+
+    def _run(self):
+        count = 0
+        while not self._stop_event.wait(self.interval):
+            count += 1
+            self._sample(self.uss_every > 0 and count % self.uss_every == 0)
+
+    def start(self):
+        """Start sampling."""
+        self._stop_event.clear()
+        self.peak_rss, self.peak_uss = 0, 0
+        self._sample(self.uss_every > 0)
+        self.start_rss = self.peak_rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and take a last sample."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sample(self.uss_every > 0)
+
+    def stats(self):
+        """Get the sampled memory in MB.
+
+        Returns:
+            dict: the peak RSS, the peak USS and the peak RSS increase since start.
+        """
+        return {
+            "peak_rss": self.peak_rss / 1048576,
+            "peak_uss": self.peak_uss / 1048576,
+            "peak_rss_increase": (self.peak_rss - self.start_rss) / 1048576,
+        }
+
 
 @objective_registry
 class Footprint(Objective):
     """Configuration Footprint class.
 
-    Evaluate the peak size of memory blocks during inference.
+    Evaluate the peak increase of the resident memory during inference, sampled by MemorySampler.
     """
 
     representation = "memory footprint (MB)"
 
+    def __init__(self):
+        """Initialize the memory sampler."""
+        super().__init__()
+        self.sampler = MemorySampler()
+        self._memory_stats = []
+
+    def reset(self):
+        """Reset the results and the memory statistics."""
+        self._memory_stats = []
+        return super().reset()
+
     def start(self):
-        """Record the space allocation."""
-        tracemalloc.start()
+        """Start sampling the memory."""
+        self.sampler.start()
 
     def end(self):
-        """Calculate the space usage."""
-        _, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        self._result_list.append(peak // 1048576)
+        """Calculate the memory usage."""
+        self.sampler.stop()
+        stats = self.sampler.stats()
+        self._memory_stats.append(stats)
+        self._result_list.append(int(stats["peak_rss_increase"]))
+
+    def memory_stats(self):
+        """Get the peak RSS, USS and RSS increase in MB of each start-end measure."""
+        return self._memory_stats
 
 
 @objective_registry
@@ -212,6 +351,24 @@ class ModelSize(Objective):
         self._result_list.append(model_size)
 
 
+class _ObjectivesMeasurer:
+    """Forward the measure of each evaluation iteration to several objectives."""
+
+    def __init__(self, objectives):
+        """Initialize _ObjectivesMeasurer."""
+        self.objectives = objectives
+
+    def start(self):
+        """Start the objectives, the last one first so that the first ones measure the closest to the iteration."""
+        for objective in reversed(self.objectives):
+            objective.start()
+
+    def end(self):
+        """End the objectives."""
+        for objective in self.objectives:
+            objective.end()
+
+
 class MultiObjective:
     """The base class for multiple benchmarks supported by neural_compressor.
 
@@ -439,9 +596,17 @@ class MultiObjective:
         if self.is_measure:
             acc = eval_func(model, self.objectives[0])
         else:
-            self.start()
-            acc = eval_func(model)
-            self.end(acc)
+            iteration_objectives = [obj for obj in self.objectives if getattr(obj, "per_iteration", False)]
+            if iteration_objectives and getattr(eval_func, "builtin", False):
+                # the built-in evaluation measures each iteration, e.g. for the latency percentiles
+                others = [obj for obj in self.objectives if obj not in iteration_objectives]
+                self.start(others)
+                acc = eval_func(model, _ObjectivesMeasurer(iteration_objectives))
+                self.end(acc, others)
+            else:
+                self.start()
+                acc = eval_func(model)
+                self.end(acc)
 
         self.val = acc, self.result()
         return self.val
@@ -451,14 +616,14 @@ class MultiObjective:
         for objective in self.objectives:
             objective.reset()
 
-    def start(self):
+    def start(self, objectives=None):
         """Start to measure the objective value."""
-        for objective in self.objectives:
+        for objective in self.objectives if objectives is None else objectives:
             objective.start()
 
-    def end(self, acc):
+    def end(self, acc, objectives=None):
         """Calculate the objective value."""
-        for objective in self.objectives:
+        for objective in self.objectives if objectives is None else objectives:
             if isinstance(objective, Accuracy):
                 objective.end(acc)
             else:
@@ -16,7 +16,6 @@
 # limitations under the License.
 """Neural Compressor Quantization API."""
 import os
-import pickle
 import random
 
 import numpy as np
@@ -27,7 +26,7 @@ from .metric import register_customer_metric
 from .model import Model
 from .strategy import STRATEGIES
 from .utils import logger
-from .utils.utility import dump_class_attrs, time_limit
+from .utils.utility import dump_class_attrs, load_tuning_snapshot, time_limit
 
 
 def fit(
@@ -181,8 +180,7 @@ def fit(
     )
     if resume_file:
         assert os.path.exists(resume_file), "The specified resume file {} doesn't exist!".format(resume_file)
-        with open(resume_file, "rb") as f:
-            _resume = pickle.load(f).__dict__
+        _resume = load_tuning_snapshot(resume_file).__dict__
 
     if eval_func is None and eval_dataloader is None:  # pragma: no cover
         logger.info("Quantize model without tuning!")
@@ -60,7 +60,7 @@ from .utils.constant import FALLBACK_RECIPES_SET, TUNING_ITEMS_LST
 from .utils.tuning_sampler import tuning_sampler_dict
 from .utils.tuning_space import TuningSpace
 from .utils.tuning_structs import OpTuningConfig
-from .utils.utility import build_slave_faker_model, quant_options
+from .utils.utility import build_slave_faker_model, get_tune_cfg_fingerprint, quant_options
 
 STRATEGIES = {}
 
@@ -171,6 +171,11 @@ class TuneStrategy(metaclass=TuneStrategyMeta):
         self.tune_data = {}
         self.tune_result_record = []
         self.tuning_history = []
+        # fingerprint of tune_cfg -> [(tuning_history, history)], rebuilt when the history is changed elsewhere
+        self._tuning_history_index = None
+        self._num_indexed_history = 0
+        # the trials are appended to the snapshot once it has been fully saved by this strategy
+        self._snapshot_saved = False
         self.tuning_result_data = []
         self._baseline = None
         self.last_tune_result = None
@@ -1971,10 +1976,53 @@ class TuneStrategy(metaclass=TuneStrategyMeta):
         return need_stop
 
     def _save(self):
-        """Save current tuning state to snapshot for resuming."""
+        """Save current tuning state to snapshot for resuming.
+
+        The snapshot is rewritten as a whole, the trials added later are appended to it as records.
+        """
         logger.info("Save tuning history to {}.".format(self.history_path))
         with fault_tolerant_file(self.history_path) as f:
             pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._snapshot_saved = True
+
+    def _append_snapshot_record(self, record):
+        """Append a tuning history record to the snapshot instead of saving the whole tuning state.
+
+        Args:
+            record (dict): The record applied by `_apply_tuning_history_record`.
+        """
+        if not getattr(self, "_snapshot_saved", False) or not os.path.exists(self.history_path):
+            self._save()
+            return
+        logger.debug("Append tuning history to {}.".format(self.history_path))
+        with open(self.history_path, "ab") as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _get_tuning_history_index(self):
+        """Get the index from the fingerprint of tune_cfg to the evaluated histories.
+
+        Returns:
+            dict: The fingerprint -> list of (tuning_history, history) mapping.
+        """
+        num_history = sum(len(tuning_history["history"]) for tuning_history in self.tuning_history)
+        index = getattr(self, "_tuning_history_index", None)
+        if index is None or getattr(self, "_num_indexed_history", 0) != num_history:
+            index = defaultdict(list)
+            for tuning_history in self.tuning_history:
+                for history in tuning_history["history"]:
+                    self._index_history(index, tuning_history, history)
+            self._tuning_history_index = index
+            self._num_indexed_history = num_history
+        return index
+
+    @staticmethod
+    def _index_history(index, tuning_history, history):
+        """Add an evaluated history to the index of tuning history."""
+        if history and history.get("tune_cfg") is not None:
+            fingerprint = get_tune_cfg_fingerprint(history["tune_cfg"], ignore_keys=["trial_number"])
+            index[fingerprint].append((tuning_history, history))
 
     def _find_tuning_history(self, tune_cfg):
         """Check if the specified tune_cfg is evaluated or not on same config.
@@ -1985,13 +2033,14 @@ class TuneStrategy(metaclass=TuneStrategyMeta):
         Returns:
             tuning_history or None: The tuning history containing evaluated tune_cfg.
         """
-        for tuning_history in self.tuning_history:
+        fingerprint = get_tune_cfg_fingerprint(tune_cfg, ignore_keys=["trial_number"])
+        for tuning_history, history in self._get_tuning_history_index().get(fingerprint, []):
             # only check if a tune_cfg is evaluated under same config, excluding
             # some fields in tuning section of config, such as tensorboard, snapshot, resume.
-            if self._same_conf(tuning_history["cfg"], self.conf):
-                for history in tuning_history["history"]:
-                    if history and equal_dicts(history["tune_cfg"], tune_cfg, ignore_keys=["trial_number"]):
-                        return tuning_history
+            if self._same_conf(tuning_history["cfg"], self.conf) and equal_dicts(
+                history["tune_cfg"], tune_cfg, ignore_keys=["trial_number"]
+            ):
+                return tuning_history
 
         return None
 
@@ -2037,32 +2086,58 @@ class TuneStrategy(metaclass=TuneStrategyMeta):
 
         Note this record is added under same config.
         """
-        found = False
         d = {"tune_cfg": tune_cfg, "tune_result": tune_result}
-        for tuning_history in self.tuning_history:
+        d.update(kwargs)
+        entry = None
+        for index, tuning_history in enumerate(self.tuning_history):
             if self._same_conf(tuning_history["cfg"], self.conf):
-                d.update(kwargs)
-                tuning_history["history"].append(d)
-                tuning_history["last_tune_result"] = self.last_tune_result
-                tuning_history["best_tune_result"] = self.best_tune_result
-                tuning_history["cfg"] = self.conf
-                found = True
+                entry = index
                 break
+        record = {
+            "entry": entry,
+            "version": __version__,
+            "cfg": self.conf,
+            "baseline": self.baseline,
+            "last_tune_result": self.last_tune_result,
+            "best_tune_result": self.best_tune_result,
+            "history": d,
+        }
+        self._apply_tuning_history_record(record)
+        self._append_snapshot_record(record)
 
-        if not found:
+    def _apply_tuning_history_record(self, record):
+        """Apply a record created by `_add_tuning_history` to the tuning history.
+
+        It is also used to replay the records appended to the snapshot when loading it, so the
+        tuning history of the same config is referred by its position in the record.
+
+        Args:
+            record (dict): The record to apply.
+        """
+        d = record["history"]
+        appended = True
+        if record["entry"] is not None:
+            tuning_history = self.tuning_history[record["entry"]]
+            tuning_history["history"].append(d)
+            tuning_history["last_tune_result"] = record["last_tune_result"]
+            tuning_history["best_tune_result"] = record["best_tune_result"]
+            tuning_history["cfg"] = record["cfg"]
+        else:
             tuning_history = {}
-            tuning_history["version"] = __version__
-            tuning_history["cfg"] = self.conf
-            tuning_history["baseline"] = self.baseline
-            tuning_history["last_tune_result"] = self.last_tune_result
-            tuning_history["best_tune_result"] = self.best_tune_result
+            tuning_history["version"] = record["version"]
+            tuning_history["cfg"] = record["cfg"]
+            tuning_history["baseline"] = record["baseline"]
+            tuning_history["last_tune_result"] = record["last_tune_result"]
+            tuning_history["best_tune_result"] = record["best_tune_result"]
             tuning_history["history"] = []
-            if tune_cfg and tune_result:
-                d.update(kwargs)
+            appended = bool(d["tune_cfg"] and d["tune_result"])
+            if appended:
                 tuning_history["history"].append(d)
             self.tuning_history.append(tuning_history)
-
-        self._save()
+        # keep the index up to date instead of rebuilding it on the next lookup
+        if appended and getattr(self, "_tuning_history_index", None) is not None:
+            self._index_history(self._tuning_history_index, tuning_history, d)
+            self._num_indexed_history += 1
 
     def _collect_ops_by_quant_mode(self, tune_cfg, quant_mode):
         ops_lst = []
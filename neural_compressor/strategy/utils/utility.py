@@ -20,6 +20,8 @@ from collections import OrderedDict
 from copy import deepcopy
 from typing import Dict
 
+import numpy as np
+
 
 class QuantType(enum.IntEnum):
     """Quantization type."""
@@ -95,6 +97,46 @@ class OrderedDefaultDict(OrderedDict):
         return value
 
 
+def _canonical_tune_cfg_item(item):
+    """Convert an item of tune_cfg into a hashable value, items that compare equal map to the same value."""
+    if isinstance(item, dict):
+        items = [(_canonical_tune_cfg_item(k), _canonical_tune_cfg_item(v)) for k, v in item.items()]
+        return ("dict", tuple(sorted(items, key=repr)))
+    if isinstance(item, (list, tuple)):
+        return ("seq", tuple(_canonical_tune_cfg_item(v) for v in item))
+    if isinstance(item, (set, frozenset)):
+        return ("set", tuple(sorted((_canonical_tune_cfg_item(v) for v in item), key=repr)))
+    if isinstance(item, np.ndarray):
+        return ("seq", tuple(_canonical_tune_cfg_item(v) for v in item.tolist()))
+    if isinstance(item, (bool, int, float, np.number)):
+        return float(item)
+    if isinstance(item, str):
+        return str(item)
+    if item is None or isinstance(item, bytes):
+        return item
+    # only the type takes part in the fingerprint, the equality is checked by the caller on hash hit
+    return type(item).__qualname__
+
+
+def get_tune_cfg_fingerprint(tune_cfg: Dict, ignore_keys=None) -> int:
+    """Get the fingerprint of a tune_cfg, which is used to index the tuning history.
+
+    Equal tune_cfgs always get the same fingerprint. The reverse is not guaranteed,
+    so a hit should be confirmed by comparing the tune_cfgs.
+
+    Args:
+        tune_cfg (dict): The tune_cfg converted by the strategy.
+        ignore_keys (list, optional): The top-level keys excluded from the fingerprint. Defaults to None.
+
+    Returns:
+        int: The fingerprint.
+    """
+    ignore_keys = ignore_keys or []
+    if isinstance(tune_cfg, dict):
+        tune_cfg = {k: v for k, v in tune_cfg.items() if k not in ignore_keys}
+    return hash(_canonical_tune_cfg_item(tune_cfg))
+
+
 def extract_data_type(data_type: str) -> str:
     """Extract data type and signed from data type.
 
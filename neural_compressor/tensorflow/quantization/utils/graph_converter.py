@@ -49,6 +49,7 @@ from neural_compressor.tensorflow.quantization.utils.graph_rewriter.generic.stri
 from neural_compressor.tensorflow.quantization.utils.graph_rewriter.generic.strip_unused_nodes import (
     StripUnusedNodesOptimizer,
 )
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.graph_base import GraphRewritePipeline
 from neural_compressor.tensorflow.quantization.utils.graph_rewriter.int8.freeze_fake_quant import (
     FreezeFakeQuantOpOptimizer,
 )
@@ -99,7 +100,12 @@ from neural_compressor.tensorflow.quantization.utils.transform_graph.insert_logg
 from neural_compressor.tensorflow.quantization.utils.transform_graph.rerange_quantized_concat import (
     RerangeQuantizedConcat,
 )
-from neural_compressor.tensorflow.quantization.utils.utility import generate_feed_dict, iterator_sess_run
+from neural_compressor.tensorflow.quantization.utils.utility import (
+    HistogramDataCollector,
+    MinMaxDataCollector,
+    generate_feed_dict,
+    iterator_sess_run,
+)
 from neural_compressor.tensorflow.utils import (
     SPR_BASE_VERSIONS,
     CaptureOutputToFile,
@@ -194,6 +200,7 @@ class GraphConverter:
         self._gen_tmp_filenames()
         self._kl_op_dict = {}
         self._kl_keys = []
+        self._kl_node_names = []
         self._llm_weight_minmax = {}
         self._print_node_mapping = {}
         self._enable_kl_op_names = [k for k in self.op_wise_config if self.op_wise_config[k][1] == "kl"]
@@ -223,13 +230,16 @@ class GraphConverter:
         self.new_api = new_api  # bool(version1_gte_version2(tf.version.VERSION, '2.8.0'))
         self.use_bf16 = use_bf16
         self.exclude_node_names = []
+        # time and memory stats of the graph rewrite passes
+        self.rewrite_stats = []
 
     # pylint: disable=no-member
-    def _inference(self, model):
+    def _inference(self, model, collector=None):
         """Run the calibration on the input graph.
 
         Args:
             model(TensorflowBaseModel): input TensorflowBaseModel
+            collector(callable, optional): called with the fetched outputs of every calibration batch.
         """
         if self.calib_func:
             self.calib_func(model)
@@ -256,11 +266,13 @@ class GraphConverter:
         logger.info("Start sampling on calibration dataset.")
         if hasattr(self.data_loader, "__len__") and len(self.data_loader) == 0:  # pragma: no cover
             feed_dict = {}
-            _ = (
+            outputs = (
                 sess.run(output_tensor, feed_dict)
                 if iter_op == []
                 else iterator_sess_run(sess, iter_op, feed_dict, output_tensor, self.calib_iteration)
             )
+            if collector is not None:
+                collector(outputs)
         for idx, (inputs, labels) in enumerate(self.data_loader):
             if len(input_tensor) == 1:
                 feed_dict = {}
@@ -320,11 +332,13 @@ class GraphConverter:
                             if check_shape(dis_tensor, dis_input):
                                 feed_dict.update({dis_tensor: dis_input})
                                 break
-            _ = (
+            outputs = (
                 sess.run(output_tensor, feed_dict)
                 if iter_op == []
                 else iterator_sess_run(sess, iter_op, feed_dict, output_tensor, self.calib_iteration)
             )
+            if collector is not None:
+                collector(outputs)
             if idx + 1 == self.calib_iteration:
                 break
         os.environ["ITEX_REMAPPER"] = "1"
@@ -485,14 +499,16 @@ class GraphConverter:
         ):
             model = self.bf16_convert()
 
+        # the model graph_def is only materialized and loaded once for all the post passes
+        pipeline = GraphRewritePipeline(model.graph_def)
         if self.new_api:
             if self.performance_only:
-                model.graph_def = FuseConvRedundantDequantizeTransformer(model.graph_def).do_transformation()
-            post_optimize_graph_def = FuseMatMulRedundantDequantizeTransformer(model.graph_def).do_transformation()
-            post_optimize_graph_def.library.CopyFrom(self.model.graph_def.library)
-            model.graph_def = post_optimize_graph_def
-        post_cse_graph_def = PostCseOptimizer(model.graph_def).do_transformation()
-        post_hostconst_graph_def = PostHostConstConverter(post_cse_graph_def).do_transformation()
+                pipeline.run(FuseConvRedundantDequantizeTransformer)
+            pipeline.run(FuseMatMulRedundantDequantizeTransformer)
+        pipeline.run(PostCseOptimizer)
+        pipeline.run(PostHostConstConverter)
+        self.rewrite_stats.extend(pipeline.stats)
+        post_hostconst_graph_def = pipeline.graph_def
         post_hostconst_graph_def.library.CopyFrom(self.model.graph_def.library)
         model.graph_def = post_hostconst_graph_def
 
@@ -546,17 +562,64 @@ class GraphConverter:
 
         for i in output_node_names:
             self._kl_keys.append(";" + i + "__print__;__KL")
+        self._kl_node_names = output_node_names
 
         fp32_graph_def = graph_pb2.GraphDef()
         fp32_graph_def.CopyFrom(self._fp32_model.graph_def)
-        self._fp32_model.graph_def = InsertLogging(
-            self._fp32_model.graph_def, node_name_list=output_node_names, message="__KL:", summarize=-1, dump_fp32=True
-        ).do_transformation()
+        if not self._use_fetch_calibration():
+            self._fp32_model.graph_def = InsertLogging(
+                self._fp32_model.graph_def,
+                node_name_list=output_node_names,
+                message="__KL:",
+                summarize=-1,
+                dump_fp32=True,
+            ).do_transformation()
 
         self._fp32_model.save(self._fp32_logged_model_path)
         self._fp32_model.graph_def = fp32_graph_def
         return self._fp32_model
 
+    def _use_fetch_calibration(self):
+        """Check whether the calibration data can be fetched from the session instead of the printed log.
+
+        The customized calib_func and the LLM signature inference do not expose the session fetches,
+        and the iterator models collate the fetches of all iterations, so they keep the printed log.
+        """
+        if self.calib_func or self.model.model_type == "llm_saved_model":
+            return False
+        return all(node.op != "MakeIterator" for node in self._fp32_model.graph_def.node)
+
+    def _calibrate_sampling_graph(self, sampling_graph_def, output_tensor_names):
+        """Insert the Min/Max reductions of the quantized nodes and run the calibration to get the sampling data.
+
+        Args:
+            sampling_graph_def (graphdef): the fp32 graph to insert the reductions into.
+            output_tensor_names (list): the model output tensor names, extended with the reduction outputs.
+        """
+        fetch_min_max = self._use_fetch_calibration()
+        num_outputs = len(output_tensor_names)
+        min_max_records = []
+        for i in self.quantized_node_info:
+            min_max_inserter = InsertPrintMinMaxNode(sampling_graph_def, i[0], i[-1], self.new_api, fetch_min_max)
+            sampling_graph_def, output_names = min_max_inserter.do_transformation()
+            output_tensor_names.extend(output_names)
+            min_max_records.extend(min_max_inserter.min_max_records)
+
+        if not self.quantized_node_info:
+            return
+        sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
+        self._sampling_model.graph_def = sampling_graph_def
+        self._sampling_model.output_tensor_names = output_tensor_names
+        if fetch_min_max:
+            collector = MinMaxDataCollector(min_max_records, num_outputs)
+            self._inference(self._sampling_model, collector)
+            self._calibration_data = collector.get_calibration_data()
+        else:
+            tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
+            with CaptureOutputToFile(tmp_dump_file):
+                self._inference(self._sampling_model)
+            self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+
     def _search_y_pattern_for_itex(self):  # pragma: no cover
         """Search the Y pattern for itex and return the op name."""
         g = GraphAnalyzer()
@@ -564,8 +627,7 @@ class GraphConverter:
         g.parse_graph()
         y_pattern = [["Conv2D", "MatMul"], ["BiasAdd"], ["Add", "AddV2", "AddN"], ("Relu",)]
         y_pattern_variant = [["MaxPool", "AvgPool"], ["Add", "AddV2", "AddN"], ("Relu",)]
-        target_nodes = g.query_fusion_pattern_nodes(y_pattern)
-        target_nodes_variant = g.query_fusion_pattern_nodes(y_pattern_variant)
+        target_nodes, target_nodes_variant = g.query_multi_fusion_pattern_nodes([y_pattern, y_pattern_variant])
 
         res = {}
         for i in target_nodes:
@@ -612,19 +674,7 @@ class GraphConverter:
                     sampling_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api
                 ).do_transformation()
 
-                for i in self.quantized_node_info:
-                    sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                        sampling_graph_def, i[0], i[-1], self.new_api
-                    ).do_transformation()
-                    output_tensor_names.extend(output_names)
-                if self.quantized_node_info:
-                    sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-                    self._sampling_model.graph_def = sampling_graph_def
-                    self._sampling_model.output_tensor_names = output_tensor_names
-                    tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
-                    with CaptureOutputToFile(tmp_dump_file):
-                        self._inference(self._sampling_model)
-                    self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+                self._calibrate_sampling_graph(sampling_graph_def, output_tensor_names)
 
                 del output_tensor_names
                 del sampling_graph_def
@@ -724,6 +774,17 @@ class GraphConverter:
         model.output_tensor_names = self.output_tensor_names
         model.input_tensor_names = self.input_tensor_names
 
+        if enable_kl_algo and self._use_fetch_calibration():
+            # fetch the fp32 outputs and combine them into histograms batch by batch
+            collector = HistogramDataCollector(
+                [self._print_node_mapping[i] + "_eightbit_requant_range" for i in self._kl_node_names],
+                len(self.output_tensor_names),
+            )
+            model.output_tensor_names = self.output_tensor_names + [i + ":0" for i in self._kl_node_names]
+            self._inference(model, collector)
+            self._kl_op_dict.update(collector.histograms)
+            return
+
         with CaptureOutputToFile(tmp_dump_file):
             self._inference(model)
 
@@ -771,54 +832,41 @@ class GraphConverter:
 
     def _fuse_requantize_with_fused_quantized_node(self):
         """Fuse the Requantize/Dequantize with fused quantized Ops."""
+        pipeline = GraphRewritePipeline(self._tmp_graph_def)
         if self.fake_quant:  # pragma: no cover
-            self._tmp_graph_def = FreezeFakeQuantOpOptimizer(self._tmp_graph_def).do_transformation()
+            pipeline.run(FreezeFakeQuantOpOptimizer)
 
-        self._tmp_graph_def = FuseConvRequantizeTransformer(
-            self._tmp_graph_def, self.device, self.new_api
-        ).do_transformation()
+        pipeline.run(FuseConvRequantizeTransformer, self.device, self.new_api)
 
         if not self.fake_quant:
             if self.qdq_enabled:
-                self._tmp_graph_def = FuseMatMulRequantizeNewAPITransformer(self._tmp_graph_def).do_transformation()
-
-                self._tmp_graph_def = FuseMatMulRequantizeDequantizeNewAPITransformer(
-                    self._tmp_graph_def
-                ).do_transformation()
+                pipeline.run(FuseMatMulRequantizeNewAPITransformer)
+                pipeline.run(FuseMatMulRequantizeDequantizeNewAPITransformer)
             else:
-                self._tmp_graph_def = FuseMatMulRequantizeTransformer(self._tmp_graph_def).do_transformation()
+                pipeline.run(FuseMatMulRequantizeTransformer)
+                pipeline.run(FuseMatMulRequantizeDequantizeTransformer)
 
-                self._tmp_graph_def = FuseMatMulRequantizeDequantizeTransformer(self._tmp_graph_def).do_transformation()
-
-        self._tmp_graph_def = StripUnusedNodesOptimizer(
-            self._tmp_graph_def, self._tmp_model.input_node_names, self._tmp_model.output_node_names
-        ).do_transformation()
+        pipeline.run(StripUnusedNodesOptimizer, self._tmp_model.input_node_names, self._tmp_model.output_node_names)
 
         input_output_names = self._tmp_model.input_node_names + self._tmp_model.output_node_names
-        self._tmp_graph_def = RemoveTrainingNodesOptimizer(
-            self._tmp_graph_def, protected_nodes=input_output_names
-        ).do_transformation()
+        pipeline.run(RemoveTrainingNodesOptimizer, protected_nodes=input_output_names)
 
-        self._tmp_graph_def = FoldBatchNormNodesOptimizer(self._tmp_graph_def).do_transformation()
+        pipeline.run(FoldBatchNormNodesOptimizer)
 
         if self.performance_only or (
             "scale_propagation_concat" in self.recipes and self.recipes["scale_propagation_concat"]
         ):
-            self._tmp_graph_def = RerangeQuantizedConcat(
-                self._tmp_graph_def, self.device, performance_only=self.performance_only
-            ).do_transformation()
+            pipeline.run(RerangeQuantizedConcat, self.device, performance_only=self.performance_only)
 
-        self._tmp_graph_def = MetaInfoChangingMemOpOptimizer(self._tmp_graph_def).do_transformation()
+        pipeline.run(MetaInfoChangingMemOpOptimizer)
 
-        self._tmp_graph_def = StripEquivalentNodesOptimizer(
-            self._tmp_graph_def, self._tmp_model.output_node_names
-        ).do_transformation()
+        pipeline.run(StripEquivalentNodesOptimizer, self._tmp_model.output_node_names)
 
         if self.advance_config is not None and deep_get(self.advance_config, "bias_correction") is not None:
-            self._tmp_graph_def = BiasCorrection(
-                self._tmp_graph_def, self.model.graph_def, self.new_api
-            ).do_transformation()
+            pipeline.run(BiasCorrection, self.model.graph_def, self.new_api)
 
+        self.rewrite_stats.extend(pipeline.stats)
+        self._tmp_graph_def = pipeline.graph_def
         self._tmp_graph_def.library.CopyFrom(self.model.graph_def.library)
 
         self._tmp_model.graph_def = self._tmp_graph_def
@@ -908,20 +956,7 @@ class GraphConverter:
             sampling_graph_def, non_pad_ops, self._tmp_model.input_node_names, self.op_wise_config, self.new_api, True
         ).do_transformation()
 
-        for i in self.quantized_node_info:
-            sampling_graph_def, output_names = InsertPrintMinMaxNode(
-                sampling_graph_def, i[0], i[-1], self.new_api
-            ).do_transformation()
-            output_tensor_names.extend(output_names)
-
-        if self.quantized_node_info:
-            sampling_graph_def.library.CopyFrom(self.model.graph_def.library)
-            self._sampling_model.graph_def = sampling_graph_def
-            self._sampling_model.output_tensor_names = output_tensor_names
-            tmp_dump_file = tempfile.mkstemp(suffix=".log")[1]
-            with CaptureOutputToFile(tmp_dump_file):
-                self._inference(self._sampling_model)
-            self._calibration_data = Helper.gen_valid_sampling_log(tmp_dump_file)
+        self._calibrate_sampling_graph(sampling_graph_def, output_tensor_names)
 
         if hasattr(self._sampling_model, "_weight_tensor_minmax_dict"):
             self._llm_weight_minmax = self._sampling_model.weight_tensor_minmax_dict
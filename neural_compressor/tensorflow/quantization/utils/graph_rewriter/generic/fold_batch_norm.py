@@ -32,6 +32,8 @@ from ..graph_base import GraphRewriterBase
 class FoldBatchNormNodesOptimizer(GraphRewriterBase):
     """Folding BatchNorm nodes into Conv."""
 
+    keeps_graph_analysis = True
+
     INPUT_ORDER = {
         # Order of inputs for BatchNormWithGlobalNormalization.
         "BatchNormWithGlobalNormalization": ["conv_op", "mean_op", "var_op", "beta_op", "gamma_op"],
@@ -268,4 +270,4 @@ class FoldBatchNormNodesOptimizer(GraphRewriterBase):
             cur_graph.remove_node(beta_node_name)
             cur_graph.remove_node(gamma_node_name)
 
-        return cur_graph.dump_graph()
+        return cur_graph.dump_graph(in_place=self.in_place)
@@ -39,14 +39,15 @@ class FuseGeluOptimizer(GraphRewriterBase):  # pragma: no cover
         # Below code is relative to expression on
         # https://github.com/IntelAI/models/blob/master/models/language_modeling/tensorflow/
         # bert_large/inference/generic_ops.py#L105
-        target_nodes = cur_graph.query_fusion_pattern_nodes(
-            [["Pow"], ["Mul"], ["AddV2"], ["Mul"], ["Tanh"], ["AddV2"], ["Mul"], ["Mul"]]
+        target_nodes, short_target_nodes = cur_graph.query_multi_fusion_pattern_nodes(
+            [
+                [["Pow"], ["Mul"], ["AddV2"], ["Mul"], ["Tanh"], ["AddV2"], ["Mul"], ["Mul"]],
+                [["Pow"], ["Mul"], ["AddV2"], ["Mul"], ["Tanh"], ["AddV2"], ["Mul"]],
+            ]
         )
 
         if not target_nodes:
-            target_nodes = cur_graph.query_fusion_pattern_nodes(
-                [["Pow"], ["Mul"], ["AddV2"], ["Mul"], ["Tanh"], ["AddV2"], ["Mul"]]
-            )
+            target_nodes = short_target_nodes
 
         for node_combination in target_nodes:
             match_node_length = len(node_combination)
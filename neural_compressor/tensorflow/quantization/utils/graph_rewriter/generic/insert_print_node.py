@@ -30,13 +30,25 @@ from neural_compressor.tensorflow.utils import version1_gt_version2
 class InsertPrintMinMaxNode(GraphRewriterBase):
     """InsertPrintMinMaxNode Pass for tensorflow sampling."""
 
-    def __init__(self, model, pre_node_name, post_node_name, new_api):
-        """Initialization."""
+    def __init__(self, model, pre_node_name, post_node_name, new_api, fetch_min_max=False):
+        """Initialization.
+
+        Args:
+            model (graphdef): input model
+            pre_node_name (string): the first node name of the quantized pattern.
+            post_node_name (string): the last node name of the quantized pattern.
+            new_api (bool): whether the new quantization API is enabled.
+            fetch_min_max (bool): only insert the Min/Max reductions and return them as extra fetches
+                instead of printing them. The printed messages are recorded in `min_max_records`.
+        """
         super().__init__(model)
         self.pre_node_name = pre_node_name
         self.post_node_name = post_node_name
         self.signature = pre_node_name + post_node_name
         self.new_api = new_api
+        self.fetch_min_max = fetch_min_max
+        # (min message, max message, min tensor name, max tensor name) of each fetched reduction pair
+        self.min_max_records = []
 
     def do_transformation(self):
         """Insert print node in the graph to do the calibration."""
@@ -150,6 +162,18 @@ class InsertPrintMinMaxNode(GraphRewriterBase):
                 max_input_node.attr["T"].CopyFrom(src_dt)
                 max_print_node.attr["T"].CopyFrom(src_dt)
 
+                if self.fetch_min_max:
+                    if min_input_name in cur_graph.node_name_details:
+                        continue
+                    cur_graph.add_node(reshape_dims_node, None, [reshape_input_name])
+                    cur_graph.add_node(reduction_dims_node, None, [max_input_name, min_input_name])
+                    cur_graph.add_node(reshape_input_node, each_node_name, [max_input_name, min_input_name])
+                    cur_graph.add_node(max_input_node, reshape_input_name, [])
+                    cur_graph.add_node(min_input_node, reshape_input_name, [])
+                    self.min_max_records.append((min_msg, max_msg, min_input_name + ":0", max_input_name + ":0"))
+                    output_names.extend([min_input_name + ":0", max_input_name + ":0"])
+                    continue
+
                 min_print_node.attr["message"].s = min_msg.encode()
                 min_print_node.attr["first_n"].i = -1
                 min_print_node.attr["summarize"].i = 1024
@@ -25,6 +25,8 @@ from ..graph_base import GraphRewriterBase
 class RemoveTrainingNodesOptimizer(GraphRewriterBase):
     """Remove training nodes optimizer."""
 
+    keeps_graph_analysis = True
+
     def __init__(self, model, protected_nodes=[], types_to_splice=["Identity", "CheckNumerics", "StopGradient"]):
         """Initilizaiton."""
         super().__init__(model)
@@ -63,4 +65,4 @@ class RemoveTrainingNodesOptimizer(GraphRewriterBase):
         for k, _ in names_to_splice.items():
             graph_handle.remove_node_with_single_input_output(k)
 
-        return graph_handle.dump_graph()
+        return graph_handle.dump_graph(in_place=self.in_place)
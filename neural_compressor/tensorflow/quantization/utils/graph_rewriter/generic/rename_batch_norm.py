@@ -51,10 +51,10 @@ class RenameBatchNormOptimizer(GraphRewriterBase):
         cur_graph.graph = self.model
         graph_details = cur_graph.parse_graph()
 
-        for _, v in graph_details.items():
+        for node_name, v in graph_details.items():
             # for node in cur_graph.graph.node:
             if v.node.op == "FusedBatchNorm" or v.node.op == "FusedBatchNormV2":
-                v.node.op = "FusedBatchNormV3"
+                cur_graph.update_node_op(node_name, "FusedBatchNormV3")
                 v.node.attr["U"].CopyFrom(v.node.attr["T"])
 
         return cur_graph.dump_graph()
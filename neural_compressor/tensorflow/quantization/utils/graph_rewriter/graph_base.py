@@ -17,8 +17,14 @@
 """Graph Rewrite Base Class."""
 
 import logging
+import os
+import time
 from abc import abstractmethod
 
+import psutil
+
+from neural_compressor.tensorflow.quantization.utils.graph_util import GraphAnalyzer
+
 
 class GraphRewriterBase:
     """Graph Rewrite Base class.
@@ -33,8 +39,79 @@ class GraphRewriterBase:
         """Initialization."""
         self.model = model
         self.logger = logging.getLogger("neural_compressor")
+        # the rewriters that dump the graph with GraphAnalyzer may update the input graph in place if set
+        self.in_place = False
+
+    # whether the rewriter updates the graph only through GraphAnalyzer, so a GraphRewritePipeline can
+    # hand its parsed graph over to the next pass instead of parsing the graph again
+    keeps_graph_analysis = False
 
     @abstractmethod
     def do_transformation(self):
         """Base Interface that need to be implemented by each sub class."""
         raise NotImplementedError
+
+
+class GraphRewritePipeline:
+    """Run graph rewriters one after another on a shared graph.
+
+    The rewriters supporting it update the shared graphdef in place, so only the updated nodes are copied
+    instead of the whole graph for every pass. Back-to-back rewriters that keep the graph analysis share
+    the parsed GraphAnalyzer, only the output edges are rebuilt if the previous pass updated the graph.
+    The time and memory of each pass are recorded in `stats`.
+
+    Args:
+        graph_def (graphdef): the graph to rewrite, it may be updated in place.
+    """
+
+    def __init__(self, graph_def):
+        """Initialization."""
+        self.graph_def = graph_def
+        self.stats = []
+        self.logger = logging.getLogger("neural_compressor")
+        self._process = psutil.Process(os.getpid())
+        # whether the graph parsed by the GraphAnalyzer singleton is still valid for graph_def
+        self._analysis_valid = False
+
+    def run(self, rewriter_cls, *args, **kwargs):
+        """Apply one rewriter on the shared graph.
+
+        Args:
+            rewriter_cls (GraphRewriterBase): the rewriter class, constructed with the shared graph and the args.
+
+        Returns:
+            graphdef: the rewritten graph.
+        """
+        graph_analyzer = GraphAnalyzer()
+        share_parsed_graph = self._analysis_valid and rewriter_cls.keeps_graph_analysis
+        start_rss = self._process.memory_info().rss
+        start = time.time()
+        graph_analyzer.share_parsed_graph = share_parsed_graph
+        try:
+            rewriter = rewriter_cls(self.graph_def, *args, **kwargs)
+            rewriter.in_place = True
+            output_graph_def = rewriter.do_transformation()
+        finally:
+            graph_analyzer.share_parsed_graph = False
+        end = time.time()
+        end_rss = self._process.memory_info().rss
+        self._analysis_valid = (
+            rewriter_cls.keeps_graph_analysis
+            and output_graph_def is graph_analyzer.parsed_graph
+            and not graph_analyzer.dirty_node_names
+        )
+
+        self.stats.append(
+            {
+                "pass": rewriter_cls.__name__,
+                "time_ms": round((end - start) * 1000, 2),
+                "rss_mb": round(end_rss / 1024**2, 2),
+                "rss_delta_mb": round((end_rss - start_rss) / 1024**2, 2),
+                "node_count": len(output_graph_def.node),
+                "in_place": output_graph_def is self.graph_def,
+                "shared_analysis": share_parsed_graph,
+            }
+        )
+        self.logger.debug("Graph rewrite pass stats: {}.".format(self.stats[-1]))
+        self.graph_def = output_graph_def
+        return self.graph_def
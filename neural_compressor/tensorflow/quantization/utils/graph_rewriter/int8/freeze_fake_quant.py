@@ -146,4 +146,4 @@ class FreezeFakeQuantOpOptimizer(GraphRewriterBase):  # pragma: no cover
 
         self._remove_all_fake_quants()
 
-        return GraphAnalyzer().dump_graph()
+        return GraphAnalyzer().dump_graph(in_place=self.in_place)
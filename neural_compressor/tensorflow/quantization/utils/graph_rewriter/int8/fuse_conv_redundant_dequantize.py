@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class FuseConvRedundantDequantizeTransformer(GraphRewriterBase):
     """Fuse _QuantizedConv/_QuantizedDeConv with the successor Dequantize Op."""
 
+    keeps_graph_analysis = True
+
     fuse_patterns = [
         [
             "_FusedQuantizedConv3D",
@@ -147,4 +149,4 @@ class FuseConvRedundantDequantizeTransformer(GraphRewriterBase):
 
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
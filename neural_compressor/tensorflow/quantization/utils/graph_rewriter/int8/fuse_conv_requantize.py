@@ -29,6 +29,8 @@ from ..graph_base import GraphRewriterBase
 class FuseConvRequantizeTransformer(GraphRewriterBase):
     """Fuse Quantized Conv Op with the successor Requantize Op."""
 
+    keeps_graph_analysis = True
+
     fuse_patterns = [
         [
             "QuantizedConv2DWithBiasAndRelu",
@@ -816,4 +818,4 @@ class FuseConvRequantizeTransformer(GraphRewriterBase):
             if deq_node.op == "Dequantize":
                 self.graph_analyzer.remove_node_with_single_input_output(deq_node.name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
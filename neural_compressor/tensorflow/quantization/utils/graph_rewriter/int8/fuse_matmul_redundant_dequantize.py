@@ -28,6 +28,8 @@ from ..graph_base import GraphRewriterBase
 class FuseMatMulRedundantDequantizeTransformer(GraphRewriterBase):
     """Fuse _QuantizedMatMul with the successor Dequantize Op."""
 
+    keeps_graph_analysis = True
+
     fuse_patterns = [["_QuantizedMatMul", "_QuantizedBatchMatMul"], ["Dequantize", "Cast"]]
 
     def __init__(self, model, device="cpu"):
@@ -155,4 +157,4 @@ class FuseMatMulRedundantDequantizeTransformer(GraphRewriterBase):
 
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
@@ -31,6 +31,8 @@ from ..graph_base import GraphRewriterBase
 class FuseMatMulRequantizeDequantizeTransformer(GraphRewriterBase):
     """Fuse QuantizedMatMul + Requantize + Dequantize into QuantizedMatMulWithBiasAndDequantize."""
 
+    keeps_graph_analysis = True
+
     def __init__(self, model, device="cpu"):
         """Initialization."""
         super().__init__(model)
@@ -199,12 +201,14 @@ class FuseMatMulRequantizeDequantizeTransformer(GraphRewriterBase):
 
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
 
 
 class FuseMatMulRequantizeTransformer(GraphRewriterBase):
     """Fuse Quantized MatMul Op with the successor Requantize Op."""
 
+    keeps_graph_analysis = True
+
     def __init__(self, model, device="cpu"):
         """Initialization."""
         super().__init__(model)
@@ -373,12 +377,14 @@ class FuseMatMulRequantizeTransformer(GraphRewriterBase):
             )
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
 
 
 class FuseMatMulRequantizeDequantizeNewAPITransformer(GraphRewriterBase):  # pragma: no cover
     """Fuse _QuantizedMatMul + Requantize + Dequantize into _QuantizedMatMul."""
 
+    keeps_graph_analysis = True
+
     def __init__(self, model, device="cpu"):
         """Initialization."""
         super().__init__(model)
@@ -611,12 +617,14 @@ class FuseMatMulRequantizeDequantizeNewAPITransformer(GraphRewriterBase):  # pra
 
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
 
 
 class FuseMatMulRequantizeNewAPITransformer(GraphRewriterBase):
     """Fuse newAPI Quantized MatMul Op with the successor Requantize Op."""
 
+    keeps_graph_analysis = True
+
     def __init__(self, model, device="cpu"):
         """Initialization."""
         super().__init__(model)
@@ -905,4 +913,4 @@ class FuseMatMulRequantizeNewAPITransformer(GraphRewriterBase):
             )
             self.graph_analyzer.remove_node(quantized_node_name)
 
-        return self.graph_analyzer.dump_graph()
+        return self.graph_analyzer.dump_graph(in_place=self.in_place)
@@ -113,4 +113,4 @@ class MetaInfoChangingMemOpOptimizer(GraphRewriterBase):
                 self.graph_analyzer.remove_node(self.graph_info[quantize_node_name].node.input[1])
                 self.graph_analyzer.remove_node(self.graph_info[quantize_node_name].node.input[2])
                 self.graph_analyzer.remove_node(quantize_node_name)
-        return GraphAnalyzer().dump_graph()
+        return GraphAnalyzer().dump_graph(in_place=self.in_place)
@@ -50,6 +50,18 @@ class GraphAnalyzer:
         """
         self._graph = None
         self.extend_engine = extend_engine
+        self.node_name_details = {}
+        # op type -> node names (ordered as a dict), kept in sync by the node update functions below.
+        self._op_type_index = {}
+        # node name -> insertion position, used to restore the node_name_details order of indexed nodes.
+        self._node_positions = {}
+        self._next_position = 0
+        # the graphdef parsed into node_name_details and the nodes updated since then
+        self._parsed_graph = None
+        self._dirty_node_names = set()
+        # set by GraphRewritePipeline when the parsed graph may be reused by the next pass
+        self.share_parsed_graph = False
+        self._outputs_outdated = False
 
     @property
     def graph(self):
@@ -211,6 +223,58 @@ class GraphAnalyzer:
         else:
             return self._search_patterns(patterns)
 
+    def query_multi_fusion_pattern_nodes(self, patterns_list):
+        """Query several fusion patterns with one traversal of the graph.
+
+        Args:
+            patterns_list (list): the patterns to query, please check the _search_patterns definition.
+
+        Returns:
+            [list]: The matched results of each pattern, same as query_fusion_pattern_nodes returns.
+        """
+        if self.extend_engine:
+            # Todo keep this for future extension API
+            pass
+        else:
+            return self._search_multi_patterns(patterns_list)
+
+    def get_nodes_by_op_types(self, op_types):
+        """Get the names of the nodes with the specified op types from the op type index.
+
+        Nodes whose op is changed in place must be re-indexed with update_node_op, otherwise they are
+        only found under their new op once the bucket of their old op has been queried.
+
+        Args:
+            op_types (string list): op types.
+
+        Returns:
+            [string list]: node names in the order of node_name_details.
+        """
+        op_types = set(op_types)
+        node_names = set()
+        changed_names = []
+        for op_type in op_types:
+            indexed_names = self._op_type_index.get(op_type, {})
+            # the nodes removed or changed outside the node update functions are fixed lazily
+            stale_names = [
+                i
+                for i in indexed_names
+                if i not in self.node_name_details or self.node_name_details[i].node.op != op_type
+            ]
+            for i in stale_names:
+                indexed_names.pop(i)
+                if i in self.node_name_details:
+                    changed_names.append(i)
+            node_names.update(indexed_names)
+        for i in changed_names:
+            # the op was changed in place, index the node under its current op
+            op_type = self.node_name_details[i].node.op
+            self._op_type_index.setdefault(op_type, {})[i] = None
+            if op_type in op_types:
+                node_names.add(i)
+
+        return sorted(node_names, key=self._node_positions.__getitem__)
+
     def _search_patterns(self, input_pattern):
         """Search user specified patterns on internal grpah structure.
 
@@ -243,38 +307,44 @@ class GraphAnalyzer:
                     ]
         """
 
-        def _validate_input(data, criteria):
-            if isinstance(criteria, str) and data == criteria:
-                return True
+        return self._search_multi_patterns([input_pattern])[0]
 
-            if isinstance(criteria, (list, tuple)) and data in criteria:
-                return True
+    @staticmethod
+    def _get_pattern_end_op_types(pattern):
+        """Get the op types the last matched node of the pattern may have.
 
-            return False
+        The trailing optional elements may be skipped, so it is the union of them and the
+        last mandatory element.
+        """
+        end_op_types = set()
+        for criteria in reversed(pattern):
+            end_op_types.update([criteria] if isinstance(criteria, str) else criteria)
+            if not isinstance(criteria, tuple):
+                break
+        return end_op_types
 
-        def _compare_list(list_a, list_b):
-            """Check list a is a subset of list b.
+    def _search_multi_patterns(self, input_patterns):
+        """Search several user specified patterns with one traversal of the internal graph structure.
 
-            e.g, list a is ['a', 'b', 'c'] while list b is ['a', 'b', 'c', 'd'],
-            then list a is subset of list b.
+        Each pattern is compiled into the op types of its last node, so only the candidate nodes from
+        the op type index are visited, once and in graph order, for all the patterns.
 
-            Args:
-                list_a ([Any]): list A
-                list_b ([Any]): list B
+        Args:
+            input_patterns (list): patterns, please check the _search_patterns definition.
 
-            Returns:
-                [bool]: list a is a subset of list b or not.
-            """
-            assert isinstance(list_a, list)
-            assert isinstance(list_b, list)
-            is_subset = True
+        Return: [list]. The matched results of each pattern.
+        """
 
-            for index, value in enumerate(list_a):
-                is_subset &= value == list_b[index]
+        def _validate_input(data, criteria):
+            if isinstance(criteria, str) and data == criteria:
+                return True
+
+            if isinstance(criteria, (list, tuple)) and data in criteria:
+                return True
 
-            return is_subset
+            return False
 
-        def _dfs(op_names, op_types, graph_info, node, pattern):
+        def _dfs(op_names, op_types, graph_info, node, pattern, output_result, matched_keys):
             if pattern == []:
                 return
             start_index = 0
@@ -296,13 +366,10 @@ class GraphAnalyzer:
 
             if start_index == end_index:
                 if matched_flag:
-                    matched_res = copy.deepcopy(op_names)
-                    matched_res.reverse()
-                    op_types_copy = copy.deepcopy(op_types)
-                    op_types_copy.reverse()
-                    matched_res.append(op_types_copy)
-                    if matched_res not in output_result:
-                        output_result.append(matched_res)
+                    matched_key = (tuple(reversed(op_names)), tuple(reversed(op_types)))
+                    if matched_key not in matched_keys:
+                        matched_keys.add(matched_key)
+                        output_result.append(list(matched_key[0]) + [list(matched_key[1])])
 
                     op_names.pop()
                     op_types.pop()
@@ -310,47 +377,46 @@ class GraphAnalyzer:
 
             for index, value in enumerate(node.input):
                 cur_node = graph_info[GraphRewriterHelper.node_name_from_input(value)].node
-                _dfs(op_names, op_types, graph_info, cur_node, pattern[:end_index])
+                _dfs(op_names, op_types, graph_info, cur_node, pattern[:end_index], output_result, matched_keys)
                 if index == len(node.input) - 1:
                     op_names.pop()
                     op_types.pop()
 
-        output_result = []
-
-        for _, v in self.node_name_details.items():
-            start_index = len(input_pattern) - 1
-            while start_index >= 0:
-                find_first_match = _validate_input(v.node.op, input_pattern[start_index])
-                if find_first_match:
-                    break
-
-                if isinstance(input_pattern[start_index], tuple):
-                    start_index -= 1
-                    continue
-
-                start_index = -2
-
-            if start_index < 0:
-                continue
-
-            visited_op_name = []
-            visited_op_types = []
+        end_op_patterns = {}
+        for pattern_index, pattern in enumerate(input_patterns):
+            for op_type in self._get_pattern_end_op_types(pattern):
+                end_op_patterns.setdefault(op_type, []).append(pattern_index)
+
+        output_results = [[] for _ in input_patterns]
+        matched_keys = [set() for _ in input_patterns]
+        for node_name in self.get_nodes_by_op_types(end_op_patterns):
+            node = self.node_name_details[node_name].node
+            for pattern_index in end_op_patterns[node.op]:
+                _dfs(
+                    [],
+                    [],
+                    self.node_name_details,
+                    node,
+                    input_patterns[pattern_index],
+                    output_results[pattern_index],
+                    matched_keys[pattern_index],
+                )
 
-            _dfs(visited_op_name, visited_op_types, self.node_name_details, v.node, input_pattern)
+        return [self._filter_matched_patterns(i) for i in output_results]
 
+    @staticmethod
+    def _filter_matched_patterns(output_result):
+        """Drop the matches covered by a longer match and keep the longest match of each start node."""
         sorted_output = sorted(output_result, key=lambda i: i[-1])
 
-        useless_match_list = []
-        for index, value in enumerate(sorted_output):
-            if index == len(sorted_output) - 1:
-                break
-
+        # a match is useless if it is a prefix of the next longer match
+        useless_match_index = set()
+        for index, value in enumerate(sorted_output[:-1]):
             next_matched_op_names = sorted_output[index + 1][:-1]
-            if len(value[:-1]) < len(next_matched_op_names) and _compare_list(value[:-1], next_matched_op_names):
-                useless_match_list.append(value)
+            if len(value[:-1]) < len(next_matched_op_names) and value[:-1] == next_matched_op_names[: len(value) - 1]:
+                useless_match_index.add(index)
 
-        for i in useless_match_list:
-            sorted_output.remove(i)
+        sorted_output = [value for index, value in enumerate(sorted_output) if index not in useless_match_index]
 
         longest_match = {}
         final_output = []
@@ -369,6 +435,50 @@ class GraphAnalyzer:
 
         return final_output
 
+    def _set_node_details(self, node_name, node_details):
+        """Set the node details and update the op type index.
+
+        A new node is appended to the graph order while an existing one keeps its position.
+        """
+        if node_name in self.node_name_details:
+            self._op_type_index.get(self.node_name_details[node_name].node.op, {}).pop(node_name, None)
+        else:
+            self._node_positions[node_name] = self._next_position
+            self._next_position += 1
+        self.node_name_details[node_name] = node_details
+        self._op_type_index.setdefault(node_details.node.op, {})[node_name] = None
+        self._dirty_node_names.add(node_name)
+
+    def _pop_node_details(self, node_name):
+        """Pop the node details and update the op type index."""
+        node_details = self.node_name_details.pop(node_name)
+        self._op_type_index.get(node_details.node.op, {}).pop(node_name, None)
+        self._node_positions.pop(node_name, None)
+        self._dirty_node_names.add(node_name)
+        return node_details
+
+    def update_node_op(self, node_name, op):
+        """Change the op of a node in place and index it under the new op.
+
+        Args:
+            node_name (string): node name.
+            op (string): the new op type.
+        """
+        node = self.node_name_details[node_name].node
+        self._op_type_index.get(node.op, {}).pop(node_name, None)
+        node.op = op
+        self._op_type_index.setdefault(op, {})[node_name] = None
+
+    @property
+    def parsed_graph(self):
+        """The graphdef parsed into node_name_details, it is updated by dump_graph(in_place=True)."""
+        return self._parsed_graph
+
+    @property
+    def dirty_node_names(self):
+        """The names of the nodes added, replaced or removed since the graph was parsed or dumped in place."""
+        return self._dirty_node_names
+
     def remove_node_with_single_input_output(self, node_name):
         """Remove node with one input and rebuild internal graph data structure.
 
@@ -433,7 +543,7 @@ class GraphAnalyzer:
             logger.debug("The {} is not a valid node name.".format(node_name))
             return False
         try:
-            self.node_name_details.pop(node_name)
+            self._pop_node_details(node_name)
         except Exception as e:
             logger.info("Fail to remove {} due to {}.".format(node_name, str(e)))
             return False
@@ -453,7 +563,7 @@ class GraphAnalyzer:
         """
         new_const_node_name = new_const_node.name
 
-        self.node_name_details[new_const_node_name] = self.node_details(node=new_const_node, outputs=target_node)
+        self._set_node_details(new_const_node_name, self.node_details(node=new_const_node, outputs=target_node))
 
         for sub_node in target_node:
             if sub_node not in self.node_name_details:
@@ -498,7 +608,7 @@ class GraphAnalyzer:
                     logger.warning("The subgraph replaces must be constant.")
                     return False
                 elif len(self.node_name_details[input_name].outputs) == 1:
-                    self.node_name_details.pop(input_name)
+                    self._pop_node_details(input_name)
             output_node_name = self.node_name_details[old_end_node_name].outputs
             self.replace_node(new_node, old_end_node_name, output_node_name)
             self.node_name_details[new_node_name].node.ClearField("input")
@@ -528,7 +638,7 @@ class GraphAnalyzer:
                 self.node_name_details[i].outputs.remove(old_output_name)
             self.node_name_details[i].outputs.append(new_node_name)
 
-        self.node_name_details[new_node_name] = self.node_details(node=new_node, outputs=old_input_node_names)
+        self._set_node_details(new_node_name, self.node_details(node=new_node, outputs=old_input_node_names))
 
         for each_input_node_name in old_input_node_names:
             for index, each_node_name in enumerate(self.node_name_details[each_input_node_name].node.input):
@@ -550,7 +660,7 @@ class GraphAnalyzer:
             output_nodes_name (string list): output node names list
         """
         new_node_name = new_node.name
-        self.node_name_details[new_node_name] = self.node_details(node=new_node, outputs=output_nodes_name)
+        self._set_node_details(new_node_name, self.node_details(node=new_node, outputs=output_nodes_name))
         old_node = self.node_name_details[old_node_name].node
         for input_node_name in old_node.input:
             if input_node_name in self.node_name_details:
@@ -584,9 +694,9 @@ class GraphAnalyzer:
 
         if new_node_name in self.node_name_details:
             logger.debug("Remove the existed node {} from internal data structure.".format((new_node_name)))
-            self.node_name_details.pop(new_node_name)
+            self._pop_node_details(new_node_name)
 
-        self.node_name_details[new_node_name] = self.node_details(node=new_node, outputs=end_node_names)
+        self._set_node_details(new_node_name, self.node_details(node=new_node, outputs=end_node_names))
 
         for end_node_name in end_node_names:
             # Update start node's output info
@@ -618,18 +728,64 @@ class GraphAnalyzer:
                 new_node_name
             )
 
-    def dump_graph(self):
+    def dump_graph(self, in_place=False):
         """Dump the current model's graphdef.
 
+        Args:
+            in_place (bool): update the parsed graphdef in place instead of copying every node into a new one.
+                Only the removed nodes are deleted and the dirty nodes copied, then the nodes are reordered
+                as node_name_details without copying.
+
         Returns:
             [graphdef]: A graphdef object
         """
+        if in_place and self._parsed_graph is not None:
+            return self._update_graph_in_place()
+
         output_graph_def = graph_pb2.GraphDef()
         for _, v in self.node_name_details.items():
             output_graph_def.node.extend([v.node])
 
         return output_graph_def
 
+    def _update_graph_in_place(self):
+        """Apply the node updates to the parsed graphdef."""
+        graph_def = self._parsed_graph
+        # sort keys of the node objects, the removed ones are moved to the end and truncated
+        node_orders = {}
+        nodes = list(graph_def.node)
+        kept_node_names = set()
+        for node in nodes:
+            # removed, replaced by another node object, or duplicated node
+            v = self.node_name_details.get(node.name)
+            if v is None or v.node is not node or node.name in kept_node_names:
+                node_orders[id(node)] = float("inf")
+            else:
+                node_orders[id(node)] = self._node_positions[node.name]
+                kept_node_names.add(node.name)
+
+        # only the dirty nodes may be missing in the graphdef unless node_name_details was updated directly
+        new_node_names = [i for i in self._dirty_node_names if i in self.node_name_details and i not in kept_node_names]
+        if len(kept_node_names) + len(new_node_names) != len(self.node_name_details):
+            new_node_names = [i for i in self.node_name_details if i not in kept_node_names]
+        for node_name in new_node_names:
+            new_node = graph_def.node.add()
+            new_node.CopyFrom(self.node_name_details[node_name].node)
+            nodes.append(new_node)
+            if node_name not in self._node_positions:
+                self._node_positions[node_name] = self._next_position
+                self._next_position += 1
+            node_orders[id(new_node)] = self._node_positions[node_name]
+            # keep the internal data structure referring the nodes of the graphdef
+            self.node_name_details[node_name] = self.node_name_details[node_name]._replace(node=new_node)
+
+        graph_def.node.sort(key=lambda node: node_orders[id(node)])
+        del graph_def.node[len(self.node_name_details) :]
+        # the node updates don't keep the output node names of the other nodes in sync
+        self._outputs_outdated = self._outputs_outdated or bool(self._dirty_node_names)
+        self._dirty_node_names = set()
+        return graph_def
+
     def get_frame_info(self):
         """Get the frame info of the model.
 
@@ -642,7 +798,7 @@ class GraphAnalyzer:
         input_node_names, _ = self.get_graph_input_output()
 
         traverse_list = copy.deepcopy(input_node_names)
-        visited = []
+        visited = set()
 
         while traverse_list:
             node_name = traverse_list.pop(0)
@@ -675,7 +831,7 @@ class GraphAnalyzer:
                         if node_details.node.name in self.parent_frame_details:
                             self.parent_frame_details[output] = self.parent_frame_details[node_details.node.name]
 
-            visited.append(node_details.node.name)
+            visited.add(node_details.node.name)
         return self.parent_frame_details
 
     def parse_graph(self, input_graph_def=None):
@@ -690,7 +846,16 @@ class GraphAnalyzer:
         if not input_graph_def:
             input_graph_def = self._graph
 
+        if self.share_parsed_graph and input_graph_def is self._parsed_graph and not self._dirty_node_names:
+            # the graph was updated in place by the previous pass, only the output edges are rebuilt
+            if self._outputs_outdated:
+                self._build_outputs()
+            return self.node_name_details
+
         self.node_name_details = {}
+        self._op_type_index = {}
+        self._node_positions = {}
+        self._next_position = 0
 
         for node in input_graph_def.node:
             node_name = GraphRewriterHelper.node_name_from_input(node.name)
@@ -698,14 +863,22 @@ class GraphAnalyzer:
             each_node = self.node_details(node=node, outputs=[])
 
             if node_name not in self.node_name_details:
-                self.node_name_details[node_name] = each_node
+                self._set_node_details(node_name, each_node)
 
+        self._build_outputs()
+        self._parsed_graph = input_graph_def
+        self._dirty_node_names = set()
+        return self.node_name_details
+
+    def _build_outputs(self):
+        """Build the output node names of each node from the node inputs."""
+        for node_details in self.node_name_details.values():
+            del node_details.outputs[:]
         for node_name, node_details in self.node_name_details.items():
             # update the upper node's output information.
             for each_input in node_details.node.input:
                 self.node_name_details[GraphRewriterHelper.node_name_from_input(each_input)].outputs.append(node_name)
-
-        return self.node_name_details
+        self._outputs_outdated = False
 
 
 class GraphRewriterHelper:
@@ -35,6 +35,7 @@ from tensorflow.python.util import nest
 
 from neural_compressor.common import logger
 from neural_compressor.tensorflow.quantization.utils.graph_util import GraphAnalyzer, GraphRewriterHelper
+from neural_compressor.tensorflow.utils.utility import combine_histogram, get_tensor_histogram
 
 
 def read_graph(in_graph, in_graph_is_binary=True):
@@ -223,6 +224,83 @@ def collate_tf_preds(results):
     return collate_results
 
 
+class MinMaxDataCollector:
+    """Accumulate the fetched Min/Max reductions of every calibration batch.
+
+    The reductions are fetched after the model outputs, so each batch result is sliced from `num_outputs`
+    on. The accumulated values are rendered to the same sampling lines `GraphRewriterHelper.gen_valid_sampling_log`
+    returns for the printed sampling log.
+    """
+
+    def __init__(self, min_max_records, num_outputs):
+        """Initialization.
+
+        Args:
+            min_max_records (list): (min message, max message, min tensor, max tensor) of each reduction pair.
+            num_outputs (int): the number of model outputs fetched before the reductions.
+        """
+        self.min_max_records = min_max_records
+        self.num_outputs = num_outputs
+        self._values = []
+
+    def __call__(self, outputs):
+        """Collect the reductions of one batch."""
+        values = np.asarray(outputs[self.num_outputs :], dtype=np.float64)
+        self._values.append(values.reshape(-1, 2))
+
+    def get_calibration_data(self):
+        """Get the sampling lines of all the collected batches."""
+        if not self._values:
+            return []
+        # iterations x pairs x (min, max)
+        values = np.stack(self._values)
+        min_values = values[:, :, 0]
+        max_values = values[:, :, 1]
+        requant = np.array(["__print__;__requant_" in record[0] for record in self.min_max_records], dtype=bool)
+        requant_min = np.minimum(min_values[:, requant], 0)
+        requant_max = np.where(max_values[:, requant] > requant_min, max_values[:, requant], requant_min + 1e-05)
+        min_values[:, requant] = requant_min
+        max_values[:, requant] = requant_max
+
+        res = []
+        for iter_min, iter_max in zip(min_values.tolist(), max_values.tolist()):
+            requant_lines = []
+            for (min_msg, max_msg, _, _), min_value, max_value, is_requant in zip(
+                self.min_max_records, iter_min, iter_max, requant
+            ):
+                if is_requant:
+                    requant_lines.append("{}_max:[{}][{}]".format(min_msg[:-1], min_value, max_value))
+                else:
+                    res.append("{}[{}]".format(max_msg, max_value))
+                    res.append("{}[{}]".format(min_msg, min_value))
+            res.extend(requant_lines)
+        return res
+
+
+class HistogramDataCollector:
+    """Combine the fetched fp32 tensors of every calibration batch into histograms for KL calibration."""
+
+    def __init__(self, keys, num_outputs):
+        """Initialization.
+
+        Args:
+            keys (list): the histogram key of each fetched tensor.
+            num_outputs (int): the number of model outputs fetched before the tensors.
+        """
+        self.keys = keys
+        self.num_outputs = num_outputs
+        self.histograms = {}
+
+    def __call__(self, outputs):
+        """Collect the tensors of one batch."""
+        for key, data in zip(self.keys, outputs[self.num_outputs :]):
+            data = np.asarray(data, dtype=np.float32).ravel()
+            if key not in self.histograms:
+                self.histograms[key] = get_tensor_histogram(data)
+            else:
+                self.histograms[key] = combine_histogram(self.histograms[key], data)
+
+
 def get_input_output_node_names(graph_def):
     """Get the input node name and output node name of the graph_def."""
     g = GraphAnalyzer()
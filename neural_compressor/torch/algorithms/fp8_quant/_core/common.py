@@ -97,13 +97,41 @@ def load_json(fname):
     return d
 
 
+# npz entry holding the json structure of the saved dict, arrays are stored as separate entries
+NPZ_TREE_KEY = "__tree__"
+NPZ_ARRAY_KEY = "__array__"
+
+
 def save_npz(d, fname):
-    np.savez(fname, d)
+    """Saves a dict of arrays without pickling, every array is an npz entry referenced from a json tree."""
+    arrays = {}
+
+    def add_array(x):
+        if isinstance(x, (np.ndarray, np.generic)):
+            key = str(len(arrays))
+            arrays[key] = np.asarray(x)
+            return {NPZ_ARRAY_KEY: key}
+        return x
+
+    tree = rec_fn(d, add_array)
+    np.savez(fname, **{NPZ_TREE_KEY: np.array(json.dumps(tree))}, **arrays)
 
 
 def load_npz(fname):
-    d = np.load(fname, allow_pickle=True)
-    return d["arr_0"].item()
+    with np.load(fname, allow_pickle=True) as d:
+        if NPZ_TREE_KEY not in d.files:  # files saved as a pickled dict by older versions
+            return d["arr_0"].item()
+
+        def get_array(x):
+            if isinstance(x, dict):
+                if NPZ_ARRAY_KEY in x:
+                    return d[x[NPZ_ARRAY_KEY]]
+                return {k: get_array(v) for k, v in x.items()}
+            elif isinstance(x, list):
+                return [get_array(v) for v in x]
+            return x
+
+        return get_array(json.loads(d[NPZ_TREE_KEY].item()))
 
 
 def save_file(model, d, source_format, fname, mode):
@@ -214,6 +242,7 @@ format_functions = {
     (list, torch.Tensor): torch.tensor,
     (list, np.ndarray): lambda x: np.array(x),
     (list, ShapeList): lambda x: [int(s) for s in x[0]],
+    (np.ndarray, ShapeList): lambda x: [int(s) for s in x[0]],
 }
 
 
@@ -15,16 +15,18 @@
 import json
 import os
 
-import habana_frameworks.torch.core as htcore
 import numpy as np
 import torch
 
+from neural_compressor.torch.utils.auto_accelerator import auto_detect_accelerator
+
 from .._quant_common.quant_config import MeasureExclude, QuantMode, ScaleMethod, get_hqt_config, set_hqt_config
 from ..utils.logger import logger
 from .common import *
 
 imod_dict = {}
 gmod_list = []
+cur_accelerator = auto_detect_accelerator()
 
 
 def patch_module_measure(mod, mconfig, mod_dict):
@@ -91,7 +93,10 @@ def prepare_model(model, mod_list=None):
     config = get_hqt_config(model).cfg
     observer_class = observer_types[config["observer"]]
     if (config.get("shape_file", None) is not None) and (observer_class != ShapeObserver):
-        shapes_fname = config["shape_file"] + ".json"
+        shapes_fname = config["shape_file"] + ".npz"
+        if not os.path.isfile(shapes_fname) and os.path.isfile(config["shape_file"] + ".json"):
+            # shape files dumped before the npz format
+            shapes_fname = config["shape_file"] + ".json"
         d_shapes = load_file(shapes_fname, ShapeList, False)
     else:
         d_shapes = None
@@ -114,6 +119,7 @@ def register_patched_measure_modules(model, mod_list, observer_class, d_shapes=N
     top_level_config = get_hqt_config(model)
     config = top_level_config.cfg
     skip_outputs_measurements = config["measure_exclude"] & (MeasureExclude.OUTPUT | MeasureExclude.ALL)
+    device = cur_accelerator.current_device_name()
     patched_types = set()
     non_patched_types = set()
     patched_modules = []
@@ -148,9 +154,9 @@ def register_patched_measure_modules(model, mod_list, observer_class, d_shapes=N
                 if pmod._mod_extra_config:
                     for param_name in pmod._mod_extra_config.params:
                         param = getattr(pmod, param_name)
-                        param = param.to("hpu")
+                        param = param.to(device)
                         pmod._mod_extra_config.params[param_name].measure(param)
-                        htcore.mark_step()
+                        cur_accelerator.mark_step()
                 if observer_class == SaveObserver:
                     save_module(pmod)
                 patched_modules.append(name)
@@ -160,8 +166,11 @@ def register_patched_measure_modules(model, mod_list, observer_class, d_shapes=N
     logger.debug("None-patched module types: %s", non_patched_types)
     logger.debug("Patched modules: %s", patched_modules)
     logger.debug("Total patched modules: %d", len(patched_modules))
-    model = model.to("hpu")
-    htcore.mark_step()
+    observer_updates.flush()
+    model = model.to(device)
+    # observers of a forward step are updated together once the step is done
+    model.register_forward_hook(lambda *args: observer_updates.flush())
+    cur_accelerator.mark_step()
 
 
 def is_measure_done(mod_extra_config):
@@ -190,42 +199,20 @@ def get_mod_extra_config_dict(model):
 
 
 def measure_control_to_state_dict(mcd):
+    observer_updates.flush()
+    to_array = format_functions[(torch.Tensor, np.ndarray)]
     sd = {}
-    sdl = {}
     for mname in mcd:
         sd[mname] = dict()
-        sdl[mname] = dict()
-        sd[mname]["inputs"] = [
-            mcd[mname].inputs[i].state.detach().cpu().float().numpy()
-            for i in range(len(mcd[mname].inputs))
-            if mcd[mname].inputs[i].state is not None
-        ]
-        sdl[mname]["inputs"] = [
-            mcd[mname].inputs[i].state.detach().cpu().float().numpy().tolist()
-            for i in range(len(mcd[mname].inputs))
-            if mcd[mname].inputs[i].state is not None
-        ]
+        sd[mname]["inputs"] = [to_array(obs.state) for obs in mcd[mname].inputs if obs.state is not None]
         if mcd[mname].outputs:
-            sd[mname]["outputs"] = [
-                mcd[mname].outputs[i].state.detach().cpu().float().numpy()
-                for i in range(len(mcd[mname].outputs))
-                if mcd[mname].outputs[i].state is not None
-            ]
-            sdl[mname]["outputs"] = [
-                mcd[mname].outputs[i].state.detach().cpu().float().numpy().tolist()
-                for i in range(len(mcd[mname].outputs))
-                if mcd[mname].outputs[i].state is not None
-            ]
+            sd[mname]["outputs"] = [to_array(obs.state) for obs in mcd[mname].outputs if obs.state is not None]
         if len(mcd[mname].params) > 0:
             sd[mname]["params"] = dict()
-            sdl[mname]["params"] = dict()
             for param_name in mcd[mname].params:
                 if mcd[mname].params[param_name].state is not None:
-                    sd[mname]["params"][param_name] = mcd[mname].params[param_name].state.detach().cpu().float().numpy()
-                    sdl[mname]["params"][param_name] = (
-                        mcd[mname].params[param_name].state.detach().cpu().float().numpy().tolist()
-                    )
-    return sd, sdl
+                    sd[mname]["params"][param_name] = to_array(mcd[mname].params[param_name].state)
+    return sd
 
 
 def save_measurements(model, fname=None):
@@ -239,16 +226,14 @@ def save_measurements(model, fname=None):
                 fname_base = config["shape_file"]
                 measure_type = "Shape"
             fname_np = fname_base + ".npz"
-            fname_list = fname_base + ".json"
         else:
             logger.warning("'fname' is not None - Measurements/Shapes will not be saved")
             return
         mcd = get_mod_extra_config_dict(model)
-        sd, sdl = measure_control_to_state_dict(mcd)
+        sd = measure_control_to_state_dict(mcd)
 
         logger.info("Dumping measurements")
         save_file(model, sd, np.ndarray, fname_np, measure_type)
-        save_file(model, sdl, list, fname_list, measure_type)
         save_json(gmod_list, fname_base + "_mod_list.json")
 
 
@@ -268,6 +253,48 @@ def load_measurements(model, fname):
     return d
 
 
+def merge_measurements(fnames, fname):
+    """Merges the measurement files of several ranks into one file.
+
+    The files are folded in one at a time, the max-abs measurements are merged by an elementwise maximum
+    and shapes are taken from the first file measuring the module. Only the merged result and the file
+    being merged are held in memory, and fname may be one of fnames to merge new files into an existing result.
+
+    Args:
+        fnames (list): The measurement files (.npz) to merge.
+        fname (str): The file to save the merged measurements to.
+    """
+
+    def merge_max(x, y):
+        if isinstance(x, dict):
+            res = {k: merge_max(x[k], y[k]) if k in y else x[k] for k in x}
+            res.update({k: y[k] for k in y if k not in x})
+            return res
+        elif isinstance(x, (list, tuple)):
+            return [merge_max(a, b) for a, b in zip(x, y)] + list(x[len(y) :]) + list(y[len(x) :])
+        return np.maximum(x, y)
+
+    merged = None
+    for source_fname in fnames:
+        logger.debug("Merging measurements file: %s", source_fname)
+        d = load_npz(source_fname)
+        if merged is None:
+            merged = d
+            continue
+        if d["Mode"] != merged["Mode"]:
+            raise ValueError(f"Can't merge {d['Mode']} measurements of {source_fname} into {merged['Mode']}")
+        for mname, node in d["Nodes"].items():
+            if mname not in merged["Nodes"]:
+                merged["Nodes"][mname] = node
+            elif merged["Mode"] != "Shape":
+                merged["Nodes"][mname] = merge_max(merged["Nodes"][mname], node)
+    if merged is None:
+        raise ValueError("No measurements files to merge")
+    merged["GlobalRank"] = None
+    merged["LocalRank"] = None
+    save_npz(merged, fname)
+
+
 def save_json(d, fname):
     with open(fname, "w") as f:
         json.dump(d, f, indent=4)
@@ -279,6 +306,36 @@ def load_json(fname):
     return d
 
 
+class ObserverUpdates:
+    """Pending running max updates of the observers, applied together once per forward step.
+
+    Observers only reduce their input in measure and add the result here, flush then updates the
+    states of all the observers with one multi-tensor maximum instead of one maximum and copy per tensor.
+    """
+
+    def __init__(self):
+        self.pending = {}
+
+    def add(self, observer, value):
+        if observer.state.device != value.device:
+            observer.state = observer.state.to(value.device)
+        value = value.reshape(observer.state.shape).to(observer.state.dtype)
+        if observer in self.pending:  # module called more than once in a step
+            value = torch.maximum(self.pending[observer], value)
+        self.pending[observer] = value
+
+    def flush(self):
+        if not self.pending:
+            return
+        states = [observer.state for observer in self.pending]
+        values = list(self.pending.values())
+        self.pending = {}
+        torch._foreach_maximum_(states, values)
+
+
+observer_updates = ObserverUpdates()
+
+
 class MaxAbsObserver:
     def __init__(self, name, mod, d_shape=None, params=None):
         self.name = name
@@ -286,10 +343,10 @@ class MaxAbsObserver:
         self.first = True
         self.used = False
         config = get_hqt_config(mod).cfg
-        self.state = torch.zeros((1, 1), device="hpu", dtype=config["hp_dtype"])
+        self.state = torch.zeros((1, 1), device=cur_accelerator.current_device_name(), dtype=config["hp_dtype"])
 
     def update_state(self, x):
-        self.state.copy_(torch.maximum(torch.max(torch.abs(x)), self.state))
+        observer_updates.add(self, torch.linalg.vector_norm(x, ord=float("inf")))
 
     def measure(self, x):
         self.update_state(x)
@@ -308,11 +365,7 @@ class MaxAbsPerChannelObserver:
         self.used = False
         self.dim = params["dim"] if (params is not None) and ("dim" in params) else -1
         if d_shape is not None:
-            p = list(range(len(d_shape)))
             self.dim = self.dim if self.dim >= 0 else len(d_shape) + self.dim
-            p[-1] = self.dim
-            p[self.dim] = len(d_shape) - 1
-            self.p = p
             self.state = self.init_state_from_shape(d_shape)
 
     def init_state(self, x):
@@ -323,8 +376,8 @@ class MaxAbsPerChannelObserver:
         self.shape = list(x.shape)
         return state
 
-    def init_state_from_shape(self, x_shape, device="hpu"):
-        device = device
+    def init_state_from_shape(self, x_shape, device=None):
+        device = cur_accelerator.current_device_name() if device is None else device
         Nch = x_shape[self.dim]
         self.Nch = Nch
         state = torch.zeros((Nch, 1), device=device, dtype=torch.float32)
@@ -332,16 +385,9 @@ class MaxAbsPerChannelObserver:
         return state
 
     def update_state(self, x):
-        self.state.copy_(
-            torch.maximum(
-                torch.max(
-                    torch.abs(x.permute(self.p).reshape([-1, self.Nch])),
-                    dim=0,
-                    keepdim=True,
-                )[0].t(),
-                self.state,
-            )
-        )
+        # reduce all the dims but the channel dim in one pass, without permuting x
+        dims = [d for d in range(x.dim()) if d != self.dim % x.dim()]
+        observer_updates.add(self, torch.linalg.vector_norm(x, ord=float("inf"), dim=dims) if dims else x.abs())
 
     def measure(self, x):
         if self.first:
@@ -379,7 +425,8 @@ class SaveObserver:
         self.shape = list(x.shape)
         return state
 
-    def init_state_from_shape(self, x_shape, device="hpu"):
+    def init_state_from_shape(self, x_shape, device=None):
+        device = cur_accelerator.current_device_name() if device is None else device
         state = torch.zeros((1, 1), device=device, dtype=torch.float32)
         self.first = False
         return state
@@ -409,7 +456,7 @@ class ShapeObserver:
         state = torch.tensor(x.shape, device=device, dtype=torch.int32).reshape((1, Ndim))
         return state
 
-    def init_state_from_shape(self, x_shape, device="hpu"):
+    def init_state_from_shape(self, x_shape, device=None):
         logger.info("ShapeObserver doesn't support init_state_from_shape")
         return
 
@@ -14,13 +14,16 @@
 
 from abc import abstractmethod
 
-import habana_frameworks.torch.core as htcore
 import torch
 import torch.nn as nn
 
+from neural_compressor.common.utils import LazyImport
+
 from .._core.scale_handler import create_scale_tensor
 from .._quant_common.quant_config import ScaleFormat
 
+htcore = LazyImport("habana_frameworks.torch.core")
+
 descale_fcn = lambda x, scale: torch.mul(x, scale)
 scale_fcn = lambda x, scale: torch.div(x, scale)
 cast_fcn = lambda x, dtype: x.to(dtype=dtype)
@@ -17,8 +17,6 @@ from .._quant_common.quant_config import QuantMode, get_hqt_config
 from ..utils.logger import logger
 from .common import mod_default_dict
 from .measure import prepare_model as prepare_model_for_measure
-from .quantize import quantize
-from .scale import scale_method_mapping, scaling_params
 
 
 def update_mod_dict(config):
@@ -77,6 +75,10 @@ def prepare_model(model):
     if (config.cfg["mode"] == QuantMode.MEASURE) or (config.cfg["mode"] == QuantMode.SHAPE):
         return prepare_model_for_measure(model, mod_list)
     elif config.cfg["mode"] == QuantMode.QUANTIZE:
+        # quantization needs the HPU kernels, keep the measurement importable without them
+        from .quantize import quantize
+        from .scale import scale_method_mapping, scaling_params
+
         scaling_method_name = scale_method_mapping[(config.cfg["scale_method"], config.cfg["observer"])]
         scaling_params[scaling_method_name].update(config.cfg["scale_params"])
         config.cfg["scale_params"] = scaling_params[scaling_method_name]
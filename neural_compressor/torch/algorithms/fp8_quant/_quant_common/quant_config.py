@@ -21,11 +21,15 @@ from enum import Enum, Flag, auto
 from json.decoder import JSONDecodeError
 from typing import Any, Mapping
 
-import habana_frameworks.torch.utils.experimental as htexp
 import torch
 
+from neural_compressor.common.utils import LazyImport
+from neural_compressor.torch.utils import is_hpex_available
+
 from ..utils.logger import logger
 
+htexp = LazyImport("habana_frameworks.torch.utils.experimental")
+
 try:
     world_size = torch.distributed.get_world_size()
     local_rank = torch.distributed.get_rank()
@@ -148,7 +152,9 @@ class Fp8cfg:
             "global_rank": None,
             "world_size": world_size if world_size >= 0 else None,
             "seperate_measure_files": True,  # Determines whether to expect one or several measure files when using more than one gaudi
-            "device_type": htexp._get_device_type(),  # Determines device type: Gaudi2, Gaudi3...
+            "device_type": (
+                htexp._get_device_type() if is_hpex_available() else None
+            ),  # Determines device type: Gaudi2, Gaudi3...
             "measure_exclude": MeasureExclude.OUTPUT,
             "recalc_scales": False,
             "scale_format": ScaleFormat.CONST,
@@ -19,6 +19,8 @@ import sys
 
 import numpy as np
 
+from neural_compressor.torch.algorithms.fp8_quant._core.common import load_npz, save_npz
+
 
 def fix_cache_inputs(json_data):
     for layer_index in range(len(json_data["Nodes"])):
@@ -36,11 +38,11 @@ def fix_cache_inputs(json_data):
                 qk_matmul_input = node_info["inputs"][1]
             if f"model.layers.{layer_index}.self_attn.attn.impl.key_cache" in node_name:
                 key_cache_input = node_info["inputs"][0]
-        if kv_matmul_input != value_cache_input:
+        if not np.array_equal(kv_matmul_input, value_cache_input):
             json_data["Nodes"][f"model.layers.{layer_index}.self_attn.attn.impl.kv_matmul"]["inputs"][
                 1
             ] = value_cache_input
-        if qk_matmul_input != key_cache_input:
+        if not np.array_equal(qk_matmul_input, key_cache_input):
             json_data["Nodes"][f"model.layers.{layer_index}.self_attn.attn.impl.qk_matmul"]["inputs"][
                 1
             ] = key_cache_input
@@ -72,20 +74,20 @@ def main(args):
         os.mkdir(output_path)
     measurements_path = args.measurements
     measurements_paths = os.listdir(measurements_path)
-    measurements_paths_ranges = [
-        measurement_path
-        for measurement_path in measurements_paths
-        if measurement_path.endswith(".json")
-        and "MAXABS_HW" not in measurement_path
-        and "mod_list" not in measurement_path
-    ]
-    measurements_paths_scales = [
-        measurement_path
-        for measurement_path in measurements_paths
-        if measurement_path.endswith(".json") and "MAXABS_HW" in measurement_path and "mod_list" not in measurement_path
+    # measurements are dumped as npz, json dumps are only read from older measurement directories
+    npz_paths = [path for path in measurements_paths if path.endswith(".npz") and "mod_list" not in path]
+    json_paths = [
+        path
+        for path in measurements_paths
+        if path.endswith(".json") and "mod_list" not in path and path.replace(".json", ".npz") not in npz_paths
     ]
 
-    for measurement in measurements_paths_ranges + measurements_paths_scales:
+    for measurement in npz_paths:
+        fixed_npz_path = os.path.join(output_path, f"fixed_{measurement.split(os.sep)[-1]}")
+        fixed_data = fix_cache_inputs(load_npz(os.path.join(measurements_path, measurement)))
+        save_npz(fixed_data, fixed_npz_path)
+
+    for measurement in json_paths:
         fixed_json_path = os.path.join(output_path, f"fixed_{measurement.split(os.sep)[-1]}")
         with open(fixed_json_path, "w") as fixed_json_file:
             with open(os.path.join(measurements_path, measurement), "r") as json_file:
@@ -109,8 +111,7 @@ def main(args):
                         layers[layer]["params"] = {}
                         layers[layer]["params"]["weight"] = np.array(dlayer["params"]["weight"])
                 df = {"GlobalRank": global_rank, "LocalRank": local_rank, "Mode": mode, "Nodes": layers}
-                with open(fixed_npz_path, "w"):
-                    np.savez(fixed_npz_path, df)
+                save_npz(df, fixed_npz_path)
 
     print("finished fix_measurements script")
 
@@ -18,7 +18,12 @@
 
 import gc
 import json
+import mmap
 import os
+import struct
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
 from accelerate.utils import set_module_tensor_to_device
@@ -190,6 +195,280 @@ def _get_path(pretrained_model_name_or_path):
 get_path = _get_path
 
 
+SAFETENSORS_DTYPE_MAPPING = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+if hasattr(torch, "float8_e4m3fn"):
+    SAFETENSORS_DTYPE_MAPPING.update({"F8_E4M3": torch.float8_e4m3fn, "F8_E5M2": torch.float8_e5m2})
+
+
+class CheckpointIndex:
+    """Index of a local checkpoint directory which is parsed once and reused by every tensor load.
+
+    For safetensors checkpoints the headers of all shards are parsed once into a
+    name -> (shard, dtype, shape, offset) lookup and the shards are kept open as memory maps,
+    so loading a tensor is a slice of the mapped file. Other checkpoints fall back to the
+    torch pickle loader with the directory listing and the shard index cached.
+    """
+
+    def __init__(self, path):
+        """Init the CheckpointIndex object.
+
+        Args:
+            path (str): local directory of the checkpoint.
+        """
+        self.path = path
+        self.files = os.listdir(path)
+        self.signature = _get_checkpoint_signature(path, self.files)
+        self.weight_map = {}  # tensor name -> (shard file, dtype, shape, offset)
+        self._mmaps = {}
+        self._lock = threading.Lock()
+        safetensors_files = sorted(filename for filename in self.files if filename.endswith(".safetensors"))
+        if safetensors_files:
+            self.format = "safetensors"
+            for filename in safetensors_files:
+                self._parse_safetensors_header(filename)
+        elif "pytorch_model.bin.index.json" in self.files:
+            self.format = "bin_shard"
+            with open(os.path.join(path, "pytorch_model.bin.index.json"), "r") as f:
+                self.weight_map = json.load(f)["weight_map"]
+        else:
+            self.format = "bin"
+
+    def _parse_safetensors_header(self, filename):
+        with open(os.path.join(self.path, filename), "rb") as f:
+            header_size = struct.unpack("<Q", f.read(8))[0]
+            header = json.loads(f.read(header_size))
+        header.pop("__metadata__", None)
+        for name, info in header.items():
+            start, end = info["data_offsets"]
+            offset = 8 + header_size + start
+            self.weight_map[name] = (filename, info["dtype"], info["shape"], offset, end - start)
+
+    def _get_mmap(self, filename):
+        with self._lock:
+            if filename not in self._mmaps:
+                with open(os.path.join(self.path, filename), "rb") as f:
+                    self._mmaps[filename] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmaps[filename]
+
+    def resolve_name(self, tensor_name, prefix=None):
+        """Get the name of the tensor in the checkpoint, trying the name without the model prefix."""
+        if self.format == "bin" or tensor_name in self.weight_map:
+            return tensor_name
+        if prefix and tensor_name.replace(f"{prefix}.", "") in self.weight_map:
+            return tensor_name.replace(f"{prefix}.", "")
+        assert False, "{} not in the checkpoint {}".format(tensor_name, self.path)
+
+    def locate(self, tensor_name, prefix=None):
+        """Get (shard file, offset) of the tensor, offset is None for pickle checkpoints."""
+        tensor_name = self.resolve_name(tensor_name, prefix)
+        if self.format == "safetensors":
+            filename, _, _, offset, _ = self.weight_map[tensor_name]
+            return filename, offset
+        if self.format == "bin_shard":
+            return self.weight_map[tensor_name], None
+        return "pytorch_model.bin", None
+
+    def get_tensor(self, tensor_name, prefix=None, device="cpu"):
+        """Load the tensor with given name.
+
+        Args:
+            tensor_name (str): tensor name.
+            prefix (str, optional): model prefix which may be absent in the checkpoint. Defaults to None.
+            device (str, optional): target device. Defaults to "cpu".
+
+        Returns:
+            tensor: the loaded tensor, it doesn't share memory with the checkpoint file.
+        """
+        if self.format == "bin":
+            return load_tensor(os.path.join(self.path, "pytorch_model.bin"), tensor_name, prefix)
+        if self.format == "bin_shard":
+            tensor_name = self.resolve_name(tensor_name, prefix)
+            return load_tensor(os.path.join(self.path, self.weight_map[tensor_name]), tensor_name, None)
+        tensor_name = self.resolve_name(tensor_name, prefix)
+        filename, dtype, shape, offset, nbytes = self.weight_map[tensor_name]
+        dtype = SAFETENSORS_DTYPE_MAPPING[dtype]
+        if nbytes == 0:
+            return torch.empty(shape, dtype=dtype, device=device)
+        with warnings.catch_warnings():
+            # the view of the read-only mapped shard is copied below
+            warnings.simplefilter("ignore", UserWarning)
+            value = torch.frombuffer(self._get_mmap(filename), dtype=torch.uint8, count=nbytes, offset=offset)
+        return value.view(dtype).reshape(shape).to(device, copy=True)
+
+    def close(self):
+        """Close the memory maps of the shards."""
+        with self._lock:
+            for mm in self._mmaps.values():
+                mm.close()
+            self._mmaps.clear()
+
+
+def _get_checkpoint_signature(path, files=None):
+    """Get (file name, mtime, size) of the checkpoint files, which changes when the checkpoint is rewritten."""
+    files = os.listdir(path) if files is None else files
+    signature = []
+    for filename in sorted(files):
+        if filename.endswith((".safetensors", ".bin", ".json")):
+            stat = os.stat(os.path.join(path, filename))
+            signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+_checkpoint_indexes = {}
+
+
+def get_checkpoint_index(path):
+    """Get the cached CheckpointIndex of the checkpoint directory.
+
+    The index is parsed once per load or quantization session, see refresh_checkpoint_index.
+    """
+    path = os.path.abspath(path)
+    index = _checkpoint_indexes.get(path)
+    if index is None:
+        index = _checkpoint_indexes[path] = CheckpointIndex(path)
+    return index
+
+
+def refresh_checkpoint_index(path):
+    """Drop the cached CheckpointIndex if the checkpoint was rewritten since it was parsed.
+
+    The mtime and size of the checkpoint files are checked once when a session starts,
+    a checkpoint rewritten at the same path is parsed again.
+    """
+    path = os.path.abspath(path)
+    index = _checkpoint_indexes.get(path)
+    if index is not None and index.signature != _get_checkpoint_signature(path):
+        _drop_checkpoint_index(path)
+
+
+def _drop_checkpoint_index(path):
+    prefetcher = _prefetchers.pop(path, None)
+    if prefetcher is not None:
+        prefetcher.shutdown()
+    index = _checkpoint_indexes.pop(path, None)
+    if index is not None:
+        index.close()
+
+
+def clear_checkpoint_index_cache():
+    """Close and drop all cached checkpoint indexes and prefetched tensors.
+
+    Called when layer-wise loading or quantization finishes.
+    """
+    for path in list(_checkpoint_indexes):
+        _drop_checkpoint_index(path)
+    for prefetcher in _prefetchers.values():
+        prefetcher.shutdown()
+    _prefetchers.clear()
+
+
+class TensorPrefetcher:
+    """Load the parameters of the next module in the background while the current one is processed."""
+
+    def __init__(self, index, num_workers=1):
+        """Init the TensorPrefetcher object.
+
+        Args:
+            index (CheckpointIndex): index of the checkpoint to load tensors from.
+            num_workers (int, optional): number of loading threads. Defaults to 1.
+        """
+        self.index = index
+        self._executor = ThreadPoolExecutor(max_workers=num_workers)
+        self._futures = {}
+        self._module_order = None
+
+    def prefetch(self, param_names, prefix=None, device="cpu"):
+        """Schedule the loading of given parameters, prefetched tensors which were never used are dropped."""
+        for param_name in list(self._futures):
+            if param_name not in param_names:
+                self._futures.pop(param_name).cancel()
+        for param_name in param_names:
+            if param_name not in self._futures:
+                self._futures[param_name] = self._executor.submit(self.index.get_tensor, param_name, prefix, device)
+
+    def get_tensor(self, param_name, prefix=None, device="cpu"):
+        """Get a prefetched tensor, or load it synchronously if it was not prefetched."""
+        future = self._futures.pop(param_name, None)
+        if future is None:
+            return self.index.get_tensor(param_name, prefix, device)
+        return future.result().to(device)
+
+    def next_module_name(self, model, module_name):
+        """Get the name of the leaf module following `module_name`."""
+        if self._module_order is None or module_name not in self._module_order:
+            names = [name for name, _ in get_named_children(model)]
+            self._module_order = {name: idx for idx, name in enumerate(names)}
+            self._module_names = names
+        idx = self._module_order.get(module_name)
+        if idx is None or idx + 1 >= len(self._module_names):
+            return None
+        return self._module_names[idx + 1]
+
+    def shutdown(self):
+        """Drop the pending prefetches and stop the loading threads.
+
+        Running loads are waited for, so the checkpoint index can be closed afterwards.
+        """
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=True)
+
+
+_prefetchers = {}
+
+
+def get_prefetcher(path):
+    """Get the TensorPrefetcher of the checkpoint directory."""
+    index = get_checkpoint_index(path)
+    if index.path not in _prefetchers:
+        _prefetchers[index.path] = TensorPrefetcher(index)
+    return _prefetchers[index.path]
+
+
+def _get_param_name_in_checkpoint(model, param_name):
+    """Map the lm_head parameter to the input embeddings when they are tied."""
+    if "lm_head" in param_name and getattr(model.config, "tie_word_embeddings", True):
+        input_embeddings = model.get_input_embeddings()
+        modules = get_named_children(model)
+        for name, module in modules:
+            if module == input_embeddings:
+                param_name = name + "." + param_name.split(".")[-1]
+    return param_name
+
+
+def prefetch_next_module(model, module_name, path, device="cpu"):
+    """Load the parameters of the leaf module following `module_name` in the background.
+
+    Args:
+        model (torch.nn.module): torch model.
+        module_name (str): name of the module being processed.
+        path (str): path to load state_dict per layer.
+        device (str, optional): module device. Defaults to "cpu".
+    """
+    prefetcher = get_prefetcher(path)
+    next_name = prefetcher.next_module_name(model, module_name)
+    if next_name is None or os.path.exists(os.path.join(LWQ_WORKSPACE, f"{next_name}.pt")):
+        # the next module is loaded from its saved state_dict instead of the checkpoint
+        return
+    param_names = [
+        _get_param_name_in_checkpoint(model, next_name + "." + n)
+        for n, _ in get_module(model, next_name).named_parameters()
+    ]
+    prefetcher.prefetch(param_names, model.base_model_prefix, device)
+
+
 def load_value(model, param_name, path, device="cpu"):
     """Load the module value.
 
@@ -202,27 +481,11 @@ def load_value(model, param_name, path, device="cpu"):
     Returns:
         tensor: the module value.
     """
-    if "lm_head" in param_name and getattr(model.config, "tie_word_embeddings", True):
-        input_embeddings = model.get_input_embeddings()
-        modules = get_named_children(model)
-        for name, module in modules:
-            if module == input_embeddings:
-                param_name = name + "." + param_name.split(".")[-1]
-    prefix = model.base_model_prefix
-    files = os.listdir(path)
-    safetensors_files = [filename for filename in files if filename.endswith(".safetensors")]
-    if len(safetensors_files) == 1:
-        value = load_tensor_from_safetensors(os.path.join(path, "model.safetensors"), param_name, device=device)
-    elif len(safetensors_files) >= 2:
-        value = load_tensor_from_safetensors_shard(path, param_name, device=device)
-    elif "pytorch_model.bin.index.json" in files:
-        value = load_tensor_from_shard(path, param_name, prefix)
-    else:
-        value = load_tensor(os.path.join(path, "pytorch_model.bin"), param_name, prefix)
-    return value
+    param_name = _get_param_name_in_checkpoint(model, param_name)
+    return get_prefetcher(path).get_tensor(param_name, model.base_model_prefix, device)
 
 
-def load_module(model, module_name, path, device="cpu"):
+def load_module(model, module_name, path, device="cpu", prefetch=True):
     """Load all named parameters of module.
 
     Args:
@@ -230,15 +493,20 @@ def load_module(model, module_name, path, device="cpu"):
         module_name (str): module name.
         path (str): path to load state_dict per layer.
         device (str, optional): module device. Defaults to "cpu".
+        prefetch (bool, optional): load the next module in the background. Defaults to True.
     """
     module = get_module(model, module_name)
     for n, p in module.named_parameters():
         param_name = module_name + "." + n
         value = load_value(model, param_name, path, device)
         set_module_tensor_to_device(model, param_name, device, value)
+    if prefetch:
+        prefetch_next_module(model, module_name, path, device)
 
 
-def register_weight_hooks(model, path, device="cpu", clean_weight=True, saved_path=None, indicated_layers=None):
+def register_weight_hooks(
+    model, path, device="cpu", clean_weight=True, saved_path=None, indicated_layers=None, prefetch=True
+):
     """Register weight hooks for model.
 
     Args:
@@ -247,6 +515,8 @@ def register_weight_hooks(model, path, device="cpu", clean_weight=True, saved_pa
         device (str, optional): module device. Defaults to "cpu".
         clean_weight (bool, optional): to clean model weight. Defaults to True.
         saved_path (str, optional): path to save module weight. Defaults to None.
+        prefetch (bool, optional): load the next module in the background while the current one runs.
+            Defaults to True.
 
     Returns:
         list: handlers.
@@ -270,6 +540,8 @@ def register_weight_hooks(model, path, device="cpu", clean_weight=True, saved_pa
                     value = load_value(model, param_name, path, device=device)
                 set_module_tensor_to_device(model, param_name, device, value)
             module = module.to(device)
+            if prefetch:
+                prefetch_next_module(model, name, path, device)
 
         return hook
 
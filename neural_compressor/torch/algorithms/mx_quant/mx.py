@@ -27,7 +27,7 @@ from torch.nn import functional as F
 from neural_compressor.torch.algorithms import Quantizer
 from neural_compressor.torch.utils import logger, set_module
 
-from .utils import quantize_elemwise_op, quantize_mx_op
+from .utils import clear_mx_scratch, pack_mx_op, quantize_elemwise_op, quantize_mx_op, unpack_mx_op
 
 
 class MXLinear(torch.nn.Linear):
@@ -46,6 +46,7 @@ class MXLinear(torch.nn.Linear):
 
         self.name = name
         self.mx_specs = mx_specs
+        self.packed = False
         super().__init__(in_features, out_features, bias)
 
     def apply_mx_specs(self):
@@ -57,6 +58,14 @@ class MXLinear(torch.nn.Linear):
                 if self.bias is not None:
                     self.bias.data = quantize_elemwise_op(self.bias.data, mx_specs=self.mx_specs)
 
+            if self.mx_specs.pack_weight:
+                self.pack(
+                    *pack_mx_op(
+                        self.weight.data, self.mx_specs.w_dtype, self.mx_specs.round_method, self.mx_specs.blocksize
+                    )
+                )
+                return
+
             # MX quantize everything along input size
             self.weight.data = quantize_mx_op(
                 self.weight.data,
@@ -66,6 +75,25 @@ class MXLinear(torch.nn.Linear):
                 axes=[-1],
             )
 
+    def pack(self, weight_packed, weight_shared_exp):
+        """Replace the float weight with the packed element codes and shared exponents of pack_mx_op."""
+        self.weight_dtype = self.weight.dtype
+        del self.weight
+        self.register_buffer("weight_packed", weight_packed)
+        self.register_buffer("weight_shared_exp", weight_shared_exp)
+        self.packed = True
+
+    def recover(self):
+        """Dequantize the packed weight, equal to the fake-quantized weight of an unpacked MXLinear."""
+        return unpack_mx_op(
+            self.weight_packed,
+            self.weight_shared_exp,
+            self.mx_specs.w_dtype,
+            self.mx_specs.blocksize,
+            (self.out_features, self.in_features),
+            dtype=self.weight_dtype,
+        )
+
     def forward(self, input):
         """Forward function."""
         if self.mx_none:
@@ -83,9 +111,10 @@ class MXLinear(torch.nn.Linear):
                 self.mx_specs.round_method,
                 self.mx_specs.blocksize,
                 axes=[-1],
+                enable_torch_compile=self.mx_specs.enable_torch_compile,
             )
         # compute output
-        output = F.linear(input, self.weight)
+        output = F.linear(input, self.recover() if self.packed else self.weight)
         if self.mx_specs.out_dtype != "float32":
             output = quantize_elemwise_op(output, mx_specs=self.mx_specs)
 
@@ -159,7 +188,10 @@ class MXQuantizer(Quantizer):
             new_module.load_state_dict(tmp_stat)
             new_module.apply_mx_specs()
             if name == "":
+                clear_mx_scratch()
                 return new_module
             else:
                 set_module(model, name, new_module)
+        # release the scratch buffers used to quantize the weights
+        clear_mx_scratch()
         return model
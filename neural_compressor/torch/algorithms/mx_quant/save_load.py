@@ -0,0 +1,87 @@
+# Copyright (c) 2024 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""MX quantization save and load."""
+
+import os
+
+import torch
+
+from neural_compressor.common.utils import load_config_mapping, save_config_mapping
+from neural_compressor.torch.utils import QCONFIG_NAME, WEIGHT_NAME, logger, set_module
+
+from .mx import MXLinear
+
+
+def save(model, output_dir="./saved_results"):
+    """Save the MX quantized model and config to the output path.
+
+    Packed MXLinear modules are saved as their packed element codes and shared exponents.
+
+    Args:
+        model (torch.nn.module): MX quantized model.
+        output_dir (str, optional): output path to save.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    qmodel_weight_file_path = os.path.join(os.path.abspath(os.path.expanduser(output_dir)), WEIGHT_NAME)
+    qconfig_file_path = os.path.join(os.path.abspath(os.path.expanduser(output_dir)), QCONFIG_NAME)
+    save_config_mapping(model.qconfig, qconfig_file_path)
+
+    # MethodType 'save' not in state_dict
+    del model.save
+    torch.save(model.state_dict(), qmodel_weight_file_path)
+
+    logger.info("Save quantized model weight to {}.".format(qmodel_weight_file_path))
+    logger.info("Save configuration of quantized model to {}.".format(qconfig_file_path))
+
+
+def load(model_name_or_path, original_model):
+    """Load MX quantized model.
+
+    Args:
+        model_name_or_path (str): directory the quantized model is saved to.
+        original_model (torch.nn.module): original model before quantization.
+
+    Returns:
+        torch.nn.Module: quantized model
+    """
+    from neural_compressor.common.base_config import ConfigRegistry
+
+    qmodel_weight_file_path = os.path.join(os.path.abspath(os.path.expanduser(model_name_or_path)), WEIGHT_NAME)
+    qconfig_file_path = os.path.join(os.path.abspath(os.path.expanduser(model_name_or_path)), QCONFIG_NAME)
+    assert os.path.exists(qmodel_weight_file_path), "Cannot load model weight from path {}.".format(
+        qmodel_weight_file_path
+    )
+    config_mapping = load_config_mapping(qconfig_file_path, ConfigRegistry.get_all_configs()["torch"])
+    state_dict = torch.load(qmodel_weight_file_path)
+
+    model = original_model
+    for (name, op_type), config in config_mapping.items():
+        if op_type != "Linear":  # pragma: no cover
+            continue
+        m = model.get_submodule(name)
+        new_module = MXLinear(m.in_features, m.out_features, bias=m.bias is not None, mx_specs=config, name=name)
+        new_module.to(m.weight.dtype)
+        prefix = name + "." if name else ""
+        if prefix + "weight_packed" in state_dict:
+            new_module.pack(state_dict[prefix + "weight_packed"], state_dict[prefix + "weight_shared_exp"])
+        if name == "":
+            model = new_module
+        else:
+            set_module(model, name, new_module)
+
+    model.load_state_dict(state_dict, assign=True, strict=False)
+    model.qconfig = config_mapping
+    model.eval()
+    logger.info("Loading MX quantized model successfully.")
+    return model
@@ -19,6 +19,9 @@
 # limitations under the License.
 """MX quantization utils."""
 
+import functools
+import math
+import threading
 from enum import Enum, IntEnum
 
 import torch
@@ -496,21 +499,8 @@ def quantize_elemwise_op(A, mx_specs):
     return A
 
 
-def _quantize_mx(
-    A,
-    scale_bits,
-    elem_format,  # can be None for no quantization
-    shared_exp_method="max",
-    axes=None,
-    block_size=32,
-    round="nearest",
-    flush_fp32_subnorms=False,
-):
-    """Function used for MX* quantization."""
-    # Shortcut for no quantization
-    if elem_format is None:
-        return A
-
+def _quantize_mx_elements(A, scale_bits, elem_format, shared_exp_method, axes, block_size, round, flush_fp32_subnorms):
+    """Quantize A to MX elements, returns the blocked elements and the shared exponents of the blocks."""
     assert scale_bits > 0
 
     # Make sure axes is a list of non-negative numbers
@@ -551,6 +541,28 @@ def _quantize_mx(
 
     A = _quantize_elemwise_core(A, mbits, ebits, max_norm, round=round, allow_denorm=True, saturate_normals=True)
 
+    return A, shared_exp, axes, orig_shape, padded_shape
+
+
+def _quantize_mx(
+    A,
+    scale_bits,
+    elem_format,  # can be None for no quantization
+    shared_exp_method="max",
+    axes=None,
+    block_size=32,
+    round="nearest",
+    flush_fp32_subnorms=False,
+):
+    """Function used for MX* quantization."""
+    # Shortcut for no quantization
+    if elem_format is None:
+        return A
+
+    A, shared_exp, axes, orig_shape, padded_shape = _quantize_mx_elements(
+        A, scale_bits, elem_format, shared_exp_method, axes, block_size, round, flush_fp32_subnorms
+    )
+
     A = A * (2**shared_exp)
 
     # Undo tile reshaping
@@ -559,6 +571,116 @@ def _quantize_mx(
     return A
 
 
+# per-thread scratch buffers reused by the fused MX quantization, keyed by (device, dtype, index)
+_mx_scratch = threading.local()
+
+# larger tensors get scratch buffers of their own, so the cached buffers stay bounded
+_MX_SCRATCH_MAX_NUMEL = 2**22
+
+# compiled fused MX quantization kernels, keyed by (elem_format, block_size, round, scale_bits)
+_MX_KERNEL_CACHE = {}
+
+
+def _get_mx_scratch(numel, dtype, device, index):
+    """Get a scratch buffer with at least `numel` elements owned by the calling thread."""
+    if numel > _MX_SCRATCH_MAX_NUMEL:
+        return torch.empty(numel, dtype=dtype, device=device)
+    buffers = getattr(_mx_scratch, "buffers", None)
+    if buffers is None:
+        buffers = _mx_scratch.buffers = {}
+    key = (str(device), dtype, index)
+    buffer = buffers.get(key)
+    if buffer is None or buffer.numel() < numel:
+        buffer = buffers[key] = torch.empty(numel, dtype=dtype, device=device)
+    return buffer[:numel]
+
+
+def clear_mx_scratch():
+    """Release the scratch buffers of the calling thread."""
+    _mx_scratch.buffers = {}
+
+
+def _quantize_mx_fused(A, exp_scale, absA, scale_bits, ebits, mbits, emax, max_norm, round):
+    """MX quantize the blocks in the last dim of A in place, with the ops of _quantize_mx in the same order.
+
+    exp_scale and absA are scratch buffers shaped like A. Only the per-block shared exponents are allocated.
+    """
+    # shared exponents, see _shared_exponents
+    torch.abs(A, out=absA)
+    shared_exp = torch.amax(absA, dim=-1, keepdim=True)
+    shared_exp = torch.floor(torch.log2(shared_exp + FP32_MIN_NORMAL * (shared_exp == 0).type(shared_exp.dtype)))
+    shared_exp = shared_exp - emax
+    scale_emax = 2 ** (scale_bits - 1) - 1
+    shared_exp[shared_exp > scale_emax] = float("NaN")
+    shared_exp[shared_exp < -scale_emax] = -scale_emax
+    shared_scale = 2**shared_exp
+    A.div_(shared_scale)
+
+    # element quantization, see _quantize_elemwise_core. Zeros get the min private exponent instead of 0,
+    # which doesn't change them. Elements can't be +-Inf here as Inf/NaN inputs give a NaN shared exponent.
+    if ebits != 0:
+        torch.abs(A, out=exp_scale).log2_().floor_().clamp_(min=-(2 ** (ebits - 1)) + 2)
+        torch.pow(2, exp_scale, out=exp_scale)
+        A.div_(exp_scale)
+    A.mul_(2 ** (mbits - 2))
+
+    torch.abs(A, out=absA)
+    if round == "even":
+        mask = ((absA - 0.5) % 2 == 0).type(A.dtype)
+        absA.add_(0.5).floor_().sub_(mask)
+    elif round == "nearest":
+        absA.add_(0.5).floor_()
+    else:
+        absA.floor_()
+    A.sign_().mul_(absA)
+
+    A.div_(2 ** (mbits - 2))
+    if ebits != 0:
+        A.mul_(exp_scale)
+    A.clamp_(min=-max_norm, max=max_norm)
+    A.mul_(shared_scale)
+    return A
+
+
+def _get_mx_kernel(elem_format, block_size, round, scale_bits, enable_torch_compile):
+    """Get the fused MX quantization kernel of the format, compiled once per (format, block size) if asked."""
+    ebits, mbits, emax, max_norm, _ = _get_format_params(elem_format)
+    kernel = functools.partial(
+        _quantize_mx_fused,
+        scale_bits=scale_bits,
+        ebits=ebits,
+        mbits=mbits,
+        emax=emax,
+        max_norm=max_norm,
+        round=round,
+    )
+    if not enable_torch_compile:
+        return kernel
+    key = (elem_format, block_size, round, scale_bits)
+    if key not in _MX_KERNEL_CACHE:
+        _MX_KERNEL_CACHE[key] = torch.compile(kernel, dynamic=True)
+    return _MX_KERNEL_CACHE[key]
+
+
+def _quantize_mx_last_axis(A, scale_bits, elem_format, block_size, round, enable_torch_compile=False):
+    """MX quantize A along the last axis with the fused kernel, bit-exact with _quantize_mx."""
+    if block_size == 0:
+        raise Exception("block_size == 0 in _quantize_mx_last_axis")
+    size = A.shape[-1]
+    num_blocks = -(-size // block_size)
+    out = torch.empty(*A.shape[:-1], num_blocks * block_size, dtype=A.dtype, device=A.device)
+    out[..., :size] = A
+    if num_blocks * block_size != size:
+        out[..., size:] = 0
+    blocks = out.view(*A.shape[:-1], num_blocks, block_size)
+    exp_scale = _get_mx_scratch(out.numel(), A.dtype, A.device, 0).view_as(blocks)
+    absA = _get_mx_scratch(out.numel(), A.dtype, A.device, 1).view_as(blocks)
+
+    kernel = _get_mx_kernel(elem_format, block_size, round, scale_bits, enable_torch_compile)
+    kernel(blocks, exp_scale, absA)
+    return out[..., :size]
+
+
 def quantize_mx_op(
     A: torch.Tensor,
     elem_format: str,
@@ -567,13 +689,30 @@ def quantize_mx_op(
     scale_bits=8,
     axes=None,
     expand_and_reshape=False,
+    enable_torch_compile=False,
 ):
-    """Quantize tensor to MX data type."""
+    """Quantize tensor to MX data type.
+
+    Quantization along the last axis without autograd uses a fused in-place kernel, optionally compiled
+    with torch.compile, its output is bit-exact with the reference implementation.
+    """
     if elem_format is None:
         return A
     elif type(elem_format) is str:
         elem_format = ElemFormat.from_str(elem_format)
 
+    if (
+        isinstance(axes, (list, tuple))
+        and len(axes) == 1
+        and A.ndim > 0
+        and axes[0] in (-1, A.ndim - 1)
+        and round in ("nearest", "floor", "even")
+        and A.is_floating_point()
+        and A.numel() > 0
+        and not (torch.is_grad_enabled() and A.requires_grad)
+    ):
+        return _quantize_mx_last_axis(A, scale_bits, elem_format, block_size, round, enable_torch_compile)
+
     return _quantize_mx(
         A,
         scale_bits,
@@ -584,3 +723,155 @@ def quantize_mx_op(
         shared_exp_method="max",
         flush_fp32_subnorms=False,
     )
+
+
+_ELEM_VALUES_CACHE = {}
+
+
+def _get_elem_values(elem_format):
+    """Get the bit width of the element format and the sorted magnitudes its codes represent.
+
+    Codes of the formats with at most 8 bits are sign-magnitude, the sign is the top bit and the
+    remaining bits index the magnitudes. 16-bit formats keep their native float16/bfloat16 bits.
+
+    Args:
+        elem_format (ElemFormat): element format
+
+    Returns:
+        bits: bit width of an element
+        values: float32 tensor of the magnitudes, None for 16-bit formats
+    """
+    if elem_format in _ELEM_VALUES_CACHE:
+        return _ELEM_VALUES_CACHE[elem_format]
+
+    ebits, mbits, emax, max_norm, _ = _get_format_params(elem_format)
+    if ElemFormat.is_bf(elem_format.value) or elem_format == ElemFormat.float16:
+        bits, values = 16, None
+    elif ebits == 0:
+        # integers are k / 2**(mbits - 2) in sign-magnitude
+        bits = mbits
+        values = torch.arange(2 ** (mbits - 1), dtype=torch.float64) / 2 ** (mbits - 2)
+    else:
+        # mbits counts the sign and the implicit one
+        bits = ebits + mbits - 1
+        mantissa_bits = mbits - 2
+        min_exp = -(2 ** (ebits - 1)) + 2
+        mantissas = torch.arange(2**mantissa_bits, dtype=torch.float64)
+        values = [mantissas * 2.0 ** (min_exp - mantissa_bits)]  # subnormals
+        for exp in range(min_exp, emax + 1):
+            values.append((2**mantissa_bits + mantissas) * 2.0 ** (exp - mantissa_bits))
+        values = torch.cat(values)
+        values = values[values <= max_norm]
+    if values is not None:
+        assert len(values) <= 2 ** (bits - 1), "Element format %s doesn't fit %d bits" % (elem_format, bits)
+        values = values.float()
+
+    _ELEM_VALUES_CACHE[elem_format] = (bits, values)
+    return bits, values
+
+
+def _pack_bits(codes, bits):
+    """Pack the low bits of every uint8 code into a flat uint8 tensor, 8 // gcd(bits, 8) codes at a time."""
+    group = 8 // math.gcd(bits, 8)
+    codes = codes.flatten()
+    codes = torch.nn.functional.pad(codes, (0, -codes.numel() % group)).view(-1, group).int()
+    word = codes[:, 0].clone()
+    for i in range(1, group):
+        word |= codes[:, i] << (bits * i)
+    return torch.stack([(word >> (8 * i)) & 0xFF for i in range(group * bits // 8)], dim=1).to(torch.uint8).flatten()
+
+
+def _unpack_bits(packed, bits, numel):
+    """Unpack numel codes packed by _pack_bits, returns int32 codes."""
+    group = 8 // math.gcd(bits, 8)
+    packed = packed.view(-1, group * bits // 8)
+    mask = 2**bits - 1
+    codes = []
+    for i in range(group):
+        # every code spans at most two bytes, shifts and masks stay in uint8
+        byte, shift = divmod(bits * i, 8)
+        code = packed[:, byte] >> shift
+        if shift + bits > 8:
+            code = code | (packed[:, byte + 1] << (8 - shift))
+        codes.append(code & mask)
+    return torch.stack(codes, dim=1).flatten()[:numel].int()
+
+
+def pack_mx_op(A: torch.Tensor, elem_format: str, round: str, block_size: int):
+    """Quantize tensor to MX data type along the last axis and pack it.
+
+    The result dequantized by unpack_mx_op is bit-exact with quantize_mx_op(A.float(), ..., axes=[-1]).
+
+    Args:
+        A (torch.Tensor): tensor to be quantized
+        elem_format (str): element format
+        round (str): rounding method
+        block_size (int): number of elements sharing an exponent
+
+    Returns:
+        packed (torch.Tensor): flat uint8 tensor of the packed element codes of the padded blocks
+        shared_exp (torch.Tensor): uint8 tensor of the biased E8M0 shared exponents, shape (*A.shape[:-1], n_blocks)
+    """
+    if type(elem_format) is str:
+        elem_format = ElemFormat.from_str(elem_format)
+    bits, values = _get_elem_values(elem_format)
+
+    elems, shared_exp, _, _, _ = _quantize_mx_elements(
+        A.float(), 8, elem_format, "max", [-1], block_size, round, flush_fp32_subnorms=False
+    )
+    # blocks with a NaN scale dequantize to NaN whatever their elements are
+    nan_blocks = torch.isnan(shared_exp)
+    elems = elems.masked_fill(nan_blocks, 0)
+    shared_exp = (shared_exp + FP32_EXPONENT_BIAS).masked_fill(nan_blocks, 2**8 - 1).to(torch.uint8)
+
+    if values is None:
+        dtype = torch.float16 if elem_format == ElemFormat.float16 else torch.bfloat16
+        packed = elems.to(dtype).flatten().view(torch.uint8)
+    else:
+        magnitude = elems.abs().flatten()
+        index = torch.searchsorted(values, magnitude).clamp_(max=len(values) - 1)
+        if not torch.equal(values[index], magnitude):
+            raise ValueError("Elements that are not representable in %s can't be packed" % elem_format.name)
+        codes = index | (torch.signbit(elems.flatten()).int() << (bits - 1))
+        packed = _pack_bits(codes.to(torch.uint8), bits)
+    return packed, shared_exp.reshape(*A.shape[:-1], -1)
+
+
+def unpack_mx_op(packed, shared_exp, elem_format, block_size, shape, dtype=torch.float32):
+    """Dequantize the MX tensor packed by pack_mx_op.
+
+    Args:
+        packed (torch.Tensor): packed element codes
+        shared_exp (torch.Tensor): biased shared exponents
+        elem_format (str): element format
+        block_size (int): number of elements sharing an exponent
+        shape (torch.Size): shape of the quantized tensor
+        dtype (torch.dtype, optional): dtype of the result. Defaults to torch.float32.
+
+    Returns:
+        torch.Tensor: dequantized tensor
+    """
+    if type(elem_format) is str:
+        elem_format = ElemFormat.from_str(elem_format)
+    bits, values = _get_elem_values(elem_format)
+    numel = shared_exp.numel() * block_size
+
+    if values is None:
+        elems = packed.view(torch.float16 if elem_format == ElemFormat.float16 else torch.bfloat16).float()
+    else:
+        values = values.to(packed.device)
+        lut = torch.cat([values, torch.zeros(2 ** (bits - 1) - len(values), device=packed.device)])
+        lut = torch.cat([lut, -lut])
+        if 8 % bits == 0:
+            # decode a whole byte at once, index_select is much faster than advanced indexing
+            byte = torch.arange(256, dtype=torch.int32, device=packed.device)
+            lut = torch.stack([lut[(byte >> (bits * i)) & (2**bits - 1)] for i in range(8 // bits)], dim=1)
+            elems = lut.index_select(0, packed.int()).flatten()[:numel]
+        else:
+            elems = lut.index_select(0, _unpack_bits(packed, bits, numel))
+
+    shared_exp = shared_exp.float() - FP32_EXPONENT_BIAS
+    shared_exp[shared_exp == 2**8 - 1 - FP32_EXPONENT_BIAS] = float("NaN")
+    A = elems.view(*shared_exp.shape, block_size) * (2 ** shared_exp.unsqueeze(-1))
+    A = A.view(*shape[:-1], -1)[..., : shape[-1]]
+    return A.to(dtype)
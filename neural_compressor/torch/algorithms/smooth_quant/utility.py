@@ -627,6 +627,30 @@ def cal_scale(input_max_abs, weights, alpha, weight_max_lb=1e-5):  # pragma: no
     return weight_scale
 
 
+def cal_scale_multi_alpha(input_max_abs, weights, alphas, weight_max_lb=1e-5):  # pragma: no cover
+    """Calculate the scaling factors for weights of several alpha values at once.
+
+    Args:
+        input_max_abs (Tensor): The maximum absolute values of the inputs.
+        weights (list of Tensor): The list of weight tensors to be concatenated and processed.
+        alphas (Tensor): The 1-D tensor of alpha values.
+        weight_max_lb (float, optional): The lower bound for weight magnitudes to avoid division by zero.
+            Defaults to 1e-5.
+
+    Returns:
+        Tensor: The scaling factors in shape [len(alphas), in_channel], row i is cal_scale(..., alphas[i]).
+    """
+    weights = torch.cat(weights, dim=0)
+    weight_max = torch.max(torch.abs(weights), dim=0)[0]
+    weight_max = torch.clip(weight_max, weight_max_lb)
+    alphas = alphas.to(weight_max).unsqueeze(-1)
+    input_power = torch.pow(input_max_abs, alphas)
+    weight_power = torch.pow(weight_max, 1 - alphas)
+    weight_scale = torch.clip(input_power / weight_power, min=1e-5)
+    weight_scale[input_power == 0] = 1.0
+    return weight_scale
+
+
 def model_forward_per_sample(model, sample, device):  # pragma: no cover
     """Perform a forward pass of the model on a single sample.
 
@@ -669,29 +693,7 @@ def quant_dequant_w_v1(m, num_bits=8, scheme="sym"):  # pragma: no cover
     """
     eps = torch.finfo(torch.float32).eps
     if isinstance(m, torch.nn.Linear):
-        x = m.weight
-        tmp = torch.zeros(torch.max(x, dim=1).values.size())
-        if scheme == "sym":
-            q_min, q_max = -(2.0 ** (num_bits - 1)), 2.0 ** (num_bits - 1) - 1.0
-            x_max = torch.max(torch.abs(x), dim=1).values
-            scale = x_max / (float(q_max - q_min) / 2)
-        else:
-            q_min, q_max = 0, 2.0**num_bits - 1.0
-            x_max = torch.maximum(torch.max(x, dim=1).values, tmp)
-            x_min = torch.minimum(torch.min(x, dim=1).values, tmp)
-            scale = (x_max - x_min) / (2**num_bits - 1)
-
-        scale = torch.clip(scale, min=eps)
-
-        if scheme == "sym":
-            bias = 0
-        else:
-            bias = torch.round(0 - (torch.min(x, dim=1).values) / scale)
-            bias = bias.unsqueeze(dim=-1)
-        scale = scale.unsqueeze(dim=-1)
-        q_x = torch.round(x / scale + bias)
-        q_x.clamp_(q_min, q_max)
-        return (q_x - bias) * scale
+        return quant_dequant_linear_weight(m.weight, num_bits=num_bits, scheme=scheme)
     elif isinstance(m, torch.nn.Conv2d):
         x = m.weight
         x = torch.permute(x, (0, 2, 3, 1))
@@ -724,6 +726,44 @@ def quant_dequant_w_v1(m, num_bits=8, scheme="sym"):  # pragma: no cover
         logger.warning("unsupported layer type, please have a check")
 
 
+def quant_dequant_linear_weight(x, num_bits=8, scheme="sym"):  # pragma: no cover
+    """Quantize and dequantize a linear weight per output channel.
+
+    Args:
+        x (Tensor): The weight in shape [..., out_channel, in_channel], leading dimensions are
+            handled independently, e.g. the weights of several alpha values stacked in dim 0.
+        num_bits (int, optional): The number of bits for quantization. Defaults to 8.
+        scheme (str, optional): The quantization scheme to use.
+            Can be "sym" for symmetric or "asym" for asymmetric quantization. Defaults to "sym".
+
+    Returns:
+        Tensor: The quantized and dequantized weight.
+    """
+    eps = torch.finfo(torch.float32).eps
+    tmp = torch.zeros(torch.max(x, dim=-1).values.size(), device=x.device)
+    if scheme == "sym":
+        q_min, q_max = -(2.0 ** (num_bits - 1)), 2.0 ** (num_bits - 1) - 1.0
+        x_max = torch.max(torch.abs(x), dim=-1).values
+        scale = x_max / (float(q_max - q_min) / 2)
+    else:
+        q_min, q_max = 0, 2.0**num_bits - 1.0
+        x_max = torch.maximum(torch.max(x, dim=-1).values, tmp)
+        x_min = torch.minimum(torch.min(x, dim=-1).values, tmp)
+        scale = (x_max - x_min) / (2**num_bits - 1)
+
+    scale = torch.clip(scale, min=eps)
+
+    if scheme == "sym":
+        bias = 0
+    else:
+        bias = torch.round(0 - (torch.min(x, dim=-1).values) / scale)
+        bias = bias.unsqueeze(dim=-1)
+    scale = scale.unsqueeze(dim=-1)
+    q_x = torch.round(x / scale + bias)
+    q_x.clamp_(q_min, q_max)
+    return (q_x - bias) * scale
+
+
 def quant_dequant_x_v1(x, min_x=None, max_x=None, num_bits=8):  # pragma: no cover
     """Quantize and dequantize a tensor.
 
@@ -822,6 +862,8 @@ def reshape_scale_as_input(layer, scale):  # pragma: no cover
 
 
 TUNERS = {}
+# upper bound of the elements stacked along the alpha dimension in one batched auto-tune forward
+MULTI_ALPHA_NUMEL = 2**27
 
 
 def register_autotune(name):  # pragma: no cover
@@ -1481,6 +1523,31 @@ class AutoAlpha:  # pragma: no cover
                     self.weight_scale_dict[layer_name][alpha_tmp] = scale
         return absorb_scales_info, weight_scales_info
 
+    def _cal_scales_multi_alpha(self, absorb_to_layer, input_maxes, alphas):
+        """Calculate the adjustment scales of several alpha values at once.
+
+        Args:
+            absorb_to_layer (dict): A dictionary mapping absorb layers to smooth quantized layers.
+            input_maxes (dict): The channel-wise input max information for layers.
+            alphas (Tensor): The 1-D tensor of alpha values.
+
+        Returns:
+            dict: Absorb scales and weight scales in shape [len(alphas), in_channel].
+        """
+        weight_scales_info = {}
+        absorb_scales_info = {}
+        for key in absorb_to_layer.keys():
+            layer_names = absorb_to_layer[key]
+            input_max = input_maxes[layer_names[0]]
+            weights = [reshape_in_channel_to_last(layer_name, self.model) for layer_name in layer_names]
+            scale = cal_scale_multi_alpha(input_max, weights, alphas)
+            scale[alphas < 0] = 1.0
+            absorb_scales_info[key] = 1.0 / scale
+            absorb_scales_info[key][scale == 0] = 0
+            for layer_name in layer_names:
+                weight_scales_info[layer_name] = scale
+        return absorb_scales_info, weight_scales_info
+
     def _get_auto_loss(self, output, output_q, loss_type="abs", loss_alpha=1.0):
         """Get the loss for auto-tuning.
 
@@ -1507,6 +1574,31 @@ class AutoAlpha:  # pragma: no cover
         else:
             return torch.sum((output - output_q) ** 2)
 
+    def _get_auto_loss_multi_alpha(self, output, outputs_q, loss_type="abs"):
+        """Get the losses of several quantized outputs stacked in dim 0, see _get_auto_loss.
+
+        Args:
+            output (Tensor): FP32 output for one layer.
+            outputs_q (Tensor): Quantized outputs for one layer stacked in dim 0.
+            loss_type (str): The type of loss.
+
+        Returns:
+            Tensor: A 1-D tensor containing the loss of each quantized output.
+        """
+        num_outputs = outputs_q.shape[0]
+        if len(output.shape) <= 2:
+            max_value = torch.max(torch.abs(output))
+        else:
+            output = output.reshape(output.shape[0], -1)
+            outputs_q = outputs_q.reshape(num_outputs, output.shape[0], -1)
+            max_value = torch.max(torch.abs(output), dim=-1).values.unsqueeze(-1)
+            max_value = torch.clip(max_value, 1e-5)
+        diff = (output / max_value - outputs_q / max_value).reshape(num_outputs, -1)
+        if loss_type == "abs":
+            return torch.sum(torch.pow(torch.abs(diff), 0.5), dim=-1)
+        else:
+            return torch.sum(diff**2, dim=-1)
+
     def _get_sq_layer_names(self):
         """Get all the layers that could be smooth quantized.
 
@@ -1601,12 +1693,35 @@ class AutoAlpha:  # pragma: no cover
                 cur_alpha = orig_best_alpha[name]
             key_name = str(cur_alpha)
             loss_alphas[name] = {key_name: loss}
-        # for name in module_names:
-        #     loss_alphas[name]={}
+        # linear layers evaluate all the alpha values in one batched q_dq forward
+        per_alpha_names = []
+        alphas = torch.tensor(alpha_space, dtype=torch.float32)
+        absorb_input_scales, weight_scales = self._cal_scales_multi_alpha(self.absorb_to_layer, input_maxes, alphas)
+        for key in self.absorb_to_layer.keys():
+            for name in self.absorb_to_layer[key]:
+                module = get_module(self.model, name)
+                if not isinstance(module.orig_layer, torch.nn.Linear):
+                    per_alpha_names.append(name)
+                    continue
+                todo = [i for i, alpha in enumerate(alpha_space) if str(alpha) not in loss_alphas[name]]
+                num_alphas = self._get_alpha_chunk_size(module, fp32_output[name])
+                for start in range(0, len(todo), num_alphas):
+                    indices = todo[start : start + num_alphas]
+                    index = torch.tensor(indices, device=absorb_input_scales[key].device)
+                    outputs = module.q_dq_forward_multi_alpha(
+                        module.q_input, absorb_input_scales[key][index], weight_scales[name][index]
+                    )
+                    losses = self._get_auto_loss_multi_alpha(fp32_output[name], outputs)
+                    for i, loss in zip(indices, losses):
+                        loss_alphas[name][str(alpha_space[i])] = loss
+                    del outputs
+
+        if not per_alpha_names:
+            return loss_alphas
         for alpha in alpha_space:
             absorb_input_scales, weight_scales = self._cal_scales(self.absorb_to_layer, input_maxes, alpha)
             self._update_scales_for_auto(absorb_input_scales, weight_scales)
-            for name in module_names:
+            for name in per_alpha_names:
                 losses = loss_alphas[name]
                 if str(alpha) in losses.keys():
                     continue
@@ -1616,6 +1731,19 @@ class AutoAlpha:  # pragma: no cover
                 loss_alphas[name][str(alpha)] = loss
         return loss_alphas
 
+    def _get_alpha_chunk_size(self, module, fp32_output):
+        """Get how many alpha values are evaluated together so that the stacked tensors stay in MULTI_ALPHA_NUMEL.
+
+        Args:
+            module (WrapperLayer): The wrapped layer.
+            fp32_output (Tensor): FP32 output of the layer.
+
+        Returns:
+            int: The number of alpha values in one batched q_dq forward.
+        """
+        numel_per_alpha = module.orig_layer.weight.numel() + module.q_input.numel() + 2 * fp32_output.numel()
+        return max(1, MULTI_ALPHA_NUMEL // numel_per_alpha)
+
     def _get_one_batch_auto_loss_blockwise(self, input, alpha_space, orig_best_alpha, input_maxes):
         """Calculate the losses for all alpha values given an input in blockwise tuning mode.
 
@@ -2728,6 +2856,39 @@ class WrapperLayer(torch.nn.Module):  # pragma: no cover
         output = layer_copy(x)
         return output
 
+    def q_dq_forward_multi_alpha(self, x, input_scales, weight_scales):
+        """Perform quantization and dequantization forward pass for stacked scales of several alpha values.
+
+        Only torch.nn.Linear is supported, row i of the output is q_dq_forward(x, input_scales[i], weight_scales[i]).
+
+        Args:
+            x (Tensor): The input tensor.
+            input_scales (Tensor): The scales for the input in shape [num_alpha, in_channel].
+            weight_scales (Tensor): The scales for the weight in shape [num_alpha, in_channel].
+
+        Returns:
+            Tensor: The output tensors stacked in dim 0.
+        """
+        num_alpha = input_scales.shape[0]
+        layer = self.orig_layer
+        q_dq_weight = quant_dequant_linear_weight(layer.weight.unsqueeze(0) * weight_scales.unsqueeze(1))
+
+        # per-tensor input quant-dequant with the scaled calibration range of each alpha, see quant_dequant_x_v1
+        eps = torch.finfo(torch.float32).eps
+        max_x = torch.max(self.input_max * input_scales, dim=-1).values.view(-1, 1, 1)
+        min_x = torch.min(self.input_min * input_scales, dim=-1).values.view(-1, 1, 1)
+        scale = torch.clip((max_x - min_x) / (2**8 - 1), min=eps)
+        bias = torch.round((0 - min_x) / scale)
+        q_x = x.reshape(1, -1, x.shape[-1]) * input_scales.unsqueeze(1)
+        q_x = torch.round(q_x / scale + bias)
+        q_x.clamp_(0, 2.0**8 - 1)
+        q_dq_x = scale * (q_x - bias)
+
+        output = torch.bmm(q_dq_x, q_dq_weight.transpose(1, 2))
+        if layer.bias is not None:
+            output += layer.bias
+        return output.reshape([num_alpha] + list(x.shape[:-1]) + [output.shape[-1]])
+
     def q_dq_forward_blockwise(self, x, input_scale):
         """Perform blockwise quantization and dequantization forward pass.
 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2024 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Caches of block-wise calibration activations."""
+
+import os
+import shutil
+import tempfile
+
+import torch
+
+from neural_compressor.torch.utils import logger
+
+ACTIVATION_CACHE_BACKENDS = ["memory", "disk"]
+ACTIVATION_CACHE_DTYPES = {"fp32": torch.float32, "fp16": torch.float16, "bf16": torch.bfloat16}
+
+
+class ActivationCache(object):
+    """A list-like cache which holds one calibration activation per sample.
+
+    Values are stored by `_store` and read back by `_load`, so backends only decide where the
+    tensors live. Floating tensors can be kept in a smaller `storage_dtype` and are cast back
+    to their original dtype when read. With `dedupe`, a tensor equal to a recently appended one
+    (e.g. the attention mask shared by all samples) is stored only once.
+    """
+
+    dedupe_window = 4
+
+    def __init__(self, storage_dtype=None, dedupe=False):
+        """Init an ActivationCache object.
+
+        Args:
+            storage_dtype (torch.dtype, optional): dtype to store floating tensors in. Defaults to None.
+            dedupe (bool, optional): whether to share the storage of equal tensors. Defaults to False.
+        """
+        self.storage_dtype = storage_dtype
+        self.dedupe = dedupe
+        self._entries = []  # per sample: slot key
+        self._slots = {}  # slot key -> [stored value, original dtype, original device, reference count]
+        self._next_key = 0
+        self._recent = []  # [(slot key, tensor)] of recently stored distinct tensors, used for dedupe
+
+    def _store(self, key, value):
+        """Store a tensor under the key and return the stored object."""
+        raise NotImplementedError
+
+    def _load(self, stored):
+        """Read back a stored tensor."""
+        raise NotImplementedError
+
+    def _release(self, stored):
+        """Release a stored tensor."""
+        pass
+
+    def _overwrite(self, stored, value):
+        """Overwrite a stored tensor in place, return False if it is not possible."""
+        return False
+
+    def _find_duplicate(self, value):
+        for key, recent in self._recent:
+            if recent is value or (
+                recent.shape == value.shape
+                and recent.dtype == value.dtype
+                and recent.device == value.device
+                and torch.equal(recent, value)
+            ):
+                return key
+        return None
+
+    def _new_slot(self, value):
+        if self.dedupe and isinstance(value, torch.Tensor):
+            key = self._find_duplicate(value)
+            if key is not None:
+                self._slots[key][3] += 1
+                return key
+        key = self._next_key
+        self._next_key += 1
+        if isinstance(value, torch.Tensor):
+            dtype, device = value.dtype, value.device
+            if self.storage_dtype is not None and value.is_floating_point():
+                value = value.to(self.storage_dtype)
+            self._slots[key] = [self._store(key, value.detach()), dtype, device, 1]
+            if self.dedupe:
+                self._recent = ([(key, value)] + self._recent)[: self.dedupe_window]
+        else:
+            # keep non-tensor values (e.g. None alibi) as they are
+            self._slots[key] = [value, None, None, 1]
+        return key
+
+    def _drop_slot(self, key):
+        slot = self._slots[key]
+        slot[3] -= 1
+        if slot[3] == 0:
+            if slot[1] is not None:
+                self._release(slot[0])
+            self._recent = [(k, v) for k, v in self._recent if k != key]
+            del self._slots[key]
+
+    def append(self, value):
+        """Append the value of a new sample."""
+        self._entries.append(self._new_slot(value))
+
+    def __getitem__(self, idx):
+        """Get the value of the idx-th sample."""
+        if isinstance(idx, slice):
+            return [self[i] for i in range(len(self))[idx]]
+        stored, dtype, device, _ = self._slots[self._entries[idx]]
+        if dtype is None:
+            return stored
+        return self._load(stored).to(device=device, dtype=dtype)
+
+    def __setitem__(self, idx, value):
+        """Replace the value of the idx-th sample, the storage is reused when possible."""
+        key = self._entries[idx]
+        slot = self._slots[key]
+        if (
+            slot[3] == 1
+            and slot[1] is not None
+            and isinstance(value, torch.Tensor)
+            and value.dtype == slot[1]
+            and self._overwrite(slot[0], value if self.storage_dtype is None else value.to(self.storage_dtype))
+        ):
+            slot[2] = value.device
+            return
+        self._drop_slot(key)
+        self._entries[idx] = self._new_slot(value)
+
+    def __len__(self):
+        """Get the number of samples."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over the values of all samples."""
+        for idx in range(len(self)):
+            yield self[idx]
+
+    @property
+    def num_unique(self):
+        """Number of distinct stored values."""
+        return len(self._slots)
+
+    def clear(self):
+        """Drop all stored values."""
+        for key in list(self._slots):
+            slot = self._slots.pop(key)
+            if slot[1] is not None:
+                self._release(slot[0])
+        self._entries.clear()
+        self._recent.clear()
+
+
+class MemoryActivationCache(ActivationCache):
+    """Keep the activations in memory on their original device."""
+
+    def _store(self, key, value):
+        return value
+
+    def _load(self, stored):
+        return stored
+
+
+class DiskActivationCache(ActivationCache):
+    """Keep the activations in memory-mapped files, only the sample being used is materialized.
+
+    Replacing the value of a sample with a tensor of the same size rewrites its file in place,
+    so block outputs reuse the files of block inputs.
+    """
+
+    def __init__(self, cache_dir=None, storage_dtype=None, dedupe=False):
+        """Init a DiskActivationCache object.
+
+        Args:
+            cache_dir (str, optional): directory to create the cache files in. Defaults to the system temp dir.
+            storage_dtype (torch.dtype, optional): dtype to store floating tensors in. Defaults to None.
+            dedupe (bool, optional): whether to share the storage of equal tensors. Defaults to False.
+        """
+        super().__init__(storage_dtype=storage_dtype, dedupe=dedupe)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = tempfile.mkdtemp(prefix="act_cache_", dir=cache_dir or None)
+
+    def _map(self, path, numel, dtype):
+        return torch.from_file(path, shared=True, size=numel, dtype=dtype)
+
+    def _store(self, key, value):
+        value = value.contiguous()
+        path = os.path.join(self.cache_dir, f"{key}.bin")
+        if value.numel() > 0:
+            self._map(path, value.numel(), value.dtype).copy_(value.reshape(-1))
+        return [path, value.shape, value.dtype]
+
+    def _load(self, stored):
+        path, shape, dtype = stored
+        if shape.numel() == 0:
+            return torch.empty(shape, dtype=dtype)
+        # copy out of the mapped file, the file may be rewritten by the next __setitem__
+        return self._map(path, shape.numel(), dtype).view(shape).clone()
+
+    def _overwrite(self, stored, value):
+        path, shape, dtype = stored
+        if value.numel() != shape.numel() or value.dtype != dtype or value.numel() == 0:
+            return False
+        self._map(path, shape.numel(), dtype).copy_(value.detach().reshape(-1))
+        stored[1] = value.shape
+        return True
+
+    def _release(self, stored):
+        if os.path.exists(stored[0]):
+            os.remove(stored[0])
+
+    def clear(self):
+        """Drop all stored values and the cache directory."""
+        super().clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def __del__(self):
+        """Remove the cache directory."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def get_activation_cache(backend="memory", cache_dir=None, storage_dtype=None, dedupe=False):
+    """Create an activation cache.
+
+    Args:
+        backend (str, optional): select from ["memory", "disk"]. Defaults to "memory".
+        cache_dir (str, optional): directory of the disk backend. Defaults to None.
+        storage_dtype (torch.dtype or str, optional): dtype to store floating tensors in, a str is
+            one of ["fp32", "fp16", "bf16"]. Defaults to None.
+        dedupe (bool, optional): whether to share the storage of equal tensors. Defaults to False.
+
+    Returns:
+        ActivationCache: the cache.
+    """
+    assert backend in ACTIVATION_CACHE_BACKENDS, f"Only support {ACTIVATION_CACHE_BACKENDS} as cache backend."
+    if isinstance(storage_dtype, str):
+        assert storage_dtype in ACTIVATION_CACHE_DTYPES, f"Only support {list(ACTIVATION_CACHE_DTYPES)} as cache dtype."
+        storage_dtype = ACTIVATION_CACHE_DTYPES[storage_dtype]
+    if backend == "disk":
+        logger.debug(f"Cache calibration activations on disk under {cache_dir or tempfile.gettempdir()}.")
+        return DiskActivationCache(cache_dir=cache_dir, storage_dtype=storage_dtype, dedupe=dedupe)
+    return MemoryActivationCache(storage_dtype=storage_dtype, dedupe=dedupe)
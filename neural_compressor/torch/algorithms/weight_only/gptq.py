@@ -37,6 +37,7 @@ from neural_compressor.torch.utils import (
 )
 from neural_compressor.torch.utils.auto_accelerator import auto_detect_accelerator
 
+from .activation_cache import ActivationCache, get_activation_cache
 from .modules import INCWeightOnlyLinear
 
 if is_transformers_imported():
@@ -190,6 +191,9 @@ class RAWGPTQuantizer(object):
         model_path="",
         quant_lm_head=False,
         dataloader=None,
+        cache_backend="memory",
+        cache_dir="",
+        cache_dtype=None,
         *args,
         **kwargs,
     ):
@@ -217,6 +221,11 @@ class RAWGPTQuantizer(object):
             model_path (str): Model path that is used to load state_dict per layer.
             quant_lm_head (bool): Indicates whether quantize the lm_head layer in transformers. Defaults to False.
             device (str): cpu or cuda.
+            cache_backend (str): where to cache the block-wise calibration activations, select from
+                ["memory", "disk"]. "disk" keeps them in memory-mapped files. Defaults to "memory".
+            cache_dir (str): directory of the "disk" cache backend. Defaults to the system temp dir.
+            cache_dtype (str): dtype to cache the hidden states in, select from ["fp32", "fp16", "bf16"].
+                Defaults to None, which keeps the original dtype.
         """
         # model
         self.model = model
@@ -262,6 +271,11 @@ class RAWGPTQuantizer(object):
         self.dataloader = []
         self.nsamples = nsamples
 
+        # calibration activation cache
+        self.cache_backend = cache_backend
+        self.cache_dir = cache_dir
+        self.cache_dtype = cache_dtype
+
     def prepare_layer_wise(self, model_path, indicated_layers=None):
         """Prepare for layer-wise quantization, including registering hooks and setting up the model path.
 
@@ -369,6 +383,30 @@ class RAWGPTQuantizer(object):
         elif isinstance(data, tuple) or isinstance(data, list):
             return data[0]
 
+    def new_activation_cache(self, is_hidden_states):
+        """Create a cache for one block input of all calibration samples.
+
+        Args:
+            is_hidden_states (bool): whether the input is the hidden states, which are replaced by
+                the block outputs. The other inputs (attention mask, position ids, etc.) are usually
+                shared by samples, so their equal tensors are stored once.
+
+        Returns:
+            ActivationCache: the cache.
+        """
+        return get_activation_cache(
+            self.cache_backend,
+            cache_dir=self.cache_dir,
+            storage_dtype=self.cache_dtype if is_hidden_states else None,
+            dedupe=not is_hidden_states,
+        )
+
+    def clear_activation_cache(self):
+        """Release the cached calibration activations."""
+        for cache in list(self.cache_key_arguments.values()) + self.cache_positional_arguments:
+            if isinstance(cache, ActivationCache):
+                cache.clear()
+
     @torch.no_grad()
     def prepare_for_calibration(self):
         """Prepare input calibration data and other attributes which are critical for gptq execution."""
@@ -392,7 +430,9 @@ class RAWGPTQuantizer(object):
                 # each outputs can be different shape, hence also use list to store
                 if isinstance(kwargs[arg], torch.Tensor) or arg == "alibi":
                     if self.cache_key_arguments.get(arg, None) is None:
-                        self.cache_key_arguments[arg] = []
+                        self.cache_key_arguments[arg] = self.new_activation_cache(
+                            is_hidden_states=arg == "hidden_states"
+                        )
                     self.cache_key_arguments[arg].append(kwargs[arg])
                 continue
             # copy positional arguments, positional arguments are sensitive for their order, be cautious!
@@ -401,7 +441,7 @@ class RAWGPTQuantizer(object):
             for idx, item in enumerate(args):
                 if (idx + 1) > len(self.cache_positional_arguments):
                     # initialize
-                    self.cache_positional_arguments.append([])
+                    self.cache_positional_arguments.append(self.new_activation_cache(is_hidden_states=idx == 0))
                 self.cache_positional_arguments[idx].append(item)
             raise ValueError
 
@@ -493,9 +533,11 @@ class RAWGPTQuantizer(object):
             outs: the output of block.
         """
         if "hidden_states" in self.cache_key_arguments:
-            self.cache_key_arguments["hidden_states"] = outs[:]
+            hidden_states = self.cache_key_arguments["hidden_states"]
         else:
-            self.cache_positional_arguments[0] = outs[:]
+            hidden_states = self.cache_positional_arguments[0]
+        for j, out in enumerate(outs):
+            hidden_states[j] = out
 
     def find_true_sequential_config(self):
         """Find true sequential config.
@@ -956,11 +998,15 @@ class RAWGPTQuantizer(object):
                 new_module.pack(int_weight, gptq_scale, gptq_zp, bias, gptq_perm)
                 set_module(self.model, layer_name, new_module)
 
+        self.clear_activation_cache()
         # Clear temporary workspace
         if self.use_layer_wise:
             import shutil
 
+            from neural_compressor.torch.algorithms.layer_wise import clear_checkpoint_index_cache
+
             shutil.rmtree(LWQ_WORKSPACE, ignore_errors=True)
+            clear_checkpoint_index_cache()
         logger.info("Quantization done")
         # self.model.config.use_cache = self.use_cache
         return self.model
@@ -1374,6 +1420,9 @@ class GPTQuantizer(INCQuantizer):
         use_layer_wise=False,
         model_path=None,
         quant_lm_head=False,
+        cache_backend="memory",
+        cache_dir="",
+        cache_dtype=None,
         *args,
         **kwargs,
     ):
@@ -1394,6 +1443,9 @@ class GPTQuantizer(INCQuantizer):
             use_layer_wise=use_layer_wise,
             model_path=model_path,
             quant_lm_head=quant_lm_head,
+            cache_backend=cache_backend,
+            cache_dir=cache_dir,
+            cache_dtype=cache_dtype,
         )
         self.gptq_quantizer.prepare_for_calibration()
         return self.gptq_quantizer.model
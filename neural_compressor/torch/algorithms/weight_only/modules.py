@@ -329,9 +329,7 @@ class INCWeightOnlyLinear(WeightOnlyLinear):
         device = scales.device
         if self.g_idx is None:
             # used for recovering fp32_weight
-            self.g_idx = torch.tensor([i // self.group_size for i in range(self.in_features)], dtype=torch.int32).to(
-                device
-            )
+            self.g_idx = (torch.arange(self.in_features, dtype=torch.int32) // self.group_size).to(device)
         # unpack weight
         if not self.use_optimum_format and self.compression_dim == 0:
             qweight = qweight.T.contiguous()
@@ -340,10 +338,7 @@ class INCWeightOnlyLinear(WeightOnlyLinear):
             weight = weight.T.contiguous()
         weight = weight[: self.out_features, : self.in_features]  # avoid oversize
         if "int" not in self.dtype:
-            new_weight = torch.zeros(self.out_features, self.in_features).to(device)
-            for k, v in self.int2float_mapping.items():
-                new_weight += torch.where(weight == k, v, 0)
-            weight = new_weight
+            weight = self.int2float_lookup(weight)
 
         # unpack zero_point
         zp = None
@@ -369,23 +364,36 @@ class INCWeightOnlyLinear(WeightOnlyLinear):
         scales = unpack_params_dict.get("scales")
         zp = unpack_params_dict.get("zp")
 
-        device = scales.device
-
-        fp32_weight = torch.zeros(self.out_features, self.in_features, dtype=self.float_type).to(device)
-
-        # recover fp32 weight
+        # gather the per-group scale (and zero point) of every input channel at once
+        g_idx = self.g_idx.long()
+        g_scales = scales.index_select(1, g_idx)
         if zp is not None:
             # recover fp32 weight with int_weight, scale, and zero_point
-            for idx in range(self.in_features):
-                fp32_weight[:, idx] = (torch.subtract(weight[:, idx], zp[:, self.g_idx[idx]]).to(torch.int8)) * scales[
-                    :, self.g_idx[idx]
-                ]
+            fp32_weight = torch.subtract(weight, zp.index_select(1, g_idx)).to(torch.int8) * g_scales
         else:
             # recover fp32 weight with int_weight, scale
-            for idx in range(self.in_features):
-                fp32_weight[:, idx] = weight[:, idx] * scales[:, self.g_idx[idx]]
+            fp32_weight = weight * g_scales
+        return fp32_weight.to(self.float_type).to(scales.device)
+
+    def int2float_lookup(self, weight):
+        """Map the unpacked integer codes of nf4/fp4 weight to their float values with one gather.
 
-        return fp32_weight.to(scales.device)
+        Args:
+            weight (tensor): unpacked integer weight.
+
+        Returns:
+            tensor: float32 weight, codes missing from the mapping are mapped to 0.
+        """
+        keys = list(self.int2float_mapping.keys())
+        offset = min(keys)
+        table = torch.zeros(max(keys) - offset + 2, dtype=torch.float32, device=weight.device)
+        table[torch.tensor(keys, device=weight.device) - offset] = torch.tensor(
+            list(self.int2float_mapping.values()), dtype=torch.float32, device=weight.device
+        )
+        index = weight.long() - offset
+        # out of range codes point to the trailing zero entry of the table
+        index = torch.where((index < 0) | (index >= table.numel() - 1), table.numel() - 1, index)
+        return table[index]
 
     def pack_tensor_with_torch(self, raw_tensor):
         """Pack the tensor with torch.
@@ -420,20 +428,17 @@ class INCWeightOnlyLinear(WeightOnlyLinear):
             tensor: unpacked tensor.
         """
         target_dtype = torch.int16
-        target_len = packed_tensor.shape[1] * self.n_pack
-        unpacked_tensor = torch.zeros(packed_tensor.shape[0], target_len, dtype=target_dtype).to(packed_tensor.device)
-        mask = torch.tensor(2**self.bits - 1, dtype=self.compression_dtype).to(packed_tensor.device)
-        for j in range(packed_tensor.shape[1]):
-            for e in range(self.n_pack):
-                index = j * self.n_pack + e
-                tmp = packed_tensor[:, j]
-                tmp = tmp << (self.compress_bits - self.bits * (e + 1))
-                tmp = tmp >> self.compress_bits - self.bits
-                if hasattr(self, "qzeros"):
-                    tmp &= mask  # remove sign bit
-                unpacked_tensor[:, index].copy_(tmp.type(target_dtype))
-                accelerator.synchronize()
-        return unpacked_tensor
+        # shift every packed element to the top bits, then arithmetic shift it back down to keep the sign
+        left_shifts = torch.tensor(
+            [self.compress_bits - self.bits * (e + 1) for e in range(self.n_pack)],
+            dtype=packed_tensor.dtype,
+            device=packed_tensor.device,
+        )
+        unpacked_tensor = (packed_tensor.unsqueeze(-1) << left_shifts) >> (self.compress_bits - self.bits)
+        if hasattr(self, "qzeros"):
+            mask = torch.tensor(2**self.bits - 1, dtype=self.compression_dtype).to(packed_tensor.device)
+            unpacked_tensor &= mask  # remove sign bit
+        return unpacked_tensor.reshape(packed_tensor.shape[0], -1).type(target_dtype)
 
     def pack_array_with_numba(
         self, raw_array: np.ndarray, n_pack: int, bits: int, compress_bits: int, compression_dtype=np.int32
@@ -508,19 +513,15 @@ class INCWeightOnlyLinear(WeightOnlyLinear):
         if self.bits == 8 and self.compression_dtype == torch.int8 and hasattr(self, "qzeros"):
             # special case for unpacking uint8 date from int8 compression_dtype
             target_dtype = np.uint8
-        target_len = packed_array.shape[1] * self.n_pack
-        unpacked_array = np.zeros((packed_array.shape[0], target_len), dtype=target_dtype)
-        mask = np.uint8(2**self.bits - 1)
-        for j in range(packed_array.shape[1]):
-            for e in range(self.n_pack):
-                index = j * self.n_pack + e
-                tmp = packed_array[:, j]
-                tmp = np.left_shift(tmp, self.compress_bits - self.bits * (e + 1))
-                tmp = np.right_shift(tmp, self.compress_bits - self.bits)
-                if hasattr(self, "qzeros"):
-                    tmp &= mask
-                unpacked_array[:, index] = tmp.astype(target_dtype)
-                accelerator.synchronize()
+        left_shifts = np.array(
+            [self.compress_bits - self.bits * (e + 1) for e in range(self.n_pack)], dtype=packed_array.dtype
+        )
+        unpacked_array = np.right_shift(
+            np.left_shift(packed_array[:, :, None], left_shifts), self.compress_bits - self.bits
+        )
+        if hasattr(self, "qzeros"):
+            unpacked_array = unpacked_array & np.uint8(2**self.bits - 1)
+        unpacked_array = unpacked_array.reshape(packed_array.shape[0], -1).astype(target_dtype)
         unpacked_tensor = torch.from_numpy(unpacked_array).to(device=packed_tensor.device)
         return unpacked_tensor
 
@@ -20,7 +20,8 @@
 """RTN quantization."""
 
 import copy
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 import torch
 
@@ -99,6 +100,10 @@ class RTNQuantizer(Quantizer):
                                         Defaults to True.
             quant_lm_head (bool, optional):  Whether to quantize the lm_head layer.
                                         Defaults to False.
+            num_workers (int, optional): number of threads quantizing and packing layers in parallel.
+                                        Defaults to 1, which converts layers serially.
+            max_inflight_layers (int, optional): max number of layers being converted at the same time
+                                        when num_workers > 1, bounds the extra memory. Defaults to 2 * num_workers.
 
         Returns:
             model: fake quantized torch module
@@ -130,125 +135,193 @@ class RTNQuantizer(Quantizer):
 
         if use_layer_wise:
             from neural_compressor.common.utils import DEFAULT_WORKSPACE
-            from neural_compressor.torch.algorithms.layer_wise.utils import get_path, load_module
+            from neural_compressor.torch.algorithms.layer_wise.utils import (
+                clear_checkpoint_index_cache,
+                get_path,
+                load_module,
+            )
 
             if model_path == "":
                 model_path = model.path
             assert model_path, "model_path should not be None."
             model_path = get_path(model_path)
 
-        for name, m in model.named_modules():
-            if use_layer_wise and len(list(m.named_children())) == 0:
-                load_module(model, name, model_path, device=device)
-            if not isinstance(m, supported_layers):
-                continue
-            if name in weight_config:  # pragma: no cover
-                # initialize op configuration
-                dtype = weight_config[name].get("dtype", "int")
-                if dtype == "fp32":
-                    continue
-                # Move modules to the accelerator device layer-by-layer
-                if not use_layer_wise:
-                    m.to(device)
-                ### FP8 cast part
-                if dtype in ["fp8_e5m2", "fp8_e5m2fnuz", "fp8_e4m3fn", "fp8_e4m3fnuz"]:
-                    logger.debug("Cast module {} to FP8 using qdq mode, no scaling".format(name))
-                    m.weight = cast_fp8(m.weight, dtype, use_qdq=True)
-                    continue
-                ####
-                logger.debug("Apply RTN on module %s.", name)
-                bits = weight_config[name].get("bits", 4)
-                group_size = weight_config[name]["group_size"]
-                scheme = weight_config[name]["scheme"]
-                quantile = weight_config[name].get("quantile", 1.0)
-                group_dim = weight_config[name]["group_dim"]
-                use_full_range = weight_config[name]["use_full_range"]
-                use_mse_search = weight_config[name]["use_mse_search"]
-                use_optimum_format = kwargs.get("use_optimum_format", True)
-                # double quant config
-                double_quant_config = {
-                    "double_quant": weight_config[name]["use_double_quant"],
-                    "double_quant_dtype": weight_config[name]["double_quant_dtype"],
-                    "double_quant_bits": weight_config[name]["double_quant_bits"],
-                    "double_quant_scheme": weight_config[name]["double_quant_scheme"],
-                    "double_quant_group_size": weight_config[name]["double_quant_group_size"],
-                }
-                if dtype != "int" and "int" in dtype:
-                    bits = int(dtype.lstrip("int"))
-                    dtype = "int"
-            else:
-                continue
-            log_msg = (
-                f"RTN quantization config: bits={bits}, group_size={group_size}, "
-                + f"scheme={scheme}, quantile={quantile}"
-            )
-            if dtype != "int":
-                log_msg += f", dtype={dtype}"
-            elif scheme == "sym":  # nf4/fp4 is always [-7,7]
-                log_msg += f", use_full_range={use_full_range}"
-            if dtype == "fp32":
-                continue
-            logger.debug(f"RTN quantized module:{name, m}")
-            logger.debug(log_msg)
-
-            # for only group_dim is 0 or only `transformers.Conv1D`, we need transpose weight.
-            if is_transformers_imported():
-                transpose = (group_dim == 0) ^ (isinstance(m, transformers.Conv1D))
-            else:
-                transpose = group_dim == 0
-            if transpose:
-                weight = m.weight.detach().T.contiguous()
-            else:
-                weight = m.weight.detach()
-            if use_mse_search:
-                quantile = search_clip(m, bits, group_size, scheme, dtype, use_full_range)
-            int_weight, scale, zp = quant_tensor(
-                weight,
-                dtype=dtype,
-                bits=bits,
-                group_size=group_size,
-                scheme=scheme,
-                quantile=quantile,
-                return_int=True,
-                full_range=use_full_range,
-                **double_quant_config,
-            )
-            int_weight = int_weight.t_().contiguous() if transpose else int_weight
-            scale = scale.t_().contiguous() if transpose else scale
-            zp = zp.t_().contiguous() if transpose and zp is not None else zp
-            if isinstance(m, torch.nn.Linear):
-                in_features = m.in_features
-                out_features = m.out_features
-            elif is_transformers_imported() and isinstance(m, transformers.Conv1D):
-                in_features = m.weight.shape[0]
-                out_features = m.weight.shape[1]
-                int_weight = int_weight.t_().contiguous()
-                scale = scale.t_().contiguous()
-                zp = zp.t_().contiguous() if zp is not None else zp
-
-            new_module = INCWeightOnlyLinear(
-                in_features,
-                out_features,
-                dtype=dtype,
-                bits=bits,
-                group_size=group_size,
-                zp=zp is not None,
-                bias=m.bias is not None,
-                use_optimum_format=use_optimum_format,
-                device=device,
-            )
-            new_module.pack(int_weight, scale, zp, m.bias)
+        num_workers = kwargs.get("num_workers", 1)
+        executor = ThreadPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+        max_inflight_layers = kwargs.get("max_inflight_layers", None) or 2 * num_workers
+        pending = deque()
 
+        def _pop_pending():
+            name, m, future = pending.popleft()
+            return name, m, future.result()
+
+        def _replace_module(name, m, new_module):
             if use_layer_wise:
                 m = m.to_empty(device=torch.device("meta"))
-            if name == "":
-                return new_module
-            else:
-                set_module(model, name, new_module)
+            set_module(model, name, new_module)
             # Move modules back to the model device layer-by-layer
             if not use_layer_wise:
                 m.to(model_device)
                 new_module.to(model_device)
+
+        try:
+            for name, m in list(model.named_modules()) if executor is not None else model.named_modules():
+                if use_layer_wise and len(list(m.named_children())) == 0:
+                    load_module(model, name, model_path, device=device)
+                if not isinstance(m, supported_layers):
+                    continue
+                if name in weight_config:  # pragma: no cover
+                    # initialize op configuration
+                    dtype = weight_config[name].get("dtype", "int")
+                    if dtype == "fp32":
+                        continue
+                    # Move modules to the accelerator device layer-by-layer
+                    if not use_layer_wise:
+                        m.to(device)
+                    ### FP8 cast part
+                    if dtype in ["fp8_e5m2", "fp8_e5m2fnuz", "fp8_e4m3fn", "fp8_e4m3fnuz"]:
+                        logger.debug("Cast module {} to FP8 using qdq mode, no scaling".format(name))
+                        m.weight = cast_fp8(m.weight, dtype, use_qdq=True)
+                        continue
+                    ####
+                    logger.debug("Apply RTN on module %s.", name)
+                    bits = weight_config[name].get("bits", 4)
+                    group_size = weight_config[name]["group_size"]
+                    scheme = weight_config[name]["scheme"]
+                    quantile = weight_config[name].get("quantile", 1.0)
+                    group_dim = weight_config[name]["group_dim"]
+                    use_full_range = weight_config[name]["use_full_range"]
+                    use_mse_search = weight_config[name]["use_mse_search"]
+                    use_optimum_format = kwargs.get("use_optimum_format", True)
+                    # double quant config
+                    double_quant_config = {
+                        "double_quant": weight_config[name]["use_double_quant"],
+                        "double_quant_dtype": weight_config[name]["double_quant_dtype"],
+                        "double_quant_bits": weight_config[name]["double_quant_bits"],
+                        "double_quant_scheme": weight_config[name]["double_quant_scheme"],
+                        "double_quant_group_size": weight_config[name]["double_quant_group_size"],
+                    }
+                    if dtype != "int" and "int" in dtype:
+                        bits = int(dtype.lstrip("int"))
+                        dtype = "int"
+                else:
+                    continue
+                log_msg = (
+                    f"RTN quantization config: bits={bits}, group_size={group_size}, "
+                    + f"scheme={scheme}, quantile={quantile}"
+                )
+                if dtype != "int":
+                    log_msg += f", dtype={dtype}"
+                elif scheme == "sym":  # nf4/fp4 is always [-7,7]
+                    log_msg += f", use_full_range={use_full_range}"
+                if dtype == "fp32":
+                    continue
+                logger.debug(f"RTN quantized module:{name, m}")
+                logger.debug(log_msg)
+
+                quant_args = (
+                    m,
+                    dtype,
+                    bits,
+                    group_size,
+                    scheme,
+                    quantile,
+                    group_dim,
+                    use_full_range,
+                    use_mse_search,
+                    use_optimum_format,
+                    double_quant_config,
+                    device,
+                )
+                if name == "":
+                    return self._quantize_module(*quant_args)
+                if executor is None:
+                    new_module = self._quantize_module(*quant_args)
+                    _replace_module(name, m, new_module)
+                    continue
+                # bound the number of layers materialized at the same time, then keep the serial replacing order
+                if len(pending) >= max_inflight_layers:
+                    _replace_module(*_pop_pending())
+                pending.append((name, m, executor.submit(self._quantize_module, *quant_args)))
+            while pending:
+                _replace_module(*_pop_pending())
+        finally:
+            # also reached when a worker raises or the whole model is a single quantized layer
+            if executor is not None:
+                executor.shutdown()
+            if use_layer_wise:
+                clear_checkpoint_index_cache()
         if not use_layer_wise:
             model.to(model_device)
         return model
+
+    def _quantize_module(
+        self,
+        m,
+        dtype,
+        bits,
+        group_size,
+        scheme,
+        quantile,
+        group_dim,
+        use_full_range,
+        use_mse_search,
+        use_optimum_format,
+        double_quant_config,
+        device,
+    ):
+        """Quantize the weight of one module and pack it into a new INCWeightOnlyLinear.
+
+        It only reads the given module, so independent modules can be quantized in parallel.
+
+        Returns:
+            INCWeightOnlyLinear: the packed module.
+        """
+        # for only group_dim is 0 or only `transformers.Conv1D`, we need transpose weight.
+        if is_transformers_imported():
+            transpose = (group_dim == 0) ^ (isinstance(m, transformers.Conv1D))
+        else:
+            transpose = group_dim == 0
+        if transpose:
+            weight = m.weight.detach().T.contiguous()
+        else:
+            weight = m.weight.detach()
+        if use_mse_search:
+            quantile = search_clip(m, bits, group_size, scheme, dtype, use_full_range)
+        int_weight, scale, zp = quant_tensor(
+            weight,
+            dtype=dtype,
+            bits=bits,
+            group_size=group_size,
+            scheme=scheme,
+            quantile=quantile,
+            return_int=True,
+            full_range=use_full_range,
+            **double_quant_config,
+        )
+        int_weight = int_weight.t_().contiguous() if transpose else int_weight
+        scale = scale.t_().contiguous() if transpose else scale
+        zp = zp.t_().contiguous() if transpose and zp is not None else zp
+        if isinstance(m, torch.nn.Linear):
+            in_features = m.in_features
+            out_features = m.out_features
+        elif is_transformers_imported() and isinstance(m, transformers.Conv1D):
+            in_features = m.weight.shape[0]
+            out_features = m.weight.shape[1]
+            int_weight = int_weight.t_().contiguous()
+            scale = scale.t_().contiguous()
+            zp = zp.t_().contiguous() if zp is not None else zp
+
+        new_module = INCWeightOnlyLinear(
+            in_features,
+            out_features,
+            dtype=dtype,
+            bits=bits,
+            group_size=group_size,
+            zp=zp is not None,
+            bias=m.bias is not None,
+            use_optimum_format=use_optimum_format,
+            device=device,
+        )
+        new_module.pack(int_weight, scale, zp, m.bias)
+        return new_module
@@ -104,6 +104,8 @@ def rtn_entry(
             "use_layer_wise": quant_config.use_layer_wise,
             "model_path": quant_config.model_path,
             "quant_lm_head": quant_config.quant_lm_head,
+            "num_workers": quant_config.num_workers,
+            "max_inflight_layers": quant_config.max_inflight_layers,
         }
     )
     quantizer = get_quantizer(model, quantizer_cls=RTNQuantizer, quant_config=weight_config)
@@ -166,6 +168,9 @@ def gptq_entry(
             "use_layer_wise": quant_config.use_layer_wise,
             "model_path": quant_config.model_path,
             "quant_lm_head": quant_config.quant_lm_head,
+            "cache_backend": quant_config.cache_backend,
+            "cache_dir": quant_config.cache_dir,
+            "cache_dtype": quant_config.cache_dtype,
         }
     )
     kwargs.pop("example_inputs")
@@ -741,10 +746,12 @@ def mx_quant_entry(
     """
     logger.info("Quantize model with the mx quant algorithm.")
     from neural_compressor.torch.algorithms.mx_quant.mx import MXQuantizer
+    from neural_compressor.torch.algorithms.mx_quant.save_load import save
 
     quantizer = get_quantizer(model, quantizer_cls=MXQuantizer, quant_config=configs_mapping)
     model = quantizer.execute(model, mode=mode)
     model.qconfig = configs_mapping
+    model.save = MethodType(save, model)
     postprocess_model(model, mode, quantizer)
 
     return model
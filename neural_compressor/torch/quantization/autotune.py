@@ -14,17 +14,19 @@
 """Intel Neural Compressor Pytorch quantization AutoTune API."""
 
 
+import copy
 from copy import deepcopy
+from itertools import chain
 from typing import Callable, List, Optional, Union
 
 import torch
 
-from neural_compressor.common.base_config import BaseConfig, get_all_config_set_from_config_registry
+from neural_compressor.common.base_config import BaseConfig, ComposableConfig, get_all_config_set_from_config_registry
 from neural_compressor.common.base_tuning import EvaluationFuncWrapper, TuningConfig, init_tuning
-from neural_compressor.common.utils import dump_elapsed_time
+from neural_compressor.common.utils import GPTQ, HQQ, MIXED_PRECISION, MX_QUANT, RTN, dump_elapsed_time
 from neural_compressor.torch.quantization import quantize
 from neural_compressor.torch.quantization.config import FRAMEWORK_NAME, RTNConfig
-from neural_compressor.torch.utils import constants, logger
+from neural_compressor.torch.utils import constants, get_module, logger
 
 __all__ = [
     "autotune",
@@ -45,6 +47,139 @@ def get_rtn_double_quant_config_set() -> List[RTNConfig]:
     return rtn_double_quant_config_set
 
 
+# The algorithms only replace or update the modules listed in the configs mapping,
+# so their trials can be undone by restoring these modules instead of quantizing a copy of the model.
+MODULE_LOCAL_ALGOS = {RTN, GPTQ, HQQ, MX_QUANT, MIXED_PRECISION}
+
+
+class ModelSnapshot:
+    """Snapshot of the model state that a trial may change.
+
+    It records the attributes of every module and the state of the plain objects they refer to, e.g. the
+    model config, so modules replaced or attributes set anywhere in the model are put back after the trial.
+    Tensors are only recorded for the modules touched by the trial, the tensors of the other modules must
+    not be updated in place. The containers, objects and tensors are restored in place and the hook dicts
+    are left alone, so the handles of hooks registered on the model keep working.
+    """
+
+    def __init__(self, model: torch.nn.Module, op_names: List[str], clone_tensors: bool = True):
+        """Init a ModelSnapshot.
+
+        Args:
+            model (torch.nn.Module): the model to record.
+            op_names (List[str]): names of the modules touched by the trial.
+            clone_tensors (bool, optional): whether to copy the parameters and buffers of the touched modules
+                to CPU. It is required if the trial may update them in place. Defaults to True.
+        """
+        self.model = model
+        self.clone_tensors = clone_tensors
+        self.module_states = []
+        self.object_states = []
+        self.tensor_states = []
+        saved_ids = set()
+
+        def _save_object(obj):
+            if id(obj) in saved_ids:
+                return
+            saved_ids.add(id(obj))
+            self.object_states.append((obj, copy.copy(obj.__dict__)))
+
+        def _save_module(module):
+            if id(module) in saved_ids:
+                return
+            saved_ids.add(id(module))
+            # copy the containers, e.g. `_modules` and `_parameters`, which are updated when replacing a module
+            attrs, containers = {}, {}
+            for k, v in module.__dict__.items():
+                if _is_hook_dict(k):
+                    continue
+                if isinstance(v, (dict, set, list)):
+                    containers[k] = (v, copy.copy(v))
+                else:
+                    attrs[k] = v
+                    if _is_plain_object(v):
+                        _save_object(v)
+            self.module_states.append((module, attrs, containers))
+
+        def _save_tensors(module):
+            for tensor in chain(module._parameters.values(), module._buffers.values()):
+                if tensor is None or id(tensor) in saved_ids:
+                    continue
+                saved_ids.add(id(tensor))
+                data = tensor.detach().to("cpu", copy=True) if clone_tensors else tensor.data
+                self.tensor_states.append((tensor, data, tensor.device))
+
+        for module in model.modules():
+            _save_module(module)
+        for op_name in op_names:
+            module = get_module(model, op_name) if op_name else model
+            if module is None:
+                continue
+            for sub_module in module.modules():
+                _save_tensors(sub_module)
+
+    def restore(self) -> torch.nn.Module:
+        """Put the model back to the recorded state.
+
+        Returns:
+            torch.nn.Module: the restored model.
+        """
+        for obj, saved in self.object_states:
+            obj.__dict__.clear()
+            obj.__dict__.update(saved)
+        for module, attrs, containers in self.module_states:
+            for key in list(module.__dict__):
+                if key not in attrs and key not in containers and not _is_hook_dict(key):
+                    del module.__dict__[key]
+            module.__dict__.update(attrs)
+            for key, (container, saved) in containers.items():
+                if isinstance(container, list):
+                    container[:] = saved
+                else:
+                    container.clear()
+                    container.update(saved)
+                module.__dict__[key] = container
+        for tensor, data, device in self.tensor_states:
+            # keep the parameter and buffer objects, the storage of the trial may be shared by quantized modules
+            tensor.data = data.to(device) if self.clone_tensors else data
+        return self.model
+
+
+def _is_hook_dict(name: str) -> bool:
+    """Whether the module attribute holds hooks, e.g. `_forward_hooks`, which RemovableHandle refers to."""
+    return name.startswith("_") and "hooks" in name
+
+
+def _is_plain_object(value) -> bool:
+    """Whether the module attribute is an object whose state is kept in its __dict__, e.g. a model config."""
+    return (
+        hasattr(value, "__dict__")
+        and isinstance(value.__dict__, dict)
+        and not callable(value)
+        and not isinstance(value, (torch.nn.Module, torch.Tensor))
+    )
+
+
+def get_touched_op_names(model: torch.nn.Module, quant_config: BaseConfig) -> Optional[List[str]]:
+    """Get the names of modules that quantizing the model with quant_config will touch.
+
+    Args:
+        model (torch.nn.Module): the fp32 model.
+        quant_config (BaseConfig): the quantization config of the trial.
+
+    Returns:
+        Optional[List[str]]: the module names, or None if the algorithms may touch other parts of the model.
+    """
+    config_list = quant_config.config_list if isinstance(quant_config, ComposableConfig) else [quant_config]
+    if any(config.name not in MODULE_LOCAL_ALGOS for config in config_list):
+        return None
+    # get_model_info may update the config, e.g. with set_local, the trial quantizes with the original one
+    quant_config = deepcopy(quant_config)
+    model_info = quant_config.get_model_info(model=model)
+    configs_mapping = quant_config.to_config_mapping(model_info=model_info)
+    return [op_name for (op_name, _), config in configs_mapping.items() if getattr(config, "dtype", None) != "fp32"]
+
+
 def get_all_config_set() -> Union[BaseConfig, List[BaseConfig]]:
     """Generate all quant config set.
 
@@ -66,6 +201,10 @@ def autotune(
 ):
     """The main entry of auto-tune.
 
+    Trials of module-local algorithms (RTN, GPTQ, HQQ, MX and mixed precision) quantize `model` in place
+    and restore it after evaluation, so the returned model may be `model` itself, quantized with the best
+    config. Pass a deepcopy of the model to keep the fp32 model.
+
     Args:
         model (torch.nn.Module): _description_
         tune_config (TuningConfig): _description_
@@ -79,47 +218,79 @@ def autotune(
         The quantized model.
     """
     best_quant_model = None
+    best_trial_state = None
     eval_func_wrapper = EvaluationFuncWrapper(eval_fn, eval_args)
     config_loader, tuning_logger, tuning_monitor = init_tuning(tuning_config=tune_config)
-    baseline: float = eval_func_wrapper.evaluate(deepcopy(model))
+    baseline: float = eval_func_wrapper.evaluate(model)
     tuning_monitor.set_baseline(baseline)
     tuning_logger.tuning_start()
     for trial_index, quant_config in enumerate(config_loader, 1):
         tuning_logger.trial_start(trial_index=trial_index)
         tuning_logger.execution_start()
         logger.info(quant_config.to_dict())
-        # !!! Make sure to use deepcopy only when inplace is set to `True`.
-        q_model = quantize(
-            deepcopy(model),
-            quant_config=quant_config,
-            run_fn=run_fn,
-            run_args=run_args,
-            inplace=True,
-            example_inputs=example_inputs,
-        )
+        op_names = get_touched_op_names(model, quant_config)
+        if op_names is not None:
+            # quantize the model in place and restore the touched modules after the trial
+            fp32_state = ModelSnapshot(model, op_names)
+            q_model = quantize(
+                model,
+                quant_config=quant_config,
+                run_fn=run_fn,
+                run_args=run_args,
+                inplace=True,
+                example_inputs=example_inputs,
+            )
+        else:
+            fp32_state = None
+            # !!! Make sure to use deepcopy only when inplace is set to `True`.
+            q_model = quantize(
+                deepcopy(model),
+                quant_config=quant_config,
+                run_fn=run_fn,
+                run_args=run_args,
+                inplace=True,
+                example_inputs=example_inputs,
+            )
         tuning_logger.execution_end()
         tuning_logger.evaluation_start()
         eval_result: float = eval_func_wrapper.evaluate(q_model)
         tuning_logger.evaluation_end()
         tuning_monitor.add_trial_result(trial_index, eval_result, quant_config)
         tuning_logger.trial_end(trial_index)
+        best_trial_record = tuning_monitor.get_best_trial_record()
+        if best_trial_record.trial_index == trial_index:
+            # keep the quantized modules of the best trial to skip re-quantizing it, the previous best is released,
+            # other trials are replayed from their config
+            best_trial_state = None
+            if fp32_state is not None and q_model is model:
+                best_trial_state = ModelSnapshot(model, op_names, clone_tensors=False)
         if tuning_monitor.need_stop():
             logger.info("Stopped tuning.")
-            best_trial_record = tuning_monitor.get_best_trial_record()
             if best_trial_record.trial_index != trial_index:
-                logger.info("Re-quantizing with best quantization config...")
                 del q_model  # maybe gc.collect() is needed for memory release
-                best_quant_config: BaseConfig = best_trial_record.quant_config
-                # !!! Make sure to use deepcopy only when inplace is set to `True`.
-                q_model = quantize(
-                    deepcopy(model),
-                    quant_config=best_quant_config,
-                    run_fn=run_fn,
-                    run_args=run_args,
-                    inplace=True,
-                    example_inputs=example_inputs,
-                )
+                if fp32_state is not None:
+                    fp32_state.restore()
+                if best_trial_state is not None:
+                    logger.info("Restoring the model quantized with best quantization config...")
+                    q_model = best_trial_state.restore()
+                else:
+                    logger.info("Re-quantizing with best quantization config...")
+                    best_quant_config: BaseConfig = best_trial_record.quant_config
+                    is_local = get_touched_op_names(model, best_quant_config) is not None
+                    # !!! Make sure to use deepcopy only when inplace is set to `True`.
+                    q_model = quantize(
+                        model if is_local else deepcopy(model),
+                        quant_config=best_quant_config,
+                        run_fn=run_fn,
+                        run_args=run_args,
+                        inplace=True,
+                        example_inputs=example_inputs,
+                    )
             best_quant_model = q_model  # quantize model inplace
             break
+        if fp32_state is not None:
+            fp32_state.restore()
+        # only the best trial is kept alive while the next trial is quantized
+        del q_model
     tuning_logger.tuning_end()
     return best_quant_model
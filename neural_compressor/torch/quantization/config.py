@@ -123,6 +123,9 @@ class RTNConfig(TorchBaseConfig):
         "double_quant_group_size",
         # quant_lm_head
         "quant_lm_head",
+        # parallel conversion
+        "num_workers",
+        "max_inflight_layers",
     ]
     supported_configs: List[OperatorConfig] = []
 
@@ -146,6 +149,9 @@ class RTNConfig(TorchBaseConfig):
         double_quant_group_size: int = 256,
         # quant lm_head
         quant_lm_head: bool = False,
+        # parallel conversion
+        num_workers: int = 1,
+        max_inflight_layers: int = 0,
         # Tuning space
         white_list: Optional[List[OP_NAME_OR_MODULE_TYPE]] = DEFAULT_WHITE_LIST,
         **kwargs,
@@ -168,6 +174,9 @@ class RTNConfig(TorchBaseConfig):
             double_quant_use_sym (bool): Indicates whether double_quant scale are symmetric. Default is True.
             double_quant_group_size (int): Size of double_quant groups. Default is 32.
             quant_lm_head (bool): Indicates whether quantize the lm_head layer in transformers。 Default is False.
+            num_workers (int): Number of threads converting layers in parallel. Default is 1.
+            max_inflight_layers (int): Max number of layers converted at the same time when num_workers > 1,
+                0 means 2 * num_workers. Default is 0.
             white_list (Optional[List[OP_NAME_OR_MODULE_TYPE]]): White list of operator names or module types.
                 Default is DEFAULT_WHITE_LIST.
         """
@@ -188,6 +197,8 @@ class RTNConfig(TorchBaseConfig):
         self.double_quant_use_sym = double_quant_use_sym
         self.double_quant_group_size = double_quant_group_size
         self.quant_lm_head = quant_lm_head
+        self.num_workers = num_workers
+        self.max_inflight_layers = max_inflight_layers
         self._post_init()  # initialize global & local configuration
 
     @classmethod
@@ -245,7 +256,14 @@ class RTNConfig(TorchBaseConfig):
         """
         if not self.quant_lm_head:
             self.set_local(
-                LM_HEAD_NAMES, RTNConfig(dtype="fp32", use_layer_wise=self.use_layer_wise, model_path=self.model_path)
+                LM_HEAD_NAMES,
+                RTNConfig(
+                    dtype="fp32",
+                    use_layer_wise=self.use_layer_wise,
+                    model_path=self.model_path,
+                    num_workers=self.num_workers,
+                    max_inflight_layers=self.max_inflight_layers,
+                ),
             )
         config_mapping = super().to_config_mapping(config_list, model_info)
         return config_mapping
@@ -354,6 +372,10 @@ class GPTQConfig(TorchBaseConfig):
         "block_size",
         "static_groups",
         "true_sequential",
+        # calibration activation cache
+        "cache_backend",
+        "cache_dir",
+        "cache_dtype",
     ]
 
     def __init__(
@@ -380,6 +402,10 @@ class GPTQConfig(TorchBaseConfig):
         block_size: int = 2048,
         static_groups: bool = False,
         true_sequential: bool = False,
+        # calibration activation cache
+        cache_backend: str = "memory",
+        cache_dir: str = "",
+        cache_dtype: Optional[str] = None,
         # Tuning space
         white_list: Optional[List[OP_NAME_OR_MODULE_TYPE]] = DEFAULT_WHITE_LIST,
         **kwargs,
@@ -412,6 +438,12 @@ class GPTQConfig(TorchBaseConfig):
             true_sequential (bool): Whether to quantize layers within a transformer block in their original order.
                                   This can lead to higher accuracy but slower overall quantization process.
                                   Default is False.
+            cache_backend (str): Where to cache the block inputs of calibration samples, select from
+                                 ["memory", "disk"]. "disk" keeps them in memory-mapped files to reduce
+                                 peak memory. Default is "memory".
+            cache_dir (str): Directory of the "disk" cache backend. Default is "", the system temp dir.
+            cache_dtype (Optional[str]): Dtype to cache the hidden states in, select from ["fp32", "fp16", "bf16"].
+                                         Default is None, which keeps the original dtype.
             white_list (Optional[List[OP_NAME_OR_MODULE_TYPE]]): White list of operator names or module types.
                                                                  Default is DEFAULT_WHITE_LIST.
         """
@@ -437,6 +469,10 @@ class GPTQConfig(TorchBaseConfig):
         self.static_groups = static_groups
         self.true_sequential = true_sequential
         self.quant_lm_head = quant_lm_head
+        # calibration activation cache
+        self.cache_backend = cache_backend
+        self.cache_dir = cache_dir
+        self.cache_dtype = cache_dtype
         self._post_init()  # initialize global & local configuration
 
     @classmethod
@@ -468,7 +504,15 @@ class GPTQConfig(TorchBaseConfig):
         """
         if not self.quant_lm_head:
             self.set_local(
-                LM_HEAD_NAMES, GPTQConfig(dtype="fp32", use_layer_wise=self.use_layer_wise, model_path=self.model_path)
+                LM_HEAD_NAMES,
+                GPTQConfig(
+                    dtype="fp32",
+                    use_layer_wise=self.use_layer_wise,
+                    model_path=self.model_path,
+                    cache_backend=self.cache_backend,
+                    cache_dir=self.cache_dir,
+                    cache_dtype=self.cache_dtype,
+                ),
             )
         config_mapping = super().to_config_mapping(config_list, model_info)
         return config_mapping
@@ -1130,6 +1174,8 @@ class MXQuantConfig(TorchBaseConfig):
         "blocksize",
         "round_method",
         "weight_only",
+        "pack_weight",
+        "enable_torch_compile",
     ]
     name = MX_QUANT
 
@@ -1141,6 +1187,8 @@ class MXQuantConfig(TorchBaseConfig):
         blocksize: int = 32,
         round_method: str = "nearest",
         weight_only: bool = False,
+        pack_weight: bool = False,
+        enable_torch_compile: bool = False,
         white_list: Optional[List[OP_NAME_OR_MODULE_TYPE]] = DEFAULT_WHITE_LIST,
         **kwargs,
     ):
@@ -1153,6 +1201,10 @@ class MXQuantConfig(TorchBaseConfig):
             blocksize (int): Granularity to share the scale, default is 32.
             round_method (str): Round method, default is "nearest".
             weight_only (bool): Whether implement weight_only, default is False.
+            pack_weight (bool): Whether to store weights packed as shared exponents and element bits
+              instead of fake-quantized float weights, default is False.
+            enable_torch_compile (bool): Whether to compile the activation quantization with torch.compile,
+              once per data type and blocksize, default is False.
             white_list (Optional[List[OP_NAME_OR_MODULE_TYPE]]): White list of operator names or module types.
               Default is DEFAULT_WHITE_LIST.
         """
@@ -1163,6 +1215,8 @@ class MXQuantConfig(TorchBaseConfig):
         self.blocksize = blocksize
         self.round_method = round_method
         self.weight_only = weight_only
+        self.pack_weight = pack_weight
+        self.enable_torch_compile = enable_torch_compile
         self._post_init()
 
     @classmethod
@@ -24,6 +24,7 @@ from neural_compressor.torch.quantization.config import (
     FP8Config,
     GPTQConfig,
     HQQConfig,
+    MXQuantConfig,
     RTNConfig,
     TEQConfig,
 )
@@ -42,7 +43,7 @@ def load(model_name_or_path, original_model=None, format="default", device="cpu"
             from neural_compressor.torch.quantization import load
             load(model_name_or_path="saved_results", original_model=fp32_model)
 
-        case 2: INT8/FP8
+        case 2: INT8/FP8/MX
             from neural_compressor.torch.quantization import load
             load(model_name_or_path='saved_result', original_model=fp32_model)
 
@@ -103,6 +104,11 @@ def load(model_name_or_path, original_model=None, format="default", device="cpu"
                 qmodel = weight_only.load(model_name_or_path, original_model, format=LoadFormat.DEFAULT, device=device)
                 return qmodel.to(device)
 
+            if isinstance(config_object, MXQuantConfig):
+                from neural_compressor.torch.algorithms import mx_quant
+
+                return mx_quant.load(model_name_or_path, original_model)
+
             original_model.qconfig = config_mapping
             if isinstance(config_object, FP8Config):
                 # TODO: support loading FP8 model
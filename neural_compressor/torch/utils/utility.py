@@ -344,12 +344,16 @@ def load_empty_model(pretrained_model_name_or_path, cls=None, **kwargs):
     from transformers import AutoConfig, AutoModelForCausalLM
     from transformers.models.auto.auto_factory import _BaseAutoModelClass
 
+    from neural_compressor.torch.algorithms.layer_wise import refresh_checkpoint_index
+
     cls = AutoModelForCausalLM if cls is None else cls
     is_local = os.path.isdir(pretrained_model_name_or_path)
     if is_local:  # pragma: no cover
         path = pretrained_model_name_or_path
     else:
         path = dowload_hf_model(pretrained_model_name_or_path)
+    # a new layer-wise session starts, parse the checkpoint again if it was rewritten
+    refresh_checkpoint_index(path)
     if cls.__base__ == _BaseAutoModelClass:
         with init_empty_weights():
             model = cls.from_pretrained(path, **kwargs)
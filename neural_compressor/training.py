@@ -16,7 +16,6 @@
 # limitations under the License.
 """The configuration of the training loop."""
 import os
-import pickle
 import random
 from typing import Callable, List, Union
 
@@ -32,7 +31,7 @@ from .config import _Config, options
 from .metric import register_customer_metric
 from .model.model import Model
 from .utils import logger
-from .utils.utility import time_limit
+from .utils.utility import load_tuning_snapshot, time_limit
 
 
 class CompressionManager:
@@ -311,8 +310,7 @@ def fit(compression_manager, train_func, eval_func=None, eval_dataloader=None, e
     )
     if resume_file:
         assert os.path.exists(resume_file), "The specified resume file {} doesn't exist!".format(resume_file)
-        with open(resume_file, "rb") as f:
-            _resume = pickle.load(f).__dict__
+        _resume = load_tuning_snapshot(resume_file).__dict__
 
     if eval_func is None and eval_dataloader is None:  # pragma: no cover
         logger.info("Quantize model without tuning!")
@@ -16,6 +16,8 @@
 # limitations under the License.
 """KL Divergence: measure probability distribution difference to determine the thresholds per quantized op."""
 
+import numpy as np
+
 
 class KL_Divergence(object):  # pragma: no cover
     """The class of supporting KL divergence calibration algorithm."""
@@ -66,75 +68,96 @@ class KL_Divergence(object):  # pragma: no cover
         return (tmp_sum1 - tmp_sum2) / P_sum
 
     def get_threshold(self, hist, hist_edges, min_val, max_val, num_bins, quantized_type, num_quantized_bins=255):
-        """The interface of getting threshold per op using KL divergency algorithm."""
+        """The interface of getting threshold per op using KL divergency algorithm.
+
+        All candidate thresholds are evaluated at once with prefix sums, the results are the same as
+        evaluating them one by one with expand_quantized_bins and safe_entropy.
+        """
+        hist = np.asarray(hist)
         if min_val >= 0:
             ending_iter = num_bins - 1
             starting_iter = int(ending_iter * 0.7)
         else:
-            th = max(abs(max_val), abs(min_val))
             starting_iter = 0
             ending_iter = num_bins - 1
             if abs(max_val) > abs(min_val):
-                while starting_iter < ending_iter:
-                    if hist[starting_iter] == 0:
-                        starting_iter += 1
-                        continue
-                    else:
-                        break
+                nonzeros = np.flatnonzero(hist[starting_iter:ending_iter])
+                starting_iter = starting_iter + int(nonzeros[0]) if nonzeros.size else ending_iter
                 starting_iter += int((ending_iter - starting_iter) * 0.6)
             else:
-                while ending_iter > 0:
-                    if hist[ending_iter] == 0:
-                        ending_iter -= 1
-                        continue
-                    else:
-                        break
+                nonzeros = np.flatnonzero(hist[1 : ending_iter + 1])
+                ending_iter = int(nonzeros[-1]) + 1 if nonzeros.size else 0
                 starting_iter = int(0.6 * ending_iter)
 
         bin_width = hist_edges[1] - hist_edges[0]
-        min_kl_divergence = 0
         min_kl_index = 0
-        kl_inited = False
-
-        for i in range(starting_iter, ending_iter + 1):
-            reference_distr_P = hist[0:i].tolist()
-            outliers_count = sum(hist[i:2048])
-            if reference_distr_P[i - 1] == 0:
-                continue
-            reference_distr_P[i - 1] += outliers_count
-            reference_distr_bins = reference_distr_P[:]
-            candidate_distr_Q = hist[0:i].tolist()
-            num_merged_bins = int(i / num_quantized_bins)
-            candidate_distr_Q_quantized = [0] * num_quantized_bins
-            j_start = 0
-            j_end = num_merged_bins
-
-            for idx in range(num_quantized_bins):
-                candidate_distr_Q_quantized[idx] = sum(candidate_distr_Q[j_start:j_end])
-                j_start += num_merged_bins
-                j_end += num_merged_bins
-                if idx + 1 == num_quantized_bins - 1:
-                    j_end = i
-            candidate_distr_Q = self.expand_quantized_bins(candidate_distr_Q_quantized, reference_distr_bins)
-            P_sum = sum(reference_distr_P)
-            Q_sum = sum(candidate_distr_Q)
-            kl_divergence = self.safe_entropy(reference_distr_P, P_sum, candidate_distr_Q, Q_sum)
-            if not kl_inited:
-                min_kl_divergence = kl_divergence
-                min_kl_index = i
-                kl_inited = True
-            elif kl_divergence < min_kl_divergence:
-                min_kl_divergence = kl_divergence
-                min_kl_index = i
-            else:
-                pass
+        # candidate i keeps the first i bins, the ones whose last bin is empty are skipped
+        candidates = np.arange(max(starting_iter, 1), ending_iter + 1)
+        candidates = candidates[hist[candidates - 1] != 0]
+        if candidates.size:
+            kl_divergence = self._get_kl_divergence_of_candidates(hist, candidates, num_quantized_bins)
+            min_kl_index = int(candidates[np.argmin(kl_divergence)])
 
         if min_kl_index == 0:
-            while starting_iter > 0:
-                if hist[starting_iter] == 0:
-                    starting_iter -= 1
-                    continue
-                else:
-                    break
-            min_kl_index = starting_iter
+            nonzeros = np.flatnonzero(hist[1 : starting_iter + 1])
+            min_kl_index = int(nonzeros[-1]) + 1 if nonzeros.size else 0
         return (min_kl_index + 0.5) * bin_width
+
+    def _get_kl_divergence_of_candidates(self, hist, candidates, num_quantized_bins, max_elements=2**21):
+        """Compute the KL divergence of the candidate thresholds.
+
+        Candidate i keeps the first i bins. Bin merges are differences of prefix sums, and the
+        candidates are gathered into padded rows, processed in chunks of max_elements.
+
+        Args:
+            hist (np.array): histogram.
+            candidates (np.array): candidate thresholds in bins, the last kept bin should not be empty.
+            num_quantized_bins (int): number of quantized bins.
+            max_elements (int, optional): max number of elements of a chunk. Defaults to 2**21.
+
+        Returns:
+            np.array: KL divergence of each candidate.
+        """
+        hist = hist.astype(np.int64)
+        cumsum = np.zeros(hist.size + 1, dtype=np.int64)
+        np.cumsum(hist, out=cumsum[1:])
+        max_len = int(candidates.max())
+        positions = np.arange(max_len)
+        kl_divergence = np.empty(candidates.size)
+        chunk_size = max(1, max_elements // max_len)
+        for chunk_start in range(0, candidates.size, chunk_size):
+            length = candidates[chunk_start : chunk_start + chunk_size]
+            rows = np.arange(length.size)
+            valid = positions < length[:, None]
+            candidate_distr_Q = np.where(valid, hist[positions], 0)
+            reference_distr_P = candidate_distr_Q.copy()
+            # outliers are counted up to the 2048th bin
+            reference_distr_P[rows, length - 1] += cumsum[min(hist.size, 2048)] - cumsum[np.minimum(length, 2048)]
+
+            # merge bins into quantized bins, the last quantized bin takes the remainder
+            num_merged_bins = length // num_quantized_bins
+            bounds = np.arange(num_quantized_bins + 1) * num_merged_bins[:, None]
+            bounds[:, -1] = length
+            quantized_bins = np.diff(cumsum[bounds], axis=1)
+
+            # expand quantized bins to the non-empty reference bins
+            nonzero_P = reference_distr_P != 0
+            nonzeros_cumsum = np.zeros((length.size, max_len + 1), dtype=np.int64)
+            np.cumsum(nonzero_P, axis=1, out=nonzeros_cumsum[:, 1:])
+            nonzeros = np.diff(np.take_along_axis(nonzeros_cumsum, bounds, axis=1), axis=1)
+            avg_bin_ele = np.where(nonzeros != 0, quantized_bins / np.maximum(nonzeros, 1), 0.0)
+            block = np.minimum(positions // np.maximum(num_merged_bins, 1)[:, None], num_quantized_bins - 1)
+            block[num_merged_bins == 0] = num_quantized_bins - 1
+            expanded = np.where(nonzero_P, np.take_along_axis(avg_bin_ele, block, axis=1), 0.0)
+
+            # python sums are sequential, so are np.cumsum, this keeps the results identical to safe_entropy
+            P_sum = reference_distr_P.sum(axis=1)
+            Q_sum = np.cumsum(expanded, axis=1)[rows, length - 1]
+            P = reference_distr_P.astype(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                tmp_sum1 = np.where(nonzero_P, P * np.log(Q_sum[:, None] * P), 0.0)
+                tmp_sum2 = np.where(nonzero_P, P * np.log(P_sum[:, None] * expanded), 0.0)
+            tmp_sum1 = np.cumsum(tmp_sum1, axis=1)[rows, length - 1]
+            tmp_sum2 = np.cumsum(tmp_sum2, axis=1)[rows, length - 1]
+            kl_divergence[chunk_start : chunk_start + length.size] = (tmp_sum1 - tmp_sum2) / P_sum
+        return kl_divergence
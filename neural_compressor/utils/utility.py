@@ -397,12 +397,36 @@ def get_tuning_history(tuning_history_path):
     Args:
         tuning_history_path: The tuning history path, which need users to assign
     """
-    with open(tuning_history_path, "rb") as f:
-        strategy_object = pickle.load(f)
+    strategy_object = load_tuning_snapshot(tuning_history_path)
     tuning_history = strategy_object.tuning_history
     return tuning_history
 
 
+def load_tuning_snapshot(snapshot_path):
+    """Load the strategy saved in the history.snapshot.
+
+    The snapshot starts with the pickled strategy, followed by the tuning history records appended
+    in the tuning. The records are replayed on the strategy, an incomplete record left by an
+    interrupted tuning is dropped.
+
+    Args:
+        snapshot_path: The path of history.snapshot.
+
+    Returns:
+        The strategy object with the complete tuning history.
+    """
+    with open(snapshot_path, "rb") as f:
+        strategy_object = pickle.load(f)
+        while f.peek(1):
+            try:
+                record = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                logger.warning("Drop the incomplete tuning history record at the end of {}.".format(snapshot_path))
+                break
+            strategy_object._apply_tuning_history_record(record)
+    return strategy_object
+
+
 def recover(fp32_model, tuning_history_path, num, **kwargs):
     """Get offline recover tuned model.
 
@@ -3,6 +3,10 @@ import re
 import shutil
 import subprocess
 
+import psutil
+import pytest
+
+from neural_compressor.common.benchmark import get_pareto_frontier, summary_result_records
 from neural_compressor.common.utils import DEFAULT_WORKSPACE
 
 # build files during test process to test benchmark
@@ -31,6 +35,17 @@ print("Latency: 10 ms")
 """
 tmp_file_dict["./tmp/latency.py"] = tmp
 
+tmp = """
+import time
+from neural_compressor.common.benchmark import BenchmarkRecorder
+print("test benchmark")
+with BenchmarkRecorder(unit="images") as recorder:
+    for _ in range(5):
+        with recorder.step(num_samples=2):
+            time.sleep(0.01)
+"""
+tmp_file_dict["./tmp/recorder.py"] = tmp
+
 
 def build_tmp_file():
     os.makedirs("./tmp")
@@ -169,3 +184,39 @@ class TestBenchmark:
         assert num_i == 2, "the number of instance should be 2."
         assert all_c == 4, "the number of available cores should be num_i*num_c=4."
         assert check_log_file(log_file_path), "instance output is not correct."
+
+    @pytest.mark.skipif(psutil.cpu_count(logical=True) < 8, reason="cores 0-7 are bound to the instances.")
+    def test_recorder(self):
+        cmd = "incbench --num_i 2 --num_c 1 -C 0-7 --warmup 1 tmp/recorder.py"
+        p = trigger_process(cmd)
+        stdout, _ = p.communicate()
+        num_i, all_c, log_file_path = check_main_process(stdout.decode())
+        assert num_i == 2, "the number of instance should be 2."
+        assert check_log_file(log_file_path), "instance output is not correct."
+        assert re.search(r"Total throughput: ([0-9.]+) images/sec", stdout.decode()), "throughput is not reported."
+
+    def test_summary_result_records(self):
+        def steps(start, num_steps):
+            return [{"type": "meta", "unit": "tokens"}] + [
+                {"type": "step", "start": start + i, "end": start + i + 1, "samples": 10} for i in range(num_steps)
+            ]
+
+        # instance 2 starts 2 seconds late, so only [2, 6] is counted for both instances
+        summary = summary_result_records({1: steps(0, 6), 2: steps(2, 6)}, warmup=0)
+        assert summary["window"] == 4
+        assert summary["throughput"] == 20
+        assert summary["latency"] == 1000
+        assert summary["unit"] == "tokens"
+        # warmup steps are skipped before the window is computed
+        summary = summary_result_records({1: steps(0, 6), 2: steps(2, 6)}, warmup=3)
+        assert summary["window"] == 1
+        assert summary_result_records({1: steps(0, 2)}, warmup=2) is None
+
+    def test_pareto_frontier(self):
+        results = [
+            {"throughput": 100, "latency": 10},
+            {"throughput": 150, "latency": 20},
+            {"throughput": 120, "latency": 25},
+            {"throughput": 80, "latency": 8},
+        ]
+        assert get_pareto_frontier(results) == [0, 1, 3]
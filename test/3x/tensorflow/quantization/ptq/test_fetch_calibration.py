@@ -0,0 +1,80 @@
+import copy
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+try:
+    import tensorflow as tf
+
+    from neural_compressor.tensorflow.quantization.utils.graph_rewriter.generic.insert_print_node import (
+        InsertPrintMinMaxNode,
+    )
+    from neural_compressor.tensorflow.quantization.utils.graph_util import GraphRewriterHelper as Helper
+    from neural_compressor.tensorflow.quantization.utils.utility import MinMaxDataCollector
+    from neural_compressor.tensorflow.utils import CaptureOutputToFile
+
+    tensorflow_installed = True
+except ImportError:
+    tensorflow_installed = False
+
+
+def build_conv_graph():
+    graph = tf.Graph()
+    with graph.as_default():
+        x = tf.compat.v1.placeholder(tf.float32, [1, 8, 8, 3], name="input")
+        weight = tf.constant(np.random.randn(3, 3, 3, 4).astype(np.float32), name="weight")
+        bias = tf.constant(np.random.randn(4).astype(np.float32), name="bias")
+        conv = tf.nn.conv2d(x, weight, strides=[1, 1, 1, 1], padding="SAME", name="conv")
+        bias_add = tf.nn.bias_add(conv, bias, name="bias_add")
+        tf.nn.relu(bias_add, name="relu")
+    return graph.as_graph_def()
+
+
+def run_sampling_graph(graph_def, output_names, inputs, collector=None):
+    graph = tf.Graph()
+    with graph.as_default():
+        tf.compat.v1.import_graph_def(graph_def, name="")
+    with tf.compat.v1.Session(graph=graph) as sess:
+        for data in inputs:
+            outputs = sess.run(["relu:0"] + output_names, {"input:0": data})
+            if collector is not None:
+                collector(outputs)
+
+
+def parse_sampling_lines(lines):
+    return [(i.split(":")[0], [float(v) for v in i.split(":")[1][1:-1].split("][")]) for i in lines]
+
+
+@unittest.skipIf(not tensorflow_installed, "tensorflow is not installed")
+class TestFetchCalibration(unittest.TestCase):
+    def test_fetch_min_max(self):
+        graph_def = build_conv_graph()
+        inputs = [np.random.randn(1, 8, 8, 3).astype(np.float32) for _ in range(2)]
+
+        print_graph_def, print_output_names = InsertPrintMinMaxNode(
+            copy.deepcopy(graph_def), "conv", "relu", False
+        ).do_transformation()
+        log_path = tempfile.mkstemp(suffix=".log")[1]
+        with CaptureOutputToFile(log_path):
+            run_sampling_graph(print_graph_def, print_output_names, inputs)
+        expected = parse_sampling_lines(Helper.gen_valid_sampling_log(log_path))
+        os.remove(log_path)
+
+        min_max_inserter = InsertPrintMinMaxNode(copy.deepcopy(graph_def), "conv", "relu", False, True)
+        fetch_graph_def, fetch_output_names = min_max_inserter.do_transformation()
+        self.assertNotIn("Print", [node.op for node in fetch_graph_def.node])
+        collector = MinMaxDataCollector(min_max_inserter.min_max_records, 1)
+        run_sampling_graph(fetch_graph_def, fetch_output_names, inputs, collector)
+        result = parse_sampling_lines(collector.get_calibration_data())
+
+        # the input min/max and the requant range of relu for each batch
+        self.assertEqual(len(result), 3 * len(inputs))
+        self.assertEqual([key for key, _ in result], [key for key, _ in expected])
+        for (_, values), (_, expected_values) in zip(result, expected):
+            self.assertTrue(np.allclose(values, expected_values, rtol=1e-4, atol=1e-5))
+
+
+if __name__ == "__main__":
+    unittest.main()
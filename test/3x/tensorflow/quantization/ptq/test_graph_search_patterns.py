@@ -123,6 +123,47 @@ class TestGraphSearchPatterns(unittest.TestCase):
         res = analyzer.query_fusion_pattern_nodes([["MatMul"], ("BiasAdd"), ("Relu")])
         self.assertEqual(3, len(res[0][-1]))
 
+    def test_graph_search_multi_patterns(self):
+        float_graph_def = graph_pb2.GraphDef()
+        input_constant = QuantizeGraphHelper.create_constant_node(
+            "input_constant", value=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12], dtype=dtypes.float32, shape=[2, 6]
+        )
+        b_constant = QuantizeGraphHelper.create_constant_node(
+            "b_constant", value=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12], dtype=dtypes.float32, shape=[6, 2]
+        )
+        mat_mul_node = QuantizeGraphHelper.create_node("MatMul", "mat_mul", ["input_constant", "b_constant"])
+        relu_node = QuantizeGraphHelper.create_node("Relu", "relu", ["mat_mul"])
+        identity_node = QuantizeGraphHelper.create_node("Identity", "identity", ["relu"])
+        float_graph_def.node.extend([input_constant, b_constant, mat_mul_node, relu_node, identity_node])
+
+        analyzer = GraphAnalyzer()
+        analyzer.graph = float_graph_def
+        analyzer.parse_graph()
+        patterns = [[["MatMul"], ("BiasAdd",), ("Relu",)], [["Relu"], ["Identity"]], [["Conv2D"], ["Relu"]]]
+        res = analyzer.query_multi_fusion_pattern_nodes(patterns)
+        self.assertEqual(res, [analyzer.query_fusion_pattern_nodes(i) for i in patterns])
+        self.assertEqual(res[0], [["mat_mul", "relu", ["MatMul", "Relu"]]])
+        self.assertEqual(res[2], [])
+
+        # the op type index follows the node updates
+        self.assertEqual(analyzer.get_nodes_by_op_types(["Relu", "MatMul"]), ["mat_mul", "relu"])
+        relu6_node = QuantizeGraphHelper.create_node("Relu6", "relu6", ["mat_mul"])
+        analyzer.replace_node(relu6_node, "relu", ["identity"])
+        self.assertEqual(analyzer.get_nodes_by_op_types(["Relu", "Relu6"]), ["relu6"])
+        self.assertEqual(analyzer.query_fusion_pattern_nodes([["MatMul"], ("Relu",)]), [["mat_mul", ["MatMul"]]])
+        analyzer.remove_node("identity")
+        self.assertEqual(analyzer.get_nodes_by_op_types(["Identity"]), [])
+        # a node whose op is updated is found by a query for its new op only
+        analyzer.update_node_op("mat_mul", "BatchMatMul")
+        self.assertEqual(analyzer.node_name_details["mat_mul"].node.op, "BatchMatMul")
+        self.assertEqual(analyzer.get_nodes_by_op_types(["BatchMatMul"]), ["mat_mul"])
+        self.assertEqual(analyzer.get_nodes_by_op_types(["MatMul"]), [])
+        # a node whose op is changed directly is indexed under its new op once its old bucket is queried
+        analyzer.node_name_details["mat_mul"].node.op = "MatMul"
+        self.assertEqual(analyzer.get_nodes_by_op_types(["MatMul", "BatchMatMul"]), ["mat_mul"])
+        self.assertEqual(analyzer.get_nodes_by_op_types(["BatchMatMul"]), [])
+        self.assertEqual(analyzer.get_nodes_by_op_types(["MatMul"]), ["mat_mul"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,13 @@ import tensorflow as tf
 from tensorflow.core.framework import attr_value_pb2, graph_pb2, node_def_pb2
 from tensorflow.python.framework import tensor_util
 
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.generic.fold_batch_norm import (
+    FoldBatchNormNodesOptimizer,
+)
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.generic.remove_training_nodes import (
+    RemoveTrainingNodesOptimizer,
+)
+from neural_compressor.tensorflow.quantization.utils.graph_rewriter.graph_base import GraphRewritePipeline
 from neural_compressor.tensorflow.quantization.utils.graph_util import GraphAnalyzer, GraphRewriterHelper
 
 
@@ -163,6 +170,83 @@ class TestGraph_util(unittest.TestCase):
         assert self.add_node not in list(result_graph.node)
         assert new_add_node in list(result_graph.node)
 
+    def test_dump_graph_in_place(self):
+        graph_analyzer = GraphAnalyzer()
+        graph_analyzer.graph = copy.deepcopy(self.graph_def)
+        graph_analyzer.parse_graph()
+
+        new_add_node = node_def_pb2.NodeDef()
+        new_add_node.op = "Add"
+        new_add_node.name = "add1"
+        new_add_node.input.extend([self.input0_node.name, self.input1_node.name])
+        graph_analyzer.replace_node(new_add_node, self.add_node.name, [self.mul_node.name])
+        self.assertEqual(graph_analyzer.dirty_node_names, {"add", "add1"})
+        expected_graph = graph_analyzer.dump_graph()
+
+        result_graph = graph_analyzer.dump_graph(in_place=True)
+        self.assertIs(result_graph, graph_analyzer.graph)
+        self.assertEqual(graph_analyzer.dirty_node_names, set())
+        self.assertEqual(list(result_graph.node), list(expected_graph.node))
+
+    def test_rewrite_pipeline(self):
+        def make_const(name, value):
+            return GraphRewriterHelper.create_constant_node(name, value, tf.float32)
+
+        def make_node(op, name, inputs):
+            node = node_def_pb2.NodeDef()
+            node.op = op
+            node.name = name
+            node.input.extend(inputs)
+            node.attr["T"].CopyFrom(attr_value_pb2.AttrValue(type=tf.float32.as_datatype_enum))
+            return node
+
+        conv_node = make_node("Conv2D", "conv", ["input_identity", "weight"])
+        conv_node.attr["strides"].CopyFrom(attr_value_pb2.AttrValue(list=attr_value_pb2.AttrValue.ListValue(i=[1] * 4)))
+        conv_node.attr["padding"].CopyFrom(attr_value_pb2.AttrValue(s=b"SAME"))
+        conv_node.attr["data_format"].CopyFrom(attr_value_pb2.AttrValue(s=b"NHWC"))
+        bn_node = make_node("FusedBatchNormV3", "bn", ["conv", "gamma", "beta", "mean", "var"])
+        bn_node.attr["epsilon"].CopyFrom(attr_value_pb2.AttrValue(f=0.001))
+        graph_def = graph_pb2.GraphDef()
+        graph_def.node.extend(
+            [
+                make_node("Placeholder", "input", []),
+                make_node("Identity", "input_identity", ["input"]),
+                make_const("weight", np.random.randn(3, 3, 3, 4)),
+                conv_node,
+                make_const("gamma", np.random.randn(4)),
+                make_const("beta", np.random.randn(4)),
+                make_const("mean", np.random.randn(4)),
+                make_const("var", np.abs(np.random.randn(4))),
+                bn_node,
+                make_node("Identity", "bn_identity", ["bn"]),
+                make_node("Relu", "output", ["bn_identity"]),
+            ]
+        )
+        # bn_identity is kept until the last pass, which then needs the output edges updated by the fold
+        passes = [
+            (RemoveTrainingNodesOptimizer, ["output", "bn_identity"]),
+            (FoldBatchNormNodesOptimizer, None),
+            (RemoveTrainingNodesOptimizer, ["output"]),
+        ]
+
+        expected_graph = copy.deepcopy(graph_def)
+        for rewriter_cls, protected_nodes in passes:
+            args = [] if protected_nodes is None else [protected_nodes]
+            expected_graph = rewriter_cls(copy.deepcopy(expected_graph), *args).do_transformation()
+
+        pipeline = GraphRewritePipeline(graph_def)
+        for rewriter_cls, protected_nodes in passes:
+            args = [] if protected_nodes is None else [protected_nodes]
+            result_graph = pipeline.run(rewriter_cls, *args)
+
+        self.assertEqual([stats["shared_analysis"] for stats in pipeline.stats], [False, True, True])
+        self.assertEqual([node.op for node in result_graph.node if node.name == "output"], ["Relu"])
+        self.assertNotIn("Identity", [node.op for node in result_graph.node])
+        self.assertNotIn("FusedBatchNormV3", [node.op for node in result_graph.node])
+        self.assertEqual(
+            {node.name: node for node in result_graph.node}, {node.name: node for node in expected_graph.node}
+        )
+
     def test_freeze_value_regrex(self):
         sample_str_1 = ";efficientnet-b3/model/blocks_14/se/conv2d/Conv2D_eightbit_requant_range__print__;__requant_min_max:[-2.35420851e+09][2.59383834e+09]"
         sample_str_2 = ";efficientnet-b3/model/blocks_15/se/conv2d/Conv2D_eightbit_requant_range__print__;__requant_min_max:[-1.254][2.59383834]"
@@ -9,6 +9,8 @@ from tensorflow.python.framework import dtypes
 from neural_compressor.tensorflow import Model
 from neural_compressor.tensorflow.quantization.utils.graph_util import GraphRewriterHelper as Helper
 from neural_compressor.tensorflow.quantization.utils.utility import (
+    HistogramDataCollector,
+    MinMaxDataCollector,
     collate_tf_preds,
     fix_ref_type_of_graph_def,
     generate_feed_dict,
@@ -17,7 +19,7 @@ from neural_compressor.tensorflow.quantization.utils.utility import (
     get_tensor_by_name,
     is_ckpt_format,
 )
-from neural_compressor.tensorflow.utils import disable_random
+from neural_compressor.tensorflow.utils import combine_histogram, disable_random, get_tensor_histogram
 
 
 def build_fake_graphdef():
@@ -180,6 +182,45 @@ class TestTFutil(unittest.TestCase):
         self.assertEqual(feed_dict[input_tensor_0], input_0)
         self.assertEqual(feed_dict[input_tensor_1], input_1)
 
+    def test_min_max_data_collector(self):
+        records = [
+            (";conv_eightbit_min_input__print__;__min:", ";conv_eightbit_max_input__print__;__max:", "a:0", "b:0"),
+            (
+                ";conv_eightbit_requant_range__print__;__requant_min:",
+                ";conv_eightbit_requant_range__print__;__requant_max:",
+                "c:0",
+                "d:0",
+            ),
+        ]
+        collector = MinMaxDataCollector(records, 1)
+        collector([np.zeros(2), np.float32(-1.5), np.float32(2.5), np.float32(-0.5), np.float32(4.0)])
+        collector([np.zeros(2), np.float32(-2.0), np.float32(1.0), np.float32(-0.25), np.float32(-1.0)])
+
+        # the printed log of the same two batches
+        log_path = "./test_min_max_data_collector.log"
+        with open(log_path, "w") as f:
+            for values in (("-1.5", "2.5", "-0.5", "4"), ("-2", "1", "-0.25", "-1")):
+                f.write(";conv_eightbit_max_input__print__;__max:[{}]\n".format(values[1]))
+                f.write(";conv_eightbit_min_input__print__;__min:[{}]\n".format(values[0]))
+                f.write(";conv_eightbit_requant_range__print__;__requant_max:[{}]\n".format(values[3]))
+                f.write(";conv_eightbit_requant_range__print__;__requant_min:[{}]\n".format(values[2]))
+        expected = Helper.gen_valid_sampling_log(log_path)
+        os.remove(log_path)
+
+        parse = lambda lines: [(i.split(":")[0], [float(v) for v in i.split(":")[1][1:-1].split("][")]) for i in lines]
+        self.assertEqual(parse(collector.get_calibration_data()), parse(expected))
+
+    def test_histogram_data_collector(self):
+        data = [np.random.randn(4, 8).astype(np.float32), 3 * np.random.randn(4, 8).astype(np.float32)]
+        collector = HistogramDataCollector(["conv_eightbit_requant_range"], 1)
+        for batch in data:
+            collector([np.zeros(2), batch])
+
+        expected = combine_histogram(get_tensor_histogram(data[0].ravel()), data[1].ravel())
+        histogram = collector.histograms["conv_eightbit_requant_range"]
+        self.assertTrue((histogram[0] == expected[0]).all())
+        self.assertEqual(histogram[2:], expected[2:])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+import torch
+
+from neural_compressor.torch.algorithms.fp8_quant._core.common import load_npz, save_npz
+from neural_compressor.torch.algorithms.fp8_quant._core.measure import (
+    MaxAbsPerChannelObserver,
+    merge_measurements,
+    observer_updates,
+)
+
+
+def get_measurements(rank, value, nodes=("linear",)):
+    return {
+        "GlobalRank": rank,
+        "LocalRank": rank,
+        "Mode": "DynamicRange",
+        "Nodes": {
+            name: {
+                "inputs": [np.full((1, 1), value, dtype=np.float32)],
+                "params": {"weight": np.arange(4, dtype=np.float32).reshape(4, 1) * value},
+            }
+            for name in nodes
+        },
+    }
+
+
+# test purpose is to validate that measurements are saved without pickling and loaded back unchanged
+def test_save_load_npz(tmp_path):
+    fname = str(tmp_path / "measure.npz")
+    d = get_measurements(0, 2.0)
+    save_npz(d, fname)
+    np.load(fname, allow_pickle=False)
+    loaded = load_npz(fname)
+    assert loaded["GlobalRank"] == 0 and loaded["Mode"] == "DynamicRange"
+    np.testing.assert_array_equal(
+        loaded["Nodes"]["linear"]["params"]["weight"], d["Nodes"]["linear"]["params"]["weight"]
+    )
+
+
+# test purpose is to validate that per-rank measurements are merged by an elementwise maximum
+def test_merge_measurements(tmp_path):
+    fnames = []
+    for rank, (value, nodes) in enumerate([(1.0, ("linear",)), (3.0, ("linear", "lm_head")), (2.0, ("linear",))]):
+        fnames.append(str(tmp_path / "measure_{}.npz".format(rank)))
+        save_npz(get_measurements(rank, value, nodes), fnames[-1])
+    merged_fname = str(tmp_path / "measure.npz")
+    merge_measurements(fnames, merged_fname)
+    merged = load_npz(merged_fname)
+    assert merged["GlobalRank"] is None
+    assert set(merged["Nodes"]) == {"linear", "lm_head"}
+    np.testing.assert_array_equal(merged["Nodes"]["linear"]["inputs"][0], [[3.0]])
+    np.testing.assert_array_equal(merged["Nodes"]["linear"]["params"]["weight"], [[0.0], [3.0], [6.0], [9.0]])
+
+    shape_fname = str(tmp_path / "shape.npz")
+    d = get_measurements(0, 1.0)
+    d["Mode"] = "Shape"
+    save_npz(d, shape_fname)
+    with pytest.raises(ValueError):
+        merge_measurements([merged_fname, shape_fname], merged_fname)
+
+
+# test purpose is to validate that the per channel observer matches the max abs of each channel
+@pytest.mark.parametrize("dim", [0, 1, -1])
+def test_per_channel_observer(dim):
+    observer = MaxAbsPerChannelObserver.__new__(MaxAbsPerChannelObserver)
+    observer.dim, observer.first, observer.used = dim, True, False
+    inputs = [torch.randn(3, 5, 7) for _ in range(3)]
+    for x in inputs:
+        observer.measure(x)
+    observer_updates.flush()
+    expected = torch.stack([x.abs().movedim(dim, -1).reshape(-1, x.shape[dim]).amax(0) for x in inputs]).amax(0)
+    assert torch.equal(observer.state, expected.reshape(-1, 1))
@@ -0,0 +1,94 @@
+import copy
+import shutil
+
+import pytest
+import torch
+import transformers
+
+from neural_compressor.torch.algorithms.layer_wise.utils import (
+    clear_checkpoint_index_cache,
+    get_checkpoint_index,
+    get_prefetcher,
+    load_module,
+    load_value,
+)
+from neural_compressor.torch.utils import load_empty_model
+
+
+class TestCheckpointIndex:
+    def setup_class(self):
+        config = transformers.GPTJConfig(
+            n_layer=2, n_embd=32, n_head=4, rotary_dim=4, vocab_size=64, n_positions=32, tie_word_embeddings=False
+        )
+        self.model = transformers.GPTJForCausalLM(config).eval()
+        self.model.to(torch.bfloat16).save_pretrained("lwq_sharded_model", max_shard_size="20KB")
+        self.model.save_pretrained("lwq_single_model", safe_serialization=False)
+        self.state_dict = self.model.to(torch.bfloat16).state_dict()
+
+    def teardown_class(self):
+        clear_checkpoint_index_cache()
+        shutil.rmtree("lwq_sharded_model", ignore_errors=True)
+        shutil.rmtree("lwq_single_model", ignore_errors=True)
+
+    def test_sharded_safetensors(self):
+        index = get_checkpoint_index("lwq_sharded_model")
+        assert index.format == "safetensors"
+        assert get_checkpoint_index("lwq_sharded_model") is index, "index should be parsed only once."
+        assert len({shard for shard, _, _, _, _ in index.weight_map.values()}) > 1
+        for name, value in self.state_dict.items():
+            if name not in index.weight_map:
+                continue
+            shard, offset = index.locate(name)
+            assert shard.endswith(".safetensors") and offset > 0
+            loaded = index.get_tensor(name)
+            assert loaded.dtype == torch.bfloat16
+            assert torch.equal(loaded, value)
+        # prefix of the base model is optional
+        assert torch.equal(
+            index.get_tensor("transformer.wte.weight", prefix="transformer"), self.state_dict["transformer.wte.weight"]
+        )
+
+    def test_pytorch_bin(self):
+        index = get_checkpoint_index("lwq_single_model")
+        assert index.format == "bin"
+        model = load_empty_model("lwq_single_model")
+        value = load_value(model, "transformer.h.0.attn.q_proj.weight", "lwq_single_model")
+        assert torch.equal(value, self.model.state_dict()["transformer.h.0.attn.q_proj.weight"].float())
+
+    def test_prefetch_next_module(self):
+        model = load_empty_model("lwq_sharded_model")
+        prefetcher = get_prefetcher("lwq_sharded_model")
+        # GPTJ attention is defined in the order of k_proj, v_proj, q_proj, out_proj
+        assert prefetcher.next_module_name(model, "transformer.h.0.attn.k_proj") == "transformer.h.0.attn.v_proj"
+        load_module(model, "transformer.h.0.attn.k_proj", "lwq_sharded_model")
+        assert list(prefetcher._futures) == ["transformer.h.0.attn.v_proj.weight"]
+        load_module(model, "transformer.h.0.attn.v_proj", "lwq_sharded_model")
+        assert list(prefetcher._futures) == ["transformer.h.0.attn.q_proj.weight"]
+        assert torch.equal(
+            model.transformer.h[0].attn.v_proj.weight, self.state_dict["transformer.h.0.attn.v_proj.weight"]
+        )
+        # a prefetched tensor which is not used is dropped by the next prefetch
+        load_module(model, "transformer.h.1.mlp.fc_in", "lwq_sharded_model")
+        assert list(prefetcher._futures) == ["transformer.h.1.mlp.fc_out.weight", "transformer.h.1.mlp.fc_out.bias"]
+        load_module(model, "transformer.h.1.mlp.fc_out", "lwq_sharded_model", prefetch=False)
+        assert not prefetcher._futures
+        assert torch.equal(model.transformer.h[1].mlp.fc_out.bias, self.state_dict["transformer.h.1.mlp.fc_out.bias"])
+
+    def test_rewritten_checkpoint(self):
+        index = get_checkpoint_index("lwq_single_model")
+        prefetcher = get_prefetcher("lwq_single_model")
+        model = copy.deepcopy(self.model).float()
+        with torch.no_grad():
+            model.transformer.h[0].attn.q_proj.weight.add_(1)
+        model.save_pretrained("lwq_single_model", safe_serialization=False)
+        # the checkpoint is checked once per session, not on every load
+        assert get_checkpoint_index("lwq_single_model") is index
+        # a new session replaces the cached index and prefetcher of the rewritten checkpoint
+        empty_model = load_empty_model("lwq_single_model")
+        new_index = get_checkpoint_index("lwq_single_model")
+        assert new_index is not index
+        assert get_prefetcher("lwq_single_model") is not prefetcher
+        value = load_value(empty_model, "transformer.h.0.attn.q_proj.weight", "lwq_single_model")
+        assert torch.equal(value, model.state_dict()["transformer.h.0.attn.q_proj.weight"])
+        clear_checkpoint_index_cache()
+        assert get_checkpoint_index("lwq_single_model") is not new_index
@@ -20,3 +20,51 @@ def test_mx_quant_utility():
         utils.quantize_elemwise_op(tensor, "test")
     with pytest.raises(Exception):
         utils._round_mantissa(tensor, 3, "test")
+
+
+@pytest.mark.parametrize(
+    "elem_format",
+    ["int8", "int4", "int2", "fp8_e5m2", "fp8_e4m3", "fp6_e3m2", "fp6_e2m3", "fp4", "float16", "bfloat16"],
+)
+def test_mx_pack_unpack(elem_format):
+    tensor = torch.randn((3, 50)) * torch.logspace(-20, 20, 50)
+    tensor[0, :8] = 0
+    packed, shared_exp = utils.pack_mx_op(tensor, elem_format, "nearest", 16)
+    bits, _ = utils._get_elem_values(utils.ElemFormat.from_str(elem_format))
+    assert packed.dtype == torch.uint8 and packed.numel() == 3 * 64 * bits // 8
+    assert shared_exp.dtype == torch.uint8 and shared_exp.shape == (3, 4)
+    # bit-exact with the fake quantization, including the sign of zeros
+    expected = utils.quantize_mx_op(tensor, elem_format, "nearest", 16, axes=[-1])
+    result = utils.unpack_mx_op(packed, shared_exp, elem_format, 16, tensor.shape)
+    assert torch.equal(expected.view(torch.int32), result.view(torch.int32))
+
+
+@pytest.mark.parametrize("elem_format", ["int8", "int2", "fp8_e5m2", "fp8_e4m3", "fp6_e2m3", "fp4", "bfloat16"])
+@pytest.mark.parametrize("round", ["nearest", "floor", "even"])
+@pytest.mark.parametrize("block_size", [8, 32])
+def test_quantize_mx_fused(elem_format, round, block_size):
+    tensor = torch.randn((2, 3, 50)) * torch.logspace(-40, 38, 50)
+    tensor[0, 0, :4] = torch.tensor([0.0, -0.0, 1e-45, -1e-45])
+    tensor[0, 1, :6] = torch.tensor([0.5, 1.5, 2.5, -0.5, -2.5, 6.0])
+    tensor[1, 0, 10] = float("inf")
+    expected = utils._quantize_mx(
+        tensor, 8, utils.ElemFormat.from_str(elem_format), axes=[-1], block_size=block_size, round=round
+    )
+    result = utils.quantize_mx_op(tensor, elem_format, round, block_size, axes=[-1])
+    # bit-exact with the reference, NaNs of the blocks with an Inf aside
+    assert torch.equal(torch.isnan(expected), torch.isnan(result))
+    assert torch.equal(expected.nan_to_num().view(torch.int32), result.nan_to_num().view(torch.int32))
+
+
+def test_mx_scratch(monkeypatch):
+    tensor = torch.randn((4, 64))
+    utils.quantize_mx_op(tensor, "int8", "nearest", 32, axes=[-1])
+    assert utils._mx_scratch.buffers
+    utils.clear_mx_scratch()
+    assert not utils._mx_scratch.buffers
+    # tensors above the threshold don't grow the cached buffers
+    monkeypatch.setattr(utils, "_MX_SCRATCH_MAX_NUMEL", 128)
+    utils.quantize_mx_op(tensor, "int8", "nearest", 32, axes=[-1])
+    assert not utils._mx_scratch.buffers
+    with pytest.raises(Exception):
+        utils.quantize_mx_op(tensor, "int8", "nearest", 0, axes=[-1])
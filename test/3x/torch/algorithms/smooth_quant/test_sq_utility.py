@@ -35,3 +35,42 @@ def test_captured_dataloader():
     assert tmp_model == fp32_model, "Model should be same after building dataloader. Please check."
     assert isinstance(dataloader.args_list[0][0], torch.Tensor), "Args list should contain tensors. Please check."
     assert not dataloader.kwargs_list[0], "Kwargs list should be empty. Please check."
+
+
+def test_auto_alpha_multi_alpha_loss():
+    from neural_compressor.torch.algorithms.smooth_quant.utility import AutoAlpha, Calibration, get_module
+
+    example_inputs = torch.randn([8, 3])
+    tuner = AutoAlpha(
+        copy.deepcopy(model),
+        [example_inputs],
+        {"fc1": ["fc2"]},
+        op_types=[torch.nn.Linear],
+        device="cpu",
+        q_func=None,
+        example_inputs=example_inputs,
+        alpha_min=0.1,
+        alpha_max=0.9,
+        alpha_step=0.1,
+    )
+    with torch.no_grad():
+        calib = Calibration(tuner.model, [example_inputs], None, "cpu")
+        tuner.input_mins, tuner.input_maxes = calib.calibrate(1, tuner.op_types)
+        for key in tuner.input_mins.keys():
+            tuner.input_maxes_abs[key] = torch.max(torch.abs(tuner.input_mins[key]), torch.abs(tuner.input_maxes[key]))
+        tuner._save_scale = False
+        tuner.fp32_output_val = {}
+        tuner.default_tune_setup()
+        loss_alphas = tuner._get_one_batch_auto_loss(example_inputs, tuner.alpha_space, 0.5, tuner.input_maxes_abs)
+
+        # losses of the batched evaluation match evaluating the alpha values one by one
+        module = get_module(tuner.model, "fc2")
+        fp32_output = module.orig_layer(tuner.model.fc1.orig_layer(example_inputs))
+        for alpha in tuner.alpha_space:
+            absorb_scales, weight_scales = tuner._cal_scales(tuner.absorb_to_layer, tuner.input_maxes_abs, alpha)
+            tuner._update_scales_for_auto(absorb_scales, weight_scales)
+            output = module.q_dq_forward(module.q_input, module.input_scale, module.weight_scale)
+            expected = tuner._get_auto_loss(fp32_output, output)
+            assert torch.allclose(
+                loss_alphas["fc2"][str(alpha)], expected, rtol=1e-3
+            ), "Loss mismatch at alpha {}.".format(alpha)
@@ -0,0 +1,77 @@
+import pytest
+import torch
+
+from neural_compressor.torch.algorithms.weight_only.activation_cache import (
+    DiskActivationCache,
+    MemoryActivationCache,
+    get_activation_cache,
+)
+
+
+class TestActivationCache:
+    @pytest.mark.parametrize("backend", ["memory", "disk"])
+    def test_append_and_replace(self, backend):
+        cache = get_activation_cache(backend)
+        values = [torch.randn(2, 3, 8) for _ in range(3)]
+        for value in values:
+            cache.append(value)
+        assert len(cache) == 3
+        for value, cached in zip(values, cache):
+            assert torch.equal(value, cached)
+        # replace with the block output of the same shape and of another shape
+        out = torch.randn(2, 3, 8)
+        cache[1] = out
+        assert torch.equal(cache[1], out)
+        out = torch.randn(2, 4, 8)
+        cache[2] = out
+        assert torch.equal(cache[2], out)
+        assert [v.shape for v in cache[1:]] == [torch.Size([2, 3, 8]), torch.Size([2, 4, 8])]
+        cache.clear()
+        assert len(cache) == 0 and cache.num_unique == 0
+
+    @pytest.mark.parametrize("backend", ["memory", "disk"])
+    def test_dedupe(self, backend):
+        cache = get_activation_cache(backend, dedupe=True)
+        mask = torch.ones(1, 1, 6, 6, dtype=torch.bool)
+        for _ in range(4):
+            cache.append(mask.clone())
+        cache.append(None)
+        cache.append(torch.zeros(1, 1, 6, 6, dtype=torch.bool))
+        assert len(cache) == 6
+        assert cache.num_unique == 3
+        assert cache[4] is None
+        assert torch.equal(cache[3], mask)
+        # a shared value is not overwritten in place
+        cache[0] = torch.zeros_like(mask)
+        assert torch.equal(cache[1], mask)
+        assert not cache[0].any()
+
+    @pytest.mark.parametrize("backend", ["memory", "disk"])
+    def test_storage_dtype(self, backend):
+        cache = get_activation_cache(backend, storage_dtype="bf16")
+        value = torch.randn(4, 16)
+        position_ids = torch.arange(16)
+        cache.append(value)
+        cache.append(position_ids)
+        assert cache[0].dtype == torch.float32
+        assert torch.equal(cache[0], value.to(torch.bfloat16).float())
+        assert torch.equal(cache[1], position_ids)
+        cache[0] = value * 2
+        assert torch.equal(cache[0], (value * 2).to(torch.bfloat16).float())
+
+    def test_disk_files(self, tmp_path):
+        cache = get_activation_cache("disk", cache_dir=str(tmp_path))
+        assert isinstance(cache, DiskActivationCache)
+        cache.append(torch.randn(4, 16))
+        cache.append(torch.randn(4, 16))
+        assert len(list(tmp_path.glob("act_cache_*/*.bin"))) == 2
+        # rewrite the file in place
+        cache[0] = torch.randn(2, 32)
+        assert len(list(tmp_path.glob("act_cache_*/*.bin"))) == 2
+        cache.clear()
+        assert not list(tmp_path.glob("act_cache_*"))
+
+    def test_default_backend(self):
+        assert isinstance(get_activation_cache(), MemoryActivationCache)
+        with pytest.raises(AssertionError):
+            get_activation_cache("ssd")
@@ -50,3 +50,47 @@ class TestWeightOnlyLinear:
         new_module.pack(int_weight, scale, zp, m.bias)
         unpacked_int_weight = new_module.unpack_tensor(new_module.qweight)
         assert torch.equal(unpacked_int_weight, int_weight)
+
+    @pytest.mark.parametrize("bits", [2, 3, 4, 8])
+    @pytest.mark.parametrize(
+        "scheme, use_optimum_format, compression_dim",
+        [("asym", True, 1), ("sym", True, 1), ("asym", False, 1), ("sym", False, 1), ("asym", False, 0)],
+    )
+    def test_vectorized_recover(self, bits, scheme, use_optimum_format, compression_dim):
+        m = torch.nn.Linear(96, 40)
+        int_weight, scale, zp = quant_tensor(
+            m.weight.detach().clone(), bits=bits, group_size=32, scheme=scheme, return_int=True
+        )
+        g_idx = torch.randperm(m.in_features, dtype=torch.int32)
+        if not use_optimum_format:
+            g_idx = g_idx // 32  # non-optimum format records the group index of each channel
+        new_module = INCWeightOnlyLinear(
+            m.in_features,
+            m.out_features,
+            bits=bits,
+            group_size=32,
+            zp=zp is not None,
+            g_idx=True,
+            use_optimum_format=use_optimum_format,
+            compression_dim=compression_dim,
+        )
+        new_module.pack(int_weight, scale, zp, g_idx=g_idx)
+        assert torch.equal(
+            new_module.unpack_tensor_with_torch(new_module.qweight),
+            new_module.unpack_tensor_with_numpy(new_module.qweight),
+        )
+        params = new_module.unpack()
+        assert torch.equal(
+            params["int_weight"].to(int_weight.dtype),
+            int_weight + (0 if zp is not None or not use_optimum_format else 2 ** (bits - 1)),
+        )
+        # per-column reference of the dequantization
+        weight, scales, unpacked_zp = params["int_weight"], params["scales"], params["zp"]
+        ref_weight = torch.zeros(m.out_features, m.in_features, dtype=new_module.float_type)
+        for idx in range(m.in_features):
+            g = new_module.g_idx[idx]
+            if unpacked_zp is not None:
+                ref_weight[:, idx] = (weight[:, idx] - unpacked_zp[:, g]).to(torch.int8) * scales[:, g]
+            else:
+                ref_weight[:, idx] = weight[:, idx] * scales[:, g]
+        assert torch.equal(new_module.recover(), ref_weight)
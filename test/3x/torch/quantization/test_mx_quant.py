@@ -1,9 +1,10 @@
 import copy
+import shutil
 
 import pytest
 import torch
 
-from neural_compressor.torch.quantization import MXQuantConfig, convert, get_default_mx_config, prepare
+from neural_compressor.torch.quantization import MXQuantConfig, convert, get_default_mx_config, load, prepare
 
 
 def build_simple_torch_model():
@@ -35,7 +36,7 @@ class TestMXQuant:
         self.input = torch.randn(1, 30)
 
     def teardown_class(self):
-        pass
+        shutil.rmtree("saved_results", ignore_errors=True)
 
     def test_mx_quant_default(self):
         fp32_model = copy.deepcopy(self.fp32_model)
@@ -95,3 +96,30 @@ class TestMXQuant:
         output2 = q_model(example_inputs)
         # set a big atol to avoid random issue
         assert torch.allclose(output1, output2, atol=2e-2), "Accuracy gap atol > 0.02 is unexpected. Please check."
+
+    @pytest.mark.parametrize("w_dtype, weight_only", [("fp4", True), ("fp6_e3m2", False), ("int8", False)])
+    def test_mx_quant_pack_weight(self, w_dtype, weight_only):
+        fake_model = copy.deepcopy(self.fp32_model)
+        quant_config = MXQuantConfig(w_dtype=w_dtype, weight_only=weight_only, out_dtype="float32")
+        fake_model = convert(prepare(model=fake_model, quant_config=quant_config))
+
+        packed_model = copy.deepcopy(self.fp32_model)
+        quant_config = MXQuantConfig(w_dtype=w_dtype, weight_only=weight_only, out_dtype="float32", pack_weight=True)
+        packed_model = convert(prepare(model=packed_model, quant_config=quant_config))
+        assert packed_model.fc1.packed and "fc1.weight" not in packed_model.state_dict()
+        assert packed_model.fc1.weight_packed.dtype == torch.uint8
+        assert torch.equal(packed_model.fc1.recover(), fake_model.fc1.weight)
+        assert torch.equal(packed_model(self.input), fake_model(self.input))
+
+        packed_model.save("saved_results")
+        loaded_model = load("saved_results", copy.deepcopy(self.fp32_model))
+        assert loaded_model.fc1.packed
+        assert torch.equal(loaded_model(self.input), fake_model(self.input))
+
+    def test_mx_quant_torch_compile(self):
+        quant_config = MXQuantConfig(w_dtype="int8", act_dtype="int8", out_dtype="float32")
+        q_model = convert(prepare(model=copy.deepcopy(self.fp32_model), quant_config=quant_config))
+        quant_config = MXQuantConfig(w_dtype="int8", act_dtype="int8", out_dtype="float32", enable_torch_compile=True)
+        compiled_model = convert(prepare(model=copy.deepcopy(self.fp32_model), quant_config=quant_config))
+        with torch.no_grad():
+            assert torch.equal(compiled_model(self.input), q_model(self.input))
@@ -1,4 +1,5 @@
 import copy
+import os
 import shutil
 
 import pytest
@@ -239,6 +240,26 @@ class TestGPTQQuant:
             atol_false < atol_true
         ), "true_sequential=True doesn't help accuracy, maybe is reasonable, please double check."
 
+    def test_disk_activation_cache(self):
+        model = copy.deepcopy(self.tiny_gptj)
+        quant_config = GPTQConfig()
+        model = prepare(model, quant_config)
+        run_fn(model)
+        run_fn(model)
+        model = convert(model)
+        q_label = model(self.example_inputs)[0]
+        # block inputs are cached in memory-mapped files and should give the same result
+        model = copy.deepcopy(self.tiny_gptj)
+        quant_config = GPTQConfig(cache_backend="disk", cache_dir="act_cache")
+        model = prepare(model, quant_config)
+        run_fn(model)
+        run_fn(model)
+        model = convert(model)
+        out = model(self.example_inputs)[0]
+        assert torch.equal(out, q_label), "disk activation cache should not change the result."
+        assert not os.listdir("act_cache"), "activation cache files should be removed after quantization."
+        shutil.rmtree("act_cache", ignore_errors=True)
+
     def test_quant_lm_head(self):
         # quant_lm_head=False
         model = copy.deepcopy(self.tiny_gptj)
@@ -1,10 +1,14 @@
 import copy
 import shutil
+import threading
+import time
+from unittest import mock
 
 import pytest
 import torch
 import transformers
 
+from neural_compressor.torch.algorithms.weight_only.rtn import RTNQuantizer
 from neural_compressor.torch.quantization import (
     RTNConfig,
     convert,
@@ -145,6 +149,36 @@ class TestRTNQuant:
         except:
             assert torch.allclose(atol_false, atol_true, atol=0.012), "atol is very close, double checked the logic."
 
+    @pytest.mark.parametrize("use_mse_search", [False, True])
+    def test_parallel_convert(self, use_mse_search):
+        model = copy.deepcopy(self.tiny_gptj)
+        quant_config = RTNConfig(use_mse_search=use_mse_search)
+        model = prepare(model, quant_config)
+        model = convert(model)
+        parallel_model = copy.deepcopy(self.tiny_gptj)
+        quant_config = RTNConfig(use_mse_search=use_mse_search, num_workers=4, max_inflight_layers=3)
+        parallel_model = prepare(parallel_model, quant_config)
+        # record the threads quantizing layers, the short sleep keeps submitted layers overlapping
+        quantize_module = RTNQuantizer._quantize_module
+        thread_ids = set()
+
+        def _quantize_module(self, *args, **kwargs):
+            thread_ids.add(threading.get_ident())
+            time.sleep(0.01)
+            return quantize_module(self, *args, **kwargs)
+
+        with mock.patch.object(RTNQuantizer, "_quantize_module", _quantize_module):
+            parallel_model = convert(parallel_model)
+        assert len(thread_ids) > 1, "Layers should be converted by more than one worker."
+        assert threading.get_ident() not in thread_ids
+        assert get_woq_linear_num(model, "INCWeightOnlyLinear") == get_woq_linear_num(
+            parallel_model, "INCWeightOnlyLinear"
+        )
+        state_dict, parallel_state_dict = model.state_dict(), parallel_model.state_dict()
+        assert state_dict.keys() == parallel_state_dict.keys()
+        for key in state_dict:
+            assert torch.equal(state_dict[key], parallel_state_dict[key]), f"{key} mismatches the serial convert."
+
     def test_quant_lm_head(self):
         # tie_word_embeddings=false
         gptj_model = transformers.AutoModelForCausalLM.from_pretrained(
@@ -1,3 +1,4 @@
+import copy
 import unittest
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -14,6 +15,7 @@ from neural_compressor.torch.quantization import (
     TuningConfig,
     autotune,
     get_all_config_set,
+    quantize,
 )
 from neural_compressor.torch.utils import constants
 
@@ -198,11 +200,95 @@ class TestAutoTune(unittest.TestCase):
 
         custom_tune_config = TuningConfig(config_set=[RTNConfig(bits=[4, 6])], max_trials=2)
         best_model = autotune(model=build_simple_torch_model(), tune_config=custom_tune_config, eval_fn=eval_acc_fn)
+        # the quantized modules of the best trial are kept, re-quantizing is skipped
         assert (
-            inc_utils.FUNC_CALL_COUNTS.get("quantize") == 3
-        ), f"quantize should be called three times, but got {inc_utils.FUNC_CALL_COUNTS.get('quantize')}"
+            inc_utils.FUNC_CALL_COUNTS.get("quantize") == 2
+        ), f"quantize should be called twice, but got {inc_utils.FUNC_CALL_COUNTS.get('quantize')}"
         self.assertIsNotNone(best_model)
 
+    def test_autotune_restore_trial_model(self):
+        torch.manual_seed(0)
+        model = build_simple_torch_model()
+        fp32_model = copy.deepcopy(model)
+        acc_list = [1, 0.9, 0.95, 0.8]
+        trial_outputs = []
+
+        def eval_acc_fn(model) -> float:
+            trial_outputs.append(model(self.input))
+            return acc_list.pop(0)
+
+        custom_tune_config = TuningConfig(config_set=[RTNConfig(bits=[4, 6, 8])], max_trials=3)
+        best_model = autotune(model=model, tune_config=custom_tune_config, eval_fn=eval_acc_fn)
+        # each trial starts from the fp32 model
+        self.assertTrue(torch.equal(trial_outputs[0], fp32_model(self.input)))
+        for bits, trial_output in zip([4, 6, 8], trial_outputs[1:]):
+            q_model = quantize(copy.deepcopy(fp32_model), RTNConfig(bits=bits))
+            self.assertTrue(torch.equal(trial_output, q_model(self.input)))
+        # the best trial is restored without re-quantizing
+        self.assertIs(best_model, model)
+        self.assertTrue(torch.equal(best_model(self.input), trial_outputs[2]))
+
+    def test_model_snapshot(self):
+        from neural_compressor.torch.quantization.autotune import ModelSnapshot
+
+        model = build_simple_torch_model()
+        fp32_model = copy.deepcopy(model)
+        fc1 = model.fc1
+        snapshot = ModelSnapshot(model, ["fc1"])
+        model.fc1.weight.data.mul_(2)
+        model.fc1 = torch.nn.Identity()
+        model.is_quantized = True
+        restored_model = snapshot.restore()
+        self.assertIs(restored_model.fc1, fc1)
+        self.assertFalse(hasattr(restored_model, "is_quantized"))
+        self.assertTrue(torch.equal(restored_model(self.input), fp32_model(self.input)))
+
+    def test_model_snapshot_untouched_modules(self):
+        from types import SimpleNamespace
+
+        from neural_compressor.torch.quantization.autotune import ModelSnapshot, get_touched_op_names
+
+        model = build_simple_torch_model()
+        model.config = SimpleNamespace(use_cache=True)
+        model.fc2.config = model.config
+        fc3 = model.fc3
+        snapshot = ModelSnapshot(model, ["fc1"])
+        # modules and objects outside the touched modules are put back as well
+        model.fc3 = torch.nn.Identity()
+        model.fc2.qconfig = {}
+        model.config.use_cache = False
+        model.config.quantization_config = {}
+        snapshot.restore()
+        self.assertIs(model.fc3, fc3)
+        self.assertFalse(hasattr(model.fc2, "qconfig"))
+        self.assertIs(model.fc2.config, model.config)
+        self.assertEqual(vars(model.config), {"use_cache": True})
+
+        # the config of the trial is left as is
+        quant_config = RTNConfig()
+        self.assertEqual(get_touched_op_names(model, quant_config), ["fc1", "fc2", "fc3"])
+        self.assertEqual(quant_config.to_dict(), RTNConfig().to_dict())
+
+    def test_model_snapshot_keep_hooks(self):
+        from neural_compressor.torch.quantization.autotune import ModelSnapshot
+
+        model = build_simple_torch_model()
+        modules = dict(model._modules)
+        calls = []
+        handle = model.fc1.register_forward_hook(lambda *args: calls.append("fc1"))
+        snapshot = ModelSnapshot(model, ["fc1"])
+        model_handle = model.register_forward_pre_hook(lambda *args: calls.append("model"))
+        model.fc1 = torch.nn.Identity()
+        snapshot.restore()
+        self.assertIs(model._modules["fc1"], modules["fc1"])
+        model(self.input)
+        self.assertEqual(calls, ["model", "fc1"])
+        # the handles still remove the hooks registered before and after the snapshot
+        handle.remove()
+        model_handle.remove()
+        model(self.input)
+        self.assertEqual(calls, ["model", "fc1"])
+
     @reset_tuning_target
     def test_autotune_api_2(self):
         logger.info("test_autotune_api")
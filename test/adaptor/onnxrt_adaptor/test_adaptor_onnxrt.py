@@ -865,6 +865,65 @@ class TestAdaptorONNXRT(unittest.TestCase):
         self.assertIsNone(res[1])
         del calibrator
 
+    def test_kl_thresholds(self):
+        from scipy.stats import entropy
+
+        from neural_compressor.adaptor.ox_utils.calibrator import (
+            HistogramCollector,
+            KLCalibrator,
+            get_kl_thresholds,
+            smooth_distribution,
+        )
+
+        def get_kl_divergence(hist, i, num_quantized_bins):
+            # evaluate one candidate threshold the straightforward way
+            zero_bin_index = hist.size // 2
+            start, end = zero_bin_index - i, min(zero_bin_index + i + 1, hist.size)
+            sliced = hist[start:end]
+            p = sliced.copy()
+            p[0] += hist[:start].sum()
+            p[-1] += hist[end:].sum()
+            num_merged_bins = sliced.size // num_quantized_bins
+            q = np.zeros(p.size, dtype=np.int64)
+            for index in range(num_quantized_bins):
+                block = slice(index * num_merged_bins, (index + 1) * num_merged_bins)
+                quantized_bin = sliced[block].sum()
+                if index == num_quantized_bins - 1:
+                    quantized_bin += sliced[num_quantized_bins * num_merged_bins :].sum()
+                norm = (p[block] != 0).sum()
+                if norm != 0:
+                    q[block] = float(quantized_bin) / float(norm)
+            return entropy(smooth_distribution(p), smooth_distribution(q))
+
+        np.random.seed(0)
+        histograms = []
+        for data in [np.random.randn(1000), np.random.laplace(size=1000), np.maximum(np.random.randn(1000), 0)]:
+            collector = HistogramCollector(256)
+            collector.collect_data([data.astype("float32"), 2 * data.astype("float32")])
+            histograms.append(collector.histogram)
+        thresholds = get_kl_thresholds(histograms, 128)
+        for histogram, threshold in zip(histograms, thresholds):
+            hist, hist_edges = histogram[:2]
+            zero_bin_index = hist.size // 2
+            kl_divergence = [get_kl_divergence(hist, i, 128) for i in range(64, zero_bin_index + 1)]
+            i = 64 + int(np.argmin(kl_divergence))
+            expected = (
+                max(float(hist_edges[zero_bin_index - i]), histogram[2]),
+                min(float(hist_edges[min(zero_bin_index + i + 1, hist.size)]), histogram[3]),
+            )
+            self.assertEqual(threshold, expected)
+            self.assertEqual(get_kl_thresholds([histogram], 128)[0], threshold)
+
+        # batched ranges are the same as the ones computed one by one
+        calibrators = []
+        for data in [np.random.randn(2, 500), np.random.randn(3, 700) * 5]:
+            calibrator = KLCalibrator()
+            calibrator.collect(list(data.astype("float32")))
+            calibrators.append(calibrator)
+        expected = [KLCalibrator().get_kl_threshold(c.collector.histogram, c.num_quantized_bins) for c in calibrators]
+        KLCalibrator.compute_kl_ranges(calibrators)
+        self.assertEqual([c.calib_range for c in calibrators], expected)
+
     def test_query_block_info(self):
         framework_specific_info = {
             "device": "cpu",
@@ -1,3 +1,4 @@
+import copy
 import os
 import shutil
 import sys
@@ -5,10 +6,11 @@ import unittest
 
 import numpy as np
 import onnx
+import onnxruntime
 from onnx import TensorProto, helper, numpy_helper
 
 sys.path.append("..")
-from neural_compressor.adaptor.ox_utils.calibration import ONNXRTAugment
+from neural_compressor.adaptor.ox_utils.calibration import CalibrationCache, ONNXRTAugment
 from neural_compressor.data import DATALOADERS, Datasets
 from neural_compressor.data.datasets.dataset import Dataset
 from neural_compressor.model.onnx_model import ONNXModel
@@ -139,6 +141,98 @@ class TestAugment(unittest.TestCase):
         calib_params = augment.dump_calibration({})
         self.assertTrue("A" in calib_params and "B" in calib_params and "D" in calib_params and "C" in calib_params)
 
+    def test_dump_minmax_with_histogram(self):
+        from neural_compressor.adaptor.ox_utils.calibrator import CALIBRATOR
+
+        model, dataloader = self.cv_session
+        q_config = {
+            "conv": {"activation": {"algorithm": "kl"}},
+            "relu": {"activation": {"algorithm": "percentile"}},
+        }
+        augment = ONNXRTAugment(ONNXModel(model), dataloader, ["Conv", "Relu"])
+        min_max = augment.dump_minmax(q_config)
+
+        # outputs are merged into histograms batch by batch
+        outputs = {"C": [], "D": []}
+        session = onnxruntime.InferenceSession(
+            augment.augmented_model.SerializeToString(), providers=["CPUExecutionProvider"]
+        )
+        output_names = [output.name for output in session.get_outputs()]
+        for inputs, _ in dataloader:
+            for name, output in zip(output_names, session.run(None, {"A": inputs})):
+                if name in outputs:
+                    outputs[name].append(output)
+        for name, calib_method in [("C", "kl"), ("D", "percentile")]:
+            calibrator = CALIBRATOR[calib_method]()
+            for output in outputs[name]:
+                calibrator.collect(output)
+            self.assertEqual(list(min_max[name]), list(calibrator.calib_range))
+
+    def test_dump_minmax_with_calib_cache(self):
+        model, dataloader = self.cv_session
+        q_config = {
+            "conv": {"activation": {"algorithm": "minmax"}},
+            "relu": {"activation": {"algorithm": "percentile"}},
+        }
+        calib_cache = CalibrationCache()
+        augment = ONNXRTAugment(ONNXModel(model), dataloader, ["Conv", "Relu"], calib_cache=calib_cache)
+        min_max = augment.dump_minmax(q_config)
+
+        class CountingSession(onnxruntime.InferenceSession):
+            num_runs = 0
+
+            def run(self, *args, **kwargs):
+                CountingSession.num_runs += 1
+                return super().run(*args, **kwargs)
+
+        origin_session = onnxruntime.InferenceSession
+        onnxruntime.InferenceSession = CountingSession
+        try:
+            # fallback of relu calibrates a subset of recorded tensors
+            fallback_config = {"conv": q_config["conv"], "relu": "fp32"}
+            augment = ONNXRTAugment(
+                ONNXModel(model), dataloader, ["Conv", "Relu"], black_nodes=["relu"], calib_cache=calib_cache
+            )
+            fallback_min_max = augment.dump_minmax(fallback_config)
+            self.assertEqual(CountingSession.num_runs, 0)
+            for name in ["A", "C"]:
+                self.assertEqual(fallback_min_max[name], min_max[name])
+
+            # the tensor calibrated with another method is not recorded
+            kl_config = {"conv": q_config["conv"], "relu": {"activation": {"algorithm": "kl"}}}
+            augment = ONNXRTAugment(ONNXModel(model), dataloader, ["Conv", "Relu"], calib_cache=calib_cache)
+            augment.dump_minmax(kl_config)
+            num_batches = len(list(dataloader))
+            self.assertEqual(CountingSession.num_runs, num_batches)
+
+            # the ranges of another model are not reused
+            other_model = ONNXModel(model)
+            other_model.model.graph.initializer[0].float_data[0] += 1
+            augment = ONNXRTAugment(other_model, dataloader, ["Conv", "Relu"], calib_cache=calib_cache)
+            augment.dump_minmax(q_config)
+            self.assertEqual(CountingSession.num_runs, 2 * num_batches)
+        finally:
+            onnxruntime.InferenceSession = origin_session
+
+    def test_model_fingerprint(self):
+        from neural_compressor.adaptor.ox_utils.calibration import get_model_fingerprint
+
+        model, _ = self.cv_session
+        model = copy.deepcopy(model)
+        weight = numpy_helper.from_array(np.random.rand(64, 64).astype(np.float32), model.graph.initializer[0].name)
+        model.graph.initializer[0].CopyFrom(weight)
+        fingerprint = get_model_fingerprint(model)
+        self.assertEqual(get_model_fingerprint(copy.deepcopy(model)), fingerprint)
+        # weights scaled in place keep the name, shape and data type
+        model.graph.initializer[0].CopyFrom(numpy_helper.from_array(numpy_helper.to_array(weight) * 0.5, weight.name))
+        self.assertNotEqual(get_model_fingerprint(model), fingerprint)
+        # a single element edited anywhere in the weight is seen
+        fingerprint = get_model_fingerprint(model)
+        array = numpy_helper.to_array(model.graph.initializer[0]).copy()
+        array[37, 21] += 1
+        model.graph.initializer[0].CopyFrom(numpy_helper.from_array(array, weight.name))
+        self.assertNotEqual(get_model_fingerprint(model), fingerprint)
+
     def test_augment_graph(self):
         """TEST_CONFIG_1."""
 
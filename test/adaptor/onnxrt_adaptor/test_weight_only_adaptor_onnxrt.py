@@ -501,5 +501,76 @@ class TestWeightOnlyAdaptor(unittest.TestCase):
                 self.assertTrue((np.abs(q_out[0] - org_out[0]) < 0.5).all())
 
 
+class TestRTNStreaming(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        np.random.seed(0)
+        nodes = []
+        inits = []
+        for i in range(4):
+            nodes.append(
+                onnx.helper.make_node(
+                    "MatMul", ["x{}".format(i), "w{}".format(i)], ["m{}".format(i)], "matmul{}".format(i)
+                )
+            )
+            nodes.append(
+                onnx.helper.make_node(
+                    "Add", ["m{}".format(i), "b{}".format(i)], ["x{}".format(i + 1)], "add{}".format(i)
+                )
+            )
+            inits.append(onnx.numpy_helper.from_array(np.random.randn(64, 64).astype(np.float32), "w{}".format(i)))
+            inits.append(onnx.numpy_helper.from_array(np.random.randn(64).astype(np.float32), "b{}".format(i)))
+        graph = onnx.helper.make_graph(
+            nodes,
+            "matmul_chain",
+            [onnx.helper.make_tensor_value_info("x0", onnx.TensorProto.FLOAT, [1, 64])],
+            [onnx.helper.make_tensor_value_info("x4", onnx.TensorProto.FLOAT, [1, 64])],
+            inits,
+        )
+        self.model = onnx.helper.make_model(graph, opset_imports=[onnx.helper.make_opsetid("", 17)])
+        os.makedirs("streaming_src", exist_ok=True)
+        onnx.save_model(
+            copy.deepcopy(self.model),
+            "streaming_src/model.onnx",
+            save_as_external_data=True,
+            location="model.onnx_data",
+            size_threshold=0,
+        )
+        self.data = {"x0": np.random.randn(1, 64).astype(np.float32)}
+
+    @classmethod
+    def tearDownClass(self):
+        shutil.rmtree("streaming_src", ignore_errors=True)
+        shutil.rmtree("streaming_dst", ignore_errors=True)
+
+    def test_rtn_streaming(self):
+        for num_bits in [4, 8]:
+            q_model = rtn_quantize(copy.deepcopy(self.model), num_bits=num_bits, group_size=32)
+            stream_model = rtn_quantize(
+                "streaming_src/model.onnx", num_bits=num_bits, group_size=32, save_path="streaming_dst/model.onnx"
+            )
+            self.assertTrue(stream_model.is_large_model)
+            self.assertEqual(stream_model.model_path, "streaming_dst/model.onnx")
+            # only stubs are kept in the graph, the data is in the new external data file
+            for tensor in stream_model.initializer():
+                self.assertEqual(tensor.data_location, onnx.TensorProto.EXTERNAL)
+                self.assertEqual(tensor.external_data[0].value, "model.onnx_data")
+            saved_model = onnx.load("streaming_dst/model.onnx")
+            for tensor, saved_tensor in zip(q_model.initializer(), saved_model.graph.initializer):
+                self.assertEqual(tensor.name, saved_tensor.name)
+                np.testing.assert_array_equal(
+                    onnx.numpy_helper.to_array(tensor), onnx.numpy_helper.to_array(saved_tensor)
+                )
+            out = ort.InferenceSession("streaming_dst/model.onnx", providers=["CPUExecutionProvider"]).run(
+                None, self.data
+            )
+            np.testing.assert_array_equal(Inference(q_model.model, self.data)[0], out[0])
+
+    def test_rtn_num_workers(self):
+        q_model = rtn_quantize(copy.deepcopy(self.model), num_bits=4, group_size=32)
+        parallel_model = rtn_quantize(copy.deepcopy(self.model), num_bits=4, group_size=32, num_workers=2)
+        self.assertEqual(q_model.model.SerializeToString(), parallel_model.model.SerializeToString())
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -519,6 +519,43 @@ class TestDataloader(unittest.TestCase):
         data = next(iterator)
         self.assertEqual(data.shape, (1, 256, 256, 3))
 
+    def test_default_dataloader_workers(self):
+        from neural_compressor.data.dataloaders.default_dataloader import DefaultDataLoader
+
+        class index_dataset(object):
+            def __len__(self):
+                return 37
+
+            def __getitem__(self, index):
+                return np.full([64, 64, 8], index, dtype=np.float32), index
+
+        class iter_dataset(object):
+            def __iter__(self):
+                for i in range(37):
+                    yield np.full([64, 64, 8], i, dtype=np.float32), i
+
+        for dataset in [index_dataset(), iter_dataset()]:
+            for last_batch in ["rollover", "discard"]:
+                expected = list(DefaultDataLoader(dataset, batch_size=4, last_batch=last_batch))
+                for worker_type in ["process", "thread"]:
+                    data_loader = DefaultDataLoader(
+                        dataset, batch_size=4, last_batch=last_batch, num_workers=3, worker_type=worker_type
+                    )
+                    result = list(data_loader)
+                    self.assertEqual(len(result), len(expected))
+                    for data, expected_data in zip(result, expected):
+                        np.testing.assert_array_equal(data[0], expected_data[0])
+                        self.assertEqual(list(data[1]), list(expected_data[1]))
+
+        class error_dataset(index_dataset):
+            def __getitem__(self, index):
+                if index == 5:
+                    raise ValueError("invalid sample")
+                return super().__getitem__(index)
+
+        with self.assertRaises(RuntimeError):
+            list(DefaultDataLoader(error_dataset(), batch_size=2, num_workers=2))
+
     def test_tensorflow_bert(self):
         import collections
         import json
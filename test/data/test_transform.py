@@ -995,6 +995,50 @@ class TestONNXTransfrom(unittest.TestCase):
         with self.assertRaises(ValueError):
             TestONNXTransfrom.transforms["RandomResizedCrop"](**args)
 
+    def testComposeCollate(self):
+        from neural_compressor.data.dataloaders.default_dataloader import default_collate
+
+        general_transforms = TRANSFORMS("onnxrt_qlinearops", "general")
+        transform_list = [
+            TestONNXTransfrom.transforms["Resize"](size=[80]),
+            TestONNXTransfrom.transforms["CenterCrop"](size=[64]),
+            TestONNXTransfrom.transforms["Rescale"](),
+            TestONNXTransfrom.transforms["Normalize"](mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+            TestONNXTransfrom.transforms["Transpose"](perm=[2, 0, 1]),
+            general_transforms["Cast"](dtype="float32"),
+        ]
+        compose = TestONNXTransfrom.transforms["Compose"](transform_list)
+        self.assertEqual(len(compose.sample_transforms), 1)
+        samples = [((np.random.random_sample([100, 90, 3]) * 255).astype(np.uint8), i) for i in range(4)]
+        expected = default_collate([compose(sample) for sample in samples])
+        result = compose.collate(samples)
+        self.assertEqual(result[0].dtype, np.float32)
+        self.assertTrue(result[0].flags.c_contiguous)
+        np.testing.assert_array_equal(result[0], expected[0])
+        self.assertEqual(list(result[1]), list(expected[1]))
+
+        # images with different shapes are transformed one by one
+        compose = TestONNXTransfrom.transforms["Compose"](transform_list[1:])
+        self.assertEqual(len(compose.sample_transforms), 0)
+        samples = [((np.random.random_sample([100, 90 + i, 3]) * 255).astype(np.uint8), i) for i in range(4)]
+        expected = default_collate([compose(sample) for sample in samples])
+        result = compose.collate(samples)
+        np.testing.assert_array_equal(result[0], expected[0])
+
+        # a pending cast is applied before the next cast
+        compose = TestONNXTransfrom.transforms["Compose"](
+            [
+                general_transforms["Cast"](dtype="uint8"),
+                TestONNXTransfrom.transforms["CenterCrop"](size=[64]),
+                general_transforms["Cast"](dtype="float16"),
+            ]
+        )
+        samples = [((np.random.random_sample([100, 90, 3]) * 255).astype(np.float32), i) for i in range(4)]
+        expected = default_collate([compose(sample) for sample in samples])
+        result = compose.collate(samples)
+        self.assertEqual(result[0].dtype, np.float16)
+        np.testing.assert_array_equal(result[0], expected[0])
+
 
 if __name__ == "__main__":
     unittest.main()
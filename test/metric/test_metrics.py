@@ -1100,6 +1100,52 @@ class TestMetrics(unittest.TestCase):
         rmse_result = rmse.result()
         self.assertAlmostEqual(rmse_result, np.sqrt(0.5))
 
+    def test_roc(self):
+        import sklearn.metrics
+
+        metrics = METRICS("pytorch")
+        roc = metrics["ROC"]()
+        rng = np.random.default_rng(0)
+        scores, targets = [], []
+        for _ in range(10):
+            target = rng.integers(0, 2, (100, 1)).astype(np.float32)
+            score = np.clip(rng.normal(0.35 + 0.3 * target, 0.2), 0, 1).astype(np.float32)
+            roc.update([score], [target])
+            scores.append(score)
+            targets.append(target)
+        scores = np.concatenate(scores).squeeze()
+        targets = np.concatenate(targets).squeeze()
+        self.assertEqual(roc.result(), sklearn.metrics.accuracy_score(targets, np.round(scores)))
+        self.assertAlmostEqual(roc.auc, sklearn.metrics.roc_auc_score(targets, scores), places=4)
+        roc.reset()
+        self.assertEqual(roc.sample, 0)
+        self.assertIsNone(roc.auc)
+        # the auc of samples of one class is not defined
+        roc.update([np.array([0.2, 0.7])], [np.array([1, 1])])
+        self.assertEqual(roc.result(), 0.5)
+        self.assertIsNone(roc.auc)
+
+    def test_hvd_reduce_state(self):
+        class FakeHvd:
+            # the other rank evaluated the same predictions
+            def allgather_object(self, obj):
+                return [obj, obj]
+
+        metrics = METRICS("pytorch")
+        acc = metrics["Accuracy"]()
+        acc.hvd = FakeHvd()
+        acc.update([1, 0, 1, 1], [0, 1, 1, 1])
+        self.assertEqual(acc.result(), 0.5)
+        mse = metrics["MSE"]()
+        mse.hvd = FakeHvd()
+        mse.update([1, 0, 0, 1], [0, 1, 0, 0])
+        self.assertEqual(mse.result(), 0.75)
+        roc = metrics["ROC"]()
+        roc.hvd = FakeHvd()
+        roc.update([np.array([0.1, 0.8, 0.6, 0.3])], [np.array([0, 1, 0, 1])])
+        self.assertEqual(roc.result(), 0.5)
+        self.assertEqual(roc.auc, 0.75)
+
     def test_loss(self):
         metrics = METRICS("pytorch")
         loss = metrics["Loss"]()
@@ -407,6 +407,69 @@ class TestOnnxModel(unittest.TestCase):
         initializer = find_by_name("X1", self.model.initializer())
         self.assertIsNone(initializer)
 
+    def test_index_consistency(self):
+        conv1 = self.model.get_node("Conv1")
+        conv3 = self.model.get_node("Conv3")
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 1)
+
+        # nodes and initializers added or removed through ONNXModel keep the indexes up to date
+        relu = onnx.helper.make_node("Relu", ["X1_weight"], ["relu_output"], name="added_relu")
+        self.model.add_node(relu)
+        self.assertEqual(self.model.get_node("added_relu").output, ["relu_output"])
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 2)
+        self.model.remove_nodes([self.model.get_node("added_relu"), self.model.get_node("Add")])
+        self.assertIsNone(self.model.get_node("added_relu"))
+        self.assertIsNone(self.model.get_node("Add"))
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 1)
+        # the nodes left in the graph are still the same objects
+        self.assertIs(self.model.get_node("Conv3"), conv3)
+        conv3.name = "Conv3_renamed"
+        self.assertEqual(self.model.nodes()[-1].name, "Conv3_renamed")
+        self.assertIs(self.model.get_node("Conv3_renamed"), conv3)
+
+        # inputs replaced in place are not counted as shares anymore
+        conv1.input[1] = "X3_weight"
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 0)
+
+        # edits done on the graph directly are detected
+        self.model.graph().node.extend([onnx.helper.make_node("Relu", ["X5_weight"], ["out"], name="direct_relu")])
+        self.assertIsNotNone(self.model.get_node("direct_relu"))
+        self.assertEqual(self.model.get_initializer_share_num("X5_weight"), 2)
+        self.model.graph().initializer.remove(self.model.get_initializer("X5_bias"))
+        self.assertIsNone(self.model.get_initializer("X5_bias"))
+
+        weight = self.model.get_initializer("X3_weight")
+        self.model.remove_initializers([self.model.get_initializer("X1_weight"), self.model.get_initializer("X1_bias")])
+        self.assertIsNone(self.model.get_initializer("X1_weight"))
+        self.assertIs(self.model.get_initializer("X3_weight"), weight)
+        self.model.add_initializer(generate_input_initializer([2, 2], np.float32, "X1_weight"))
+        self.assertEqual(self.model.initializer()[-1].name, "X1_weight")
+        self.assertEqual(self.model.get_initializer("X1_weight").dims, [2, 2])
+
+    def test_index_node_input_edits(self):
+        self.assertEqual(self.model.get_initializer_share_num("X3_weight"), 1)
+        self.assertIsNone(self.model.get_node("Conv4"))
+
+        # inputs set or replaced through ONNXModel keep the consumer index up to date
+        self.model.set_node_input(self.model.get_node("Conv1"), 1, "X3_weight")
+        self.assertEqual(self.model.get_initializer_share_num("X3_weight"), 2)
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 0)
+        self.model.replace_input_of_all_nodes("X3_weight", "X5_weight")
+        self.assertEqual(self.model.get_initializer_share_num("X3_weight"), 0)
+        self.assertEqual(self.model.get_initializer_share_num("X5_weight"), 3)
+        self.model.replace_node_input(self.model.get_node("Conv3"), "X5_weight", "X1_weight")
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 1)
+
+        # nodes renamed in place are found without invalidating the index, even after a miss
+        self.model.get_node("Conv2").name = "Conv4"
+        self.assertEqual(self.model.get_node("Conv4").op_type, "Conv")
+        self.assertIsNone(self.model.get_node("Conv2"))
+
+        # inputs added in place are picked up after invalidating the index
+        self.model.graph().node[1].input[1] = "X1_weight"
+        self.model.invalidate_node_index()
+        self.assertEqual(self.model.get_initializer_share_num("X1_weight"), 2)
+
     def test_remove_unused_nodes(self):
         self.assertEqual(len(self.model.nodes()), 6)
         node_to_add = onnx.helper.make_node("Relu", ["output1"], ["output2"], keepdims=0, name="added_relu")
@@ -470,6 +533,26 @@ class TestOnnxModel(unittest.TestCase):
         model.check_is_large_model()
         self.assertFalse(model.is_large_model)
 
+    def test_check_large_model_by_dims(self):
+        # size is estimated from dims and data type, the data itself is never serialized
+        model = self.model
+        init = onnx.TensorProto(name="large_weight", data_type=TensorProto.FLOAT16, dims=[1024, 1024, 1024])
+        model.add_initializer(init)
+        model.check_is_large_model()
+        self.assertTrue(model.is_large_model)
+
+        model.get_initializer("large_weight").data_type = TensorProto.INT8
+        model.check_is_large_model()
+        self.assertFalse(model.is_large_model)
+
+    def test_set_initializer(self):
+        self.model.add_initializer(numpy_helper.from_array(np.zeros((2, 3), dtype=np.float16), "fp16_weight"))
+        self.model.set_initializer("fp16_weight", np.arange(6, dtype=np.float32))
+        init = self.model.get_initializer("fp16_weight")
+        self.assertEqual(init.data_type, TensorProto.FLOAT16)
+        self.assertEqual(len(init.raw_data), 12)
+        np.testing.assert_array_equal(numpy_helper.to_array(init), np.arange(6, dtype=np.float16).reshape(2, 3))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -287,6 +287,33 @@ class TestObjs(unittest.TestCase):
         num, _ = obj.best_result(tune_data, baseline)
         self.assertEqual(num, 6)
 
+    def test_latency_percentile_and_footprint(self):
+        import numpy as np
+
+        from neural_compressor.objective import MultiObjective
+
+        def eval_func(model, measurer=None):
+            buffers = []
+            for i in range(20):
+                measurer.start()
+                buffers.append(np.ones(1024 * 1024 * 4, dtype=np.uint8))
+                measurer.end()
+            return 0.9
+
+        eval_func.builtin = True
+        obj = MultiObjective(["accuracy", "p99latency", "performance", "footprint"], {"relative": 0.1})
+        acc, result = obj.evaluate(eval_func, None)
+        self.assertEqual(acc, 0.9)
+        p99_latency, performance = obj.objectives[1], obj.objectives[2]
+        # the latency percentile is measured per iteration, the first one is discarded as warmup
+        self.assertEqual(len(p99_latency.result_list()), 20)
+        self.assertEqual(result[1], np.percentile(p99_latency.result_list()[1:], 99))
+        self.assertEqual(len(performance.result_list()), 1)
+        self.assertEqual(set(performance.latency_stats()), {"mean", "p50", "p90", "p99", "max"})
+        # the whole evaluation keeps 80 MB of native numpy buffers
+        self.assertGreaterEqual(result[3], 40)
+        self.assertGreater(obj.objectives[3].memory_stats()[0]["peak_uss"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,17 +1,107 @@
 """Tests for strategy utility."""
 
+import os
+import pickle
+import shutil
 import unittest
 
-from neural_compressor.strategy.utils.utility import build_slave_faker_model
+import torch
+
+from neural_compressor.strategy.utils.utility import build_slave_faker_model, get_tune_cfg_fingerprint
+
+
+class FakeModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.fc1 = torch.nn.Linear(8, 8)
+        self.fc2 = torch.nn.Linear(8, 8)
+        self.fc3 = torch.nn.Linear(8, 4)
+
+    def forward(self, x):
+        return self.fc3(self.fc2(self.fc1(x)))
+
+
+class FakeDataLoader:
+    batch_size = 1
+
+    def __iter__(self):
+        for _ in range(2):
+            yield torch.randn(1, 8), 0
 
 
 class TestUtils(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree("./saved_snapshot", ignore_errors=True)
+
     def test_build_slave_faker_model(self):
         faker_model = build_slave_faker_model()
         faker_model.some_method(0, a=1)
         faker_model.some_attr
         faker_model.some_attr.another_attr[0].some_method()
 
+    def test_tune_cfg_fingerprint(self):
+        tune_cfg = {
+            "calib_iteration": 1,
+            "op": {
+                ("fc1", "Linear"): {"weight": {"dtype": "int8", "scheme": "sym"}, "activation": {"dtype": "uint8"}},
+                ("fc2", "Linear"): {"weight": {"dtype": "fp32"}, "activation": {"dtype": "fp32"}},
+            },
+            "trial_number": 1,
+        }
+        same_tune_cfg = {
+            "trial_number": 3,
+            "op": {
+                ("fc2", "Linear"): {"activation": {"dtype": "fp32"}, "weight": {"dtype": "fp32"}},
+                ("fc1", "Linear"): {"activation": {"dtype": "uint8"}, "weight": {"scheme": "sym", "dtype": "int8"}},
+            },
+            "calib_iteration": 1.0,
+        }
+        other_tune_cfg = {
+            "calib_iteration": 1,
+            "op": {
+                ("fc1", "Linear"): {"weight": {"dtype": "fp32"}, "activation": {"dtype": "fp32"}},
+                ("fc2", "Linear"): {"weight": {"dtype": "fp32"}, "activation": {"dtype": "fp32"}},
+            },
+            "trial_number": 1,
+        }
+        fingerprint = get_tune_cfg_fingerprint(tune_cfg, ignore_keys=["trial_number"])
+        self.assertEqual(fingerprint, get_tune_cfg_fingerprint(same_tune_cfg, ignore_keys=["trial_number"]))
+        self.assertNotEqual(fingerprint, get_tune_cfg_fingerprint(same_tune_cfg))
+        self.assertNotEqual(fingerprint, get_tune_cfg_fingerprint(other_tune_cfg, ignore_keys=["trial_number"]))
+
+    def test_history_snapshot_records(self):
+        from neural_compressor import PostTrainingQuantConfig, quantization
+        from neural_compressor.config import AccuracyCriterion, TuningCriterion, options
+        from neural_compressor.utils.utility import get_tuning_history, load_tuning_snapshot
+
+        accuracy = iter([1.0] + [0.5] * 10)
+        conf = PostTrainingQuantConfig(
+            quant_level=1,
+            tuning_criterion=TuningCriterion(max_trials=4),
+            accuracy_criterion=AccuracyCriterion(tolerable_loss=0.01),
+        )
+        options.workspace = "./saved_snapshot"
+        quantization.fit(FakeModel(), conf, calib_dataloader=FakeDataLoader(), eval_func=lambda model: next(accuracy))
+        options.workspace = "./nc_workspace"
+        snapshot_path = "./saved_snapshot/history.snapshot"
+
+        # the evaluated trials are appended to the snapshot as records and replayed when loading
+        with open(snapshot_path, "rb") as f:
+            num_saved_history = len(pickle.load(f).tuning_history[0]["history"])
+        tuning_history = get_tuning_history(snapshot_path)
+        num_history = len(tuning_history[0]["history"])
+        self.assertGreater(num_history, num_saved_history)
+        for history in tuning_history[0]["history"]:
+            self.assertIn("q_config", history)
+        strategy = load_tuning_snapshot(snapshot_path)
+        self.assertEqual(len(strategy.tuning_history), 1)
+
+        # an incomplete record left by an interrupted tuning is dropped
+        with open(snapshot_path, "r+b") as f:
+            f.truncate(os.path.getsize(snapshot_path) - 10)
+        self.assertEqual(len(get_tuning_history(snapshot_path)[0]["history"]), num_history - 1)
+
 
 if __name__ == "__main__":
     unittest.main()